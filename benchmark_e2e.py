@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+End-to-End Proxy Benchmark
+Runs the real application in-process against a local mock LLM upstream and
+reports RPS, p50/p99 latency and proxy overhead (proxied minus direct latency)
+for chat, streaming, embeddings and provider fallback. Results are written as
+JSON for comparison between releases. With --detect-blocking-io the run fails
+when the proxy makes blocking I/O calls on the event loop.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+
+from src.benchmarks.e2e import (SCENARIOS, BenchmarkSettings, format_results,
+                                run_suite)
+from src.benchmarks.mock_upstream import LatencyDistribution, UpstreamProfile
+from src.benchmarks.regression import ResultStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent in-flight requests")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario and path")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios to run")
+    parser.add_argument("--latency", default="constant:5",
+                        help="Upstream latency in ms: N, constant:N, uniform:A:B, normal:MEAN:SD, "
+                             "lognormal:MEDIAN:SIGMA or exponential:MEAN")
+    parser.add_argument("--stream-tokens", type=int, default=20, help="Chunks per streamed completion")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Streaming rate (0 = unthrottled)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Share of upstream calls answered with 429")
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="Share of upstream calls answered with a 5xx")
+    parser.add_argument("--max-context-tokens", type=int, default=0,
+                        help="Upstream context window; longer prompts get context_length_exceeded")
+    parser.add_argument("--failing-status", type=int, default=503, help="Status of the failing provider in 'fallback'")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for upstream latency and error injection")
+    parser.add_argument("--config", type=Path, default=Path("config.yaml"), help="Base configuration to benchmark")
+    parser.add_argument("--output", type=Path, help="Write the JSON result document here")
+    parser.add_argument("--detect-blocking-io", action="store_true",
+                        help="Record sync file/socket I/O on the event loop and exit 1 if any is found")
+    parser.add_argument("--store", type=Path,
+                        help="Record the run in this result store (see benchmark_regression.py)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    settings = BenchmarkSettings(
+        requests=args.requests,
+        concurrency=args.concurrency,
+        warmup=args.warmup,
+        scenarios=tuple(name.strip() for name in args.scenarios.split(",") if name.strip()),
+        upstream=UpstreamProfile(
+            latency=LatencyDistribution.parse(args.latency),
+            stream_tokens=args.stream_tokens,
+            tokens_per_second=args.tokens_per_second,
+            rate_429=args.rate_429,
+            rate_5xx=args.rate_5xx,
+            max_context_tokens=args.max_context_tokens,
+        ),
+        failing_status=args.failing_status,
+        seed=args.seed,
+        base_config=args.config,
+        blocking_io_detection="log" if args.detect_blocking_io else "off",
+    )
+
+    result = asyncio.run(run_suite(settings)).to_dict()
+    print(format_results(result))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(result, indent=2))
+        print(f"\nResults written to {args.output}")
+    if args.store:
+        print(f"Run recorded at {ResultStore(args.store).record(result)}")
+    if args.detect_blocking_io and result["event_loop"].get("blocking_io", {}).get("blocking_calls"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Middleware Overhead Benchmark
+Request-overhead floor of the ASGI stack, measured against a null provider
+endpoint that returns a canned completion without doing any work. Compares the
+bare app, a pass-through BaseHTTPMiddleware (the previous gateway's
+structure) and the pure-ASGI GatewayMiddleware, for JSON and SSE responses.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.api.gateway import GatewayMiddleware
+from src.api.responses import completion_response
+from src.core.auth import APIKeyAuth
+from src.core.rate_limiter import TokenBucketRateLimiter, rate_limiter
+from src.models.upstream_response import UpstreamResponse
+
+API_KEY = "benchmark-key"
+COMPLETION = (b'{"id":"chatcmpl-null","object":"chat.completion","model":"null",'
+              b'"choices":[{"index":0,"message":{"role":"assistant","content":"ok"},"finish_reason":"stop"}],'
+              b'"usage":{"prompt_tokens":1,"completion_tokens":1,"total_tokens":2}}')
+
+
+class PassThroughMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+def build_app(middleware: str) -> FastAPI:
+    app = FastAPI()
+    app.state.api_key_auth = APIKeyAuth([API_KEY])
+
+    @app.post("/v1/null/completions")
+    async def null_completion(request: Request):
+        return completion_response(request, UpstreamResponse({}, raw=COMPLETION))
+
+    @app.post("/v1/null/stream")
+    async def null_stream(request: Request):
+        async def chunks():
+            for _ in range(3):
+                yield b'data: {"choices":[{"delta":{"content":"ok"}}]}\n\n'
+            yield b"data: [DONE]\n\n"
+        return completion_response(request, chunks(), stream=True)
+
+    if middleware == "base_http":
+        app.add_middleware(PassThroughMiddleware)
+    elif middleware == "gateway":
+        app.add_middleware(GatewayMiddleware)
+    return app
+
+
+async def call(app: FastAPI, path: str) -> List[Dict[str, Any]]:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8000),
+        "headers": [(b"authorization", f"Bearer {API_KEY}".encode()), (b"content-type", b"application/json")],
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"{}", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages
+
+
+async def measure(app: FastAPI, path: str, iterations: int) -> float:
+    """Mean wall-clock microseconds per request"""
+    for _ in range(100):  # warm-up
+        await call(app, path)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await call(app, path)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def run(iterations: int) -> None:
+    rate_limiter.token_bucket_limiter = TokenBucketRateLimiter(requests_per_minute=10**9)
+    print(f"{'stack':<12} {'json us/req':>12} {'sse us/req':>12}")
+    for middleware in ("bare", "base_http", "gateway"):
+        app = build_app(middleware)
+        json_us = await measure(app, "/v1/null/completions", iterations)
+        sse_us = await measure(app, "/v1/null/stream", iterations)
+        print(f"{middleware:<12} {json_us:12.1f} {sse_us:12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5000, help="Requests per stack and response type")
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
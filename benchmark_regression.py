@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Performance Regression Gate
+Runs the hot-path micro-benchmarks (route_request, UnifiedCache.get,
+MetricsCollector.record_request, TokenBucketRateLimiter.is_allowed, config
+load), records every run in a result store and compares it against the stored
+baseline. Exits with status 1 when a benchmark got slower than its threshold
+and the difference is statistically significant.
+
+  run       run the micro suite, record it and gate it against the baseline
+  compare   gate any stored result (micro or e2e) against a baseline
+  baseline  promote a result file to the baseline of its suite
+  history   print one metric over the recorded runs
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+from src.benchmarks.micro import (MICRO_SUITE, format_micro_results,
+                                  run_micro_suite, select_benchmarks)
+from src.benchmarks.regression import (DEFAULT_ALPHA, DEFAULT_STORE,
+                                       DEFAULT_THRESHOLD, ResultStore,
+                                       compare_results, format_report)
+
+
+def parse_thresholds(values: List[str]) -> Dict[str, float]:
+    thresholds = {}
+    for value in values:
+        name, sep, limit = value.partition("=")
+        if not sep:
+            raise SystemExit(f"Invalid --limit '{value}', expected NAME=FRACTION")
+        thresholds[name] = float(limit)
+    return thresholds
+
+
+def gate(store: ResultStore, result: dict, baseline: dict, args) -> int:
+    if baseline is None:
+        print(f"\nNo {result['suite']} baseline in {store.root}; nothing to compare against")
+        return 0
+    report = compare_results(baseline, result, threshold=args.threshold, alpha=args.alpha,
+                             thresholds=parse_thresholds(args.limit))
+    print()
+    print(format_report(report))
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(json.dumps(report.to_dict(), indent=2))
+    return 0 if report.passed else 1
+
+
+def cmd_run(args) -> int:
+    benchmarks = select_benchmarks([name.strip() for name in args.benchmarks.split(",") if name.strip()])
+    result = run_micro_suite(benchmarks, samples=args.samples, min_sample_time=args.min_time).to_dict()
+    print(format_micro_results(result))
+
+    store = ResultStore(args.store)
+    if not args.no_record:
+        print(f"\nRun recorded at {store.record(result)}")
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(result, indent=2))
+
+    status = gate(store, result, store.baseline(MICRO_SUITE), args)
+    if args.update_baseline and status == 0:
+        print(f"Baseline updated at {store.set_baseline(result)}")
+    return status
+
+
+def cmd_compare(args) -> int:
+    store = ResultStore(args.store)
+    result = store.load(args.result)
+    baseline = store.load(args.baseline) if args.baseline else store.baseline(result["suite"])
+    return gate(store, result, baseline, args)
+
+
+def cmd_baseline(args) -> int:
+    store = ResultStore(args.store)
+    print(f"Baseline updated at {store.set_baseline(store.load(args.result))}")
+    return 0
+
+
+def cmd_history(args) -> int:
+    for point in ResultStore(args.store).history(args.suite, args.metric, args.limit):
+        print(f"{point['run']:<40} {point['commit'] or '-':<10} {point['value']:>14.2f}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--store", type=Path, default=DEFAULT_STORE, help="Result store directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_gate_options(command):
+        command.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                             help="Allowed slowdown as a fraction of the baseline median")
+        command.add_argument("--alpha", type=float, default=DEFAULT_ALPHA,
+                             help="Significance level below which a difference is not noise")
+        command.add_argument("--limit", action="append", default=[], metavar="NAME=FRACTION",
+                             help="Per-metric threshold, repeatable")
+        command.add_argument("--report", type=Path, help="Write the comparison as JSON here")
+
+    run = commands.add_parser("run", help="Run, record and gate the micro suite")
+    run.add_argument("--benchmarks", default="", help="Comma-separated benchmarks (default: all)")
+    run.add_argument("--samples", type=int, default=20, help="Samples per benchmark")
+    run.add_argument("--min-time", type=float, default=0.02, help="Minimum seconds per sample")
+    run.add_argument("--no-record", action="store_true", help="Do not store this run")
+    run.add_argument("--update-baseline", action="store_true",
+                     help="Make this run the baseline when it passes the gate")
+    run.add_argument("--output", type=Path, help="Also write the result document here")
+    add_gate_options(run)
+    run.set_defaults(handler=cmd_run)
+
+    compare = commands.add_parser("compare", help="Gate a result file against a baseline")
+    compare.add_argument("result", type=Path)
+    compare.add_argument("--baseline", type=Path, help="Baseline file (default: the stored baseline)")
+    add_gate_options(compare)
+    compare.set_defaults(handler=cmd_compare)
+
+    baseline = commands.add_parser("baseline", help="Promote a result file to baseline")
+    baseline.add_argument("result", type=Path)
+    baseline.set_defaults(handler=cmd_baseline)
+
+    history = commands.add_parser("history", help="Print one metric over recorded runs")
+    history.add_argument("metric")
+    history.add_argument("--suite", default=MICRO_SUITE)
+    history.add_argument("--limit", type=int, default=20)
+    history.set_defaults(handler=cmd_history)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
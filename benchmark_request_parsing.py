@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Chat Request Parsing Benchmark
+Per-request CPU time of the legacy ingestion path (stdlib JSON, Pydantic model,
+dict conversion, validator sanitization, provider re-validation) versus the
+fast path (single orjson parse into a validated ChatRequestView).
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict
+
+from src.api.validation.request_validator import RequestValidator
+from src.models.request_view import parse_chat_request
+from src.models.requests import ChatCompletionRequest
+from src.providers.openai import OpenAIProvider
+
+
+def build_payload(message_count: int, content_chars: int = 400) -> bytes:
+    """Agent-style transcript with alternating user/assistant turns"""
+    messages = [{"role": "system", "content": "You are a helpful assistant."}]
+    for i in range(message_count - 1):
+        role = "user" if i % 2 == 0 else "assistant"
+        messages.append({"role": role, "content": f"Turn {i}: " + "lorem ipsum " * (content_chars // 12)})
+    return json.dumps({
+        "model": "gpt-4",
+        "messages": messages,
+        "temperature": 0.7,
+        "max_tokens": 512,
+    }).encode()
+
+
+def legacy_path(body: bytes, validator: RequestValidator) -> Dict[str, Any]:
+    data = json.loads(body)                                             # Starlette request.json()
+    asyncio.run(validator.validate_chat_completion_request(data))       # validation middleware
+    request = ChatCompletionRequest(**json.loads(body))                 # FastAPI body model
+    req_dict = request.dict(exclude_unset=True)                         # route_request
+    OpenAIProvider._validate_request(None, req_dict, is_chat=True)      # provider re-validation
+    return req_dict
+
+
+def fast_path(body: bytes, validator: RequestValidator) -> Dict[str, Any]:
+    view = parse_chat_request(body)
+    OpenAIProvider._validate_request(None, view, is_chat=True)          # skipped for validated views
+    return view
+
+
+def measure(func: Callable, body: bytes, iterations: int) -> float:
+    """Mean CPU milliseconds per request"""
+    validator = RequestValidator()
+    func(body, validator)  # warm-up
+    start = time.process_time()
+    for _ in range(iterations):
+        func(body, validator)
+    return (time.process_time() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=1000, help="Messages per request")
+    parser.add_argument("--iterations", type=int, default=50, help="Requests per path")
+    args = parser.parse_args()
+
+    body = build_payload(args.messages)
+    legacy_ms = measure(legacy_path, body, args.iterations)
+    fast_ms = measure(fast_path, body, args.iterations)
+
+    print(f"Payload: {args.messages} messages, {len(body) / 1024:.1f} KiB")
+    print(f"Legacy path: {legacy_ms:8.3f} ms CPU/request")
+    print(f"Fast path:   {fast_ms:8.3f} ms CPU/request")
+    print(f"Speedup:     {legacy_ms / fast_ms:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,39 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 from typing import List
+import json
 import logging
+import os
 from .utils.context_condenser_impl import condense_context
+from .utils.job_queue import CondenseJobQueue, QueueFullError
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Seconds /condense waits for its job before answering 202 with the job id.
+# Keep it below the proxy client's 30 s read timeout (DEFAULT_TIMEOUT in
+# src/api/controllers/context_controller.py), or the proxy gives up first
+# and never sees the 202
+CONDENSE_WAIT_TIMEOUT = float(os.getenv("CONDENSE_WAIT_TIMEOUT", "20"))
+MAX_BATCH_SIZE = int(os.getenv("CONDENSE_MAX_BATCH", "100"))
+
+job_queue = CondenseJobQueue.from_env(condense_context)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop the condensation workers"""
+    job_queue.ensure_started()
+    yield
+    await job_queue.stop()
+
 app = FastAPI(
     title="Context Condensation Service",
     description="Service for condensing text context using AI providers",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 class CondenseRequest(BaseModel):
@@ -21,6 +43,17 @@ class CondenseRequest(BaseModel):
 class CondenseResponse(BaseModel):
     summary: str
 
+class CondenseBatchRequest(BaseModel):
+    jobs: List[CondenseRequest] = Field(..., min_length=1)
+
+def queue_full_response(e: QueueFullError) -> JSONResponse:
+    logger.warning(f"Rejecting condensation request: {e}")
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(e), "retry_after": e.retry_after},
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
 @app.post("/condense", response_model=CondenseResponse)
 async def condense_context_endpoint(req: CondenseRequest):
     """
@@ -28,18 +61,69 @@ async def condense_context_endpoint(req: CondenseRequest):
 
     - **chunks**: List of text chunks to condense
     - **max_tokens**: Maximum number of tokens for the summary (default: 512)
+
+    The request goes through the job queue (bounded workers, deduplication);
+    if it does not finish within CONDENSE_WAIT_TIMEOUT a 202 with the job id is returned.
     """
+    logger.info(f"Received condensation request with {len(req.chunks)} chunks, max_tokens={req.max_tokens}")
     try:
-        logger.info(f"Received condensation request with {len(req.chunks)} chunks, max_tokens={req.max_tokens}")
-        summary = await condense_context(req.chunks, req.max_tokens)
+        job = await job_queue.submit(req.chunks, req.max_tokens)
+    except QueueFullError as e:
+        return queue_full_response(e)
+
+    job = await job_queue.wait(job.job_id, CONDENSE_WAIT_TIMEOUT) or job
+    if job.status == "done":
         logger.info(f"Condensation completed successfully")
-        return CondenseResponse(summary=summary)
-    except ValueError as e:
-        logger.error(f"Validation error: {e}")
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"Internal error: {e}")
-        raise HTTPException(status_code=500, detail=f"Condensation failed: {str(e)}")
+        return CondenseResponse(summary=job.summary)
+    if job.status == "failed":
+        logger.error(f"Condensation failed: {job.error}")
+        if job.error_status == 400:
+            raise HTTPException(status_code=400, detail=job.error)
+        raise HTTPException(status_code=500, detail=f"Condensation failed: {job.error}")
+    return JSONResponse(status_code=202, content=job.to_dict())
+
+@app.post("/condense/batch", status_code=202)
+async def condense_batch_endpoint(req: CondenseBatchRequest):
+    """
+    Queue several condensation jobs at once.
+
+    Returns one entry per job with its `job_id`; identical jobs share one id.
+    Poll `/condense/jobs/{job_id}` or stream `/condense/jobs/{job_id}/events`.
+    Answers 429 with Retry-After when the queue cannot take the whole batch.
+    """
+    if len(req.jobs) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_SIZE} jobs")
+    try:
+        jobs = await job_queue.submit_batch([(job.chunks, job.max_tokens) for job in req.jobs])
+    except QueueFullError as e:
+        return queue_full_response(e)
+    logger.info(f"Queued condensation batch of {len(jobs)} jobs")
+    return {"jobs": [job.to_dict() for job in jobs]}
+
+@app.get("/condense/jobs/{job_id}")
+async def get_condense_job(job_id: str):
+    """Poll the status (and result) of a condensation job"""
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+@app.get("/condense/jobs/{job_id}/events")
+async def stream_condense_job(job_id: str):
+    """Stream job status changes as server-sent events until the job finishes"""
+    if await job_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        async for job in job_queue.watch(job_id):
+            yield f"event: {job.status}\ndata: {json.dumps(job.to_dict())}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@app.get("/condense/queue")
+async def get_queue_stats():
+    """Queue depth and worker statistics"""
+    return await job_queue.get_stats()
 
 @app.get("/health")
 async def health_check():
@@ -57,4 +141,4 @@ async def root():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8001)
@@ -0,0 +1,454 @@
+"""
+Condensation job queue for the context service.
+
+Jobs are stored in SQLite so several service replicas on one host can share a
+queue file (``JOB_QUEUE_PATH``) as a local stand-in for a networked queue;
+the default ``:memory:`` database serves a single replica. Each replica runs a
+bounded pool of workers that atomically claim queued jobs, so the number of
+concurrent condensation calls stays fixed no matter how many jobs arrive.
+
+- Deduplication: the job id is a hash of the job input, so identical jobs
+  share one queue entry (and reuse its result while it is retained).
+- Backpressure: submissions beyond ``max_pending`` queued/running jobs are
+  rejected with ``QueueFullError`` carrying a Retry-After estimate.
+- Recovery: running jobs carry a heartbeat, so only jobs left running by a
+  replica that died go stale and are requeued.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import (Any, AsyncIterator, Awaitable, Callable, Dict, List,
+                    Optional, Tuple)
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+TERMINAL_STATUSES = frozenset({DONE, FAILED})
+
+MAINTENANCE_INTERVAL = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    summary TEXT,
+    error TEXT,
+    error_status INTEGER,
+    owner TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+
+class QueueFullError(Exception):
+    """Raised when a submission would exceed the queue's pending-job limit"""
+
+    def __init__(self, pending: int, retry_after: int):
+        super().__init__(f"Condensation queue is full ({pending} pending jobs)")
+        self.pending = pending
+        self.retry_after = retry_after
+
+
+@dataclass
+class CondenseJob:
+    """Public view of a queued condensation job"""
+    job_id: str
+    status: str
+    chunks_count: int
+    max_tokens: int
+    summary: Optional[str] = None
+    error: Optional[str] = None
+    error_status: Optional[int] = None
+    attempts: int = 0
+    created_at: float = 0.0
+    updated_at: float = 0.0
+    deduplicated: bool = False
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def job_id_for(chunks: List[str], max_tokens: int) -> str:
+    """Deterministic job id, so identical jobs deduplicate to one entry"""
+    digest = hashlib.sha256(json.dumps([chunks, max_tokens], ensure_ascii=False).encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+class SQLiteJobStore:
+    """Job table shared by every replica that opens the same database file"""
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row, deduplicated: bool = False) -> CondenseJob:
+        payload = json.loads(row["payload"])
+        return CondenseJob(
+            job_id=row["job_id"],
+            status=row["status"],
+            chunks_count=len(payload["chunks"]),
+            max_tokens=payload["max_tokens"],
+            summary=row["summary"],
+            error=row["error"],
+            error_status=row["error_status"],
+            attempts=row["attempts"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            deduplicated=deduplicated,
+        )
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._pending_count()
+
+    def _pending_count(self) -> int:
+        row = self._conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+        ).fetchone()
+        return row[0]
+
+    def submit_many(self, jobs: List[Tuple[str, str]], max_pending: int) -> List[CondenseJob]:
+        """
+        Enqueue ``(job_id, payload)`` pairs in one transaction. Jobs that are
+        already queued, running or done come back marked as deduplicated;
+        failed jobs are requeued. Admission is all-or-nothing: QueueFullError
+        is raised (and nothing enqueued) if the new jobs do not fit.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                pending = self._pending_count()
+                existing = {}
+                for job_id, _ in jobs:
+                    row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+                    if row is not None:
+                        existing[job_id] = row
+
+                new_ids = {job_id for job_id, _ in jobs
+                           if job_id not in existing or existing[job_id]["status"] == FAILED}
+                if new_ids and pending + len(new_ids) > max_pending:
+                    self._conn.execute("ROLLBACK")
+                    raise QueueFullError(pending, 0)
+
+                results = []
+                seen = set()
+                for job_id, payload in jobs:
+                    if job_id in new_ids and job_id not in seen:
+                        self._conn.execute(
+                            "INSERT INTO jobs (job_id, status, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?) "
+                            "ON CONFLICT(job_id) DO UPDATE SET status = excluded.status, summary = NULL, "
+                            "error = NULL, error_status = NULL, owner = NULL, updated_at = excluded.updated_at",
+                            (job_id, QUEUED, payload, now, now)
+                        )
+                    row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+                    results.append(self._to_job(row, deduplicated=job_id in seen or job_id not in new_ids))
+                    seen.add(job_id)
+
+                self._conn.execute("COMMIT")
+                return results
+            except QueueFullError:
+                raise
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def claim(self, owner: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Atomically move the oldest queued job to running and return it"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE job_id = (SELECT job_id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1) "
+                "AND status = ? RETURNING job_id, payload",
+                (RUNNING, owner, now, QUEUED, QUEUED)
+            ).fetchall()  # drain the statement so the update is committed
+        if not row:
+            return None
+        return row[0]["job_id"], json.loads(row[0]["payload"])
+
+    def touch(self, job_id: str, owner: str) -> bool:
+        """Refresh a running job's heartbeat; False if this owner no longer holds it"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET updated_at = ? WHERE job_id = ? AND status = ? AND owner = ?",
+                (time.time(), job_id, RUNNING, owner)
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, summary: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, summary = ?, owner = NULL, updated_at = ? WHERE job_id = ?",
+                (DONE, summary, time.time(), job_id)
+            )
+
+    def fail(self, job_id: str, error: str, error_status: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, error_status = ?, owner = NULL, updated_at = ? WHERE job_id = ?",
+                (FAILED, error, error_status, time.time(), job_id)
+            )
+
+    def get(self, job_id: str) -> Optional[CondenseJob]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row is not None else None
+
+    def requeue_stale(self, older_than: float) -> int:
+        """Requeue running jobs whose replica stopped updating them"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, updated_at = ? WHERE status = ? AND updated_at < ?",
+                (QUEUED, time.time(), RUNNING, time.time() - older_than)
+            )
+        return cursor.rowcount
+
+    def purge(self, older_than: float) -> int:
+        """Drop finished jobs past their retention"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (DONE, FAILED, time.time() - older_than)
+            )
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in (QUEUED, RUNNING, DONE, FAILED)}
+        counts.update({row[0]: row[1] for row in rows})
+        return counts
+
+
+class CondenseJobQueue:
+    """Bounded worker pool draining the shared job store"""
+
+    def __init__(self,
+                 condense_fn: Callable[[List[str], int], Awaitable[str]],
+                 path: str = ":memory:",
+                 workers: int = 4,
+                 max_pending: int = 1000,
+                 poll_interval: float = 0.2,
+                 result_ttl: float = 3600.0,
+                 stale_after: float = 300.0):
+        self.condense_fn = condense_fn
+        self.store = SQLiteJobStore(path)
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.poll_interval = poll_interval
+        self.result_ttl = result_ttl
+        self.stale_after = stale_after
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._changed: Optional[asyncio.Condition] = None
+        self._last_maintenance = 0.0
+        self._avg_duration = 1.0
+
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls, condense_fn: Callable[[List[str], int], Awaitable[str]]) -> "CondenseJobQueue":
+        return cls(
+            condense_fn,
+            path=os.getenv("JOB_QUEUE_PATH", ":memory:"),
+            workers=int(os.getenv("CONDENSE_WORKERS", "4")),
+            max_pending=int(os.getenv("CONDENSE_MAX_PENDING", "1000")),
+            poll_interval=float(os.getenv("JOB_QUEUE_POLL_INTERVAL", "0.2")),
+            result_ttl=float(os.getenv("JOB_RESULT_TTL", "3600")),
+            stale_after=float(os.getenv("JOB_STALE_AFTER", "300")),
+        )
+
+    def ensure_started(self) -> None:
+        """Start the worker pool on the running event loop (restarting it if the loop changed)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and all(not task.done() for task in self._tasks):
+            return
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._changed = asyncio.Condition()
+        self._tasks = [loop.create_task(self._worker(index)) for index in range(self.workers)]
+        logger.info(f"Condensation queue started with {self.workers} workers ({self.store.path})")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+    def close(self) -> None:
+        self.store.close()
+
+    def _retry_after(self, pending: int) -> int:
+        """Seconds until the current backlog should have drained"""
+        return max(1, math.ceil(pending / self.workers * self._avg_duration))
+
+    async def submit_batch(self, jobs: List[Tuple[List[str], int]]) -> List[CondenseJob]:
+        """Enqueue jobs; raises QueueFullError when they do not fit"""
+        self.ensure_started()
+        entries = [
+            (job_id_for(chunks, max_tokens), json.dumps({"chunks": chunks, "max_tokens": max_tokens}, ensure_ascii=False))
+            for chunks, max_tokens in jobs
+        ]
+        try:
+            results = await asyncio.to_thread(self.store.submit_many, entries, self.max_pending)
+        except QueueFullError as e:
+            self.rejected += len(entries)
+            raise QueueFullError(e.pending, self._retry_after(e.pending)) from None
+        self._wakeup.set()
+        return results
+
+    async def submit(self, chunks: List[str], max_tokens: int) -> CondenseJob:
+        return (await self.submit_batch([(chunks, max_tokens)]))[0]
+
+    async def get(self, job_id: str) -> Optional[CondenseJob]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def _wait_for_change(self, timeout: float) -> None:
+        """Wake on local job updates, or after ``timeout`` to see other replicas' work"""
+        async with self._changed:
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def watch(self, job_id: str, timeout: Optional[float] = None) -> AsyncIterator[CondenseJob]:
+        """Yield the job whenever its status changes, until it finishes or ``timeout`` expires"""
+        self.ensure_started()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        last_status = None
+        while True:
+            job = await self.get(job_id)
+            if job is None:
+                return
+            if job.status != last_status:
+                last_status = job.status
+                yield job
+            if job.finished:
+                return
+            wait = self.poll_interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                wait = min(wait, remaining)
+            await self._wait_for_change(wait)
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[CondenseJob]:
+        """Latest state of the job after it finishes or ``timeout`` expires"""
+        job = None
+        async for job in self.watch(job_id, timeout=timeout):
+            pass
+        return job
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            try:
+                await self._maintain()
+                claimed = await asyncio.to_thread(self.store.claim, self.owner)
+                if claimed is None:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                await self._run(*claimed)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Condensation worker {index} error: {e}")
+                await asyncio.sleep(self.poll_interval)
+
+    async def _heartbeat(self, job_id: str) -> None:
+        """Keep a running job's ``updated_at`` fresh so maintenance does not requeue it"""
+        interval = max(self.stale_after / 3, self.poll_interval)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.store.touch, job_id, self.owner)
+            except Exception as e:
+                logger.warning(f"Condensation job {job_id} heartbeat failed: {e}")
+
+    async def _run(self, job_id: str, payload: Dict[str, Any]) -> None:
+        start = time.monotonic()
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            summary = await self.condense_fn(payload["chunks"], payload["max_tokens"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Condensation job {job_id} failed: {e}")
+            await asyncio.to_thread(self.store.fail, job_id, str(e), 400 if isinstance(e, ValueError) else 500)
+            self.failed += 1
+        else:
+            await asyncio.to_thread(self.store.complete, job_id, summary)
+            self.completed += 1
+        finally:
+            heartbeat.cancel()
+        self._avg_duration = 0.8 * self._avg_duration + 0.2 * (time.monotonic() - start)
+        await self._notify()
+
+    async def _maintain(self) -> None:
+        now = time.monotonic()
+        if now - self._last_maintenance < MAINTENANCE_INTERVAL:
+            return
+        self._last_maintenance = now
+        requeued = await asyncio.to_thread(self.store.requeue_stale, self.stale_after)
+        purged = await asyncio.to_thread(self.store.purge, self.result_ttl)
+        if requeued or purged:
+            logger.info(f"Condensation queue maintenance: requeued {requeued} stale jobs, purged {purged}")
+
+    async def get_stats(self) -> Dict[str, Any]:
+        counts = await asyncio.to_thread(self.store.counts)
+        return {
+            "jobs": counts,
+            "pending": counts[QUEUED] + counts[RUNNING],
+            "max_pending": self.max_pending,
+            "workers": self.workers,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_job_seconds": round(self._avg_duration, 3),
+        }
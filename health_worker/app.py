@@ -23,6 +23,13 @@ from typing import List, Dict, Any
 
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
 
+# Shared-memory status table used to push health to proxy workers on this host
+try:
+    from src.core.health_status_table import StatusTableError, StatusTableWriter
+except ImportError:
+    StatusTableWriter = None
+    StatusTableError = Exception
+
 # Configuration management
 def load_provider_config() -> List[Dict[str, Any]]:
     """Load provider configuration from file or environment"""
@@ -391,6 +398,10 @@ CACHE_TTL_SECONDS = int(os.getenv("HEALTH_CHECK_CACHE_TTL", "30"))  # 30 seconds
 # Shared HTTP client for connection pooling
 shared_client: Optional[httpx.AsyncClient] = None
 
+# Writer for the shared-memory status table read by the proxy's routing path
+status_table_writer = None
+status_table_publishes = Counter('health_worker_status_table_publishes_total', 'Status snapshots pushed to proxy workers', ['result'])
+
 def get_cached_health_check(provider_name: str) -> Optional[Dict[str, Any]]:
     """Get cached health check result if still valid"""
     if provider_name in health_check_cache:
@@ -538,12 +549,39 @@ async def perform_health_checks():
             provider_name = providers[i]["name"]
             logger.error(f"Health check for {provider_name} raised exception: {result}")
 
+    await publish_provider_status()
     logger.info("Health checks completed")
 
+async def publish_provider_status() -> None:
+    """Push the current provider status to proxy workers through the status table"""
+    if status_table_writer is None:
+        return
+
+    # last_check is monotonic and meaningless in other processes, so convert to wall time
+    now_wall, now_mono = time.time(), time.monotonic()
+    async with status_lock:
+        snapshot = {
+            name: {
+                "status": status.get("status", "unknown"),
+                "error_type": status.get("error_type"),
+                "response_time": status.get("response_time"),
+                "checked_at": now_wall - (now_mono - status["last_check"]) if status.get("last_check") else None
+            }
+            for name, status in provider_status.items()
+        }
+
+    try:
+        seq = status_table_writer.publish(snapshot)
+        status_table_publishes.labels('success').inc()
+        logger.debug(f"Published health snapshot {seq} for {len(snapshot)} providers")
+    except StatusTableError as e:
+        status_table_publishes.labels('failure').inc()
+        logger.error(f"Failed to publish health snapshot: {e}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan"""
-    global shared_client
+    global shared_client, status_table_writer
 
     logger.info(
         "Health Worker starting up",
@@ -571,6 +609,14 @@ async def lifespan(app: FastAPI):
         }
     )
 
+    # Open the shared-memory status table so health results reach the proxy hot path
+    if StatusTableWriter is not None and os.getenv("HEALTH_STATUS_TABLE_ENABLED", "true").lower() == "true":
+        try:
+            status_table_writer = StatusTableWriter()
+            logger.info(f"Publishing provider health to status table {status_table_writer.path}")
+        except OSError as e:
+            logger.warning(f"Status table unavailable, health will only be served over HTTP: {e}")
+
     # Perform provider discovery
     logger.info("Performing provider discovery")
     await update_provider_config()
@@ -629,6 +675,10 @@ async def lifespan(app: FastAPI):
         await shared_client.aclose()
         logger.info("Shared HTTP client closed")
 
+    if status_table_writer:
+        status_table_writer.close()
+        status_table_writer = None
+
 app = FastAPI(
     title="Health Worker Service",
     description="Service for monitoring provider health status",
@@ -755,6 +805,8 @@ async def root():
             "PROVIDER_CONFIG": "JSON config as environment variable",
             "HEALTH_CHECK_INTERVAL": "Health check interval in seconds (default: 60)",
             "HEALTH_CHECK_CACHE_TTL": "Cache TTL in seconds (default: 30)",
+            "HEALTH_STATUS_TABLE_ENABLED": "Push status to proxy workers via shared memory (default: true)",
+            "HEALTH_STATUS_TABLE_PATH": "Shared status table file (default: /dev/shm/llm_proxy_health.tbl)",
             "PROVIDER_DISCOVERY_INTERVAL": "Discovery interval in seconds (default: 300)",
             "PROVIDER_REGISTRY_URL": "URL for provider registry",
             "LOG_LEVEL": "Logging level (default: INFO)"
@@ -3,47 +3,39 @@ LLM Proxy API - Main Application Server
 High-performance proxy with intelligent routing and fallback capabilities.
 """
 
+import argparse
 import asyncio
 import os
-import threading
 import time
 from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
-# Use orjson for faster JSON serialization if available
-try:
-    import orjson
-except ImportError:
-    orjson = None
-
+from src.api.compression import CompressionMiddleware
+# orjson-backed default response class (stdlib fallback)
+from src.api.responses import FastJSONResponse
 # New API router imports
 from src.api.router import (main_router, root_router, setup_exception_handlers,
                             setup_middleware)
-from src.core.alerting import alert_manager
 from src.core.app_state import app_state
 from src.core.auth import APIKeyAuth
-from src.core.chaos_engineering import chaos_monkey
 # Core imports
 from src.core.config import settings
 # Performance optimization imports
 from src.core.http_client_v2 import get_advanced_http_client
 from src.core.logging import ContextualLogger, setup_logging
-from src.core.memory_manager import get_memory_manager, shutdown_memory_manager
 from src.core.provider_factory import provider_factory
 from src.core.retry_strategies import RetryConfig
-from src.core.smart_cache import (get_response_cache, get_summary_cache,
-                                  shutdown_caches)
-from src.core.telemetry import TracedSpan, telemetry
+# Optional subsystems are imported by the startup manager, not here
+from src.core.startup import (format_import_report, profile_imports,
+                              startup_manager)
 
 # Setup logging with environment variable support
-import os
 log_level = os.getenv("LOG_LEVEL", "DEBUG" if settings.debug else "INFO").upper()
 setup_logging(
     log_level=log_level,
@@ -57,139 +49,115 @@ limiter = Limiter(key_func=get_remote_address)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Application lifespan management with performance optimizations"""
-    logger.info("Starting LLM Proxy API with performance optimizations")
+    """Staged startup: the request path first, optional subsystems in the background"""
+    logger.info("Starting LLM Proxy API")
 
     # Set start time for uptime tracking
     app.state.start_time = time.time()
+    app.state.startup = startup_manager
+    startup_manager.reset()
 
-    # Initialize configuration
     try:
         # Initialize app state with the new approach
-        await app_state.initialize()
-        config = app_state.config
-        
-        # Set config in app state for backward compatibility
-        app.state.config = config
-        app.state.condensation_config = config.settings.condensation
-
-        # Initialize performance systems
-        logger.info("Initializing performance optimization systems...")
-    
-        # Configure OpenTelemetry
-        telemetry.configure(settings)
-        telemetry.instrument_fastapi(app)
-        telemetry.instrument_httpx()
-        logger.info("OpenTelemetry configured successfully")
-    
+        async with startup_manager.step("app_state"):
+            await app_state.initialize()
+            config = app_state.config
+
+            # Set config in app state for backward compatibility
+            app.state.config = config
+            app.state.condensation_config = config.settings.condensation
+
         # Initialize HTTP client
-        with TracedSpan("http_client.initialize") as span:
+        async with startup_manager.step("http_client"):
             http_client = get_advanced_http_client(retry_config=RetryConfig())
             await http_client.initialize()
             app.state.http_client = http_client
-            span.set_attribute("http.client.initialized", True)
             logger.info("HTTP client initialized")
-    
+
         # Initialize caches
-        with TracedSpan("cache.initialize") as span:
+        async with startup_manager.step("caches"):
+            from src.core.smart_cache import get_response_cache, get_summary_cache
             app.state.response_cache = await get_response_cache()
             app.state.summary_cache_obj = await get_summary_cache()
-            span.set_attribute("cache.response.initialized", True)
-            span.set_attribute("cache.summary.initialized", True)
             logger.info("Smart caches initialized")
-    
-        # Initialize memory manager
-        with TracedSpan("memory_manager.initialize") as span:
-            app.state.memory_manager = await get_memory_manager()
-            span.set_attribute("memory_manager.initialized", True)
-            logger.info("Memory manager initialized")
 
         # Initialize context condensation cache with persistence
-        from src.utils.context_condenser import AsyncLRUCache
-        persist_file = 'cache.json' if config.settings.condensation.cache_persist else None
-        redis_url = getattr(config.settings.condensation, 'cache_redis_url', None)
-        app.state.lru_cache = AsyncLRUCache(
-            maxsize=config.settings.condensation.cache_size,
-            persist_file=persist_file,
-            redis_url=redis_url
-        )
-        if persist_file:
-            await app.state.lru_cache.initialize()
-        logger.info("Context condensation cache initialized")
+        async with startup_manager.step("condensation_cache"):
+            from src.utils.context_condenser import AsyncLRUCache
+            persist_file = 'cache.json' if config.settings.condensation.cache_persist else None
+            redis_url = getattr(config.settings.condensation, 'cache_redis_url', None)
+            app.state.lru_cache = AsyncLRUCache(
+                maxsize=config.settings.condensation.cache_size,
+                persist_file=persist_file,
+                redis_url=redis_url,
+                flush_interval=config.settings.condensation.cache_flush_interval,
+                ttl=config.settings.condensation.cache_ttl,
+                eviction_policy=config.settings.condensation.cache_eviction_policy
+            )
+            if persist_file:
+                await app.state.lru_cache.initialize()
+
+            # Summaries of conversation prefixes, reused when a conversation grows
+            if config.settings.condensation.prefix_cache_enabled:
+                from src.utils.prefix_summary_store import PrefixSummaryStore
+                app.state.prefix_summary_store = PrefixSummaryStore(
+                    maxsize=config.settings.condensation.cache_size,
+                    ttl=config.settings.condensation.cache_ttl
+                )
+            logger.info("Context condensation cache initialized")
 
         # Legacy cache support (for backward compatibility)
         app.state.cache = {}
         app.state.summary_cache = {}
 
-        # Initialize authentication
-        api_key_auth = APIKeyAuth(settings.proxy_api_keys)
-        app.state.api_key_auth = api_key_auth
-
-        # Configure rate limiter
-        from src.core.rate_limiter import rate_limiter
-        rate_limiter.configure_from_config(config)
-        app.state.rate_limiter = rate_limiter
-        logger.info("Rate limiter configured and initialized")
-
-        # Configure chaos engineering
-        chaos_monkey.configure(config.settings.get('chaos_engineering', {}))
-        logger.info("Chaos engineering configured")
+        # Initialize authentication and rate limiting
+        async with startup_manager.step("auth"):
+            app.state.api_key_auth = APIKeyAuth(settings.proxy_api_keys)
+            app.state.admin_key_auth = APIKeyAuth(settings.admin_api_keys)
 
-        # Start alerting system
-        with TracedSpan("alerting.initialize") as span:
-            await alert_manager.start_monitoring()
-            span.set_attribute("alerting.initialized", True)
-            logger.info("Alerting system initialized and monitoring started")
+            from src.core.rate_limiter import rate_limiter
+            rate_limiter.configure_from_config(config)
+            app.state.rate_limiter = rate_limiter
+            logger.info("Rate limiter configured and initialized")
 
         app.state.config_mtime = app_state.config_manager._last_modified
-
-        # Start web UI in background thread
-        def start_web_ui():
-            try:
-                from web_ui import app as web_app
-                logger.info("Starting web UI on port 10000")
-                web_app.run(host='0.0.0.0', port=10000, debug=False, use_reloader=False)
-            except Exception as e:
-                logger.error(f"Failed to start web UI: {e}")
-
-        # TODO: The web UI should be run as a separate process in production.
-        # Running as a daemon thread is not recommended for production systems
-        # as it can be terminated abruptly on shutdown.
-        web_ui_thread = threading.Thread(target=start_web_ui, daemon=True)
-        web_ui_thread.start()
-        logger.info("Web UI thread started")
-
-        logger.info("All systems initialized successfully")
+        startup_manager.mark_ready()
 
     except Exception as e:
         logger.error(f"Failed to initialize application: {e}")
         raise
 
+    # Telemetry, memory manager, chaos engineering, alerting and the web UI
+    # load after the server starts accepting requests
+    startup_manager.start_optional_background(app)
+
     yield
 
     # Cleanup with proper shutdown sequence - CRITICAL FIX FOR RACE CONDITIONS
     logger.info("Shutting down LLM Proxy API")
 
     try:
-        # Shutdown app state first
+        # Stop optional subsystems first (only the ones that started)
+        await startup_manager.shutdown(app)
+
+        # Shutdown app state
         await app_state.shutdown()
         logger.info("App state shutdown complete")
 
         # Shutdown performance systems in reverse order with proper async handling
         shutdown_tasks = []
 
-        if hasattr(app.state, 'memory_manager'):
-            shutdown_tasks.append(shutdown_memory_manager())
-
         if hasattr(app.state, 'response_cache'):
+            from src.core.smart_cache import shutdown_caches
             shutdown_tasks.append(shutdown_caches())
 
         # Shutdown context condensation cache
         if hasattr(app.state, 'lru_cache') and app.state.lru_cache:
             shutdown_tasks.append(app.state.lru_cache.shutdown())
 
-        # Shutdown alerting system
-        shutdown_tasks.append(alert_manager.stop_monitoring())
+        # Close the shared context service client
+        if getattr(app.state, 'context_service_client', None) is not None:
+            shutdown_tasks.append(app.state.context_service_client.aclose())
 
         # Wait for all shutdown tasks to complete
         if shutdown_tasks:
@@ -220,6 +188,7 @@ app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="High-performance LLM proxy with intelligent routing and fallback",
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
 )
 
@@ -245,7 +214,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# Negotiated zstd/br/gzip with per-route thresholds; SSE is not buffered
+app.add_middleware(CompressionMiddleware)
 
 # Root endpoint is now handled by root_router in src/api/router.py
 
@@ -263,6 +233,45 @@ app.add_middleware(GZipMiddleware, minimum_size=1000)
 # Global exception handler is now managed by the error handling framework in src/api/errors/
             
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LLM Proxy API server")
+    parser.add_argument("--import-profile", action="store_true",
+                        help="Print an import-time profile of the application and exit")
+    parser.add_argument("--import-profile-top", type=int, default=30,
+                        help="Number of packages and modules listed in the import profile")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (overrides workers.count in config.yaml)")
+    args = parser.parse_args()
+
+    if args.import_profile:
+        print(format_import_report(profile_imports("main"), top=args.import_profile_top))
+        raise SystemExit(0)
+
+    from src.core.supervisor import Supervisor, supports_multiple_workers
+    from src.core.unified_config import config_manager
+
+    worker_settings = config_manager.load_config().settings.workers
+    tier_settings = config_manager.load_config().settings.cache_tiers
+    workers = args.workers or worker_settings.count
+
+    if workers > 1 and supports_multiple_workers():
+        raise SystemExit(Supervisor(
+            app,
+            host=settings.host,
+            port=settings.port,
+            workers=workers,
+            log_level=log_level,
+            shared_state_path=worker_settings.shared_state_path,
+            shared_state_slots=worker_settings.shared_state_slots,
+            graceful_timeout=worker_settings.graceful_timeout,
+            restart_delay=worker_settings.restart_delay,
+            shared_cache_path=tier_settings.shared_cache_path,
+            shared_cache_mb=tier_settings.shared_cache_mb if tier_settings.enabled else 0,
+            shared_cache_slots=tier_settings.shared_cache_slots
+        ).run())
+
+    if workers > 1:
+        logger.warning("Multiple workers need os.fork; running a single process")
+
     uvicorn.run(
         app,
         host=settings.host,
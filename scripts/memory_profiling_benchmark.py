@@ -18,6 +18,8 @@ Options:
     --enhanced       Profile enhanced cache system
     --previous       Profile previous cache system
     --both           Profile both systems (default)
+    --entries N      Entries for the per-entry footprint measurement (default: 100000)
+    --footprint-only Only measure bytes per cache entry / history record
     --export-results Export profiling results to file
     --help           Show this help message
 
@@ -39,7 +41,7 @@ import time
 import tracemalloc
 from pathlib import Path
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from memory_profiler import profile, memory_usage
 import gc
@@ -52,6 +54,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from src.core.consolidated_cache_enhanced import get_consolidated_cache_manager as get_enhanced_manager
 from src.core.consolidated_cache import get_consolidated_cache_manager as get_previous_manager
 from src.core.logging import ContextualLogger
+from src.core.metrics import RequestRecord
+from src.core.unified_cache import CacheEntry
 
 logger = ContextualLogger(__name__)
 
@@ -72,6 +76,90 @@ class MemoryProfileResult:
     metadata: Dict[str, Any]
 
 
+@dataclass
+class LegacyCacheEntry:
+    """CacheEntry layout before slots (per-instance __dict__), kept for the footprint comparison"""
+    key: str
+    value: Any
+    timestamp: float
+    ttl: int
+    access_count: int = 0
+    last_accessed: float = field(default_factory=time.time)
+    size_bytes: int = 0
+    hit_count: int = 0
+    miss_count: int = 0
+    average_access_time: float = 0.0
+    category: str = "default"
+    priority: int = 1
+
+
+def _traced_bytes(build) -> int:
+    """Bytes still allocated by ``build()`` while its result is alive"""
+    gc.collect()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    del result
+    if not was_tracing:
+        tracemalloc.stop()
+    return allocated
+
+
+def measure_entry_footprint(entries: int) -> Dict[str, Any]:
+    """
+    Bytes per cache entry and per request-history record, before (dict-backed
+    records) and after (slotted records). Keys and the shared value are built
+    outside the measured region, so the numbers are the per-entry overhead of
+    the record plus its slot in the cache index.
+    """
+    keys = [f"mem_test_key_{i}" for i in range(entries)]
+    value = {"data": "x" * 100}
+    now = time.time()
+
+    def cache_with(entry_class):
+        return lambda: {key: entry_class(key=key, value=value, timestamp=now, ttl=1800,
+                                         last_accessed=now, size_bytes=128)
+                        for key in keys}
+
+    def legacy_history():
+        return [{"timestamp": datetime.now().isoformat(), "provider": "openai", "model": "gpt-4",
+                 "success": True, "response_time": 0.25, "tokens": 100, "error_type": None,
+                 "sampled": True} for _ in range(entries)]
+
+    def slotted_history():
+        return [RequestRecord(time.time(), "openai", "gpt-4", True, True, 0.25, 100)
+                for _ in range(entries)]
+
+    def per_entry(build) -> float:
+        return round(_traced_bytes(build) / entries, 1)
+
+    cache_before = per_entry(cache_with(LegacyCacheEntry))
+    cache_after = per_entry(cache_with(CacheEntry))
+    history_before = per_entry(legacy_history)
+    history_after = per_entry(slotted_history)
+
+    def saving(before: float, after: float) -> float:
+        return round((1 - after / before) * 100, 1) if before else 0.0
+
+    return {
+        "entries": entries,
+        "cache_entry": {
+            "bytes_per_entry_before": cache_before,
+            "bytes_per_entry_after": cache_after,
+            "saving_percent": saving(cache_before, cache_after),
+            "total_mb_after": round(cache_after * entries / 1024 / 1024, 2),
+        },
+        "request_history_record": {
+            "bytes_per_entry_before": history_before,
+            "bytes_per_entry_after": history_after,
+            "saving_percent": saving(history_before, history_after),
+        },
+    }
+
+
 class MemoryProfilingBenchmark:
     """Benchmarks memory usage for cache systems"""
 
@@ -99,6 +187,18 @@ class MemoryProfilingBenchmark:
         start_time = time.time()
 
         try:
+            footprint = measure_entry_footprint(self.args.entries)
+            logger.info("Cache entry footprint",
+                        entries=footprint["entries"],
+                        bytes_before=footprint["cache_entry"]["bytes_per_entry_before"],
+                        bytes_after=footprint["cache_entry"]["bytes_per_entry_after"])
+            if self.args.footprint_only:
+                report = {"status": "completed", "timestamp": time.time(),
+                          "entry_footprint": footprint}
+                if self.args.export_results:
+                    self._export_results(report)
+                return report
+
             # Determine which scenarios to run
             scenarios_to_run = []
             if self.args.light:
@@ -129,6 +229,7 @@ class MemoryProfilingBenchmark:
             # Generate report
             duration = time.time() - start_time
             report = self._generate_profiling_report(duration)
+            report["entry_footprint"] = footprint
 
             if self.args.export_results:
                 self._export_results(report)
@@ -418,6 +519,19 @@ def parse_arguments() -> argparse.Namespace:
         help="Profile both cache systems (default)"
     )
 
+    parser.add_argument(
+        "--entries",
+        type=int,
+        default=100000,
+        help="Entries for the per-entry footprint measurement (default: 100000)"
+    )
+
+    parser.add_argument(
+        "--footprint-only",
+        action="store_true",
+        help="Only measure bytes per cache entry and request-history record"
+    )
+
     parser.add_argument(
         "--export-results",
         action="store_true",
@@ -0,0 +1,399 @@
+"""
+Response compression middleware.
+
+Replaces the blanket ``GZipMiddleware`` with a pure-ASGI layer that:
+
+- negotiates zstd, brotli or gzip from ``Accept-Encoding`` (zstd and brotli
+  only when the ``zstandard`` / ``brotli`` packages are installed);
+- applies size and content-type thresholds per route prefix, so small JSON
+  answers are sent as-is instead of paying compression CPU for nothing;
+- leaves ``text/event-stream`` untouched by default, or, when a route enables
+  it, compresses SSE with a flush after every event so tokens are not held
+  back in the compressor;
+- keeps the compressed form of repeated GET payloads (e.g. ``/v1/models``)
+  for routes with ``cache`` enabled, keyed by a hash of the body;
+- records CPU time per input byte for each encoding (``compression_metrics``).
+"""
+
+import hashlib
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.logging import ContextualLogger
+
+# Optional encoders
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = ContextualLogger(__name__)
+
+SSE_CONTENT_TYPE = "text/event-stream"
+
+
+class _Gzip:
+    name = "gzip"
+
+    def __init__(self, level: int):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    def stream(self) -> "_GzipStream":
+        return _GzipStream(zlib.compressobj(self.level, zlib.DEFLATED, 31))
+
+
+class _GzipStream:
+    def __init__(self, compressor):
+        self._compressor = compressor
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _Brotli:
+    name = "br"
+
+    def __init__(self, quality: int):
+        self.quality = quality
+
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self.quality)
+
+    def stream(self) -> "_BrotliStream":
+        return _BrotliStream(brotli.Compressor(quality=self.quality))
+
+
+class _BrotliStream:
+    def __init__(self, compressor):
+        self._compressor = compressor
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _Zstd:
+    name = "zstd"
+
+    def __init__(self, level: int):
+        self._context = zstandard.ZstdCompressor(level=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._context.compress(data)
+
+    def stream(self) -> "_ZstdStream":
+        return _ZstdStream(self._context.compressobj())
+
+
+class _ZstdStream:
+    def __init__(self, compressor):
+        self._compressor = compressor
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_encoders(settings: Any) -> Dict[str, Any]:
+    """Encoders enabled in the settings whose implementation is installed, in preference order"""
+    encoders = {}
+    for name in settings.encodings:
+        if name == "zstd" and zstandard is not None:
+            encoders[name] = _Zstd(settings.zstd_level)
+        elif name == "br" and brotli is not None:
+            encoders[name] = _Brotli(settings.brotli_quality)
+        elif name == "gzip":
+            encoders[name] = _Gzip(settings.gzip_level)
+    return encoders
+
+
+def negotiate_encoding(accept_encoding: str, supported: List[str]) -> Optional[str]:
+    """
+    Pick an encoding from an Accept-Encoding header: highest client q-value,
+    ties broken by server preference (the order of ``supported``).
+    """
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            weights[name] = q
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for name in supported:
+        q = weights.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+class CompressionMetrics:
+    """Bytes and CPU time spent compressing, per encoding"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.encodings: Dict[str, Dict[str, float]] = {}
+        self.skipped: Dict[str, int] = {}
+        self.cache_hits = 0
+
+    def record(self, encoding: str, bytes_in: int, bytes_out: int, cpu_ns: int) -> None:
+        stats = self.encodings.setdefault(encoding, {"responses": 0, "bytes_in": 0, "bytes_out": 0, "cpu_ns": 0})
+        stats["bytes_in"] += bytes_in
+        stats["bytes_out"] += bytes_out
+        stats["cpu_ns"] += cpu_ns
+
+    def count_response(self, encoding: str) -> None:
+        self.encodings.setdefault(encoding, {"responses": 0, "bytes_in": 0, "bytes_out": 0, "cpu_ns": 0})["responses"] += 1
+
+    def skip(self, reason: str) -> None:
+        self.skipped[reason] = self.skipped.get(reason, 0) + 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        encodings = {}
+        for name, stats in self.encodings.items():
+            bytes_in = stats["bytes_in"]
+            encodings[name] = {
+                **stats,
+                "ratio": stats["bytes_out"] / bytes_in if bytes_in else 0.0,
+                "cpu_ns_per_byte": stats["cpu_ns"] / bytes_in if bytes_in else 0.0
+            }
+        return {"encodings": encodings, "skipped": dict(self.skipped), "cache_hits": self.cache_hits}
+
+
+# Global compression metrics
+compression_metrics = CompressionMetrics()
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    """Effective compression rules for a route"""
+    enabled: bool
+    minimum_size: int
+    compress_sse: bool
+    cache: bool
+
+
+class CompressionMiddleware:
+    """Negotiated, per-route response compression as a pure ASGI middleware"""
+
+    def __init__(self, app: Any, settings: Any = None):
+        self.app = app
+        settings = settings if settings is not None else _compression_settings()
+        self.enabled = settings.enabled
+        self.content_types = tuple(settings.content_types)
+        self.encoders = available_encoders(settings)
+        self._supported = list(self.encoders)
+        self._default_policy = CompressionPolicy(
+            enabled=True,
+            minimum_size=settings.minimum_size,
+            compress_sse=settings.compress_sse,
+            cache=False
+        )
+        routes = []
+        for prefix, route in settings.routes.items():
+            routes.append((prefix, CompressionPolicy(
+                enabled=route.enabled,
+                minimum_size=settings.minimum_size if route.minimum_size is None else route.minimum_size,
+                compress_sse=settings.compress_sse if route.compress_sse is None else route.compress_sse,
+                cache=route.cache
+            )))
+        self._routes: List[Tuple[str, CompressionPolicy]] = sorted(routes, key=lambda item: len(item[0]), reverse=True)
+        self.cache_max_entries = settings.cache_max_entries
+        self._cache: "OrderedDict[Tuple[str, bytes], bytes]" = OrderedDict()
+
+    def policy_for(self, path: str) -> CompressionPolicy:
+        for prefix, policy in self._routes:
+            if path.startswith(prefix):
+                return policy
+        return self._default_policy
+
+    def compress_cached(self, encoding: str, body: bytes) -> Tuple[bytes, bool]:
+        """Compressed body from the payload cache, compressing on a miss"""
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = self._cache.get(key)
+        if compressed is not None:
+            self._cache.move_to_end(key)
+            compression_metrics.cache_hits += 1
+            return compressed, True
+        compressed = self.compress(encoding, body)
+        if self.cache_max_entries:
+            self._cache[key] = compressed
+            while len(self._cache) > self.cache_max_entries:
+                self._cache.popitem(last=False)
+        return compressed, False
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        start = time.thread_time_ns()
+        compressed = self.encoders[encoding].compress(body)
+        compression_metrics.record(encoding, len(body), len(compressed), time.thread_time_ns() - start)
+        return compressed
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not self.enabled or not self._supported:
+            await self.app(scope, receive, send)
+            return
+        policy = self.policy_for(scope["path"])
+        if not policy.enabled:
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = negotiate_encoding(accept_encoding, self._supported)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self, policy, encoding, scope.get("method") == "GET", send)
+        await self.app(scope, receive, responder.send)
+
+    def compressible(self, content_type: str) -> bool:
+        return content_type.startswith(self.content_types)
+
+
+class _CompressionResponder:
+    """Per-response state: decides on the first body message, then streams"""
+
+    def __init__(self, middleware: CompressionMiddleware, policy: CompressionPolicy,
+                 encoding: str, cacheable: bool, send: Any):
+        self.middleware = middleware
+        self.policy = policy
+        self.encoding = encoding
+        self.cacheable = cacheable and policy.cache
+        self._send = send
+        self._start: Optional[Dict[str, Any]] = None
+        self._mode: Optional[str] = None  # "passthrough" | "stream"
+        self._stream = None
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self._start = message
+            return
+        if message_type != "http.response.body" or self._mode == "passthrough":
+            await self._send(message)
+            return
+        if self._mode == "stream":
+            await self._send_chunk(message)
+            return
+        await self._first_body(message)
+
+    async def _passthrough(self, message: Dict[str, Any], reason: str, vary: bool = False) -> None:
+        self._mode = "passthrough"
+        compression_metrics.skip(reason)
+        start = self._start
+        if vary:
+            start = {**start, "headers": _with_vary(start.get("headers", []))}
+        await self._send(start)
+        await self._send(message)
+
+    async def _first_body(self, message: Dict[str, Any]) -> None:
+        headers = self._start.get("headers", [])
+        content_type = ""
+        for name, value in headers:
+            lower = name.lower()
+            if lower == b"content-encoding":
+                await self._passthrough(message, "already_encoded")
+                return
+            if lower == b"content-type":
+                content_type = value.decode("latin-1").lower()
+        if not self.middleware.compressible(content_type):
+            await self._passthrough(message, "content_type")
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if content_type.startswith(SSE_CONTENT_TYPE) and not self.policy.compress_sse:
+            await self._passthrough(message, "event_stream")
+            return
+        if not more_body and len(body) < self.policy.minimum_size:
+            await self._passthrough(message, "below_minimum_size", vary=True)
+            return
+
+        compression_metrics.count_response(self.encoding)
+        if not more_body:
+            if self.cacheable:
+                compressed, _ = self.middleware.compress_cached(self.encoding, body)
+            else:
+                compressed = self.middleware.compress(self.encoding, body)
+            await self._send({**self._start, "headers": _encoded_headers(headers, self.encoding, len(compressed))})
+            await self._send({**message, "body": compressed})
+            return
+
+        # Streaming: flush after every message so each event reaches the client
+        self._mode = "stream"
+        self._stream = self.middleware.encoders[self.encoding].stream()
+        await self._send({**self._start, "headers": _encoded_headers(headers, self.encoding, None)})
+        await self._send_chunk(message)
+
+    async def _send_chunk(self, message: Dict[str, Any]) -> None:
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        start = time.thread_time_ns()
+        compressed = self._stream.chunk(body) if body else b""
+        if not more_body:
+            compressed += self._stream.finish()
+        compression_metrics.record(self.encoding, len(body), len(compressed), time.thread_time_ns() - start)
+        await self._send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+
+def _with_vary(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    for name, value in headers:
+        if name.lower() == b"vary" and b"accept-encoding" in value.lower():
+            return list(headers)
+    return list(headers) + [(b"vary", b"Accept-Encoding")]
+
+
+def _encoded_headers(headers: List[Tuple[bytes, bytes]], encoding: str,
+                     content_length: Optional[int]) -> List[Tuple[bytes, bytes]]:
+    result = [(name, value) for name, value in _with_vary(headers) if name.lower() != b"content-length"]
+    result.append((b"content-encoding", encoding.encode("latin-1")))
+    if content_length is not None:
+        result.append((b"content-length", str(content_length).encode("latin-1")))
+    return result
+
+
+def _compression_settings() -> Any:
+    """Compression settings from the unified config (defaults if unavailable)"""
+    try:
+        settings = getattr(config_manager.load_config().settings, 'compression', None)
+        if isinstance(settings, CompressionSettings):
+            return settings
+    except Exception as e:
+        logger.debug(f"Using default compression settings: {e}")
+    return CompressionSettings()
+
+
+# Import at the end to avoid circular imports
+from src.core.unified_config import CompressionSettings, config_manager
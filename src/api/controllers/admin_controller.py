@@ -0,0 +1,133 @@
+"""
+Admin endpoints: sampling profiler and event-loop monitor
+
+Protected by the admin keys (``X-Admin-Key``), separate from the proxy API keys.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+
+from src.core.auth import verify_admin_key
+from src.core.logging import ContextualLogger
+from src.core.profiler import (ProfilerBusyError, loop_monitor,
+                               sampling_profiler)
+from src.core.unified_config import ProfilingSettings, config_manager
+
+logger = ContextualLogger(__name__)
+
+router = APIRouter(prefix="/admin")
+
+
+def _memory_snapshot() -> Dict[str, Any]:
+    """Process memory and GC counters from the memory manager (empty without psutil)"""
+    try:
+        from src.core import memory_manager
+        stats = memory_manager.get_memory_stats()
+    except Exception as e:
+        logger.debug(f"Memory stats unavailable: {e}")
+        return {}
+
+    snapshot = {
+        "process_memory_mb": stats.process_memory_mb,
+        "memory_percent": stats.memory_percent,
+        "gc_collections": stats.gc_collections,
+    }
+    if memory_manager._memory_manager is not None:
+        snapshot["manager"] = memory_manager._memory_manager.get_manager_stats()
+    return snapshot
+
+
+@router.get("/profile")
+async def profile(
+    request: Request,
+    duration: float = Query(10.0, gt=0, description="Profiling window in seconds"),
+    interval_ms: Optional[float] = Query(None, ge=1, le=1000, description="Sampling interval"),
+    threads: str = Query("all", pattern="^(all|loop)$", description="Sample every thread or only the event loop"),
+    format: str = Query("collapsed", pattern="^(collapsed|json)$", description="Collapsed stacks or a JSON summary"),
+    include_idle: bool = Query(False, description="Keep samples of threads waiting in select/locks/queues"),
+    _: bool = Depends(verify_admin_key)
+):
+    """
+    Sample the event-loop thread and worker threads for ``duration`` seconds.
+
+    ``format=collapsed`` returns a flamegraph-ready file (flamegraph.pl,
+    inferno, speedscope); ``format=json`` returns the top functions, the
+    event-loop lag and GC pauses seen during the window, and memory before
+    and after.
+    """
+    settings = _profiling_settings()
+    if not settings.enabled:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if duration > settings.max_duration_s:
+        raise HTTPException(status_code=400,
+                            detail=f"duration must not exceed {settings.max_duration_s} seconds")
+
+    interval = (interval_ms if interval_ms is not None else settings.default_interval_ms) / 1000
+    memory_before = _memory_snapshot() if format == "json" else {}
+    slow_before = loop_monitor.slow_callback_count
+
+    try:
+        # Sampled from a worker thread; this (event-loop) thread keeps serving requests
+        result = await asyncio.to_thread(
+            sampling_profiler.profile,
+            duration,
+            interval,
+            threading.get_ident(),
+            threads == "loop",
+            include_idle,
+        )
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    logger.info("Profile taken",
+                duration_s=round(result.duration, 3),
+                samples=result.samples,
+                distinct_stacks=len(result.stacks))
+
+    if format == "collapsed":
+        filename = time.strftime("profile-%Y%m%d-%H%M%S.collapsed", time.gmtime(result.started_at))
+        return Response(
+            content=result.collapsed(),
+            media_type="text/plain; charset=utf-8",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
+
+    report = result.to_dict()
+    report["event_loop"] = loop_monitor.get_stats()
+    new_slow = loop_monitor.slow_callback_count - slow_before
+    report["slow_callbacks"] = loop_monitor.get_slow_callbacks(limit=new_slow) if new_slow > 0 else []
+    report["memory"] = {"before": memory_before, "after": _memory_snapshot()}
+    return report
+
+
+@router.get("/loop")
+async def event_loop_status(
+    request: Request,
+    limit: int = Query(20, ge=0, le=10000, description="Slow-callback and blocking-call events to return, most recent first"),
+    _: bool = Depends(verify_admin_key)
+):
+    """
+    Event-loop lag and the most recent slow callbacks with their coroutines
+    and stacks, plus blocking calls when blocking I/O detection is on
+    """
+    return {
+        "timestamp": time.time(),
+        **loop_monitor.get_stats(),
+        "recent_slow_callbacks": loop_monitor.get_slow_callbacks(limit=limit),
+        "recent_blocking_calls": loop_monitor.get_blocking_calls(limit=limit),
+    }
+
+
+def _profiling_settings() -> ProfilingSettings:
+    """Profiling settings from the unified config (defaults if unavailable)"""
+    try:
+        settings = getattr(config_manager.load_config().settings, 'profiling', None)
+        if isinstance(settings, ProfilingSettings):
+            return settings
+    except Exception as e:
+        logger.debug(f"Using default profiling settings: {e}")
+    return ProfilingSettings()
@@ -2,9 +2,12 @@ import time
 
 from fastapi import APIRouter, Depends, Request, Response
 
+from src.api.compression import compression_metrics
 from src.core.auth import verify_api_key
 from src.core.logging import ContextualLogger
 from src.core.metrics import metrics_collector
+from src.core.phase_timing import phase_histograms
+from src.core.profiler import loop_monitor
 
 logger = ContextualLogger(__name__)
 
@@ -54,7 +57,10 @@ async def get_metrics(
             "total_providers": len(provider_info),
             "total_requests": total_requests,
             "average_success_rate": avg_success_rate
-        }
+        },
+        "compression": compression_metrics.get_stats(),
+        "phases": phase_histograms.get_stats(),
+        "event_loop": loop_monitor.get_stats()
     }
 
 @router.get("/metrics/prometheus")
@@ -66,7 +72,11 @@ async def get_prometheus_metrics(
     start_time = time.time()
     logger.info("Prometheus metrics request started")
 
-    prometheus_data = metrics_collector.get_prometheus_metrics()
+    prometheus_data = "\n".join([
+        metrics_collector.get_prometheus_metrics(),
+        phase_histograms.to_prometheus(),
+        loop_monitor.to_prometheus(),
+    ])
 
     response_time = time.time() - start_time
     data_size = len(prometheus_data) if prometheus_data else 0
@@ -1,11 +1,13 @@
 import time
 
 from fastapi import APIRouter, BackgroundTasks, Depends, Request
-from fastapi.responses import StreamingResponse
 
+from src.api.responses import completion_response
 from src.core.auth import verify_api_key
 from src.core.logging import ContextualLogger
+from src.core.phase_timing import phase
 from src.core.rate_limiter import rate_limiter
+from src.models.request_view import ChatRequestView, parse_chat_request
 from src.models.requests import ChatCompletionRequest, TextCompletionRequest
 
 from .common import request_router  # Import shared router
@@ -14,23 +16,40 @@ logger = ContextualLogger(__name__)
 
 router = APIRouter()
 
-@router.post("/v1/chat/completions")
+async def get_chat_request(request: Request) -> ChatRequestView:
+    """Chat request parsed and validated once per request"""
+    view = getattr(request.state, 'chat_request', None)
+    if isinstance(view, ChatRequestView):
+        return view
+    body = await request.body()
+    with phase("validation"):
+        view = parse_chat_request(body)
+    request.state.chat_request = view
+    return view
+
+@router.post(
+    "/v1/chat/completions",
+    openapi_extra={"requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": ChatCompletionRequest.model_json_schema()}}
+    }}
+)
 @rate_limiter.limit("100/minute")
 async def chat_completions(
     request: Request,
-    completion_request: ChatCompletionRequest,
     background_tasks: BackgroundTasks,
+    completion_request: ChatRequestView = Depends(get_chat_request),
     _: bool = Depends(verify_api_key)
 ):
     """OpenAI-compatible chat completions endpoint"""
     start_time = time.time()
-    model = completion_request.model
-    stream = completion_request.stream
+    model = completion_request['model']
+    stream = completion_request.get('stream', False)
 
     logger.info("Chat completion request started",
                model=model,
                stream=stream,
-               message_count=len(completion_request.messages) if hasattr(completion_request, 'messages') else 0)
+               message_count=len(completion_request['messages']))
 
     result = await request_router.route_request(
         request,
@@ -45,9 +64,7 @@ async def chat_completions(
                stream=stream,
                response_time=response_time)
 
-    if completion_request.stream:
-        return StreamingResponse(result, media_type="text/event-stream")
-    return result
+    return completion_response(request, result, stream=stream)
 
 @router.post("/v1/completions")
 @rate_limiter.limit("100/minute")
@@ -80,6 +97,4 @@ async def text_completions(
                stream=stream,
                response_time=response_time)
 
-    if completion_request.stream:
-        return StreamingResponse(result, media_type="text/event-stream")
-    return result
\ No newline at end of file
+    return completion_response(request, result, stream=bool(completion_request.stream))
\ No newline at end of file
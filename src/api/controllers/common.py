@@ -1,18 +1,26 @@
+import functools
+import math
 import re
 import time
 import uuid
 from http import HTTPStatus
-from typing import Any, AsyncGenerator, Dict, List, Union
+from typing import Any, AsyncGenerator, Dict, List, Optional, Union
 
 from fastapi import BackgroundTasks, Request
 from fastapi.responses import JSONResponse
 
 from src.api.controllers.context_controller import background_condense
-from src.core.circuit_breaker import get_circuit_breaker
+from src.core.circuit_breaker import (CircuitBreakerOpenException,
+                                      get_circuit_breaker)
+from src.core.embeddings_pipeline import get_embeddings_pipeline
 from src.core.exceptions import (InvalidRequestError, NotImplementedError,
-                                 ServiceUnavailableError)
+                                 RateLimitError, ServiceUnavailableError)
 from src.core.logging import ContextualLogger
 from src.core.metrics import metrics_collector
+from src.core.phase_timing import phase
+from src.core.retry_budget import (Deadline, DeadlineExceededError,
+                                   deadline_scope, get_retry_budget,
+                                   retry_after_from_error)
 from src.models.requests import (ChatCompletionRequest, EmbeddingRequest,
                                  TextCompletionRequest)
 from src.utils.tasks import safe_background_task
@@ -34,38 +42,103 @@ class RequestRouter:
         Generic request router with comprehensive error handling and fallback
         """
         app_state = request.app.state.app_state
-        request_id = f"{operation}_{int(time.time() * 1000)}"
-        logger.set_context(request_id=request_id, operation=operation, model=request_data.get('model', 'unknown'))
-
-        # Get providers for the model
-        model = request_data.get('model', '')
-        providers = await app_state.provider_factory.get_providers_for_model(model)
-
-        if not providers:
-            logger.error("No providers available for model", model=model)
-            raise InvalidRequestError(
-                f"Model '{model}' is not supported by any available provider",
-                param="model",
-                code="model_not_found"
-            )
+        # The gateway's ID (the client's X-Request-ID when valid) is echoed in the
+        # response headers, so the logs and upstream calls use the same one
+        request_id = getattr(request.state, "request_id", None) or f"{operation}_{int(time.time() * 1000)}"
+        # Validated request views and plain dicts are passed to providers as-is
+        req_dict = request_data if isinstance(request_data, dict) else request_data.dict(exclude_unset=True)
+        logger.set_context(request_id=request_id, operation=operation, model=req_dict.get('model', 'unknown'))
+
+        with phase("routing"):
+            # Get providers for the model
+            model = req_dict.get('model', '')
+            providers = await app_state.provider_factory.get_providers_for_model(model)
+
+            if not providers:
+                logger.error("No providers available for model", model=model)
+                raise InvalidRequestError(
+                    f"Model '{model}' is not supported by any available provider",
+                    param="model",
+                    code="model_not_found"
+                )
 
-        # Check for forced provider
-        config = app_state.config_manager.load_config()
-        forced_provider = config.get_forced_provider()
+            # Check for forced provider
+            config = app_state.config_manager.load_config()
+            forced_provider = config.get_forced_provider()
 
-        if forced_provider and forced_provider.name in [p.name for p in providers]:
-            # Use forced provider exclusively
-            providers = [p for p in providers if p.name == forced_provider.name]
-            logger.info(f"Using forced provider: {forced_provider.name}")
+            if forced_provider and forced_provider.name in [p.name for p in providers]:
+                # Use forced provider exclusively
+                providers = [p for p in providers if p.name == forced_provider.name]
+                logger.info(f"Using forced provider: {forced_provider.name}")
+
+            deadline_timeout = self._resolve_deadline(request, config)
+        with deadline_scope(deadline_timeout) as deadline:
+            return await self._try_providers(
+                request, req_dict, operation, background_tasks,
+                providers, model, request_id, deadline
+            )
 
+    def _resolve_deadline(self, request: Request, config: Any) -> float:
+        """Request deadline: the configured request timeout, optionally shortened by the client"""
+        timeout = float(config.settings.request_timeout)
+        header = config.settings.retry_budget.deadline_header
+        requested = request.headers.get(header)
+        if requested:
+            try:
+                requested_timeout = float(requested)
+            except ValueError:
+                logger.warning(f"Ignoring invalid {header} header", value=requested)
+            else:
+                if requested_timeout > 0:
+                    timeout = min(timeout, requested_timeout)
+        return timeout
+
+    def _skip_reason(self, provider_name: str, deadline: Deadline, upstream_failed: bool) -> Optional[str]:
+        """Why a provider must not be attempted right now, or None"""
+        if deadline.expired():
+            return "deadline_exceeded"
+        budget = get_retry_budget(provider_name)
+        if budget.retry_after() > 0:
+            return "retry_after"
+        if upstream_failed and not budget.try_acquire():
+            return "retry_budget_exhausted"
+        return None
+
+    async def _try_providers(self,
+                             request: Request,
+                             req_dict: Dict[str, Any],
+                             operation: str,
+                             background_tasks: BackgroundTasks,
+                             providers: List[Any],
+                             model: str,
+                             request_id: str,
+                             deadline: Deadline) -> Union[Dict[str, Any], AsyncGenerator]:
+        """Try providers in priority order within the request deadline and retry budgets"""
         # Track attempts for metrics
         attempt_info = []
         last_exception = None
+        # Set once an upstream call actually failed; later providers are then
+        # fallbacks that must be paid for by their retry budget
+        upstream_failed = False
 
         # Try providers in priority order
         for i, provider in enumerate(providers):
             attempt_start = time.time()
 
+            skip_reason = self._skip_reason(provider.name, deadline, upstream_failed)
+            if skip_reason:
+                attempt_info.append({
+                    "provider": provider.name,
+                    "success": False,
+                    "error": skip_reason,
+                    "response_time": 0.0,
+                    "attempt_number": i + 1
+                })
+                logger.warning(f"Skipping provider {provider.name} for {operation}", reason=skip_reason)
+                if skip_reason == "deadline_exceeded":
+                    break
+                continue
+
             try:
                 logger.info(f"Attempting {operation} with provider {provider.name} (attempt {i+1}/{len(providers)})")
 
@@ -77,13 +150,13 @@ class RequestRouter:
                 elif operation == "text_completion":
                     method = provider.create_text_completion
                 elif operation == "embeddings":
-                    method = provider.create_embeddings
+                    # Batched with concurrent embedding requests for this provider
+                    method = functools.partial(get_embeddings_pipeline().embed_with, provider)
                 elif operation == "image_generation":
                     method = provider.create_image
                 else:
                     raise ValueError(f"Unknown operation: {operation}")
 
-                req_dict = request_data.dict(exclude_unset=True) if hasattr(request_data, 'dict') else request_data
                 result = await circuit_breaker.execute(lambda: method(req_dict))
 
                 attempt_time = time.time() - attempt_start
@@ -108,14 +181,13 @@ class RequestRouter:
                     request_id, operation, provider.name, attempt_time, attempt_info
                 )
 
-                # Add provider info to response
-                if isinstance(result, dict):
-                    result.setdefault("_proxy_info", {}).update({
-                        "provider": provider.name,
-                        "attempt_number": i + 1,
-                        "response_time": attempt_time,
-                        "request_id": request_id
-                    })
+                # Provider info is sent as X-Proxy-* response headers, leaving the body untouched
+                request.state.proxy_info = {
+                    "provider": provider.name,
+                    "attempt_number": i + 1,
+                    "response_time": attempt_time,
+                    "request_id": request_id
+                }
 
                 return result
 
@@ -133,9 +205,28 @@ class RequestRouter:
                 logger.info(f"Provider {provider.name} doesn't support {operation}, trying next")
                 continue
 
+            except CircuitBreakerOpenException as e:
+                # Rejected locally: no upstream call was made, so the next provider is not a retry
+                last_exception = e
+                attempt_info.append({
+                    "provider": provider.name,
+                    "success": False,
+                    "error": "circuit_open",
+                    "error_message": str(e),
+                    "response_time": time.time() - attempt_start,
+                    "attempt_number": i + 1
+                })
+                logger.info(f"Circuit open for provider {provider.name}, trying next")
+                continue
+
             except Exception as e:
                 attempt_time = time.time() - attempt_start
                 last_exception = e
+                upstream_failed = True
+
+                retry_after = retry_after_from_error(e)
+                if retry_after is not None:
+                    get_retry_budget(provider.name).defer(retry_after)
 
                 # Record failed attempt
                 attempt_info.append({
@@ -171,6 +262,7 @@ class RequestRouter:
                             }
                         )
                     # Truncate for streaming
+                    req_dict = dict(req_dict)
                     req_dict["messages"] = req_dict["messages"][-len(req_dict["messages"])//2:]
                     req_dict["stream"] = False
                     # Re-attempt with the same provider
@@ -193,6 +285,18 @@ class RequestRouter:
         )
 
         # Determine appropriate error response
+        if attempt_info and attempt_info[-1]["error"] == "deadline_exceeded":
+            raise DeadlineExceededError(
+                f"Request deadline of {deadline.timeout:.1f}s exceeded after {len(attempt_info) - 1} provider attempts"
+            )
+        if attempt_info and all(attempt["error"] == "retry_after" for attempt in attempt_info):
+            # Every provider asked us to back off; pass the shortest wait on to the client
+            retry_after = min(get_retry_budget(p.name).retry_after() for p in providers)
+            raise RateLimitError(
+                "All providers requested a backoff",
+                retry_after=max(1, math.ceil(retry_after)),
+                code="providers_rate_limited"
+            )
         if all(attempt["error"] == "operation_not_supported" for attempt in attempt_info):
             raise NotImplementedError(
                 f"The {operation} operation is not supported by any provider for model '{model}'",
@@ -217,13 +321,12 @@ class RequestRouter:
                                     attempt_info: List[Dict]) -> None:
         """Background task to record detailed success metrics"""
         try:
-            metrics_collector.record_request(
-                provider_name,
-                success=True,
-                response_time=response_time,
-                operation=operation,
-                attempts=len(attempt_info)
-            )
+            with phase("metrics"):
+                metrics_collector.record_request(
+                    provider_name,
+                    success=True,
+                    response_time=response_time
+                )
         except Exception as e:
             logger.error(f"Failed to record success metrics: {e}")
 
@@ -231,15 +334,15 @@ class RequestRouter:
                                     attempt_info: List[Dict]) -> None:
         """Background task to record detailed failure metrics"""
         try:
-            for attempt in attempt_info:
-                if not attempt["success"]:
-                    metrics_collector.record_request(
-                        attempt["provider"],
-                        success=False,
-                        response_time=attempt["response_time"],
-                        error_type=attempt.get("error", "unknown"),
-                        operation=operation
-                    )
+            with phase("metrics"):
+                for attempt in attempt_info:
+                    if not attempt["success"]:
+                        metrics_collector.record_request(
+                            attempt["provider"],
+                            success=False,
+                            response_time=attempt["response_time"],
+                            error_type=attempt.get("error", "unknown")
+                        )
         except Exception as e:
             logger.error(f"Failed to record failure metrics: {e}")
 
@@ -12,31 +12,48 @@ from src.core.config import settings
 from src.core.exceptions import ServiceUnavailableError
 from src.core.logging import ContextualLogger
 from src.core.metrics import metrics_collector
+from src.utils.prefix_summary_store import (PrefixSummaryStore,
+                                            incremental_chunks, prefix_hashes)
 
 logger = ContextualLogger(__name__)
 router = APIRouter()
 limiter = Limiter(key_func=get_remote_address)
 
-# This timeout should be consistent with the one in main.py
+# This timeout should be consistent with the one in main.py. The read timeout
+# must exceed the context service's CONDENSE_WAIT_TIMEOUT (20 s by default),
+# so a job still queued there comes back as a 202 instead of a read timeout
 DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=5.0, read=30.0)
 
 
 from src.core.unified_config import config_manager
 
+def get_context_service_client(request: Request) -> httpx.AsyncClient:
+    """Shared keep-alive client for the context service (one per app, not per job)"""
+    client = getattr(request.app.state, 'context_service_client', None)
+    if not isinstance(client, httpx.AsyncClient) or client.is_closed:
+        client = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, limits=httpx.Limits(max_keepalive_connections=20))
+        request.app.state.context_service_client = client
+    return client
+
+
 async def condense_context_via_service(request: Request, chunks: List[str], max_tokens: int = 512) -> str:
     """Call the context condensation service via HTTP"""
     config = request.app.state.app_state.config
     context_service_url = config.settings.services.get("context_service_url", "http://localhost:8001")
 
     try:
-        async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
-            response = await client.post(
-                f"{context_service_url}/condense",
-                json={"chunks": chunks, "max_tokens": max_tokens}
-            )
-            response.raise_for_status()
-            result = response.json()
-            return result["summary"]
+        client = get_context_service_client(request)
+        response = await client.post(
+            f"{context_service_url}/condense",
+            json={"chunks": chunks, "max_tokens": max_tokens}
+        )
+        response.raise_for_status()
+        result = response.json()
+        if response.status_code == 202:
+            # Still queued behind other jobs; the service keeps the result for a later request
+            logger.warning(f"Context service queued job {result.get('job_id')} without finishing it")
+            raise ServiceUnavailableError("Context condensation service is busy")
+        return result["summary"]
     except httpx.RequestError as e:
         logger.error(f"Failed to call context service: {e}")
         raise ServiceUnavailableError("Context condensation service is unavailable")
@@ -49,7 +66,18 @@ async def background_condense(request_id: str, request: Request, chunks: List[st
     """Background task to compute full context summary and store in smart cache"""
     try:
         start_time = time.time()
-        summary = await condense_context_via_service(request, chunks)
+
+        # Only condense the messages appended since the longest already-summarized prefix
+        prefix_store = getattr(request.app.state, 'prefix_summary_store', None)
+        reused, summary = 0, None
+        if isinstance(prefix_store, PrefixSummaryStore):
+            hashes = prefix_hashes(chunks)
+            reused, summary = prefix_store.longest_prefix(hashes)
+        if not chunks or reused < len(chunks):
+            pending = incremental_chunks(summary, chunks[reused:]) if reused else chunks
+            summary = await condense_context_via_service(request, pending)
+            if isinstance(prefix_store, PrefixSummaryStore):
+                prefix_store.put(hashes, summary)
         latency = time.time() - start_time
 
         cache_data = {
@@ -57,6 +85,7 @@ async def background_condense(request_id: str, request: Request, chunks: List[st
             "timestamp": time.time(),
             "latency": latency,
             "chunks_count": len(chunks),
+            "reused_messages": reused,
             "total_chars": sum(len(chunk) for chunk in chunks)
         }
 
@@ -97,7 +126,7 @@ async def get_summary_status(request_id: str, request: Request):
             if result is not None:
                 if "error" in result:
                     return {"status": "error", "error": result["error"], "timestamp": result["timestamp"]}
-                return {"status": "completed", "summary": result["summary"], "timestamp": result["timestamp"], "latency": result.get("latency", 0), "cached": True}
+                return {"status": "completed", "summary": result["summary"], "timestamp": result["timestamp"], "latency": result.get("latency", 0), "reused_messages": result.get("reused_messages", 0), "cached": True}
         except Exception as e:
             logger.warning(f"Smart cache error for {request_id}: {e}")
 
@@ -106,6 +135,6 @@ async def get_summary_status(request_id: str, request: Request):
         result = legacy_cache[request_id]
         if "error" in result:
             return {"status": "error", "error": result["error"], "timestamp": result["timestamp"]}
-        return {"status": "completed", "summary": result["summary"], "timestamp": result["timestamp"], "latency": result.get("latency", 0), "cached": False}
+        return {"status": "completed", "summary": result["summary"], "timestamp": result["timestamp"], "latency": result.get("latency", 0), "reused_messages": result.get("reused_messages", 0), "cached": False}
 
     return {"status": "not_found", "message": "Request ID not found or processing not started", "request_id": request_id}
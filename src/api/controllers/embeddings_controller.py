@@ -0,0 +1,48 @@
+import time
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Request
+
+from src.api.responses import FastJSONResponse, proxy_headers
+from src.core.auth import verify_api_key
+from src.core.embeddings_pipeline import get_embeddings_pipeline
+from src.core.logging import ContextualLogger
+from src.core.rate_limiter import rate_limiter
+from src.models.requests import EmbeddingRequest
+
+from .common import request_router  # Import shared router
+
+logger = ContextualLogger(__name__)
+
+router = APIRouter()
+
+@router.post("/v1/embeddings")
+@rate_limiter.limit("1000/minute")
+async def embeddings(
+    request: Request,
+    embedding_request: EmbeddingRequest,
+    background_tasks: BackgroundTasks,
+    _: bool = Depends(verify_api_key)
+):
+    """
+    OpenAI-compatible embeddings endpoint.
+
+    Cached inputs are answered without an upstream call; the rest are batched
+    with concurrent requests to the same provider.
+    """
+    start_time = time.time()
+    request_data = embedding_request.dict(exclude_unset=True)
+
+    async def route(upstream_request):
+        return await request_router.route_request(request, upstream_request, "embeddings", background_tasks)
+
+    body, cached = await get_embeddings_pipeline().create(request_data, route)
+
+    logger.info("Embeddings request completed",
+               model=embedding_request.model,
+               inputs=len(body["data"]),
+               cached=cached,
+               response_time=time.time() - start_time)
+
+    headers = proxy_headers(request)
+    headers["X-Embeddings-Cached"] = str(cached)
+    return FastJSONResponse(content=body, headers=headers)
@@ -2,13 +2,14 @@ import time
 from typing import Dict, Any
 
 from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
 
-from src.core.alerting import alert_manager
 from src.core.logging import ContextualLogger
 from src.core.metrics import metrics_collector
 from src.core.provider_factory import ProviderStatus
 import asyncio
 from src.core.rate_limiter import rate_limiter
+from src.core.startup import startup_manager
 from src.core.unified_config import ProviderConfig, config_manager
 from src.core.provider_factory import provider_factory
 
@@ -101,6 +102,15 @@ async def provider_health_check(request: Request):
     """Deep health check of all providers in parallel"""
     return await perform_parallel_health_checks(request)
 
+@router.get("/health/ready")
+async def readiness_check(request: Request):
+    """Readiness probe: 200 once the request path is initialized
+
+    Optional subsystems may still be starting; their progress is in the body.
+    """
+    report = startup_manager.get_report()
+    return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
+
 @router.get("/health")
 @rate_limiter.limit(route="/v1/health")
 async def health_check(request: Request):
@@ -121,8 +131,11 @@ async def health_check(request: Request):
     system_metrics = metrics_collector.get_all_stats()
     system_health = system_metrics.get("system_health", {})
 
-    # Get active alerts
-    active_alerts = alert_manager.get_active_alerts()
+    # Get active alerts (alerting is an optional subsystem started after readiness)
+    active_alerts = []
+    if startup_manager.is_started("alerting"):
+        from src.core.alerting import alert_manager
+        active_alerts = alert_manager.get_active_alerts()
     critical_alerts = [a for a in active_alerts if a["severity"] == "critical"]
     warning_alerts = [a for a in active_alerts if a["severity"] == "warning"]
 
@@ -208,6 +221,8 @@ async def health_check(request: Request):
             "recent": active_alerts[:5]  # Show last 5 alerts
         },
 
+        "startup": startup_manager.get_report(),
+
         "performance": {
             "total_requests": system_metrics.get("total_requests", 0),
             "successful_requests": system_metrics.get("successful_requests", 0),
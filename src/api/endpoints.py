@@ -2,9 +2,9 @@ import time
 from typing import Any, AsyncGenerator, Dict, List, Union
 
 from fastapi import APIRouter, BackgroundTasks, Depends, Request
-from fastapi.responses import StreamingResponse
 
 from src.api.model_endpoints import router as model_router
+from src.api.responses import completion_response
 from src.core.auth import verify_api_key
 from src.core.exceptions import (InvalidRequestError, NotImplementedError,
                                  ServiceUnavailableError)
@@ -103,14 +103,13 @@ class RequestRouter:
                     request_id, operation, provider.name, attempt_time, attempt_info
                 )
                 
-                # Add provider info to response
-                if isinstance(result, dict):
-                    result.setdefault("_proxy_info", {}).update({
-                        "provider": provider.name,
-                        "attempt_number": i + 1,
-                        "response_time": attempt_time,
-                        "request_id": request_id
-                    })
+                # Provider info is sent as X-Proxy-* response headers, leaving the body untouched
+                request.state.proxy_info = {
+                    "provider": provider.name,
+                    "attempt_number": i + 1,
+                    "response_time": attempt_time,
+                    "request_id": request_id
+                }
                 
                 return result
                 
@@ -235,9 +234,7 @@ async def chat_completions(
         "chat_completion",
         background_tasks
     )
-    if completion_request.stream:
-        return StreamingResponse(result, media_type="text/event-stream")
-    return result
+    return completion_response(request, result, stream=bool(completion_request.stream))
 
 @router.post("/v1/completions")
 @rate_limiter.limit(route="/v1/completions")
@@ -254,9 +251,7 @@ async def text_completions(
         "text_completion",
         background_tasks
     )
-    if completion_request.stream:
-        return StreamingResponse(result, media_type="text/event-stream")
-    return result
+    return completion_response(request, result, stream=bool(completion_request.stream))
 
 @router.post("/v1/embeddings")
 @rate_limiter.limit(route="/v1/embeddings")
@@ -267,12 +262,13 @@ async def embeddings(
     _: bool = Depends(verify_api_key)
 ):
     """OpenAI-compatible embeddings endpoint"""
-    return await request_router.route_request(
+    result = await request_router.route_request(
         request,
         embedding_request,
         "embeddings",
         background_tasks
     )
+    return completion_response(request, result)
 
 @router.post("/v1/images/generations")
 @rate_limiter.limit(route="/v1/images/generations")
@@ -283,12 +279,13 @@ async def image_generations(
     _: bool = Depends(verify_api_key)
 ):
     """Image generation endpoint for supported providers (e.g., Blackbox)"""
-    return await request_router.route_request(
+    result = await request_router.route_request(
         request,
         image_request,
         "image_generation",
         background_tasks
     )
+    return completion_response(request, result)
 
 # Enhanced utility endpoints
 @router.get("/v1/models")
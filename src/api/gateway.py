@@ -0,0 +1,256 @@
+"""
+API gateway middleware.
+
+One pure-ASGI middleware for the concerns shared by every request: request
+ID, API key authentication, token-bucket rate limiting, timing and a single
+access-log line. With phase timing enabled it also binds the request's
+``PhaseTimer``, sends the phases recorded before the response starts as a
+``Server-Timing`` header and, once the body is done, feeds the per-phase
+histograms (and optionally the active OpenTelemetry span). Unlike ``BaseHTTPMiddleware`` it does not run the endpoint in
+a separate task or re-stream the response body; ``send`` is only intercepted
+to add headers to ``http.response.start``, so SSE chunks reach the client as
+soon as the endpoint yields them.
+
+Routes opt out of individual concerns through ``RoutePolicy`` entries matched
+by path prefix (longest prefix wins).
+"""
+
+import itertools
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.api.errors.error_handlers import error_handler
+from src.core.exceptions import AuthenticationError, RateLimitError
+from src.core.logging import ContextualLogger
+from src.core.phase_timing import (PhaseTimer, bind_timer, phase,
+                                   phase_histograms, unbind_timer)
+from src.core.telemetry import set_span_phase_attributes
+
+logger = ContextualLogger(__name__)
+
+_REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._\-]{1,128}$')
+
+
+@dataclass(frozen=True)
+class RoutePolicy:
+    """Which gateway concerns apply to a route"""
+    auth: bool = True
+    rate_limit: bool = True
+    access_log: bool = True
+
+
+# Policy for API routes without a more specific entry
+API_POLICY = RoutePolicy()
+# Policy for everything outside the API prefix (root, docs, dashboard)
+PUBLIC_POLICY = RoutePolicy(auth=False, rate_limit=False)
+
+# API routes that are served without an API key
+DEFAULT_ROUTE_POLICIES: Dict[str, RoutePolicy] = {
+    "/v1/health": RoutePolicy(auth=False, rate_limit=False, access_log=False),
+    "/v1/models": RoutePolicy(auth=False),
+    "/v1/providers": RoutePolicy(auth=False),
+    "/v1/cache": RoutePolicy(auth=False),
+    "/v1/summary": RoutePolicy(auth=False),
+    "/v1/config": RoutePolicy(auth=False),
+    "/v1/status": RoutePolicy(auth=False),
+    # Checked against the admin keys by the endpoints themselves
+    "/v1/admin": RoutePolicy(auth=False),
+}
+
+
+class GatewayMiddleware:
+    """Request ID, auth, rate limiting, timing and access logging in one ASGI layer"""
+
+    def __init__(self,
+                 app: ASGIApp,
+                 route_policies: Optional[Dict[str, RoutePolicy]] = None,
+                 api_prefix: str = "/v1",
+                 phase_timing: Any = None):
+        self.app = app
+        self.api_prefix = api_prefix
+        timing = phase_timing if phase_timing is not None else _phase_timing_settings()
+        self.timing_enabled = timing.enabled
+        self.server_timing_header = timing.enabled and timing.server_timing_header
+        self.timing_histograms = timing.enabled and timing.histograms
+        self.timing_span_attributes = timing.enabled and timing.span_attributes
+        policies = DEFAULT_ROUTE_POLICIES if route_policies is None else route_policies
+        self._policies: List[Tuple[str, RoutePolicy]] = sorted(
+            policies.items(), key=lambda item: len(item[0]), reverse=True
+        )
+        # The API key header comes from the app's config (replaced on reload);
+        # the one resolved here is used until the app state has a config
+        self._default_key_header = _api_key_header_setting()
+        self._key_header_config: Any = None
+        self._key_header = self._default_key_header
+        self._counter = itertools.count(1)
+        self.request_count = 0
+        self.error_count = 0
+        self.rejected_count = 0
+
+    def policy_for(self, path: str) -> RoutePolicy:
+        for prefix, policy in self._policies:
+            if path.startswith(prefix):
+                return policy
+        return API_POLICY if path.startswith(self.api_prefix) else PUBLIC_POLICY
+
+    def _request_id(self, headers: Dict[bytes, bytes]) -> str:
+        incoming = headers.get(b"x-request-id")
+        if incoming:
+            value = incoming.decode("latin-1")
+            if _REQUEST_ID_PATTERN.match(value):
+                return value
+        return f"req_{int(time.time() * 1000)}_{next(self._counter)}"
+
+    def _check_rate_limit(self, scope: Scope, state: Dict[str, Any]) -> Optional[Exception]:
+        limiter = rate_limiter.token_bucket_limiter
+        if limiter is None:
+            return None
+        client = scope.get("client")
+        allowed, reset_time = limiter.is_allowed(client[0] if client else "unknown")
+        state["rate_limit_checked"] = True
+        if allowed:
+            return None
+        return RateLimitError("Rate limit exceeded. Please try again later.", retry_after=int(reset_time))
+
+    def _api_key_header(self, app_state: Any) -> bytes:
+        """Lower-cased API key header name, re-read only when the app's config object changes"""
+        config = getattr(app_state, "config", None)
+        if config is None:
+            return self._default_key_header
+        if config is not self._key_header_config:
+            self._key_header = config.settings.api_key_header.lower().encode("latin-1")
+            self._key_header_config = config
+        return self._key_header
+
+    def _check_auth(self, scope: Scope, headers: Dict[bytes, bytes], state: Dict[str, Any]) -> Optional[Exception]:
+        app_state = getattr(scope.get("app"), "state", None)
+        api_key_auth = getattr(app_state, "api_key_auth", None)
+        if api_key_auth is None:
+            # Not initialized yet; the endpoint's verify_api_key dependency decides
+            return None
+        api_key = headers.get(self._api_key_header(app_state))
+        if not api_key:
+            authorization = headers.get(b"authorization", b"")
+            if authorization.startswith(b"Bearer "):
+                api_key = authorization[7:]
+        if not api_key:
+            return AuthenticationError("API key required", code="missing_api_key")
+        if not api_key_auth.verify_api_key(api_key.decode("latin-1")):
+            return AuthenticationError("Invalid or unauthorized API key", code="invalid_api_key")
+        state["authenticated"] = True
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        self.request_count += 1
+        policy = self.policy_for(scope["path"])
+        headers = dict(scope["headers"])
+        request_id = self._request_id(headers)
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+
+        timer = None
+        if self.timing_enabled:
+            timer = PhaseTimer(start)
+            timer_token = bind_timer(timer)
+
+        rejection = None
+        if policy.rate_limit:
+            with phase("rate_limit"):
+                rejection = self._check_rate_limit(scope, state)
+        if rejection is None and policy.auth:
+            with phase("auth"):
+                rejection = self._check_auth(scope, headers, state)
+
+        status_code = 500
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_headers = list(message.get("headers", []))
+                if not any(name.lower() == b"x-request-id" for name, _ in response_headers):
+                    response_headers.append((b"x-request-id", request_id.encode("latin-1")))
+                # Time to the first byte; streamed bodies continue after this
+                elapsed = time.perf_counter() - start
+                response_headers.append((b"x-process-time", f"{elapsed * 1000:.2f}ms".encode("latin-1")))
+                if timer is not None and self.server_timing_header:
+                    response_headers.append((b"server-timing", timer.server_timing(elapsed).encode("latin-1")))
+                message = {**message, "headers": response_headers}
+            await send(message)
+
+        try:
+            if rejection is not None:
+                self.rejected_count += 1
+                response = await error_handler.handle_exception(Request(scope, receive), rejection)
+                if isinstance(rejection, RateLimitError):
+                    response.headers["Retry-After"] = str(rejection.retry_after)
+                await response(scope, receive, send_with_headers)
+            else:
+                await self.app(scope, receive, send_with_headers)
+        except Exception:
+            self.error_count += 1
+            raise
+        finally:
+            if timer is not None:
+                unbind_timer(timer_token)
+                self._record_phases(timer)
+            if policy.access_log:
+                duration_ms = round((time.perf_counter() - start) * 1000, 2)
+                log = logger.warning if status_code >= 400 else logger.info
+                log("Request completed",
+                    request_id=request_id,
+                    method=scope["method"],
+                    path=scope["path"],
+                    status_code=status_code,
+                    duration_ms=duration_ms)
+
+    def _record_phases(self, timer: PhaseTimer) -> None:
+        """Phase durations of a finished request (body and background tasks included)"""
+        total = timer.elapsed()
+        if self.timing_histograms:
+            phase_histograms.record(timer, total)
+        if self.timing_span_attributes:
+            set_span_phase_attributes(timer.milliseconds(total))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.request_count,
+            "errors": self.error_count,
+            "rejected": self.rejected_count
+        }
+
+
+def _phase_timing_settings() -> Any:
+    """Phase timing settings from the unified config (defaults if unavailable)"""
+    try:
+        settings = getattr(config_manager.load_config().settings, 'phase_timing', None)
+        if isinstance(settings, PhaseTimingSettings):
+            return settings
+    except Exception as e:
+        logger.debug(f"Using default phase timing settings: {e}")
+    return PhaseTimingSettings()
+
+
+def _api_key_header_setting() -> bytes:
+    """API key header name from the unified config (default if unavailable)"""
+    try:
+        header = config_manager.load_config().settings.api_key_header
+    except Exception as e:
+        logger.debug(f"Using default API key header: {e}")
+        header = "X-API-Key"
+    return header.lower().encode("latin-1")
+
+
+# Import at the end to avoid circular imports
+from src.core.rate_limiter import rate_limiter
+from src.core.unified_config import PhaseTimingSettings, config_manager
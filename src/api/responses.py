@@ -0,0 +1,90 @@
+"""
+Response classes and helpers for proxied completions.
+
+``FastJSONResponse`` is the application-wide default response class: it
+encodes with orjson when available and falls back to the stdlib encoder for
+anything orjson cannot handle. ``completion_response`` builds the response for
+a routed completion: upstream bodies that were not modified are forwarded as
+their original bytes, and proxy metadata (provider, attempt, timing, request
+id) travels in ``X-Proxy-*`` headers instead of being added to the body.
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from src.core.phase_timing import phase, time_stream
+from src.models.upstream_response import UpstreamResponse
+
+# Use orjson for faster JSON serialization if available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson is not None else 0
+
+
+def dumps_json(content: Any) -> bytes:
+    """Serialize to compact JSON bytes, orjson first, stdlib as fallback"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(content, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # Types orjson does not know (Pydantic models, sets, ...)
+            content = jsonable_encoder(content)
+            return orjson.dumps(content, option=_ORJSON_OPTIONS)
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when available"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+class RawJSONResponse(Response):
+    """Already-encoded JSON body, sent without touching it"""
+
+    media_type = "application/json"
+
+
+def proxy_headers(request: Request) -> Dict[str, str]:
+    """X-Proxy-* headers describing how the request was served"""
+    info: Optional[Dict[str, Any]] = getattr(request.state, 'proxy_info', None)
+    if not info:
+        return {}
+    return {
+        "X-Proxy-Provider": str(info["provider"]),
+        "X-Proxy-Attempt": str(info["attempt_number"]),
+        "X-Proxy-Response-Time": f"{info['response_time']:.4f}",
+        "X-Request-ID": str(info["request_id"]),
+    }
+
+
+def completion_response(request: Request, result: Any, stream: bool = False) -> Response:
+    """
+    Build the HTTP response for a routed completion.
+
+    Returning a Response directly skips FastAPI's ``jsonable_encoder`` pass;
+    unmodified upstream bodies are not re-encoded at all.
+    """
+    headers = proxy_headers(request)
+    if stream:
+        return StreamingResponse(time_stream(result), media_type="text/event-stream", headers=headers)
+    with phase("post_processing"):
+        if isinstance(result, Response):
+            result.headers.update(headers)
+            return result
+        if isinstance(result, UpstreamResponse) and result.raw is not None:
+            return RawJSONResponse(content=result.raw, headers=headers)
+        return FastJSONResponse(content=result, headers=headers)
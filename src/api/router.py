@@ -12,10 +12,12 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.responses import HTMLResponse, JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from .controllers.admin_controller import router as admin_router
 from .controllers.alerting_controller import router as alerting_router
 from .controllers.analytics_controller import router as analytics_router
 from .controllers.chat_controller import router as chat_router
 from .controllers.config_controller import router as config_router
+from .controllers.embeddings_controller import router as embeddings_router
 from .controllers.health_controller import router as health_router
 from .controllers.context_controller import router as context_router
 from .controllers.model_controller import router as model_router
@@ -24,34 +26,26 @@ from .errors.custom_exceptions import APIException
 from .errors.error_handlers import (global_exception_handler,
                                     http_exception_handler,
                                     validation_exception_handler)
-from .validation.middleware import middleware_pipeline
+from .gateway import GatewayMiddleware
 
 # Create main API router
 main_router = APIRouter(prefix="/v1")
 
 # Include all controller routers
 main_router.include_router(chat_router, tags=["chat"])
+main_router.include_router(embeddings_router, tags=["embeddings"])
 main_router.include_router(model_router, tags=["models"])
 main_router.include_router(health_router, tags=["health"])
 main_router.include_router(context_router, tags=["context"])
 main_router.include_router(analytics_router, tags=["analytics"])
 main_router.include_router(alerting_router, tags=["alerting"])
 main_router.include_router(config_router, prefix="/config", tags=["config"])
-
-class APIGatewayMiddleware(BaseHTTPMiddleware):
-    """Main API gateway middleware that orchestrates all middleware processing."""
-
-    def __init__(self, app):
-        super().__init__(app)
-
-    async def dispatch(self, request: Request, call_next):
-        """Dispatch request through middleware pipeline."""
-        return await middleware_pipeline.process_request(request, call_next)
+main_router.include_router(admin_router, tags=["admin"])
 
 # Middleware setup functions
 def setup_middleware(app):
     """Setup all middleware for the FastAPI application."""
-    app.add_middleware(APIGatewayMiddleware)
+    app.add_middleware(GatewayMiddleware)
 
 def setup_exception_handlers(app):
     """Setup global exception handlers for the FastAPI application."""
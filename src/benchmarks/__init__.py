@@ -0,0 +1 @@
+"""Benchmark tooling: local mock upstream and the end-to-end suite"""
@@ -0,0 +1,170 @@
+"""
+Cache hit-rate replay for the eviction policies in ``src.core.cache_policy``
+
+A trace is a sequence of ``(key, size_bytes)`` lookups. It is loaded from a
+log file or generated synthetically, then replayed against each policy at
+the same budget the way the caches use them: a hit touches the key, a miss
+records the access, stores the key and evicts until the cache is back
+within budget.
+
+Trace files are read line by line:
+
+- JSON lines (the proxy's structured logs or exported request logs): the key
+  is the first present field of ``key_fields`` (``cache_key``, ``key``,
+  ``request_hash``, ``prompt_hash`` by default) and the size the first of
+  ``size_fields`` (``size_bytes``, ``response_bytes``, ``size``). Lines
+  without a key field are skipped, so a full application log can be
+  replayed as is.
+- Anything else: the stripped line is the key and the size is 1.
+
+The synthetic trace mixes a Zipf-distributed hot set with sweeps of one-off
+keys, the pattern that flushes a plain LRU (a batch of unique prompts).
+"""
+
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.core.cache_policy import EVICTION_POLICIES, create_policy
+
+DEFAULT_KEY_FIELDS = ("cache_key", "key", "request_hash", "prompt_hash")
+DEFAULT_SIZE_FIELDS = ("size_bytes", "response_bytes", "size")
+DEFAULT_POLICIES = ("lru", "slru", "tinylfu")
+
+Trace = List[Tuple[str, int]]
+
+
+@dataclass
+class ReplayResult:
+    """Outcome of one policy over one trace"""
+    policy: str
+    capacity: int
+    requests: int
+    hits: int
+    byte_hits: int
+    total_bytes: int
+    evictions: int
+    rejected: int
+    policy_stats: Dict[str, Any]
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.requests if self.requests else 0.0
+
+    @property
+    def byte_hit_rate(self) -> float:
+        return self.byte_hits / self.total_bytes if self.total_bytes else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "policy": self.policy,
+            "capacity": self.capacity,
+            "requests": self.requests,
+            "hits": self.hits,
+            "hit_rate": round(self.hit_rate, 4),
+            "byte_hit_rate": round(self.byte_hit_rate, 4),
+            "evictions": self.evictions,
+            "rejected": self.rejected,
+            "policy_stats": self.policy_stats,
+        }
+
+
+def parse_trace(lines: Iterable[str], key_fields: Sequence[str] = DEFAULT_KEY_FIELDS,
+                size_fields: Sequence[str] = DEFAULT_SIZE_FIELDS) -> Trace:
+    trace: Trace = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if isinstance(record, dict):
+                key = next((record[name] for name in key_fields if record.get(name) is not None), None)
+                if key is None:
+                    continue
+                size = next((record[name] for name in size_fields if isinstance(record.get(name), int)), 1)
+                trace.append((str(key), max(1, size)))
+                continue
+        trace.append((line, 1))
+    return trace
+
+
+def load_trace(path: Path, key_fields: Sequence[str] = DEFAULT_KEY_FIELDS,
+               size_fields: Sequence[str] = DEFAULT_SIZE_FIELDS) -> Trace:
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return parse_trace(f, key_fields, size_fields)
+
+
+def synthetic_trace(length: int = 200000, keys: int = 5000, skew: float = 1.0, scan_every: int = 20000,
+                    scan_length: int = 4000, seed: int = 0) -> Trace:
+    """Zipf(``skew``) lookups over ``keys`` keys, with a sweep of unique keys every ``scan_every`` lookups"""
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) ** skew for rank in range(keys)]
+    hot = rng.choices(range(keys), weights=weights, k=length)
+    trace: Trace = []
+    scanned = 0
+    for index, rank in enumerate(hot):
+        if scan_every and index % scan_every < scan_length:
+            trace.append((f"scan-{scanned}", 1))
+            scanned += 1
+        else:
+            trace.append((f"key-{rank}", 1))
+    return trace
+
+
+def replay(trace: Trace, policy_name: str, capacity: int, expected_entries: Optional[int] = None) -> ReplayResult:
+    """Replay ``trace`` against a ``capacity``-byte policy (sizes of 1 make it an entry count)"""
+    if expected_entries is None:
+        mean_size = sum(size for _, size in trace) / len(trace) if trace else 1
+        expected_entries = max(1, int(capacity / max(mean_size, 1)))
+    policy = create_policy(policy_name, capacity, expected_entries=expected_entries)
+
+    hits = byte_hits = total_bytes = evictions = rejected = 0
+    for key, size in trace:
+        total_bytes += size
+        if key in policy:
+            hits += 1
+            byte_hits += size
+            policy.touch(key)
+            continue
+        policy.record_access(key)
+        if not policy.admits(size):
+            rejected += 1
+            continue
+        policy.add(key, size)
+        while policy.over_budget():
+            if policy.pop_victim() is None:
+                break
+            evictions += 1
+
+    return ReplayResult(policy_name, capacity, len(trace), hits, byte_hits, total_bytes,
+                        evictions, rejected, policy.get_stats())
+
+
+def compare_policies(trace: Trace, capacity: int, policies: Sequence[str] = DEFAULT_POLICIES) -> List[ReplayResult]:
+    unknown = [name for name in policies if name not in EVICTION_POLICIES]
+    if unknown:
+        raise ValueError(f"Unknown eviction policies: {unknown}")
+    return [replay(trace, name, capacity) for name in policies]
+
+
+def format_replay(results: List[ReplayResult], trace_name: str = "") -> str:
+    if not results:
+        return "No results"
+    baseline = results[0]
+    lines = [
+        f"Trace: {trace_name or 'synthetic'} ({baseline.requests} lookups, capacity {baseline.capacity})",
+        f"{'policy':<10} {'hit rate':>9} {'byte hit':>9} {'vs ' + baseline.policy:>9} {'evictions':>10}",
+    ]
+    for result in results:
+        delta = (result.hit_rate - baseline.hit_rate) * 100
+        lines.append(
+            f"{result.policy:<10} {result.hit_rate * 100:>8.2f}% {result.byte_hit_rate * 100:>8.2f}% "
+            f"{delta:>+8.2f}pp {result.evictions:>10}"
+        )
+    return "\n".join(lines)
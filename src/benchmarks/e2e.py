@@ -0,0 +1,440 @@
+"""
+End-to-end in-process benchmark for LLM Proxy API
+
+Starts the real application (``main.app``, with its lifespan) against a local
+``MockUpstream`` and drives it in-process through ``httpx.ASGITransport``, so
+a run measures the whole request path (gateway, validation, routing,
+providers, pooled upstream client) without a network hop to the proxy.
+
+Every scenario is also run directly against the mock upstream with the same
+client; the difference is reported as proxy overhead.
+
+Scenarios:
+
+- chat: non-streaming chat completion
+- streaming: SSE chat completion, with time to first byte
+- embeddings: single-input embeddings
+- fallback: the first provider for the model always fails, the second answers
+
+Results are a JSON document (see ``SuiteResult.to_dict``) meant to be stored
+and compared between releases. It includes the event-loop lag seen during the
+run and, with ``blocking_io_detection`` on, the blocking calls the proxy made
+on the event loop (the mock upstream shares the loop).
+
+Run in a fresh process: the application reads its configuration when it is
+first imported.
+"""
+
+import asyncio
+import itertools
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+from src.benchmarks.mock_upstream import (LatencyDistribution, MockUpstream,
+                                          UpstreamProfile)
+from src.core.logging import ContextualLogger
+from src.core.profiler import loop_monitor
+
+logger = ContextualLogger(__name__)
+
+BENCH_API_KEY = "benchmark-key"
+BENCH_PROVIDER_KEY_ENV = "BENCH_UPSTREAM_API_KEY"
+SCENARIOS = ("chat", "streaming", "embeddings", "fallback")
+RESULT_SCHEMA_VERSION = 1
+
+
+@dataclass
+class BenchmarkSettings:
+    """Load shape and upstream behaviour of one suite run"""
+    requests: int = 500
+    concurrency: int = 16
+    warmup: int = 20
+    scenarios: Tuple[str, ...] = SCENARIOS
+    upstream: UpstreamProfile = field(default_factory=lambda: UpstreamProfile(latency=LatencyDistribution("constant", 5.0)))
+    failing_status: int = 503
+    seed: int = 0
+    base_config: Path = Path("config.yaml")
+    blocking_io_detection: str = "off"
+
+    def __post_init__(self):
+        unknown = set(self.scenarios) - set(SCENARIOS)
+        if unknown:
+            raise ValueError(f"Unknown scenarios: {sorted(unknown)}, expected {SCENARIOS}")
+        if self.requests < 1 or self.concurrency < 1:
+            raise ValueError("requests and concurrency must be positive")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "concurrency": self.concurrency,
+            "warmup": self.warmup,
+            "scenarios": list(self.scenarios),
+            "upstream": self.upstream.to_dict(),
+            "failing_status": self.failing_status,
+            "seed": self.seed,
+            "blocking_io_detection": self.blocking_io_detection,
+        }
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Linear-interpolated percentile (q in 0..100) of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(latencies_ms: List[float]) -> Dict[str, float]:
+    values = sorted(latencies_ms)
+    if not values:
+        return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "mean": 0.0, "min": 0.0, "max": 0.0}
+    return {
+        "p50": round(percentile(values, 50), 3),
+        "p90": round(percentile(values, 90), 3),
+        "p99": round(percentile(values, 99), 3),
+        "mean": round(statistics.fmean(values), 3),
+        "min": round(values[0], 3),
+        "max": round(values[-1], 3),
+    }
+
+
+@dataclass
+class LoadResult:
+    """Raw samples of one load run"""
+    latencies_ms: List[float] = field(default_factory=list)
+    ttfb_ms: List[float] = field(default_factory=list)
+    statuses: Dict[int, int] = field(default_factory=dict)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def completed(self) -> int:
+        return len(self.latencies_ms)
+
+    @property
+    def rps(self) -> float:
+        return self.completed / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    requests: int
+    errors: int
+    rps: float
+    latency_ms: Dict[str, float]
+    direct_latency_ms: Dict[str, float]
+    overhead_ms: Dict[str, float]
+    statuses: Dict[str, int]
+    ttfb_ms: Optional[Dict[str, float]] = None
+    upstream_calls: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        if self.ttfb_ms is None:
+            result.pop("ttfb_ms")
+        return result
+
+
+@dataclass
+class SuiteResult:
+    settings: Dict[str, Any]
+    scenarios: List[ScenarioResult]
+    started_at: float
+    duration: float
+    environment: Dict[str, Any]
+    event_loop: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "schema_version": RESULT_SCHEMA_VERSION,
+            "suite": "e2e",
+            "started_at": self.started_at,
+            "duration": round(self.duration, 3),
+            "environment": self.environment,
+            "settings": self.settings,
+            "scenarios": {scenario.name: scenario.to_dict() for scenario in self.scenarios},
+            "event_loop": self.event_loop,
+        }
+
+
+def environment_info() -> Dict[str, Any]:
+    """Where a result came from, so runs on different machines are not compared blindly"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def build_proxy_config(base: Dict[str, Any], upstream: MockUpstream,
+                       blocking_io_detection: str = "off") -> Dict[str, Any]:
+    """
+    The repository config with its providers replaced by mock upstream profiles.
+
+    Optional subsystems and rate limits are turned off so they do not dominate
+    the numbers; everything on the request path stays as configured.
+    """
+    config = dict(base)
+
+    def provider(name: str, profile: str, models: List[str], priority: int) -> Dict[str, Any]:
+        return {
+            "name": name,
+            "type": "openai",
+            "api_key_env": BENCH_PROVIDER_KEY_ENV,
+            "base_url": upstream.url(profile),
+            "models": models,
+            "enabled": True,
+            "forced": False,
+            "priority": priority,
+            "timeout": 30,
+            "max_retries": 0,
+            "max_connections": 200,
+            "max_keepalive_connections": 100,
+            "keepalive_expiry": 30.0,
+            "retry_delay": 0.1,
+        }
+
+    config["providers"] = [
+        provider("bench_primary", "ok", ["bench-chat", "bench-embed"], 1),
+        provider("bench_failing", "failing", ["bench-fallback"], 1),
+        provider("bench_backup", "ok", ["bench-fallback"], 2),
+    ]
+    config["auth"] = {**(base.get("auth") or {}), "api_keys": [BENCH_API_KEY]}
+    config["api_keys"] = [BENCH_API_KEY]
+    config["rate_limit_rpm"] = 1_000_000_000
+    config["rate_limit"] = {**(base.get("rate_limit") or {}),
+                            "requests_per_window": 1_000_000_000, "routes": {}}
+    for section in ("telemetry", "chaos_engineering", "memory", "alerting", "web_ui"):
+        config[section] = {**(base.get(section) or {}), "enabled": False}
+    config["workers"] = {**(base.get("workers") or {}), "count": 1}
+    config["profiling"] = {**(base.get("profiling") or {}), "enabled": True,
+                           "blocking_io_detection": blocking_io_detection}
+    return config
+
+
+class ProxyHarness:
+    """The application with its lifespan running, plus an in-process client"""
+
+    def __init__(self, config_path: Path):
+        self.config_path = config_path
+        self.app = None
+        self.client = None
+        self._lifespan = None
+
+    async def __aenter__(self) -> "ProxyHarness":
+        import httpx
+
+        os.environ["PROXY_API_CONFIG_FILE"] = str(self.config_path)
+        os.environ["PROXY_API_PROXY_API_KEYS"] = BENCH_API_KEY
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+        from src.core import optimized_config, unified_config
+        # Already bound if the modules were imported before the environment was set
+        optimized_config.config_loader.config_path = self.config_path
+        optimized_config.config_loader.cache.clear()
+        unified_config.config_manager.config_path = self.config_path
+
+        import main
+        self.app = main.app
+        self._lifespan = self.app.router.lifespan_context(self.app)
+        await self._lifespan.__aenter__()
+        # The loop monitor is an optional subsystem; it should see the whole run
+        await self.app.state.startup.wait_optional()
+        self.client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=self.app),
+            base_url="http://proxy",
+            headers={"Authorization": f"Bearer {BENCH_API_KEY}"},
+            timeout=60.0,
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+        if self._lifespan is not None:
+            await self._lifespan.__aexit__(exc_type, exc_val, exc_tb)
+
+
+Sender = Callable[[int], Awaitable[Tuple[int, Optional[float]]]]
+
+
+async def run_load(send: Sender, total: int, concurrency: int, start_index: int = 0) -> LoadResult:
+    """Issue ``total`` requests from ``concurrency`` workers and record each latency"""
+    result = LoadResult()
+    counter = itertools.count(start_index)
+    end_index = start_index + total
+
+    async def worker() -> None:
+        while True:
+            index = next(counter)
+            if index >= end_index:
+                return
+            started = time.perf_counter()
+            try:
+                status, ttfb = await send(index)
+            except Exception as e:
+                logger.debug(f"Benchmark request failed: {e}")
+                result.errors += 1
+                continue
+            result.latencies_ms.append((time.perf_counter() - started) * 1000.0)
+            if ttfb is not None:
+                result.ttfb_ms.append((ttfb - started) * 1000.0)
+            result.statuses[status] = result.statuses.get(status, 0) + 1
+            if status >= 400:
+                result.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, total))))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def make_sender(client, path: str, body: Callable[[int], Dict[str, Any]], stream: bool) -> Sender:
+    """Request function for one scenario; streaming bodies are read to the end"""
+    if not stream:
+        async def send(index: int) -> Tuple[int, Optional[float]]:
+            response = await client.post(path, json=body(index))
+            return response.status_code, None
+        return send
+
+    async def send_stream(index: int) -> Tuple[int, Optional[float]]:
+        first = None
+        async with client.stream("POST", path, json=body(index)) as response:
+            async for _ in response.aiter_bytes():
+                if first is None:
+                    first = time.perf_counter()
+            return response.status_code, first
+    return send_stream
+
+
+def scenario_request(name: str) -> Tuple[str, Callable[[int], Dict[str, Any]], bool]:
+    """(path, body factory, streaming) of a scenario; bodies vary so caches do not answer"""
+    if name == "embeddings":
+        return "/embeddings", lambda i: {"model": "bench-embed", "input": [f"benchmark input {i}"]}, False
+    model = "bench-fallback" if name == "fallback" else "bench-chat"
+    stream = name == "streaming"
+
+    def body(i: int) -> Dict[str, Any]:
+        payload = {"model": model, "messages": [{"role": "user", "content": f"benchmark request {i}"}]}
+        if stream:
+            payload["stream"] = True
+        return payload
+    return "/chat/completions", body, stream
+
+
+async def run_scenario(name: str, settings: BenchmarkSettings, harness: ProxyHarness,
+                       direct_client, upstream: MockUpstream) -> ScenarioResult:
+    path, body, stream = scenario_request(name)
+
+    direct = make_sender(direct_client, upstream.url("ok") + path, body, stream)
+    proxied = make_sender(harness.client, "/v1" + path, body, stream)
+
+    # Warm both paths (connection pools, caches of compiled templates)
+    await run_load(direct, settings.warmup, settings.concurrency, start_index=10_000_000)
+    await run_load(proxied, settings.warmup, settings.concurrency, start_index=20_000_000)
+
+    direct_result = await run_load(direct, settings.requests, settings.concurrency, start_index=30_000_000)
+    upstream.reset_stats()
+    proxy_result = await run_load(proxied, settings.requests, settings.concurrency)
+
+    latency = summarize(proxy_result.latencies_ms)
+    direct_latency = summarize(direct_result.latencies_ms)
+    return ScenarioResult(
+        name=name,
+        requests=settings.requests,
+        errors=proxy_result.errors,
+        rps=round(proxy_result.rps, 2),
+        latency_ms=latency,
+        direct_latency_ms=direct_latency,
+        overhead_ms={key: round(latency[key] - direct_latency[key], 3) for key in ("p50", "p90", "p99", "mean")},
+        statuses={str(code): count for code, count in sorted(proxy_result.statuses.items())},
+        ttfb_ms=summarize(proxy_result.ttfb_ms) if stream else None,
+        upstream_calls={f"{profile}:{status}": count for (profile, status), count in sorted(upstream.requests.items())},
+    )
+
+
+async def run_suite(settings: BenchmarkSettings) -> SuiteResult:
+    """Run the configured scenarios and return their results"""
+    import httpx
+
+    started_at = time.time()
+    started = time.perf_counter()
+    profiles = {
+        "ok": settings.upstream,
+        "failing": UpstreamProfile(latency=settings.upstream.latency, rate_5xx=1.0,
+                                   status_5xx=settings.failing_status),
+    }
+    with open(settings.base_config, "r", encoding="utf-8") as f:
+        base_config = yaml.safe_load(f) or {}
+
+    results: List[ScenarioResult] = []
+    async with MockUpstream(profiles, seed=settings.seed) as upstream:
+        with tempfile.TemporaryDirectory(prefix="proxy-bench-") as workdir:
+            config_path = Path(workdir) / "config.yaml"
+            with open(config_path, "w", encoding="utf-8") as f:
+                yaml.safe_dump(build_proxy_config(base_config, upstream, settings.blocking_io_detection),
+                               f, sort_keys=False)
+            os.environ[BENCH_PROVIDER_KEY_ENV] = "mock-upstream-key"
+
+            limits = httpx.Limits(max_connections=settings.concurrency * 2,
+                                  max_keepalive_connections=settings.concurrency * 2)
+            async with httpx.AsyncClient(limits=limits, timeout=60.0) as direct_client:
+                async with ProxyHarness(config_path) as harness:
+                    for name in settings.scenarios:
+                        logger.info("Running benchmark scenario", scenario=name)
+                        results.append(await run_scenario(name, settings, harness, direct_client, upstream))
+                    event_loop = {**loop_monitor.get_stats(),
+                                  "blocking_calls": loop_monitor.get_blocking_calls(limit=50)}
+
+    return SuiteResult(
+        settings=settings.to_dict(),
+        scenarios=results,
+        started_at=started_at,
+        duration=time.perf_counter() - started,
+        environment=environment_info(),
+        event_loop=event_loop,
+    )
+
+
+def format_results(result: Dict[str, Any]) -> str:
+    """Human-readable table of a suite result document"""
+    lines = [f"{'scenario':<12} {'rps':>9} {'p50 ms':>9} {'p99 ms':>9} {'ovh p50':>9} {'ovh p99':>9} {'errors':>7}"]
+    for name, scenario in result["scenarios"].items():
+        lines.append(
+            f"{name:<12} {scenario['rps']:>9.1f} {scenario['latency_ms']['p50']:>9.2f} "
+            f"{scenario['latency_ms']['p99']:>9.2f} {scenario['overhead_ms']['p50']:>9.2f} "
+            f"{scenario['overhead_ms']['p99']:>9.2f} {scenario['errors']:>7}"
+        )
+        if "ttfb_ms" in scenario:
+            lines.append(f"{'':<12} ttfb p50 {scenario['ttfb_ms']['p50']:.2f} ms, p99 {scenario['ttfb_ms']['p99']:.2f} ms")
+
+    event_loop = result.get("event_loop") or {}
+    if event_loop.get("lag_ms"):
+        lag = event_loop["lag_ms"]
+        lines.append(f"\nevent loop lag p50 {lag['p50']:.2f} ms, p99 {lag['p99']:.2f} ms, max {lag['max']:.2f} ms; "
+                     f"slow callbacks {event_loop['slow_callbacks']}")
+    blocking = event_loop.get("blocking_io") or {}
+    if blocking.get("mode", "off") != "off":
+        lines.append(f"blocking calls on the event loop: {blocking['blocking_calls']}")
+        for site in blocking["call_sites"]:
+            lines.append(f"  {site['count']:>6}  {site['event']:<20} {site['call_site']}")
+    return "\n".join(lines)
@@ -0,0 +1,322 @@
+"""
+Hot-path micro-benchmarks for LLM Proxy API
+
+Each benchmark times one operation that every proxied request pays for:
+
+- route_request: ``RequestRouter.route_request`` with an in-process provider,
+  so routing, config lookup, deadline, retry budget and circuit breaker are
+  measured without any I/O
+- unified_cache_get: ``UnifiedCache.get`` hits on a warm cache
+- metrics_record_request: ``MetricsCollector.record_request``
+- rate_limiter_is_allowed: ``TokenBucketRateLimiter.is_allowed`` over 100 clients
+- config_load: ``ConfigManager.load_config(force_reload=True)``
+
+Timing follows ``timeit``: the loop count is calibrated until one sample takes
+at least ``min_sample_time``, the garbage collector is paused while a sample
+runs, and every sample is stored as nanoseconds per operation so later runs
+can be compared sample by sample (see ``src.benchmarks.regression``).
+"""
+
+import asyncio
+import gc
+import inspect
+import itertools
+import statistics
+import time
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from src.benchmarks.e2e import environment_info, percentile
+from src.core.logging import ContextualLogger
+
+logger = ContextualLogger(__name__)
+
+MICRO_SUITE = "micro"
+RESULT_SCHEMA_VERSION = 1
+MAX_LOOPS = 1 << 20
+
+
+@dataclass
+class MicroBenchmark:
+    """
+    One timed operation.
+
+    ``setup`` returns the operation to time; an ``async def`` setup returns a
+    coroutine function and the benchmark runs inside an event loop.
+    ``threshold`` overrides the regression gate's default for this benchmark.
+    """
+    name: str
+    setup: Callable[[], Any]
+    description: str = ""
+    threshold: Optional[float] = None
+
+    @property
+    def is_async(self) -> bool:
+        return inspect.iscoroutinefunction(self.setup)
+
+
+@dataclass
+class MicroResult:
+    name: str
+    loops: int
+    samples_ns: List[float]
+    threshold: Optional[float] = None
+
+    @property
+    def median_ns(self) -> float:
+        return statistics.median(self.samples_ns)
+
+    @property
+    def ops_per_sec(self) -> float:
+        return 1e9 / self.median_ns if self.median_ns > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        values = sorted(self.samples_ns)
+        result = {
+            "unit": "ns/op",
+            "loops": self.loops,
+            "median": round(self.median_ns, 2),
+            "mean": round(statistics.fmean(values), 2),
+            "stdev": round(statistics.stdev(values), 2) if len(values) > 1 else 0.0,
+            "p10": round(percentile(values, 10), 2),
+            "p90": round(percentile(values, 90), 2),
+            "ops_per_sec": round(self.ops_per_sec, 1),
+            "samples": [round(value, 2) for value in self.samples_ns],
+        }
+        if self.threshold is not None:
+            result["threshold"] = self.threshold
+        return result
+
+
+@dataclass
+class MicroSuiteResult:
+    settings: Dict[str, Any]
+    results: List[MicroResult]
+    started_at: float
+    duration: float
+    environment: Dict[str, Any] = field(default_factory=environment_info)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "schema_version": RESULT_SCHEMA_VERSION,
+            "suite": MICRO_SUITE,
+            "started_at": self.started_at,
+            "duration": round(self.duration, 3),
+            "environment": self.environment,
+            "settings": self.settings,
+            "benchmarks": {result.name: result.to_dict() for result in self.results},
+        }
+
+
+def time_sync(operation: Callable[[], Any], loops: int) -> float:
+    """Seconds taken by ``loops`` calls, with the collector paused"""
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        for _ in range(loops):
+            operation()
+        return time.perf_counter() - started
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+async def time_async(operation: Callable[[], Any], loops: int) -> float:
+    """Seconds taken by ``loops`` awaited calls, with the collector paused"""
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        for _ in range(loops):
+            await operation()
+        return time.perf_counter() - started
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def next_loops(loops: int, elapsed: float, min_sample_time: float) -> Optional[int]:
+    """Loop count for the next calibration round, or None once a sample is long enough"""
+    if elapsed >= min_sample_time or loops >= MAX_LOOPS:
+        return None
+    return min(loops * 2 if elapsed <= 0 else max(loops * 2, int(loops * min_sample_time / elapsed * 1.2)),
+               MAX_LOOPS)
+
+
+def measure(operation: Callable[[], Any], samples: int, min_sample_time: float) -> MicroResult:
+    """Calibrate and sample a synchronous operation"""
+    loops = 1
+    while True:
+        elapsed = time_sync(operation, loops)
+        following = next_loops(loops, elapsed, min_sample_time)
+        if following is None:
+            break
+        loops = following
+    timings = [time_sync(operation, loops) * 1e9 / loops for _ in range(samples)]
+    return MicroResult(name="", loops=loops, samples_ns=timings)
+
+
+async def measure_async(operation: Callable[[], Any], samples: int, min_sample_time: float) -> MicroResult:
+    """Calibrate and sample a coroutine function"""
+    loops = 1
+    while True:
+        elapsed = await time_async(operation, loops)
+        following = next_loops(loops, elapsed, min_sample_time)
+        if following is None:
+            break
+        loops = following
+    timings = [await time_async(operation, loops) * 1e9 / loops for _ in range(samples)]
+    return MicroResult(name="", loops=loops, samples_ns=timings)
+
+
+def run_benchmark(benchmark: MicroBenchmark, samples: int = 20, min_sample_time: float = 0.02) -> MicroResult:
+    """Set up and time one benchmark"""
+    if benchmark.is_async:
+        async def _run() -> MicroResult:
+            operation = await benchmark.setup()
+            return await measure_async(operation, samples, min_sample_time)
+        result = asyncio.run(_run())
+    else:
+        result = measure(benchmark.setup(), samples, min_sample_time)
+    result.name = benchmark.name
+    result.threshold = benchmark.threshold
+    return result
+
+
+def run_micro_suite(benchmarks: Iterable[MicroBenchmark], samples: int = 20,
+                    min_sample_time: float = 0.02) -> MicroSuiteResult:
+    """Run the given benchmarks in order"""
+    benchmarks = list(benchmarks)
+    started_at = time.time()
+    started = time.perf_counter()
+    results = []
+    for benchmark in benchmarks:
+        logger.info("Running micro-benchmark", benchmark=benchmark.name)
+        results.append(run_benchmark(benchmark, samples, min_sample_time))
+    return MicroSuiteResult(
+        settings={"samples": samples, "min_sample_time": min_sample_time,
+                  "benchmarks": [benchmark.name for benchmark in benchmarks]},
+        results=results,
+        started_at=started_at,
+        duration=time.perf_counter() - started,
+    )
+
+
+# Hot-path benchmarks. Imports are local so the runner can be imported, and
+# a subset selected, without loading the whole application.
+
+async def _setup_route_request():
+    from fastapi import BackgroundTasks
+
+    from src.api.controllers.common import RequestRouter
+    from src.core.unified_config import config_manager
+
+    response = {"id": "bench", "object": "chat.completion",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}}]}
+
+    async def create_completion(request: Dict[str, Any]) -> Dict[str, Any]:
+        return response
+
+    provider = SimpleNamespace(name="micro_bench", create_completion=create_completion)
+
+    async def get_providers_for_model(model: str) -> List[Any]:
+        return [provider]
+
+    app_state = SimpleNamespace(
+        provider_factory=SimpleNamespace(get_providers_for_model=get_providers_for_model),
+        config_manager=config_manager,
+    )
+    app = SimpleNamespace(state=SimpleNamespace(app_state=app_state))
+    router = RequestRouter()
+    request_data = {"model": "bench-model", "messages": [{"role": "user", "content": "hello"}]}
+
+    async def operation():
+        request = SimpleNamespace(app=app, headers={}, state=SimpleNamespace())
+        return await router.route_request(request, request_data, "chat_completion", BackgroundTasks())
+    return operation
+
+
+async def _setup_unified_cache_get():
+    from src.core.unified_cache import UnifiedCache
+
+    cache = UnifiedCache(max_size=2000, enable_disk_cache=False, enable_smart_ttl=True,
+                         enable_predictive_warming=False, enable_consistency_monitoring=False)
+    keys = [f"bench:{i}" for i in range(1000)]
+    for key in keys:
+        await cache.set(key, {"model": "bench", "content": key * 4})
+    next_key = itertools.cycle(keys).__next__
+
+    async def operation():
+        return await cache.get(next_key())
+    return operation
+
+
+def _setup_metrics_record_request():
+    from src.core.metrics import MetricsCollector
+
+    collector = MetricsCollector(enable_persistence=False)
+
+    def operation():
+        collector.record_request("micro_bench", True, 0.05, tokens=42, model_name="bench-model")
+    return operation
+
+
+def _setup_rate_limiter_is_allowed():
+    from src.core.rate_limiter import TokenBucketRateLimiter
+
+    limiter = TokenBucketRateLimiter(requests_per_minute=10 ** 9)
+    next_key = itertools.cycle([f"client-{i}" for i in range(100)]).__next__
+
+    def operation():
+        return limiter.is_allowed(next_key())
+    return operation
+
+
+def _setup_config_load():
+    from src.core.unified_config import ConfigManager
+
+    manager = ConfigManager()
+    manager.load_config()
+
+    def operation():
+        return manager.load_config(force_reload=True)
+    return operation
+
+
+HOT_PATH_BENCHMARKS: Dict[str, MicroBenchmark] = {
+    benchmark.name: benchmark for benchmark in (
+        MicroBenchmark("route_request", _setup_route_request,
+                       "RequestRouter.route_request with an in-process provider"),
+        MicroBenchmark("unified_cache_get", _setup_unified_cache_get, "UnifiedCache.get on a warm cache"),
+        MicroBenchmark("metrics_record_request", _setup_metrics_record_request,
+                       "MetricsCollector.record_request"),
+        MicroBenchmark("rate_limiter_is_allowed", _setup_rate_limiter_is_allowed,
+                       "TokenBucketRateLimiter.is_allowed over 100 clients"),
+        # File I/O and validation make reloads noisier than the in-memory paths
+        MicroBenchmark("config_load", _setup_config_load, "ConfigManager.load_config(force_reload=True)",
+                       threshold=0.25),
+    )
+}
+
+
+def select_benchmarks(names: Optional[Iterable[str]] = None) -> List[MicroBenchmark]:
+    """Registered benchmarks by name (all of them when no names are given)"""
+    if not names:
+        return list(HOT_PATH_BENCHMARKS.values())
+    selected = []
+    for name in names:
+        if name not in HOT_PATH_BENCHMARKS:
+            raise ValueError(f"Unknown benchmark '{name}', expected one of {sorted(HOT_PATH_BENCHMARKS)}")
+        selected.append(HOT_PATH_BENCHMARKS[name])
+    return selected
+
+
+def format_micro_results(result: Dict[str, Any]) -> str:
+    """Human-readable table of a micro suite result document"""
+    lines = [f"{'benchmark':<26} {'median ns':>12} {'p10 ns':>12} {'p90 ns':>12} {'ops/s':>12}"]
+    for name, bench in result["benchmarks"].items():
+        lines.append(f"{name:<26} {bench['median']:>12.1f} {bench['p10']:>12.1f} "
+                     f"{bench['p90']:>12.1f} {bench['ops_per_sec']:>12.0f}")
+    return "\n".join(lines)
@@ -0,0 +1,363 @@
+"""
+Local mock LLM upstream for benchmarks
+
+A small HTTP/1.1 server (asyncio, standard library only) that speaks enough of
+the OpenAI API for the proxy's providers: chat and text completions (plain and
+SSE streaming), embeddings (float or base64) and the model list.
+
+Behaviour is selected per *profile*, the first path segment, so one server can
+play several upstreams at once::
+
+    http://127.0.0.1:<port>/<profile>/v1/chat/completions
+
+Each profile has a latency distribution, a streaming token rate, 429 and 5xx
+injection rates and an optional context window that triggers the upstream's
+``context_length_exceeded`` error.
+"""
+
+import asyncio
+import base64
+import random
+import struct
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import orjson
+
+    def _dumps(value: Any) -> bytes:
+        return orjson.dumps(value)
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is a hard dependency
+    import json
+
+    def _dumps(value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode()
+
+    _loads = json.loads
+
+from src.core.logging import ContextualLogger
+
+logger = ContextualLogger(__name__)
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 429: "Too Many Requests",
+           500: "Internal Server Error", 502: "Bad Gateway", 503: "Service Unavailable"}
+
+
+@dataclass(frozen=True)
+class LatencyDistribution:
+    """
+    Upstream latency in milliseconds.
+
+    ``kind`` is one of constant (a), uniform (a..b), normal (mean a, stddev b),
+    lognormal (median a, sigma b) or exponential (mean a).
+    """
+    kind: str = "constant"
+    a: float = 0.0
+    b: float = 0.0
+
+    KINDS = ("constant", "uniform", "normal", "lognormal", "exponential")
+
+    def __post_init__(self):
+        if self.kind not in self.KINDS:
+            raise ValueError(f"Unknown latency distribution '{self.kind}', expected one of {self.KINDS}")
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        """Parse ``kind:a[:b]``, e.g. ``lognormal:40:0.5``; a bare number is constant"""
+        parts = spec.split(":")
+        if len(parts) == 1:
+            return cls("constant", float(parts[0]))
+        params = [float(p) for p in parts[1:]] + [0.0]
+        return cls(parts[0], params[0], params[1])
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "constant":
+            value = self.a
+        elif self.kind == "uniform":
+            value = rng.uniform(self.a, self.b)
+        elif self.kind == "normal":
+            value = rng.gauss(self.a, self.b)
+        elif self.kind == "lognormal":
+            value = self.a * rng.lognormvariate(0.0, self.b)
+        else:
+            value = rng.expovariate(1.0 / self.a) if self.a > 0 else 0.0
+        return max(0.0, value)
+
+    def __str__(self) -> str:
+        return f"{self.kind}:{self.a:g}:{self.b:g}"
+
+
+@dataclass
+class UpstreamProfile:
+    """How one simulated upstream behaves"""
+    latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    stream_tokens: int = 20
+    tokens_per_second: float = 0.0  # 0 streams as fast as possible
+    rate_429: float = 0.0
+    rate_5xx: float = 0.0
+    status_5xx: int = 503
+    retry_after: Optional[float] = None
+    max_context_tokens: int = 0  # 0 disables the context window check
+    embedding_dimensions: int = 256
+    completion_text: str = "benchmark"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "latency": str(self.latency),
+            "stream_tokens": self.stream_tokens,
+            "tokens_per_second": self.tokens_per_second,
+            "rate_429": self.rate_429,
+            "rate_5xx": self.rate_5xx,
+            "status_5xx": self.status_5xx,
+            "max_context_tokens": self.max_context_tokens,
+            "embedding_dimensions": self.embedding_dimensions,
+        }
+
+
+def estimate_tokens(payload: Dict[str, Any]) -> int:
+    """Rough prompt size (4 characters per token), like the proxy's own estimate"""
+    chars = 0
+    for message in payload.get("messages") or ():
+        content = message.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+    prompt = payload.get("prompt")
+    if isinstance(prompt, str):
+        chars += len(prompt)
+    return chars // 4
+
+
+class MockUpstream:
+    """Asyncio HTTP server simulating OpenAI-compatible upstreams"""
+
+    def __init__(self,
+                 profiles: Optional[Dict[str, UpstreamProfile]] = None,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 seed: Optional[int] = None):
+        self.profiles: Dict[str, UpstreamProfile] = dict(profiles or {})
+        self.profiles.setdefault("default", UpstreamProfile())
+        self.host = host
+        self.port = port
+        self._rng = random.Random(seed)
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._ids = 0
+        self.requests: Counter = Counter()  # (profile, status) -> count
+
+    async def start(self) -> "MockUpstream":
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("Mock upstream listening", host=self.host, port=self.port, profiles=list(self.profiles))
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "MockUpstream":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
+
+    def url(self, profile: str = "default") -> str:
+        """Base URL (ending in /v1) of one profile"""
+        return f"http://{self.host}:{self.port}/{profile}/v1"
+
+    def request_count(self, profile: Optional[str] = None, status: Optional[int] = None) -> int:
+        return sum(count for (name, code), count in self.requests.items()
+                   if (profile is None or name == profile) and (status is None or code == status))
+
+    def reset_stats(self) -> None:
+        self.requests.clear()
+
+    # HTTP handling
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._dispatch(method, path, body, writer)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, _ = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0) or 0)
+        body = await reader.readexactly(length) if length else b""
+        return method, target.split("?", 1)[0], headers, body
+
+    async def _send(self, writer: asyncio.StreamWriter, status: int, body: bytes,
+                    extra_headers: Optional[Dict[str, str]] = None) -> None:
+        head = [f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}",
+                "content-type: application/json",
+                f"content-length: {len(body)}"]
+        for name, value in (extra_headers or {}).items():
+            head.append(f"{name}: {value}")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def _send_error(self, writer: asyncio.StreamWriter, status: int, message: str,
+                          error_type: str, code: Optional[str] = None,
+                          extra_headers: Optional[Dict[str, str]] = None) -> None:
+        body = _dumps({"error": {"message": message, "type": error_type, "param": None, "code": code}})
+        await self._send(writer, status, body, extra_headers)
+
+    async def _dispatch(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        segments = path.strip("/").split("/")
+        profile_name = segments[0] if segments and segments[0] in self.profiles else "default"
+        if segments and segments[0] == profile_name:
+            segments = segments[1:]
+        if segments and segments[0] == "v1":
+            segments = segments[1:]
+        endpoint = "/".join(segments)
+        profile = self.profiles[profile_name]
+
+        status = await self._respond(profile, method, endpoint, body, writer)
+        self.requests[(profile_name, status)] += 1
+
+    async def _respond(self, profile: UpstreamProfile, method: str, endpoint: str,
+                       body: bytes, writer: asyncio.StreamWriter) -> int:
+        if method == "GET" and endpoint == "models":
+            await self._send(writer, 200, _dumps({"object": "list", "data": [
+                {"id": "mock-model", "object": "model", "created": 0, "owned_by": "mock"}]}))
+            return 200
+        if method != "POST" or endpoint not in ("chat/completions", "completions", "embeddings"):
+            await self._send_error(writer, 404, f"Unknown endpoint {method} /{endpoint}", "invalid_request_error")
+            return 404
+
+        try:
+            payload = _loads(body) if body else {}
+        except ValueError:
+            await self._send_error(writer, 400, "Invalid JSON body", "invalid_request_error")
+            return 400
+
+        delay = profile.latency.sample(self._rng)
+        if delay:
+            await asyncio.sleep(delay / 1000.0)
+
+        roll = self._rng.random()
+        if roll < profile.rate_429:
+            headers = {"retry-after": f"{profile.retry_after:g}"} if profile.retry_after is not None else None
+            await self._send_error(writer, 429, "Rate limit reached", "rate_limit_error", "rate_limit_exceeded", headers)
+            return 429
+        if roll < profile.rate_429 + profile.rate_5xx:
+            await self._send_error(writer, profile.status_5xx, "Upstream failure", "server_error")
+            return profile.status_5xx
+
+        if profile.max_context_tokens and estimate_tokens(payload) > profile.max_context_tokens:
+            await self._send_error(
+                writer, 400,
+                f"This model's maximum context length is {profile.max_context_tokens} tokens. "
+                f"However, your messages resulted in {estimate_tokens(payload)} tokens.",
+                "invalid_request_error", "context_length_exceeded")
+            return 400
+
+        if endpoint == "embeddings":
+            await self._send(writer, 200, self._embeddings(profile, payload))
+        elif payload.get("stream"):
+            await self._stream(writer, profile, payload, chat=endpoint == "chat/completions")
+        else:
+            await self._send(writer, 200, self._completion(profile, payload, chat=endpoint == "chat/completions"))
+        return 200
+
+    # Response bodies
+
+    def _next_id(self) -> str:
+        self._ids += 1
+        return f"mock-{self._ids}"
+
+    def _completion(self, profile: UpstreamProfile, payload: Dict[str, Any], chat: bool) -> bytes:
+        text = profile.completion_text
+        choice = ({"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}
+                  if chat else {"index": 0, "text": text, "finish_reason": "stop"})
+        prompt_tokens = estimate_tokens(payload)
+        return _dumps({
+            "id": self._next_id(),
+            "object": "chat.completion" if chat else "text_completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "mock-model"),
+            "choices": [choice],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": 1,
+                      "total_tokens": prompt_tokens + 1},
+        })
+
+    def _embeddings(self, profile: UpstreamProfile, payload: Dict[str, Any]) -> bytes:
+        inputs = payload.get("input")
+        if not isinstance(inputs, list):
+            inputs = [inputs]
+        dims = int(payload.get("dimensions") or profile.embedding_dimensions)
+        as_base64 = payload.get("encoding_format") == "base64"
+        data = []
+        for index, text in enumerate(inputs):
+            seed = zlib.crc32(str(text).encode()) & 0xFFFF
+            vector = [((seed + i) % 97) / 97.0 for i in range(dims)]
+            embedding = (base64.b64encode(struct.pack(f"<{dims}f", *vector)).decode("ascii")
+                         if as_base64 else vector)
+            data.append({"object": "embedding", "index": index, "embedding": embedding})
+        return _dumps({
+            "object": "list",
+            "data": data,
+            "model": payload.get("model", "mock-embedding"),
+            "usage": {"prompt_tokens": len(inputs), "total_tokens": len(inputs)},
+        })
+
+    async def _stream(self, writer: asyncio.StreamWriter, profile: UpstreamProfile,
+                      payload: Dict[str, Any], chat: bool) -> None:
+        writer.write(b"HTTP/1.1 200 OK\r\ncontent-type: text/event-stream\r\n"
+                     b"cache-control: no-cache\r\ntransfer-encoding: chunked\r\n\r\n")
+        interval = 1.0 / profile.tokens_per_second if profile.tokens_per_second > 0 else 0.0
+        completion_id = self._next_id()
+        created = int(time.time())
+        model = payload.get("model", "mock-model")
+
+        for index in range(profile.stream_tokens):
+            last = index == profile.stream_tokens - 1
+            if chat:
+                choice = {"index": 0, "delta": {"content": f"tok{index} "}, "finish_reason": "stop" if last else None}
+            else:
+                choice = {"index": 0, "text": f"tok{index} ", "finish_reason": "stop" if last else None}
+            event = b"data: " + _dumps({
+                "id": completion_id,
+                "object": "chat.completion.chunk" if chat else "text_completion",
+                "created": created,
+                "model": model,
+                "choices": [choice],
+            }) + b"\n\n"
+            writer.write(b"%x\r\n%s\r\n" % (len(event), event))
+            await writer.drain()
+            if interval and not last:
+                await asyncio.sleep(interval)
+
+        done = b"data: [DONE]\n\n"
+        writer.write(b"%x\r\n%s\r\n0\r\n\r\n" % (len(done), done))
+        await writer.drain()
@@ -0,0 +1,304 @@
+"""
+Benchmark result store and regression gate
+
+Result documents from the benchmark suites (``micro`` from
+``src.benchmarks.micro``, ``e2e`` from ``src.benchmarks.e2e``) are recorded
+in a ``ResultStore``:
+
+    <root>/runs/<suite>/<timestamp>-<commit>.json   every recorded run
+    <root>/baselines/<suite>.json                   the run new results are held against
+
+``compare_results`` turns both documents into comparable metrics and gives
+each one a verdict. A metric regresses only when its median moved in the
+wrong direction by more than its threshold *and*, when both runs carry raw
+samples, a Mann-Whitney U test says the shift is not noise. Runs from a
+different interpreter or machine are compared but flagged, since absolute
+timings do not carry over between them.
+"""
+
+import json
+import math
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.core.logging import ContextualLogger
+
+logger = ContextualLogger(__name__)
+
+DEFAULT_STORE = Path(".benchmarks")
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_ALPHA = 0.01
+# Fewer samples than this per side make the rank test meaningless
+MIN_SAMPLES = 5
+ENVIRONMENT_KEYS = ("python", "implementation", "platform", "cpu_count")
+
+REGRESSION = "regression"
+IMPROVEMENT = "improvement"
+UNCHANGED = "unchanged"
+NOISE = "noise"
+NEW = "new"
+MISSING = "missing"
+
+
+@dataclass
+class Metric:
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool = False
+    samples: Optional[List[float]] = None
+    threshold: Optional[float] = None
+
+
+@dataclass
+class MetricComparison:
+    name: str
+    unit: str
+    verdict: str
+    baseline: Optional[float] = None
+    current: Optional[float] = None
+    change: Optional[float] = None
+    threshold: Optional[float] = None
+    p_value: Optional[float] = None
+
+
+@dataclass
+class RegressionReport:
+    suite: str
+    comparisons: List[MetricComparison]
+    baseline_commit: Optional[str] = None
+    current_commit: Optional[str] = None
+    environment_mismatch: List[str] = field(default_factory=list)
+
+    @property
+    def regressions(self) -> List[MetricComparison]:
+        return [c for c in self.comparisons if c.verdict == REGRESSION]
+
+    @property
+    def passed(self) -> bool:
+        return not self.regressions
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "suite": self.suite,
+            "passed": self.passed,
+            "baseline_commit": self.baseline_commit,
+            "current_commit": self.current_commit,
+            "environment_mismatch": self.environment_mismatch,
+            "comparisons": [asdict(c) for c in self.comparisons],
+        }
+
+
+def mann_whitney_p(a: Sequence[float], b: Sequence[float]) -> float:
+    """Two-sided p-value of the Mann-Whitney U test (normal approximation, tie-corrected)"""
+    n1, n2 = len(a), len(b)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+    combined = sorted([(value, 0) for value in a] + [(value, 1) for value in b])
+    n = n1 + n2
+
+    rank_sum_a = 0.0
+    tie_term = 0.0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        ties = j - i + 1
+        average_rank = (i + j) / 2.0 + 1.0
+        rank_sum_a += average_rank * sum(1 for k in range(i, j + 1) if combined[k][1] == 0)
+        tie_term += ties ** 3 - ties
+        i = j + 1
+
+    u = rank_sum_a - n1 * (n1 + 1) / 2.0
+    mean_u = n1 * n2 / 2.0
+    variance = n1 * n2 / 12.0 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0 if u == mean_u else 0.0
+    # Continuity correction
+    z = (abs(u - mean_u) - 0.5) / math.sqrt(variance)
+    return min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2.0)))
+
+
+def extract_metrics(result: Dict[str, Any]) -> Dict[str, Metric]:
+    """Comparable metrics of a result document"""
+    suite = result.get("suite")
+    metrics: Dict[str, Metric] = {}
+    if suite == "micro":
+        for name, bench in result.get("benchmarks", {}).items():
+            metrics[name] = Metric(name, bench["median"], bench.get("unit", "ns/op"),
+                                   samples=bench.get("samples"), threshold=bench.get("threshold"))
+    elif suite == "e2e":
+        for name, scenario in result.get("scenarios", {}).items():
+            metrics[f"{name}.rps"] = Metric(f"{name}.rps", scenario["rps"], "req/s", higher_is_better=True)
+            for key in ("p50", "p99"):
+                metrics[f"{name}.{key}"] = Metric(f"{name}.{key}", scenario["latency_ms"][key], "ms")
+    else:
+        raise ValueError(f"Unknown benchmark suite '{suite}'")
+    return metrics
+
+
+def compare_metric(baseline: Metric, current: Metric, threshold: float, alpha: float) -> MetricComparison:
+    """Verdict for one metric present in both runs"""
+    comparison = MetricComparison(name=current.name, unit=current.unit, verdict=UNCHANGED,
+                                  baseline=baseline.value, current=current.value, threshold=threshold)
+    if baseline.value == 0:
+        return comparison
+
+    change = (current.value - baseline.value) / abs(baseline.value)
+    comparison.change = round(change, 4)
+    if abs(change) <= threshold:
+        return comparison
+
+    if (baseline.samples and current.samples
+            and len(baseline.samples) >= MIN_SAMPLES and len(current.samples) >= MIN_SAMPLES):
+        comparison.p_value = round(mann_whitney_p(baseline.samples, current.samples), 6)
+        if comparison.p_value >= alpha:
+            comparison.verdict = NOISE
+            return comparison
+
+    worse = change < 0 if current.higher_is_better else change > 0
+    comparison.verdict = REGRESSION if worse else IMPROVEMENT
+    return comparison
+
+
+def compare_results(baseline: Dict[str, Any],
+                    current: Dict[str, Any],
+                    threshold: float = DEFAULT_THRESHOLD,
+                    alpha: float = DEFAULT_ALPHA,
+                    thresholds: Optional[Dict[str, float]] = None) -> RegressionReport:
+    """
+    Compare two result documents of the same suite.
+
+    The threshold of a metric is, in order: ``thresholds[name]``, the
+    threshold stored with the current result, then ``threshold``.
+    """
+    if baseline.get("suite") != current.get("suite"):
+        raise ValueError(f"Cannot compare suite '{current.get('suite')}' against '{baseline.get('suite')}'")
+    thresholds = thresholds or {}
+    baseline_metrics = extract_metrics(baseline)
+    current_metrics = extract_metrics(current)
+
+    comparisons = []
+    for name, metric in current_metrics.items():
+        limit = thresholds.get(name, metric.threshold if metric.threshold is not None else threshold)
+        if name not in baseline_metrics:
+            comparisons.append(MetricComparison(name=name, unit=metric.unit, verdict=NEW,
+                                                current=metric.value, threshold=limit))
+            continue
+        comparisons.append(compare_metric(baseline_metrics[name], metric, limit, alpha))
+    for name, metric in baseline_metrics.items():
+        if name not in current_metrics:
+            comparisons.append(MetricComparison(name=name, unit=metric.unit, verdict=MISSING,
+                                                baseline=metric.value))
+
+    baseline_env = baseline.get("environment", {})
+    current_env = current.get("environment", {})
+    mismatch = [key for key in ENVIRONMENT_KEYS if baseline_env.get(key) != current_env.get(key)]
+    if mismatch:
+        logger.warning("Benchmark baseline was recorded in a different environment", keys=mismatch)
+
+    return RegressionReport(
+        suite=current["suite"],
+        comparisons=comparisons,
+        baseline_commit=baseline_env.get("git_commit"),
+        current_commit=current_env.get("git_commit"),
+        environment_mismatch=mismatch,
+    )
+
+
+def format_report(report: RegressionReport) -> str:
+    """Human-readable comparison table"""
+    lines = [f"{report.suite}: {report.current_commit or 'current'} vs baseline {report.baseline_commit or '?'}"]
+    if report.environment_mismatch:
+        lines.append(f"warning: baseline environment differs in {', '.join(report.environment_mismatch)}")
+    lines.append(f"{'metric':<28} {'baseline':>12} {'current':>12} {'change':>9} {'limit':>7} {'p':>9}  verdict")
+    for c in report.comparisons:
+        baseline = f"{c.baseline:.2f}" if c.baseline is not None else "-"
+        current = f"{c.current:.2f}" if c.current is not None else "-"
+        change = f"{c.change:+.1%}" if c.change is not None else "-"
+        limit = f"{c.threshold:.0%}" if c.threshold is not None else "-"
+        p_value = f"{c.p_value:.4f}" if c.p_value is not None else "-"
+        lines.append(f"{c.name:<28} {baseline:>12} {current:>12} {change:>9} {limit:>7} {p_value:>9}  {c.verdict}")
+    lines.append("PASSED" if report.passed else
+                 f"FAILED: {len(report.regressions)} regression(s): {', '.join(c.name for c in report.regressions)}")
+    return "\n".join(lines)
+
+
+class ResultStore:
+    """Recorded runs and the current baseline per suite, as JSON files"""
+
+    def __init__(self, root: Path = DEFAULT_STORE):
+        self.root = Path(root)
+
+    def _runs_dir(self, suite: str) -> Path:
+        return self.root / "runs" / suite
+
+    def baseline_path(self, suite: str) -> Path:
+        return self.root / "baselines" / f"{suite}.json"
+
+    @staticmethod
+    def load(path: Path) -> Dict[str, Any]:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write(path: Path, result: Dict[str, Any]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(result, indent=2), encoding="utf-8")
+        tmp.replace(path)
+
+    def record(self, result: Dict[str, Any]) -> Path:
+        """Store a run and return its path"""
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(result.get("started_at", time.time())))
+        commit = result.get("environment", {}).get("git_commit") or "nocommit"
+        path = self._runs_dir(result["suite"]) / f"{stamp}-{commit}.json"
+        counter = 1
+        while path.exists():
+            # Keeps runs recorded within the same second in name order
+            path = self._runs_dir(result["suite"]) / f"{stamp}.{counter:03d}-{commit}.json"
+            counter += 1
+        self._write(path, result)
+        logger.info("Benchmark run recorded", suite=result["suite"], path=str(path))
+        return path
+
+    def runs(self, suite: str) -> List[Path]:
+        """Recorded runs of a suite, oldest first"""
+        directory = self._runs_dir(suite)
+        if not directory.exists():
+            return []
+        return sorted(directory.glob("*.json"))
+
+    def latest(self, suite: str) -> Optional[Dict[str, Any]]:
+        runs = self.runs(suite)
+        return self.load(runs[-1]) if runs else None
+
+    def baseline(self, suite: str) -> Optional[Dict[str, Any]]:
+        path = self.baseline_path(suite)
+        return self.load(path) if path.exists() else None
+
+    def set_baseline(self, result: Dict[str, Any]) -> Path:
+        """Make a result the baseline of its suite"""
+        path = self.baseline_path(result["suite"])
+        self._write(path, result)
+        logger.info("Benchmark baseline updated", suite=result["suite"],
+                    commit=result.get("environment", {}).get("git_commit"))
+        return path
+
+    def history(self, suite: str, metric: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Value of one metric over the most recent runs"""
+        points = []
+        for path in self.runs(suite)[-limit:]:
+            result = self.load(path)
+            metrics = extract_metrics(result)
+            if metric in metrics:
+                points.append({
+                    "run": path.stem,
+                    "commit": result.get("environment", {}).get("git_commit"),
+                    "value": metrics[metric].value,
+                })
+        return points
+
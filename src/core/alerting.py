@@ -15,15 +15,15 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Callable
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Callable
 from urllib.parse import urljoin
 
-import aiohttp
-import psutil
-
 from .logging import ContextualLogger
 from .metrics import metrics_collector
 
+if TYPE_CHECKING:
+    import aiohttp
+
 logger = ContextualLogger(__name__)
 
 
@@ -90,10 +90,11 @@ class NotificationManager:
 
     def __init__(self, config: Dict[str, Any]):
         self.config = config
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._session: Optional["aiohttp.ClientSession"] = None
 
-    async def _get_session(self) -> aiohttp.ClientSession:
+    async def _get_session(self) -> "aiohttp.ClientSession":
         if self._session is None or self._session.closed:
+            import aiohttp  # Only needed once a webhook/Slack notification is sent
             self._session = aiohttp.ClientSession()
         return self._session
 
@@ -5,6 +5,7 @@ Provides API key and JWT token-based authentication
 
 import hashlib
 import secrets
+from typing import Optional
 
 from fastapi import Depends, HTTPException, Request
 
@@ -56,6 +57,10 @@ async def verify_api_key(
     api_key_auth: APIKeyAuth = Depends(get_api_key_auth)
 ) -> bool:
     """Verify API key from request headers using the application's auth instance"""
+    # Already checked by the gateway middleware
+    if getattr(request.state, 'authenticated', False) is True:
+        return True
+
     # Check for API key in custom header or Authorization header
     api_key = request.headers.get(config_manager.load_config().settings.api_key_header.lower())
     if not api_key:
@@ -77,5 +82,33 @@ async def verify_api_key(
             detail="Invalid or unauthorized API key"
         )
     
-    logger.info("API key verified successfully", path=request.url.path)
+    logger.debug("API key verified successfully", path=request.url.path)
+    return True
+
+
+ADMIN_KEY_HEADER = "x-admin-key"
+
+
+def get_admin_key_auth(request: Request) -> Optional[APIKeyAuth]:
+    return getattr(request.app.state, 'admin_key_auth', None)
+
+
+async def verify_admin_key(
+    request: Request,
+    admin_key_auth: Optional[APIKeyAuth] = Depends(get_admin_key_auth)
+) -> bool:
+    """Verify the admin key (X-Admin-Key header); admin endpoints are off without admin keys"""
+    if admin_key_auth is None or not admin_key_auth.valid_api_key_hashes:
+        raise HTTPException(
+            status_code=403,
+            detail="Admin endpoints are disabled; configure PROXY_API_ADMIN_API_KEYS"
+        )
+
+    if not admin_key_auth.verify_api_key(request.headers.get(ADMIN_KEY_HEADER)):
+        logger.warning("Invalid or missing admin key", path=request.url.path)
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid or missing admin key"
+        )
+
     return True
@@ -0,0 +1,482 @@
+"""
+Size accounting and eviction order for the in-memory caches
+
+- ``serialize_value`` / ``serialized_size``: entries are sized by the length
+  of their compact JSON form (orjson when available, stdlib otherwise),
+  measured once when the entry is stored instead of walking the value.
+  UnifiedCache writes the same bytes to its disk tier.
+- ``SegmentedLRU``: eviction index with O(1) add/touch/remove/evict and
+  running byte totals, overall and per category. New keys enter a probation
+  segment and a hit there promotes them to the protected segment (80% of
+  the byte budget by default), whose overflow is demoted back to probation.
+  A sweep of one-off keys therefore ages out of probation without touching
+  the keys that were read more than once. The admission filter refuses
+  entries larger than ``max_entry_ratio`` of the budget, so a single huge
+  payload cannot flush the cache.
+- ``WTinyLFU``: the default engine for the caches in ``src/core`` and the
+  condensation cache. New keys land in a small LRU window (1% of the
+  budget); when the window overflows and the cache is full, the window's
+  oldest key only displaces the main segment's victim if a
+  ``FrequencySketch`` (count-min sketch behind a doorkeeper Bloom filter)
+  has seen it more often. A sweep of one-off prompts churns the window
+  instead of evicting the hot set.
+- ``LRUPolicy``: plain LRU, the baseline for hit-rate benchmarks.
+
+``create_policy`` builds one by name (``lru``, ``slru``, ``tinylfu``).
+"""
+
+import dataclasses
+import json
+import sys
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Type
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+DEFAULT_EVICTION_POLICY = "tinylfu"
+
+SKETCH_DEPTH = 4
+SKETCH_MAX_COUNT = 15  # 4-bit counters, one per byte
+_MASK64 = (1 << 64) - 1
+# Odd 64-bit multipliers; each picks an independent slot from the same key hash
+_ROW_SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+_DOORKEEPER_SEEDS = (0xFF51AFD7ED558CCD, 0xC4CEB9FE1A85EC53)
+_HALVE = bytes(i >> 1 for i in range(256))
+
+
+def _default(obj: Any) -> Any:
+    """JSON fallback for types neither encoder knows"""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    if hasattr(obj, "dict"):
+        return obj.dict()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.decode("utf-8", errors="replace")
+    return str(obj)
+
+
+def serialize_value(value: Any) -> bytes:
+    """Compact JSON bytes for a cached value, orjson first, stdlib as fallback"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=_default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # Integers beyond 64 bits and other values orjson refuses
+            pass
+    return json.dumps(value, default=_default, ensure_ascii=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def serialized_size(value: Any) -> int:
+    """Byte length of a value as stored: raw length for bytes, JSON length otherwise"""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    try:
+        return len(serialize_value(value))
+    except (TypeError, ValueError, RecursionError):
+        return sys.getsizeof(value)
+
+
+class FrequencySketch:
+    """
+    Approximate recent access counts in fixed memory.
+
+    The first sighting of a key only sets its doorkeeper bits, so one-off
+    keys never reach the count-min rows. After ``sample_size`` recorded
+    accesses every counter is halved and the doorkeeper cleared, so the
+    estimate follows recent popularity rather than all-time totals.
+    """
+
+    __slots__ = ("width", "sample_size", "max_count", "resets", "_rows", "_row_shift",
+                 "_doorkeeper", "_door_shift", "_additions")
+
+    def __init__(self, expected_entries: int, max_count: int = SKETCH_MAX_COUNT):
+        if not 1 <= max_count <= 255:
+            raise ValueError("max_count must be between 1 and 255")
+        # Four counters per expected entry in each row keeps collisions rare
+        width = 64
+        while width < 4 * expected_entries:
+            width <<= 1
+        self.width = width
+        self.sample_size = 10 * max(expected_entries, 1)
+        # 15 is enough to compare two keys; rankings (top-K) want more headroom
+        self.max_count = max_count
+        self.resets = 0
+        self._rows = [bytearray(width) for _ in range(SKETCH_DEPTH)]
+        self._row_shift = 64 - (width.bit_length() - 1)
+        # 8 doorkeeper bits per counter column
+        self._doorkeeper = bytearray(width)
+        self._door_shift = 64 - ((width * 8).bit_length() - 1)
+        self._additions = 0
+
+    def increment(self, key: Any) -> None:
+        h = hash(key) & _MASK64
+        door = self._doorkeeper
+        seen = True
+        for seed in _DOORKEEPER_SEEDS:
+            bit = ((h * seed) & _MASK64) >> self._door_shift
+            mask = 1 << (bit & 7)
+            if not door[bit >> 3] & mask:
+                door[bit >> 3] |= mask
+                seen = False
+
+        if seen:
+            shift = self._row_shift
+            limit = self.max_count
+            for row, seed in zip(self._rows, _ROW_SEEDS):
+                index = ((h * seed) & _MASK64) >> shift
+                if row[index] < limit:
+                    row[index] += 1
+
+        self._additions += 1
+        if self._additions >= self.sample_size:
+            self._age()
+
+    def estimate(self, key: Any) -> int:
+        h = hash(key) & _MASK64
+        shift = self._row_shift
+        count = min(row[((h * seed) & _MASK64) >> shift] for row, seed in zip(self._rows, _ROW_SEEDS))
+        for seed in _DOORKEEPER_SEEDS:
+            bit = ((h * seed) & _MASK64) >> self._door_shift
+            if not self._doorkeeper[bit >> 3] & (1 << (bit & 7)):
+                return count
+        return count + 1
+
+    def _age(self) -> None:
+        for row in self._rows:
+            row[:] = row.translate(_HALVE)
+        self._doorkeeper = bytearray(self.width)
+        self._additions //= 2
+        self.resets += 1
+
+
+class SegmentedLRU:
+    """
+    Byte-budgeted segmented LRU over cache keys.
+
+    Only tracks keys, sizes and categories; the cache keeps the values,
+    calls ``record_access()`` on misses and ``touch()`` on hits, and asks
+    ``pop_victim()`` for the next key to drop while ``over_budget()``.
+    With ``max_entries`` the budget and the segment shares also apply to
+    the entry count, for caches limited by both.
+    """
+
+    name = "slru"
+
+    def __init__(self, max_bytes: int, protected_ratio: float = 0.8, max_entry_ratio: float = 0.1,
+                 max_entries: Optional[int] = None):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.protected_ratio = protected_ratio
+        self.protected_limit = int(max_bytes * protected_ratio)
+        self.protected_entry_limit = int(max_entries * protected_ratio) if max_entries else None
+        self.max_entry_bytes = max(1, int(max_bytes * max_entry_ratio))
+
+        # key -> (size_bytes, category), least recently used first
+        self._probation: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+        self._protected: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+
+        self.total_bytes = 0
+        self.protected_bytes = 0
+        self.bytes_by_category: Dict[str, int] = {}
+        self.promotions = 0
+        self.demotions = 0
+        self.rejections = 0
+
+    def __len__(self) -> int:
+        return len(self._probation) + len(self._protected)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._probation or key in self._protected
+
+    def record_access(self, key: str) -> None:
+        """Note a lookup of a key that is not cached (used by frequency-aware subclasses)"""
+
+    def admits(self, size: int) -> bool:
+        """Admission filter: entries over ``max_entry_bytes`` are not cached"""
+        if size > self.max_entry_bytes:
+            self.rejections += 1
+            return False
+        return True
+
+    def over_budget(self, additional_bytes: int = 0) -> bool:
+        if self.max_entries is not None and len(self) > self.max_entries:
+            return True
+        return self.total_bytes + additional_bytes > self.max_bytes
+
+    def add(self, key: str, size: int, category: str = "default", protected: bool = False) -> None:
+        """Track a new key, or resize a replaced one in place; ``protected`` skips probation"""
+        protected = protected or key in self._protected
+        self.remove(key)
+        slot = (size, category)
+        self._account(slot)
+        if protected:
+            self._protected[key] = slot
+            self.protected_bytes += size
+            self._demote_overflow()
+        else:
+            self._probation[key] = slot
+
+    def touch(self, key: str) -> None:
+        """Record a hit: promote from probation, or refresh within protected"""
+        slot = self._probation.pop(key, None)
+        if slot is not None:
+            self._protected[key] = slot
+            self.protected_bytes += slot[0]
+            self.promotions += 1
+            self._demote_overflow()
+        elif key in self._protected:
+            self._protected.move_to_end(key)
+
+    def remove(self, key: str) -> int:
+        """Stop tracking ``key``; returns the bytes released (0 if unknown)"""
+        slot = self._probation.pop(key, None)
+        if slot is None:
+            slot = self._protected.pop(key, None)
+            if slot is None:
+                return 0
+            self.protected_bytes -= slot[0]
+        self._release(slot)
+        return slot[0]
+
+    def victim(self) -> Optional[str]:
+        """Next key to evict: probation LRU, then protected LRU"""
+        for segment in (self._probation, self._protected):
+            if segment:
+                return next(iter(segment))
+        return None
+
+    def pop_victim(self) -> Optional[str]:
+        """Remove and return the next key to evict"""
+        if self._probation:
+            key, slot = self._probation.popitem(last=False)
+        elif self._protected:
+            key, slot = self._protected.popitem(last=False)
+            self.protected_bytes -= slot[0]
+        else:
+            return None
+        self._release(slot)
+        return key
+
+    def clear(self) -> None:
+        self._probation.clear()
+        self._protected.clear()
+        self.total_bytes = 0
+        self.protected_bytes = 0
+        self.bytes_by_category.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "policy": self.name,
+            "probation_entries": len(self._probation),
+            "protected_entries": len(self._protected),
+            "protected_bytes": self.protected_bytes,
+            "max_entry_bytes": self.max_entry_bytes,
+            "promotions": self.promotions,
+            "demotions": self.demotions,
+            "admission_rejections": self.rejections,
+        }
+
+    def _demote_overflow(self) -> None:
+        """Move protected LRU keys back to probation (as most recent) until within limit"""
+        while len(self._protected) > 1 and (
+                self.protected_bytes > self.protected_limit or
+                (self.protected_entry_limit is not None and len(self._protected) > self.protected_entry_limit)):
+            key, slot = self._protected.popitem(last=False)
+            self.protected_bytes -= slot[0]
+            self._probation[key] = slot
+            self.demotions += 1
+
+    def _account(self, slot: Tuple[int, str]) -> None:
+        size, category = slot
+        self.total_bytes += size
+        self.bytes_by_category[category] = self.bytes_by_category.get(category, 0) + size
+
+    def _release(self, slot: Tuple[int, str]) -> None:
+        size, category = slot
+        self.total_bytes -= size
+        remaining = self.bytes_by_category.get(category, 0) - size
+        if remaining > 0:
+            self.bytes_by_category[category] = remaining
+        else:
+            self.bytes_by_category.pop(category, None)
+
+
+class LRUPolicy(SegmentedLRU):
+    """Plain byte-budgeted LRU: one segment, no promotion"""
+
+    name = "lru"
+
+    def add(self, key: str, size: int, category: str = "default", protected: bool = False) -> None:
+        super().add(key, size, category, protected=False)
+
+    def touch(self, key: str) -> None:
+        if key in self._probation:
+            self._probation.move_to_end(key)
+
+
+class WTinyLFU(SegmentedLRU):
+    """
+    Window TinyLFU: an LRU admission window in front of the segmented LRU,
+    with a frequency sketch deciding which keys get into the main space.
+    """
+
+    name = "tinylfu"
+
+    def __init__(self, max_bytes: int, protected_ratio: float = 0.8, max_entry_ratio: float = 0.1,
+                 max_entries: Optional[int] = None, window_ratio: float = 0.01,
+                 expected_entries: Optional[int] = None):
+        super().__init__(max_bytes, protected_ratio, max_entry_ratio, max_entries)
+        self.window_limit = max(1, int(max_bytes * window_ratio))
+        self.protected_limit = int((max_bytes - self.window_limit) * protected_ratio)
+        self.window_entry_limit = None
+        if max_entries:
+            self.window_entry_limit = max(1, int(max_entries * window_ratio))
+            self.protected_entry_limit = int((max_entries - self.window_entry_limit) * protected_ratio)
+        self.sketch = FrequencySketch(expected_entries or max_entries or 10000)
+
+        self._window: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+        self.window_bytes = 0
+        self.admitted = 0
+        self.refused = 0
+
+    def __len__(self) -> int:
+        return len(self._window) + super().__len__()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._window or super().__contains__(key)
+
+    def record_access(self, key: str) -> None:
+        self.sketch.increment(key)
+
+    def add(self, key: str, size: int, category: str = "default", protected: bool = False) -> None:
+        """New keys enter the window; ``protected`` ones go straight to the main space"""
+        if protected or key in self._probation or key in self._protected:
+            super().add(key, size, category, protected=True)
+            return
+
+        self.remove(key)
+        slot = (size, category)
+        self._account(slot)
+        self._window[key] = slot
+        self.window_bytes += size
+
+        # While everything fits, window overflow moves to probation for free
+        while len(self._window) > 1 and self._window_overflows() and not self.over_budget():
+            self._admit(next(iter(self._window)))
+
+    def touch(self, key: str) -> None:
+        self.sketch.increment(key)
+        if key in self._window:
+            self._window.move_to_end(key)
+        else:
+            super().touch(key)
+
+    def remove(self, key: str) -> int:
+        slot = self._remove_from_window(key)
+        if slot is not None:
+            self._release(slot)
+            return slot[0]
+        return super().remove(key)
+
+    def victim(self) -> Optional[str]:
+        return self._choose()[0]
+
+    def pop_victim(self) -> Optional[str]:
+        """
+        Evict one key. An overflowing window offers its oldest key as an
+        admission candidate against the main-space victim; the less
+        frequently used of the two is evicted.
+        """
+        key, candidate = self._choose()
+        if key is None:
+            return None
+        if candidate is not None:
+            self._admit(candidate)
+            self.admitted += 1
+        elif key in self._window and super().__len__():
+            self.refused += 1
+        self.remove(key)
+        return key
+
+    def clear(self) -> None:
+        super().clear()
+        self._window.clear()
+        self.window_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats.update({
+            "window_entries": len(self._window),
+            "window_bytes": self.window_bytes,
+            "admitted": self.admitted,
+            "refused": self.refused,
+            "sketch_width": self.sketch.width,
+            "sketch_resets": self.sketch.resets,
+        })
+        return stats
+
+    def _choose(self) -> Tuple[Optional[str], Optional[str]]:
+        """(key to evict, window candidate to move into the main space first)"""
+        main_victim = super().victim()
+        if not self._window:
+            return main_victim, None
+
+        candidate = next(iter(self._window))
+        if main_victim is None:
+            return candidate, None
+        if not self._window_overflows():
+            return main_victim, None
+        if self.sketch.estimate(candidate) > self.sketch.estimate(main_victim):
+            return main_victim, candidate
+        return candidate, None
+
+    def _window_overflows(self) -> bool:
+        if self.window_entry_limit is not None and len(self._window) > self.window_entry_limit:
+            return True
+        return self.window_bytes > self.window_limit
+
+    def _admit(self, key: str) -> None:
+        """Move a window key to the most recent end of probation"""
+        slot = self._window.pop(key)
+        self.window_bytes -= slot[0]
+        self._probation[key] = slot
+
+    def _remove_from_window(self, key: str) -> Optional[Tuple[int, str]]:
+        slot = self._window.pop(key, None)
+        if slot is not None:
+            self.window_bytes -= slot[0]
+        return slot
+
+
+EVICTION_POLICIES: Dict[str, Type[SegmentedLRU]] = {
+    LRUPolicy.name: LRUPolicy,
+    SegmentedLRU.name: SegmentedLRU,
+    WTinyLFU.name: WTinyLFU,
+}
+
+
+def create_policy(name: str, max_bytes: int, max_entries: Optional[int] = None,
+                  expected_entries: Optional[int] = None, **kwargs: Any) -> SegmentedLRU:
+    """
+    Eviction policy by name. ``expected_entries`` (default ``max_entries``)
+    sizes the TinyLFU sketch and is ignored by the other policies.
+    """
+    try:
+        policy_class = EVICTION_POLICIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown eviction policy {name!r}; expected one of {sorted(EVICTION_POLICIES)}")
+    if policy_class is WTinyLFU:
+        kwargs["expected_entries"] = expected_entries
+    return policy_class(max_bytes, max_entries=max_entries, **kwargs)
@@ -0,0 +1,560 @@
+"""
+Storage tiers below the per-worker in-memory cache
+
+``ConsolidatedCacheManager`` keeps hot keys in each worker's ``UnifiedCache``
+(L1) and reads through two slower tiers on a miss:
+
+- ``SharedCacheTier`` (L2, warm): one memory-mapped file per host (under
+  /dev/shm), so every worker sees what any worker cached.  Values live in a
+  circular data log; an open-addressing index maps key digests to their
+  position.  A value is valid while the log has not wrapped over it, so the
+  oldest writes are evicted first without any bookkeeping.
+- ``DiskSegmentStore`` (L3, cold): append-only segment files on disk.  Each
+  process keeps an in-memory index and tails the segments to pick up what
+  other workers wrote; when the store exceeds its budget the oldest segment
+  is deleted.
+
+Both tiers hold values as the compact JSON bytes of ``serialize_value``, so a
+value read back from L2 or L3 has JSON types (lists for tuples, dicts for
+models).  Writers take an exclusive ``flock`` like ``shared_state``.
+
+Layout of the L2 file:
+
+    magic (4s) | version (H) | reserved (H) | slots (I) | capacity (Q) | head (Q) | 4x
+    slot * slots: key (16s) | offset (Q) | length (I) | expires_at (d) | category (I)
+    data log (capacity bytes)
+
+``offset`` and ``head`` are logical positions that only grow; the physical
+position is ``offset % capacity``.  A record is intact while
+``head - offset <= capacity``.
+
+L3 records are ``key_len (H) | category_len (H) | value_len (I) | expires_at (d)``
+followed by the key, category and value bytes; a ``value_len`` of
+``TOMBSTONE`` marks a delete.
+
+This module only depends on the standard library (and orjson when present).
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: the shared tier is not supported
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from src.core.logging import ContextualLogger
+
+logger = ContextualLogger(__name__)
+
+TIER_MAGIC = b"LPCT"
+TIER_VERSION = 1
+HEADER_FORMAT = "<4sHHIQQ4x"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+HEAD_OFFSET = 20  # Position of ``head`` in the header
+SLOT_FORMAT = "<16sQIdI"
+SLOT_SIZE = struct.calcsize(SLOT_FORMAT)
+DEFAULT_SLOTS = 65536
+MAX_PROBE = 16
+# A single value may take at most this share of the data log
+MAX_ENTRY_RATIO = 0.125
+
+SHARED_CACHE_ENV = "PROXY_SHARED_CACHE_PATH"
+
+RECORD_FORMAT = "<HHId"
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+TOMBSTONE = 0xFFFFFFFF
+SEGMENT_SUFFIX = ".seg"
+
+_EMPTY_KEY = bytes(16)
+
+
+class CacheTierError(Exception):
+    """Raised when a cache tier file cannot be used"""
+
+
+def default_shared_cache_path() -> str:
+    """Location of the shared cache file for this host"""
+    shm_dir = "/dev/shm"
+    base_dir = shm_dir if os.path.isdir(shm_dir) else tempfile.gettempdir()
+    return os.path.join(base_dir, f"llm_proxy_cache_{os.getpid()}.bin")
+
+
+def deserialize_value(payload: bytes) -> Any:
+    """Inverse of ``serialize_value``"""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _digest(key: str) -> bytes:
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+
+def _category_id(category: str) -> int:
+    # 0 marks "no category", so a category can never hash to it
+    return zlib.crc32(category.encode("utf-8")) or 1
+
+
+class SharedCacheTier:
+    """Host-wide value store in one mapped file: circular data log plus hashed index"""
+
+    def __init__(self, path: str):
+        if fcntl is None:
+            raise CacheTierError("The shared cache tier requires fcntl (POSIX only)")
+
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR)
+        size = os.fstat(self._fd).st_size
+        if size < HEADER_SIZE:
+            os.close(self._fd)
+            raise CacheTierError(f"Shared cache file {path} is not initialized")
+        self._map = mmap.mmap(self._fd, size)
+
+        magic, version, _, slots, capacity, _ = struct.unpack_from(HEADER_FORMAT, self._map, 0)
+        self._data_start = HEADER_SIZE + slots * SLOT_SIZE
+        if magic != TIER_MAGIC or version != TIER_VERSION or self._data_start + capacity > size:
+            self.close()
+            raise CacheTierError(f"Shared cache file {path} has an invalid layout")
+
+        self.slots = slots
+        self.capacity = capacity
+        self.max_entry_bytes = int(capacity * MAX_ENTRY_RATIO)
+        # flock does not exclude threads sharing this descriptor
+        self._thread_lock = threading.Lock()
+
+    @classmethod
+    def create(cls, path: str, capacity_bytes: int, slots: int = DEFAULT_SLOTS) -> "SharedCacheTier":
+        """Create (or reset) the shared cache file and open it"""
+        if capacity_bytes < 1 or slots < 1:
+            raise ValueError("capacity_bytes and slots must be positive")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            # Sparse on tmpfs: pages are only backed once a value lands in them
+            os.ftruncate(fd, HEADER_SIZE + slots * SLOT_SIZE + capacity_bytes)
+            os.pwrite(fd, struct.pack(HEADER_FORMAT, TIER_MAGIC, TIER_VERSION, 0, slots, capacity_bytes, 0), 0)
+        finally:
+            os.close(fd)
+        return cls(path)
+
+    # Locking and slot lookup
+
+    def _lock(self) -> None:
+        self._thread_lock.acquire()
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+    def _unlock(self) -> None:
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+    def _slot_offset(self, index: int) -> int:
+        return HEADER_SIZE + index * SLOT_SIZE
+
+    def _head(self) -> int:
+        return struct.unpack_from("<Q", self._map, HEAD_OFFSET)[0]
+
+    def _live(self, offset: int, length: int, expires_at: float, head: int, now: float) -> bool:
+        return length > 0 and expires_at > now and head - offset <= self.capacity
+
+    def _probe(self, key: bytes):
+        """(index, slot fields) for each slot of the key's probe run"""
+        start = int.from_bytes(key[:8], "little") % self.slots
+        for probe in range(min(MAX_PROBE, self.slots)):
+            index = (start + probe) % self.slots
+            yield index, struct.unpack_from(SLOT_FORMAT, self._map, self._slot_offset(index))
+
+    def _clear_slot(self, index: int) -> None:
+        struct.pack_into(SLOT_FORMAT, self._map, self._slot_offset(index), _EMPTY_KEY, 0, 0, 0.0, 0)
+
+    # Values
+
+    def get(self, key: str, now: Optional[float] = None) -> Optional[Tuple[bytes, float]]:
+        """(value bytes, expires_at) of a live entry, or None"""
+        now = time.time() if now is None else now
+        digest = _digest(key)
+        self._lock()
+        try:
+            head = self._head()
+            for index, (slot_key, offset, length, expires_at, _) in self._probe(digest):
+                if slot_key != digest:
+                    continue
+                if not self._live(offset, length, expires_at, head, now):
+                    self._clear_slot(index)
+                    return None
+                start = self._data_start + offset % self.capacity
+                return bytes(self._map[start:start + length]), expires_at
+            return None
+        finally:
+            self._unlock()
+
+    def set(self, key: str, payload: bytes, ttl: float, category: str = "default",
+            now: Optional[float] = None) -> bool:
+        """Append a value to the log and index it; False if it is too large for this tier"""
+        length = len(payload)
+        if length == 0 or length > self.max_entry_bytes:
+            return False
+        now = time.time() if now is None else now
+        digest = _digest(key)
+
+        self._lock()
+        try:
+            head = self._head()
+            position = head % self.capacity
+            if position + length > self.capacity:
+                head += self.capacity - position  # Records never straddle the end of the log
+            offset = head
+            start = self._data_start + offset % self.capacity
+            self._map[start:start + length] = payload
+            head += length
+            struct.pack_into("<Q", self._map, HEAD_OFFSET, head)
+
+            # Same key, else a free or dead slot, else the oldest value in the run
+            target, free, oldest, oldest_offset = -1, -1, -1, None
+            for index, (slot_key, slot_offset, slot_length, expires_at, _) in self._probe(digest):
+                if slot_key == digest:
+                    target = index
+                    break
+                if free < 0 and (slot_key == _EMPTY_KEY or
+                                 not self._live(slot_offset, slot_length, expires_at, head, now)):
+                    free = index
+                if oldest_offset is None or slot_offset < oldest_offset:
+                    oldest, oldest_offset = index, slot_offset
+            if target < 0:
+                target = free if free >= 0 else oldest
+
+            struct.pack_into(SLOT_FORMAT, self._map, self._slot_offset(target),
+                             digest, offset, length, now + ttl, _category_id(category))
+            return True
+        finally:
+            self._unlock()
+
+    def delete(self, key: str) -> bool:
+        digest = _digest(key)
+        self._lock()
+        try:
+            for index, (slot_key, *_rest) in self._probe(digest):
+                if slot_key == digest:
+                    self._clear_slot(index)
+                    return True
+            return False
+        finally:
+            self._unlock()
+
+    def clear(self, category: Optional[str] = None) -> int:
+        """Drop every entry (or those of one category); returns how many were indexed"""
+        wanted = _category_id(category) if category else None
+        cleared = 0
+        self._lock()
+        try:
+            for index in range(self.slots):
+                slot_key, _, _, _, slot_category = struct.unpack_from(SLOT_FORMAT, self._map, self._slot_offset(index))
+                if slot_key == _EMPTY_KEY or (wanted is not None and slot_category != wanted):
+                    continue
+                self._clear_slot(index)
+                cleared += 1
+        finally:
+            self._unlock()
+        return cleared
+
+    def get_stats(self) -> Dict[str, int]:
+        """Live entries and the bytes they occupy (walks the index)"""
+        now = time.time()
+        entries = live_bytes = 0
+        self._lock()
+        try:
+            head = self._head()
+            for index in range(self.slots):
+                _, offset, length, expires_at, _ = struct.unpack_from(SLOT_FORMAT, self._map, self._slot_offset(index))
+                if self._live(offset, length, expires_at, head, now):
+                    entries += 1
+                    live_bytes += length
+        finally:
+            self._unlock()
+        return {
+            "entries": entries,
+            "memory_usage": live_bytes,
+            "capacity_bytes": self.capacity,
+            "slots": self.slots,
+            "bytes_written": head,
+        }
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class DiskSegmentStore:
+    """
+    Cold tier: append-only segment files with an in-memory index per process.
+
+    Writes go to the newest segment under an exclusive lock on ``lock`` in
+    the store directory; a new segment is started once the current one
+    reaches ``segment_bytes``, and the oldest segments are deleted while the
+    store is over ``max_bytes``.  Other processes pick up new records by
+    tailing the segments, at most every ``refresh_interval`` seconds.
+    All methods block on file I/O; async callers run them in a thread.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = 1024 * 1024 * 1024,
+                 segment_bytes: int = 64 * 1024 * 1024, refresh_interval: float = 0.1):
+        if fcntl is None:
+            raise CacheTierError("The disk cache tier requires fcntl (POSIX only)")
+        if segment_bytes < 1 or max_bytes < segment_bytes:
+            raise ValueError("max_bytes must be at least segment_bytes")
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self.refresh_interval = refresh_interval
+
+        # key -> (segment, value offset, value length, expires_at, category)
+        self._index: Dict[str, Tuple[int, int, int, float, str]] = {}
+        self._scanned: Dict[int, int] = {}
+        self._readers: Dict[int, int] = {}
+        self._last_refresh = 0.0
+        self._lock = threading.RLock()
+        self._lock_fd = os.open(self.directory / "lock", os.O_RDWR | os.O_CREAT, 0o600)
+        self.refresh(force=True)
+
+    def _segment_path(self, number: int) -> Path:
+        return self.directory / f"{number:08d}{SEGMENT_SUFFIX}"
+
+    def _segments(self) -> Dict[int, int]:
+        """Segment number -> current size, oldest first"""
+        segments = {}
+        for path in self.directory.glob(f"*{SEGMENT_SUFFIX}"):
+            try:
+                segments[int(path.stem)] = path.stat().st_size
+            except (ValueError, OSError):
+                continue
+        return dict(sorted(segments.items()))
+
+    def _reader(self, number: int) -> int:
+        fd = self._readers.get(number)
+        if fd is None:
+            fd = os.open(self._segment_path(number), os.O_RDONLY)
+            self._readers[number] = fd
+        return fd
+
+    def _forget_segment(self, number: int) -> None:
+        fd = self._readers.pop(number, None)
+        if fd is not None:
+            os.close(fd)
+        self._scanned.pop(number, None)
+        for key in [key for key, slot in self._index.items() if slot[0] == number]:
+            del self._index[key]
+
+    def refresh(self, force: bool = False) -> None:
+        """Index the records appended since the last refresh, by any process"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_refresh < self.refresh_interval:
+                return
+            self._last_refresh = now
+
+            segments = self._segments()
+            for number in [number for number in self._scanned if number not in segments]:
+                self._forget_segment(number)
+            for number, size in segments.items():
+                scanned = self._scanned.get(number, 0)
+                if size > scanned:
+                    self._scanned[number] = self._scan(number, scanned, size)
+
+    def _scan(self, number: int, start: int, end: int) -> int:
+        """Index complete records in [start, end); returns where the scan stopped"""
+        try:
+            data = os.pread(self._reader(number), end - start, start)
+        except OSError:
+            return start
+        position = 0
+        while position + RECORD_SIZE <= len(data):
+            key_len, category_len, value_len, expires_at = struct.unpack_from(RECORD_FORMAT, data, position)
+            body = position + RECORD_SIZE
+            stored = 0 if value_len == TOMBSTONE else value_len
+            record_end = body + key_len + category_len + stored
+            if record_end > len(data):
+                break  # Partially written; picked up by the next refresh
+            key = data[body:body + key_len].decode("utf-8")
+            if value_len == TOMBSTONE:
+                self._index.pop(key, None)
+            else:
+                category = data[body + key_len:body + key_len + category_len].decode("utf-8")
+                value_offset = start + body + key_len + category_len
+                self._index[key] = (number, value_offset, value_len, expires_at, category)
+            position = record_end
+        return start + position
+
+    def _append(self, key: str, payload: Optional[bytes], expires_at: float, category: str) -> Optional[Tuple[int, int]]:
+        """Write one record to the newest segment; returns (segment, value offset)"""
+        key_bytes = key.encode("utf-8")
+        category_bytes = category.encode("utf-8")
+        value_len = TOMBSTONE if payload is None else len(payload)
+        record = (struct.pack(RECORD_FORMAT, len(key_bytes), len(category_bytes), value_len, expires_at)
+                  + key_bytes + category_bytes + (payload or b""))
+
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            segments = self._segments()
+            number = next(reversed(segments), 1)
+            if segments.get(number, 0) >= self.segment_bytes:
+                number += 1
+            fd = os.open(self._segment_path(number), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+            try:
+                offset = os.fstat(fd).st_size
+                os.write(fd, record)
+            finally:
+                os.close(fd)
+            segments[number] = offset + len(record)
+            self._drop_oldest(segments)
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+        return number, offset + RECORD_SIZE + len(key_bytes) + len(category_bytes)
+
+    def _drop_oldest(self, segments: Dict[int, int]) -> None:
+        """Delete the oldest segments (never the newest) while over budget; caller holds the file lock"""
+        total = sum(segments.values())
+        numbers = list(segments)
+        for number in numbers[:-1]:
+            if total <= self.max_bytes:
+                break
+            try:
+                self._segment_path(number).unlink()
+            except OSError:
+                pass
+            total -= segments[number]
+            self._forget_segment(number)
+
+    def get(self, key: str, now: Optional[float] = None) -> Optional[Tuple[bytes, float]]:
+        """(value bytes, expires_at) of a live entry, or None"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self.refresh()
+            slot = self._index.get(key)
+            if slot is None:
+                return None
+            number, offset, length, expires_at, _ = slot
+            if expires_at <= now:
+                del self._index[key]
+                return None
+            try:
+                payload = os.pread(self._reader(number), length, offset)
+            except OSError:
+                payload = b""
+            if len(payload) != length:
+                # Segment dropped by another process since the last refresh
+                self._forget_segment(number)
+                return None
+            return payload, expires_at
+
+    def set(self, key: str, payload: bytes, ttl: float, category: str = "default",
+            now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        with self._lock:
+            number, offset = self._append(key, payload, now + ttl, category)
+            self._index[key] = (number, offset, len(payload), now + ttl, category)
+            return True
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            self.refresh(force=True)
+            if key not in self._index:
+                return False
+            self._append(key, None, 0.0, "")
+            self._index.pop(key, None)
+            return True
+
+    def clear(self, category: Optional[str] = None) -> int:
+        """Drop every entry (or those of one category); returns how many were indexed"""
+        with self._lock:
+            self.refresh(force=True)
+            if category:
+                keys = [key for key, slot in self._index.items() if slot[4] == category]
+                for key in keys:
+                    self._append(key, None, 0.0, "")
+                    self._index.pop(key, None)
+                return len(keys)
+
+            cleared = len(self._index)
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                for number in self._segments():
+                    try:
+                        self._segment_path(number).unlink()
+                    except OSError:
+                        pass
+                    self._forget_segment(number)
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+            self._index.clear()
+            return cleared
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            segments = self._segments()
+            return {
+                "entries": len(self._index),
+                "memory_usage": sum(slot[2] for slot in self._index.values()),
+                "disk_usage_bytes": sum(segments.values()),
+                "max_bytes": self.max_bytes,
+                "segments": len(segments),
+                "directory": str(self.directory),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            for fd in self._readers.values():
+                os.close(fd)
+            self._readers.clear()
+            if self._lock_fd is not None:
+                os.close(self._lock_fd)
+                self._lock_fd = None
+
+
+_shared_tier: Optional[SharedCacheTier] = None
+_shared_tier_pid: Optional[int] = None
+
+
+def get_shared_cache_tier() -> Optional[SharedCacheTier]:
+    """
+    The shared (L2) cache tier of this worker, or None when the supervisor did
+    not create one (single-process mode).  Opened lazily after fork, like
+    ``get_shared_state``.
+    """
+    global _shared_tier, _shared_tier_pid
+    if _shared_tier is not None and _shared_tier_pid == os.getpid():
+        return _shared_tier
+
+    path = os.getenv(SHARED_CACHE_ENV)
+    if not path:
+        return None
+    try:
+        _shared_tier = SharedCacheTier(path)
+        _shared_tier_pid = os.getpid()
+    except (OSError, CacheTierError) as e:
+        logger.error(f"Shared cache tier unavailable, using per-worker caches: {e}")
+        os.environ.pop(SHARED_CACHE_ENV, None)
+        _shared_tier = None
+    return _shared_tier
@@ -6,9 +6,11 @@ predictions, and scheduled warming strategies.
 
 Features:
 - Proactive cache population based on usage patterns
+- Fixed-memory access tracking: a decaying count-min sketch estimates how
+  often each key is read, and only the top-K keys keep a pattern record
 - Intelligent warming strategies (time-based, usage-based, predictive)
 - Background warming without performance impact
-- Cost-effective warming with resource management
+- Cost-effective warming with resource management (per-provider rate budgets)
 - Warming effectiveness monitoring and reporting
 - Integration with unified cache system
 """
@@ -23,41 +25,58 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional, Set
 
+from .cache_policy import FrequencySketch
+from .compact import DATACLASS_SLOTS
 from .model_discovery import ModelDiscoveryService, ProviderConfig
+from .shared_state import get_shared_state
 from .unified_cache import UnifiedCache, get_unified_cache
 
 logger = logging.getLogger(__name__)
 
+# Keys the frequency sketch is sized for, and keys that keep a pattern record
+DEFAULT_TRACKED_KEYS = 10000
+DEFAULT_TOP_K = 128
+# Counters saturate here (then halve with the rest of the sketch)
+PATTERN_MAX_COUNT = 255
+# Recent-access thresholds for raising and lowering a pattern's priority
+FREQUENT_ACCESS_COUNT = 10
+RARE_ACCESS_COUNT = 2
+PREDICTIVE_BATCH_SIZE = 10
+
+
+class WarmingBudget:
+    """Local token bucket for one provider's warming requests (single-process mode)"""
+
+    __slots__ = ("capacity", "refill_rate", "tokens", "last_refill")
+
+    def __init__(self, capacity: float, refill_rate: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate  # Tokens per second
+        self.tokens = capacity
+        self.last_refill = time.time()
+
+    def consume(self) -> bool:
+        now = time.time()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+        self.last_refill = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class WarmingPattern:
-    """Cache access pattern data"""
+    """Access pattern of one heavy-hitter key (slotted: one per top-K key)"""
 
     key: str
-    access_count: int = 0
+    access_count: int = 0  # Recent accesses, as estimated by the decaying sketch
     last_accessed: float = 0.0
-    access_times: List[float] = field(default_factory=list)
     category: str = "default"
     priority: int = 1
 
-    def get_access_frequency(self) -> float:
-        """Calculate access frequency (accesses per hour)"""
-        if not self.access_times:
-            return 0.0
-
-        # Use last 24 hours of data
-        cutoff = time.time() - (24 * 3600)
-        recent_accesses = [t for t in self.access_times if t > cutoff]
-
-        if not recent_accesses:
-            return 0.0
-
-        hours_span = (time.time() - min(recent_accesses)) / 3600
-        return len(recent_accesses) / max(hours_span, 1.0)
-
     def get_predictive_score(self) -> float:
         """Calculate predictive warming score"""
-        frequency = self.get_access_frequency()
         recency = time.time() - self.last_accessed
         priority_factor = self.priority / 5.0  # Normalize to 0-1
 
@@ -65,7 +84,7 @@ class WarmingPattern:
         # Higher score = more likely to be needed soon
         recency_factor = max(0, 1 - (recency / (24 * 3600)))  # Decay over 24 hours
 
-        return frequency * recency_factor * priority_factor
+        return self.access_count * recency_factor * priority_factor
 
 
 @dataclass
@@ -90,6 +109,7 @@ class WarmingStats:
     successful_warmings: int = 0
     failed_warmings: int = 0
     skipped_warmings: int = 0
+    rate_limited_warmings: int = 0
     total_keys_warmed: int = 0
     cache_hit_improvement: float = 0.0
     average_warming_time: float = 0.0
@@ -103,9 +123,21 @@ class CacheWarmer:
 
     Provides proactive cache population with multiple strategies:
     - Pattern-based warming (based on historical access)
-    - Predictive warming (ML-based predictions)
+    - Predictive warming (the top-K most accessed keys)
     - Scheduled warming (time-based)
     - Demand-based warming (on-demand for specific keys)
+
+    ``record_access`` is O(1) and memory is fixed: every access increments
+    a count-min sketch (halved every ``10 * tracked_keys`` accesses, so
+    counts follow recent traffic), and only keys whose estimate beats the
+    smallest of the current ``top_k`` keep a ``WarmingPattern``.
+
+    Warming a key costs an upstream request, so each provider gets a token
+    bucket of ``warming_rate_share`` of its configured ``rate_limit``
+    (requests per hour), or ``default_warming_rpm`` if it has none. With
+    several workers the bucket lives in the shared state plane. Tasks over
+    budget are skipped; predictive and scheduled ones are proposed again on
+    the next cycle.
     """
 
     def __init__(
@@ -115,7 +147,12 @@ class CacheWarmer:
         warming_batch_size: int = 50,
         enable_pattern_analysis: bool = True,
         enable_predictive_warming: bool = True,
-        enable_scheduled_warming: bool = True
+        enable_scheduled_warming: bool = True,
+        top_k: int = DEFAULT_TOP_K,
+        tracked_keys: int = DEFAULT_TRACKED_KEYS,
+        warming_rate_share: float = 0.1,
+        default_warming_rpm: float = 10.0,
+        provider_rate_limits: Optional[Dict[str, int]] = None
     ):
         self.cache = cache
         self.max_concurrent_warmings = max_concurrent_warmings
@@ -130,10 +167,20 @@ class CacheWarmer:
         self._pattern_task: Optional[asyncio.Task] = None
         self._scheduled_task: Optional[asyncio.Task] = None
 
-        # Access pattern tracking
+        # Access pattern tracking: sketch for every key, patterns for the top-K
+        self.top_k = top_k
+        self._frequency = FrequencySketch(tracked_keys, max_count=PATTERN_MAX_COUNT)
+        self._sketch_resets = 0
         self._access_patterns: Dict[str, WarmingPattern] = {}
+        self._min_pattern: Optional[WarmingPattern] = None  # Smallest top-K count, found lazily
         self._pattern_lock = threading.RLock()
 
+        # Per-provider warming budgets
+        self.warming_rate_share = warming_rate_share
+        self.default_warming_rpm = default_warming_rpm
+        self._provider_rate_limits: Dict[str, int] = dict(provider_rate_limits or {})
+        self._warming_buckets: Dict[str, WarmingBudget] = {}
+
         # Warming schedules
         self._schedules: Dict[str, WarmingSchedule] = {}
         self._schedule_lock = threading.RLock()
@@ -165,6 +212,7 @@ class CacheWarmer:
 
         # Initialize discovery service
         self._discovery_service = ModelDiscoveryService()
+        self._load_provider_rate_limits()
 
         # Start background tasks
         tasks = []
@@ -205,25 +253,101 @@ class CacheWarmer:
         logger.info("CacheWarmer stopped")
 
     def record_access(self, key: str, category: str = "default") -> None:
-        """Record cache access for pattern analysis"""
+        """Record cache access for pattern analysis (O(1), fixed memory)"""
         if not self.enable_pattern_analysis:
             return
 
         with self._pattern_lock:
-            if key not in self._access_patterns:
-                self._access_patterns[key] = WarmingPattern(
-                    key=key,
-                    category=category
-                )
-
-            pattern = self._access_patterns[key]
-            pattern.access_count += 1
+            sketch = self._frequency
+            sketch.increment(key)
+            if sketch.resets != self._sketch_resets:
+                self._decay_patterns()
+            count = sketch.estimate(key)
+
+            pattern = self._access_patterns.get(key)
+            if pattern is None:
+                if len(self._access_patterns) >= self.top_k:
+                    smallest = self._smallest_pattern()
+                    if count <= smallest.access_count:
+                        return
+                    del self._access_patterns[smallest.key]
+                    self._min_pattern = None
+                pattern = WarmingPattern(key=key, category=category)
+                self._access_patterns[key] = pattern
+                if self._min_pattern is not None and count < self._min_pattern.access_count:
+                    self._min_pattern = pattern
+            elif pattern is self._min_pattern:
+                self._min_pattern = None  # It may no longer be the smallest
+
+            pattern.access_count = count
             pattern.last_accessed = time.time()
-            pattern.access_times.append(time.time())
+            pattern.category = category
 
-            # Keep only recent access times (last 7 days)
-            cutoff = time.time() - (7 * 24 * 3600)
-            pattern.access_times = [t for t in pattern.access_times if t > cutoff]
+    def _smallest_pattern(self) -> WarmingPattern:
+        """Top-K entry with the lowest count; rescanned only after the cached one changed"""
+        if self._min_pattern is None:
+            self._min_pattern = min(self._access_patterns.values(), key=lambda p: p.access_count)
+        return self._min_pattern
+
+    def _decay_patterns(self) -> None:
+        """Halve the top-K counts along with the sketch, keeping them comparable to new estimates"""
+        for _ in range(self._frequency.resets - self._sketch_resets):
+            for pattern in self._access_patterns.values():
+                pattern.access_count >>= 1
+        self._sketch_resets = self._frequency.resets
+
+    def get_top_keys(self, limit: Optional[int] = None) -> List[WarmingPattern]:
+        """Heavy hitters, most accessed first"""
+        with self._pattern_lock:
+            patterns = sorted(self._access_patterns.values(), key=lambda p: p.access_count, reverse=True)
+        return patterns[:limit] if limit is not None else patterns
+
+    def _load_provider_rate_limits(self) -> None:
+        """Provider rate limits (requests per hour) from the unified config"""
+        try:
+            from .unified_config import config_manager
+            config = config_manager.load_config()
+        except Exception as e:
+            logger.debug(f"Provider rate limits unavailable for warming budgets: {e}")
+            return
+        for provider in getattr(config, 'providers', []):
+            if getattr(provider, 'rate_limit', None):
+                self._provider_rate_limits.setdefault(provider.name, provider.rate_limit)
+
+    def _provider_for_task(self, task: Dict[str, Any]) -> Optional[str]:
+        """Provider whose API a warming task calls (model keys are ``models:<provider>:<url>``)"""
+        if task.get('provider'):
+            return task['provider']
+        parts = task.get('key', '').split(":")
+        if len(parts) >= 3 and parts[0] == "models":
+            return parts[1]
+        return None
+
+    def _take_warming_budget(self, task: Dict[str, Any]) -> bool:
+        """Spend one request of the task's provider warming budget; False if it is exhausted"""
+        provider = self._provider_for_task(task)
+        if provider is None:
+            return True
+
+        rate_limit = self._provider_rate_limits.get(provider)
+        per_minute = rate_limit * self.warming_rate_share / 60 if rate_limit else self.default_warming_rpm
+        capacity, refill_rate = max(1.0, per_minute), per_minute / 60
+
+        shared = get_shared_state()
+        if shared is not None:
+            result = shared.consume_token(f"warm:{provider}", capacity, refill_rate)
+            if result is not None:
+                return result[0]
+
+        bucket = self._warming_buckets.get(provider)
+        if bucket is None:
+            bucket = self._warming_buckets[provider] = WarmingBudget(capacity, refill_rate)
+        return bucket.consume()
+
+    def _is_fresh(self, key: str) -> bool:
+        """Whether the cache already holds a value for ``key`` that is not close to expiring"""
+        is_fresh = getattr(self.cache, 'is_fresh', None)
+        return bool(is_fresh and is_fresh(key))
 
     async def warm_key(self, key: str, getter_func: Callable, priority: int = 1) -> bool:
         """Warm a specific key on demand"""
@@ -383,6 +507,13 @@ class CacheWarmer:
                     await asyncio.sleep(5)
                     continue
 
+                # Warming must not eat the provider's rate limit
+                if not self._take_warming_budget(task):
+                    self.stats.skipped_warmings += 1
+                    self.stats.rate_limited_warmings += 1
+                    logger.debug(f"Skipped warming for key {task.get('key')}: provider warming budget exhausted")
+                    continue
+
                 # Execute warming task
                 asyncio.create_task(self._execute_warming_task(task))
 
@@ -453,78 +584,51 @@ class CacheWarmer:
     async def _analyze_patterns(self) -> None:
         """Analyze access patterns for predictive warming"""
         with self._pattern_lock:
-            # Update pattern priorities based on access frequency
+            # Update pattern priorities based on recent access counts
             for pattern in self._access_patterns.values():
-                frequency = pattern.get_access_frequency()
-
-                # Adjust priority based on frequency
-                if frequency > 10:  # More than 10 accesses per hour
+                if pattern.access_count > FREQUENT_ACCESS_COUNT:
                     pattern.priority = min(5, pattern.priority + 1)
-                elif frequency < 1:  # Less than 1 access per hour
+                elif pattern.access_count < RARE_ACCESS_COUNT:
                     pattern.priority = max(1, pattern.priority - 1)
 
     async def _queue_predictive_warming(self) -> None:
-        """Queue predictive warming based on pattern analysis"""
+        """Queue the top-K keys most likely to be read soon that are missing or about to expire"""
         if not self.enable_predictive_warming:
             return
 
+        # Score a snapshot so the lock is not held across awaits
         with self._pattern_lock:
-            # Get top predictive candidates
-            candidates = []
-            for pattern in self._access_patterns.values():
-                score = pattern.get_predictive_score()
-                if score > 0.5:  # Threshold for predictive warming
-                    candidates.append((pattern, score))
-
-            # Sort by predictive score
-            candidates.sort(key=lambda x: x[1], reverse=True)
-
-            # Queue top candidates for warming
-            for pattern, score in candidates[:10]:  # Top 10
-                if pattern.key not in self._active_warmings:
-                    # For model discovery keys, create getter function
-                    if pattern.key.startswith("models:"):
-                        await self._queue_model_discovery_warming(pattern)
-                    else:
-                        # Generic predictive warming (would need specific getter)
-                        logger.debug(f"Would predictively warm: {pattern.key} (score: {score:.2f})")
-
-    async def _queue_model_discovery_warming(self, pattern: WarmingPattern) -> None:
-        """Queue model discovery warming for predictive patterns"""
-        try:
-            # Parse provider info from key
-            parts = pattern.key.split(":")
-            if len(parts) >= 3:
-                provider_name = parts[1]
-                base_url = parts[2]
-
-                # Create provider config (simplified - may need enhancement)
-                provider_config = ProviderConfig(
-                    name=provider_name,
-                    base_url=base_url,
-                    api_key="",  # Would need to be retrieved from config
-                    timeout=30
-                )
-
-                async def getter_func():
-                    if self._discovery_service:
-                        return await self._discovery_service.discover_models(provider_config)
-                    return None
-
-                await self._warming_queue.put({
-                    'type': 'predictive',
-                    'key': pattern.key,
-                    'getter_func': getter_func,
-                    'category': pattern.category,
-                    'priority': pattern.priority,
-                    'predictive_score': pattern.get_predictive_score(),
-                    'timestamp': time.time()
-                })
-
-                logger.debug(f"Queued predictive warming for {pattern.key}")
-
-        except Exception as e:
-            logger.error(f"Error queuing predictive warming for {pattern.key}: {e}")
+            candidates = [
+                (pattern, pattern.get_predictive_score())
+                for pattern in self._access_patterns.values()
+            ]
+        candidates = [(pattern, score) for pattern, score in candidates
+                      if score > 0.5]  # Threshold for predictive warming
+        candidates.sort(key=lambda x: x[1], reverse=True)
+
+        queued = 0
+        for pattern, score in candidates:
+            if queued >= PREDICTIVE_BATCH_SIZE:
+                break
+            if pattern.key in self._active_warmings or self._is_fresh(pattern.key):
+                continue
+
+            getter_func = await self._create_getter_for_key(pattern.key)
+            if getter_func is None:
+                logger.debug(f"No getter to predictively warm: {pattern.key} (score: {score:.2f})")
+                continue
+
+            await self._warming_queue.put({
+                'type': 'predictive',
+                'key': pattern.key,
+                'getter_func': getter_func,
+                'category': pattern.category,
+                'priority': pattern.priority,
+                'predictive_score': score,
+                'timestamp': time.time()
+            })
+            queued += 1
+            logger.debug(f"Queued predictive warming for {pattern.key}")
 
     async def _queue_scheduled_warming(self, schedule: WarmingSchedule) -> None:
         """Queue scheduled warming tasks"""
@@ -636,6 +740,7 @@ class CacheWarmer:
             "successful_warmings": self.stats.successful_warmings,
             "failed_warmings": self.stats.failed_warmings,
             "skipped_warmings": self.stats.skipped_warmings,
+            "rate_limited_warmings": self.stats.rate_limited_warmings,
             "success_rate": (
                 self.stats.successful_warmings / self.stats.total_warmings
                 if self.stats.total_warmings > 0 else 0
@@ -649,6 +754,14 @@ class CacheWarmer:
             "active_warmings": len(self._active_warmings),
             "queued_warmings": self._warming_queue.qsize(),
             "tracked_patterns": len(self._access_patterns),
+            "top_keys": [
+                {"key": p.key, "access_count": p.access_count}
+                for p in self.get_top_keys(PREDICTIVE_BATCH_SIZE)
+            ],
+            "frequency_sketch": {
+                "width": self._frequency.width,
+                "resets": self._frequency.resets
+            },
             "active_schedules": len([
                 s for s in self._schedules.values() if s.enabled
             ]),
@@ -7,9 +7,18 @@ import asyncio
 import time
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
-
+from typing import (Any, Awaitable, Callable, Dict, FrozenSet, Optional,
+                    Tuple, Type)
+
+from src.core.exceptions import (APIConnectionError, AuthenticationError,
+                                 AuthorizationError, InvalidRequestError,
+                                 NotFoundError, RateLimitError,
+                                 ServiceUnavailableError)
+from src.core.exceptions import NotImplementedError as ProviderNotImplementedError
+from src.core.exceptions import TimeoutError as ProviderTimeoutError
 from src.core.logging import ContextualLogger
+from src.core.shared_state import (BREAKER_CLOSED, BREAKER_OPEN,
+                                   SharedStatePlane, get_shared_state)
 
 logger = ContextualLogger(__name__)
 
@@ -335,10 +344,426 @@ class CircuitBreaker:
         return getattr(self._breaker, name)
 
 
+class CallOutcome(Enum):
+    """Classified result of a protected call"""
+    SUCCESS = "success"
+    TIMEOUT = "timeout"
+    RATE_LIMITED = "rate_limited"      # HTTP 429
+    SERVER_ERROR = "server_error"      # HTTP 5xx
+    CLIENT_ERROR = "client_error"      # HTTP 4xx other than 429, caller's fault
+    CONNECTION_ERROR = "connection_error"
+    ERROR = "error"                    # Anything unclassified
+
+
+_OUTCOMES = tuple(CallOutcome)
+_OUTCOME_INDEX = {outcome: index for index, outcome in enumerate(_OUTCOMES)}
+
+# Outcomes that count against a provider by default (client errors do not)
+DEFAULT_FAILURE_OUTCOMES = frozenset({
+    CallOutcome.TIMEOUT,
+    CallOutcome.RATE_LIMITED,
+    CallOutcome.SERVER_ERROR,
+    CallOutcome.CONNECTION_ERROR,
+    CallOutcome.ERROR,
+})
+
+
+def classify_outcome(exception: BaseException) -> CallOutcome:
+    """Classify an exception raised by a provider call"""
+    status = getattr(exception, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(exception, 'response', None), 'status_code', None)
+
+    if isinstance(status, int):
+        if status == 429:
+            return CallOutcome.RATE_LIMITED
+        if status == 408:
+            return CallOutcome.TIMEOUT
+        if status >= 500:
+            return CallOutcome.SERVER_ERROR
+        if status >= 400:
+            return CallOutcome.CLIENT_ERROR
+
+    if isinstance(exception, RateLimitError):
+        return CallOutcome.RATE_LIMITED
+    if isinstance(exception, (InvalidRequestError, AuthenticationError, AuthorizationError,
+                              NotFoundError, ProviderNotImplementedError)):
+        return CallOutcome.CLIENT_ERROR
+    if isinstance(exception, ServiceUnavailableError):
+        return CallOutcome.SERVER_ERROR
+    if isinstance(exception, (asyncio.TimeoutError, ProviderTimeoutError)) or 'Timeout' in type(exception).__name__:
+        return CallOutcome.TIMEOUT
+    if isinstance(exception, (APIConnectionError, ConnectionError)) or 'Connect' in type(exception).__name__:
+        return CallOutcome.CONNECTION_ERROR
+    return CallOutcome.ERROR
+
+
+class SlidingWindowCounter:
+    """
+    Time-bucketed ring buffer of call outcomes.
+    Running totals are kept alongside the buckets, so rates are read in O(1)
+    and expiring old buckets is amortized O(1) per recorded call.
+    """
+
+    __slots__ = (
+        'bucket_count', 'bucket_width', '_calls', '_failures', '_slow',
+        '_outcomes', '_head', 'total_calls', 'total_failures', 'total_slow', 'outcome_totals'
+    )
+
+    def __init__(self, window_seconds: float, bucket_count: int):
+        if window_seconds <= 0 or bucket_count <= 0:
+            raise ValueError("window_seconds and bucket_count must be positive")
+
+        self.bucket_count = bucket_count
+        self.bucket_width = window_seconds / bucket_count
+        self._calls = [0] * bucket_count
+        self._failures = [0] * bucket_count
+        self._slow = [0] * bucket_count
+        self._outcomes = [[0] * len(_OUTCOMES) for _ in range(bucket_count)]
+        self._head = -1
+        self.total_calls = 0
+        self.total_failures = 0
+        self.total_slow = 0
+        self.outcome_totals = [0] * len(_OUTCOMES)
+
+    def _expire(self, slot: int) -> None:
+        """Drop a bucket's counts from the running totals"""
+        if self._calls[slot]:
+            self.total_calls -= self._calls[slot]
+            self.total_failures -= self._failures[slot]
+            self.total_slow -= self._slow[slot]
+            outcomes = self._outcomes[slot]
+            for index, count in enumerate(outcomes):
+                if count:
+                    self.outcome_totals[index] -= count
+                    outcomes[index] = 0
+            self._calls[slot] = self._failures[slot] = self._slow[slot] = 0
+
+    def advance(self, now: float) -> int:
+        """Move the window to ``now`` and return the slot for the current bucket"""
+        epoch = int(now / self.bucket_width)
+        if epoch != self._head:
+            if self._head < 0 or epoch - self._head >= self.bucket_count:
+                for slot in range(self.bucket_count):
+                    self._expire(slot)
+            else:
+                for stale_epoch in range(self._head + 1, epoch + 1):
+                    self._expire(stale_epoch % self.bucket_count)
+            self._head = epoch
+
+        return epoch % self.bucket_count
+
+    def record(self, outcome: CallOutcome, failed: bool, slow: bool, now: float) -> None:
+        """Record one call outcome at time ``now``"""
+        slot = self.advance(now)
+        index = _OUTCOME_INDEX[outcome]
+
+        self._calls[slot] += 1
+        self._outcomes[slot][index] += 1
+        self.total_calls += 1
+        self.outcome_totals[index] += 1
+        if failed:
+            self._failures[slot] += 1
+            self.total_failures += 1
+        if slow:
+            self._slow[slot] += 1
+            self.total_slow += 1
+
+    def failure_rate(self) -> float:
+        return self.total_failures / self.total_calls if self.total_calls else 0.0
+
+    def slow_call_rate(self) -> float:
+        return self.total_slow / self.total_calls if self.total_calls else 0.0
+
+    def outcome_counts(self) -> Dict[str, int]:
+        return {outcome.value: self.outcome_totals[index] for index, outcome in enumerate(_OUTCOMES)}
+
+    def reset(self) -> None:
+        for slot in range(self.bucket_count):
+            self._expire(slot)
+        self._head = -1
+
+
+@dataclass
+class SlidingWindowConfig:
+    """Configuration for the sliding-window circuit breaker"""
+    window_seconds: float = 30.0              # Rolling window evaluated for rates
+    bucket_count: int = 30                    # Buckets in the ring (1s granularity by default)
+    minimum_calls: int = 10                   # Calls in window before rates can trip the breaker
+    failure_rate_threshold: float = 0.5       # Trip when this share of calls failed
+    slow_call_rate_threshold: float = 0.4     # Trip when this share of calls was slow
+    slow_call_duration: float = 10.0          # Seconds after which a call counts as slow
+    consecutive_failure_threshold: int = 5    # Also trip on N failures in a row
+    open_timeout: float = 60.0                # Seconds to stay open before probing
+    half_open_max_probes: int = 3             # Concurrent probes allowed (and successes to close)
+    failure_outcomes: FrozenSet[CallOutcome] = DEFAULT_FAILURE_OUTCOMES
+
+
+class SlidingWindowCircuitBreaker:
+    """
+    Circuit breaker driven by failure and slow-call ratios over a rolling window.
+
+    - Outcomes are classified (timeout, 429, 5xx, client error, ...) and only
+      provider-side failures count against the breaker
+    - Trips on failure ratio, slow-call ratio or consecutive failures
+    - Half-open state admits a bounded number of concurrent probes
+    - All state evaluation is O(1); no per-request history lists
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: Optional[SlidingWindowConfig] = None,
+        expected_exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+        shared: Optional[SharedStatePlane] = None
+    ):
+        self.name = name
+        self.config = config or SlidingWindowConfig()
+        self.expected_exceptions = expected_exceptions
+
+        # Open/closed transitions are published to the other workers; the
+        # rolling window stays per worker
+        self.shared = shared
+        self._shared_generation = 0
+
+        self.state = CircuitState.CLOSED
+        self.window = SlidingWindowCounter(self.config.window_seconds, self.config.bucket_count)
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.last_failure_time: Optional[float] = None
+        self.last_success_time: Optional[float] = None
+        self.last_trip_reason: Optional[str] = None
+
+        self._half_open_in_flight = 0
+        self.half_open_success_count = 0
+
+        self.metrics = CircuitBreakerMetrics()
+
+        logger.info(
+            f"Sliding-window circuit breaker initialized for {name}",
+            extra={
+                'window_seconds': self.config.window_seconds,
+                'failure_rate_threshold': self.config.failure_rate_threshold,
+                'slow_call_rate_threshold': self.config.slow_call_rate_threshold
+            }
+        )
+
+    @property
+    def failure_count(self) -> int:
+        """Consecutive provider-side failures"""
+        return self.consecutive_failures
+
+    def is_closed(self) -> bool:
+        return self.state == CircuitState.CLOSED
+
+    def is_open(self) -> bool:
+        return self.state == CircuitState.OPEN
+
+    def is_half_open(self) -> bool:
+        return self.state == CircuitState.HALF_OPEN
+
+    def get_success_rate(self) -> float:
+        """Success rate over the current window"""
+        return 1.0 - self.window.failure_rate()
+
+    def _change_state(self, new_state: CircuitState, now: float, reason: Optional[str] = None,
+                      publish: bool = True) -> None:
+        old_state = self.state
+        if old_state == new_state:
+            return
+
+        self.state = new_state
+        self.metrics.state_changes += 1
+        self.metrics.last_state_change = time.time()
+
+        if new_state == CircuitState.OPEN:
+            self.opened_at = now
+            self.last_trip_reason = reason
+        elif old_state == CircuitState.OPEN and self.opened_at is not None:
+            self.metrics.total_downtime_seconds += now - self.opened_at
+
+        if new_state != CircuitState.HALF_OPEN:
+            self._half_open_in_flight = 0
+            self.half_open_success_count = 0
+        if new_state == CircuitState.CLOSED:
+            self.consecutive_failures = 0
+            self.window.reset()
+
+        if self.shared is not None and publish and new_state != CircuitState.HALF_OPEN:
+            generation = self.shared.publish_breaker(
+                self.name,
+                BREAKER_OPEN if new_state == CircuitState.OPEN else BREAKER_CLOSED,
+                now
+            )
+            if generation is not None:
+                self._shared_generation = generation
+
+        logger.info(
+            f"Circuit breaker {self.name} state changed",
+            extra={
+                'from_state': old_state.value,
+                'to_state': new_state.value,
+                'reason': reason,
+                'failure_rate': round(self.window.failure_rate(), 3),
+                'slow_call_rate': round(self.window.slow_call_rate(), 3)
+            }
+        )
+
+    def _retry_after(self, now: float) -> Optional[int]:
+        if self.state != CircuitState.OPEN or self.opened_at is None:
+            return None
+        return max(0, int(self.config.open_timeout - (now - self.opened_at)))
+
+    def _sync_shared(self, now: float) -> None:
+        """Adopt an open/closed transition published by another worker"""
+        entry = self.shared.read_breaker(self.name)
+        if entry is None or entry[0] == self._shared_generation:
+            return
+        generation, state, opened_at = entry
+        self._shared_generation = generation
+
+        if state == BREAKER_OPEN and self.state != CircuitState.OPEN:
+            self._change_state(CircuitState.OPEN, now, "opened_by_peer", publish=False)
+            self.opened_at = opened_at
+        elif state == BREAKER_CLOSED and self.state != CircuitState.CLOSED:
+            self._change_state(CircuitState.CLOSED, now, "closed_by_peer", publish=False)
+
+    def allow_request(self, now: Optional[float] = None) -> bool:
+        """Admit a call, reserving a probe slot when half-open"""
+        now = time.monotonic() if now is None else now
+
+        if self.shared is not None:
+            self._sync_shared(now)
+
+        if self.state == CircuitState.OPEN:
+            if self.opened_at is not None and now - self.opened_at >= self.config.open_timeout:
+                self._change_state(CircuitState.HALF_OPEN, now)
+            else:
+                return False
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self._half_open_in_flight >= self.config.half_open_max_probes:
+                return False
+            self._half_open_in_flight += 1
+
+        return True
+
+    def release_probe(self) -> None:
+        """Return a half-open probe slot for a call that produced no outcome"""
+        if self.state == CircuitState.HALF_OPEN and self._half_open_in_flight:
+            self._half_open_in_flight -= 1
+
+    def _trip_reason(self) -> Optional[str]:
+        config = self.config
+        if self.consecutive_failures >= config.consecutive_failure_threshold:
+            return "consecutive_failures"
+        if self.window.total_calls >= config.minimum_calls:
+            if self.window.failure_rate() >= config.failure_rate_threshold:
+                return "failure_rate"
+            if self.window.slow_call_rate() >= config.slow_call_rate_threshold:
+                return "slow_call_rate"
+        return None
+
+    def record_outcome(self, outcome: CallOutcome, duration: float = 0.0, now: Optional[float] = None) -> None:
+        """Record a classified call outcome and evaluate state transitions"""
+        now = time.monotonic() if now is None else now
+        failed = outcome in self.config.failure_outcomes
+        slow = duration >= self.config.slow_call_duration
+
+        self.window.record(outcome, failed, slow, now)
+        self.metrics.total_requests += 1
+        if failed:
+            self.metrics.failed_requests += 1
+            self.consecutive_failures += 1
+            self.last_failure_time = time.time()
+        else:
+            self.metrics.successful_requests += 1
+            self.consecutive_failures = 0
+            self.last_success_time = time.time()
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self._half_open_in_flight:
+                self._half_open_in_flight -= 1
+            if failed or slow:
+                self._change_state(CircuitState.OPEN, now, "half_open_probe_failed")
+            else:
+                self.half_open_success_count += 1
+                if self.half_open_success_count >= self.config.half_open_max_probes:
+                    self._change_state(CircuitState.CLOSED, now)
+        elif self.state == CircuitState.CLOSED:
+            reason = self._trip_reason()
+            if reason:
+                self._change_state(CircuitState.OPEN, now, reason)
+                logger.error(f"Circuit breaker {self.name} TRIPPED", extra={'reason': reason})
+
+    async def can_execute(self) -> bool:
+        """Check if a request can be executed (reserves a probe slot when half-open)"""
+        return self.allow_request()
+
+    async def on_success(self, duration: float = 0.0):
+        self.record_outcome(CallOutcome.SUCCESS, duration)
+
+    async def on_failure(self, exception: BaseException, duration: float = 0.0):
+        self.record_outcome(classify_outcome(exception), duration)
+
+    async def execute(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Execute function with circuit breaker protection"""
+        start = time.monotonic()
+        if not self.allow_request(start):
+            self.metrics.rejected_requests += 1
+            raise CircuitBreakerOpenException(self.name, self._retry_after(start))
+
+        try:
+            result = await func(*args, **kwargs)
+        except self.expected_exceptions as e:
+            self.record_outcome(classify_outcome(e), time.monotonic() - start)
+            raise
+        except BaseException:
+            # Cancellation or unexpected exceptions say nothing about the provider
+            self.release_probe()
+            raise
+
+        self.record_outcome(CallOutcome.SUCCESS, time.monotonic() - start)
+        return result
+
+    def reset(self) -> None:
+        """Force the breaker back to a clean closed state"""
+        self._change_state(CircuitState.CLOSED, time.monotonic())
+        self.window.reset()
+        self.consecutive_failures = 0
+        self._half_open_in_flight = 0
+        self.half_open_success_count = 0
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get comprehensive circuit breaker metrics"""
+        return {
+            'name': self.name,
+            'state': self.state.value,
+            'window_seconds': self.config.window_seconds,
+            'window_calls': self.window.total_calls,
+            'failure_rate': round(self.window.failure_rate(), 4),
+            'slow_call_rate': round(self.window.slow_call_rate(), 4),
+            'outcomes': self.window.outcome_counts(),
+            'last_trip_reason': self.last_trip_reason,
+            'current_failure_count': self.consecutive_failures,
+            'success_rate': round(self.get_success_rate(), 4),
+            'total_requests': self.metrics.total_requests,
+            'successful_requests': self.metrics.successful_requests,
+            'failed_requests': self.metrics.failed_requests,
+            'rejected_requests': self.metrics.rejected_requests,
+            'state_changes': self.metrics.state_changes,
+            'total_downtime_seconds': round(self.metrics.total_downtime_seconds, 2),
+            'last_failure_time': self.last_failure_time,
+            'last_success_time': self.last_success_time,
+            'half_open_probes_in_flight': self._half_open_in_flight,
+            'shared': self.shared is not None
+        }
+
+
 # Global circuit breaker registry
-_circuit_breakers: Dict[str, ProductionCircuitBreaker] = {}
+_circuit_breakers: Dict[str, SlidingWindowCircuitBreaker] = {}
 
-from src.core.unified_config import config_manager
+from src.core.unified_config import CircuitBreakerSettings, config_manager
 
 
 def get_circuit_breaker(
@@ -346,26 +771,42 @@ def get_circuit_breaker(
     failure_threshold: Optional[int] = None,
     recovery_timeout: Optional[int] = None,
     expected_exception: Tuple[Type[Exception], ...] = (Exception,)
-) -> ProductionCircuitBreaker:
+) -> SlidingWindowCircuitBreaker:
     """Get or create circuit breaker using unified config defaults"""
+    if name in _circuit_breakers:
+        return _circuit_breakers[name]
+
     config = config_manager.load_config()
     threshold = failure_threshold or config.settings.circuit_breaker_threshold
     timeout = recovery_timeout or config.settings.circuit_breaker_timeout
 
-    if name not in _circuit_breakers:
-        _circuit_breakers[name] = ProductionCircuitBreaker(
-            name=name,
-            failure_threshold=threshold,
-            recovery_timeout=timeout,
-            expected_exceptions=expected_exception
-        )
-        logger.info(
-            f"Created circuit breaker for {name}",
-            extra={'threshold': threshold, 'timeout': timeout}
-        )
+    cb_settings = getattr(config.settings, 'circuit_breaker', None)
+    if not isinstance(cb_settings, CircuitBreakerSettings):
+        cb_settings = CircuitBreakerSettings()
+
+    _circuit_breakers[name] = SlidingWindowCircuitBreaker(
+        name=name,
+        config=SlidingWindowConfig(
+            window_seconds=cb_settings.window_seconds,
+            bucket_count=cb_settings.bucket_count,
+            minimum_calls=cb_settings.minimum_calls,
+            failure_rate_threshold=cb_settings.failure_rate_threshold,
+            slow_call_rate_threshold=cb_settings.slow_call_rate_threshold,
+            slow_call_duration=cb_settings.slow_call_duration,
+            consecutive_failure_threshold=threshold,
+            open_timeout=timeout,
+            half_open_max_probes=cb_settings.half_open_max_calls
+        ),
+        expected_exceptions=expected_exception,
+        shared=get_shared_state()
+    )
+    logger.info(
+        f"Created circuit breaker for {name}",
+        extra={'threshold': threshold, 'timeout': timeout}
+    )
     return _circuit_breakers[name]
 
-def get_all_circuit_breakers() -> Dict[str, ProductionCircuitBreaker]:
+def get_all_circuit_breakers() -> Dict[str, SlidingWindowCircuitBreaker]:
     """Get all circuit breakers"""
     return _circuit_breakers.copy()
 
@@ -379,9 +820,6 @@ def get_circuit_breaker_metrics() -> Dict[str, Dict[str, Any]]:
 async def reset_all_circuit_breakers():
     """Reset all circuit breakers to closed state"""
     for breaker in _circuit_breakers.values():
-        async with breaker.lock:
-            await breaker._change_state(CircuitState.CLOSED)
-            breaker.failure_count = 0
-            breaker.half_open_success_count = 0
+        breaker.reset()
 
     logger.info("All circuit breakers reset to closed state")
@@ -5,12 +5,13 @@ Individual circuit breakers per provider with adaptive timeouts
 
 import asyncio
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Awaitable, Callable, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
 
 from .circuit_breaker import (CircuitBreakerOpenException,
-                              ProductionCircuitBreaker)
+                              SlidingWindowCircuitBreaker, SlidingWindowConfig)
 from .logging import ContextualLogger
 from .provider_discovery import provider_discovery
 
@@ -41,14 +42,16 @@ class AdaptiveTimeoutConfig:
 class ProviderCircuitBreaker:
     """Circuit breaker configuration for a specific provider"""
     provider_name: str
-    circuit_breaker: ProductionCircuitBreaker
+    circuit_breaker: SlidingWindowCircuitBreaker
     adaptive_config: AdaptiveTimeoutConfig
-    request_history: List[float] = field(default_factory=list)
+    request_history: Deque[float] = field(default_factory=deque)
     last_adaptation: float = 0.0
     current_timeout: float = 30.0
 
     def __post_init__(self):
         self.current_timeout = self.adaptive_config.base_timeout
+        # Bounded ring buffer: appends evict the oldest sample in O(1)
+        self.request_history = deque(self.request_history, maxlen=self.adaptive_config.history_window)
 
 
 class CircuitBreakerPool:
@@ -94,12 +97,14 @@ class CircuitBreakerPool:
         if provider_name not in self._provider_breakers:
             config = config or self._default_config
 
-            # Create circuit breaker
-            circuit_breaker = ProductionCircuitBreaker(
+            # Create circuit breaker; calls slower than the adaptive ceiling count as slow
+            circuit_breaker = SlidingWindowCircuitBreaker(
                 name=provider_name,
-                failure_threshold=5,  # Configurable via unified config
-                recovery_timeout=60,
-                adaptive_thresholds=True
+                config=SlidingWindowConfig(
+                    consecutive_failure_threshold=5,  # Configurable via unified config
+                    open_timeout=60,
+                    slow_call_duration=config.max_timeout
+                )
             )
 
             # Create provider breaker wrapper
@@ -184,13 +189,9 @@ class CircuitBreakerPool:
 
         provider_breaker = self._provider_breakers[provider_name]
 
-        # Add to request history
+        # Add to request history (bounded deque drops the oldest entry)
         provider_breaker.request_history.append(execution_time)
 
-        # Maintain history window
-        if len(provider_breaker.request_history) > provider_breaker.adaptive_config.history_window:
-            provider_breaker.request_history.pop(0)
-
         # Record in provider discovery service
         await provider_discovery.record_request_result(
             provider_name, success, execution_time * 1000  # Convert to ms
@@ -231,7 +232,7 @@ class CircuitBreakerPool:
     async def _adapt_adaptive_timeout(self, provider_breaker: ProviderCircuitBreaker):
         """Adaptive timeout based on recent performance"""
         config = provider_breaker.adaptive_config
-        history = provider_breaker.request_history[-20:]  # Last 20 requests
+        history = list(provider_breaker.request_history)[-20:]  # Last 20 requests
 
         if not history:
             return
@@ -364,6 +365,8 @@ class CircuitBreakerPool:
                 "circuit_state": breaker_metrics["state"],
                 "failure_count": breaker_metrics["current_failure_count"],
                 "success_rate": breaker_metrics["success_rate"],
+                "failure_rate": breaker_metrics["failure_rate"],
+                "slow_call_rate": breaker_metrics["slow_call_rate"],
                 "current_timeout": round(provider_breaker.current_timeout, 2),
                 "request_history_size": len(provider_breaker.request_history),
                 "last_adaptation": provider_breaker.last_adaptation,
@@ -389,6 +392,10 @@ class CircuitBreakerPool:
             "current_timeout": round(provider_breaker.current_timeout, 2),
             "failure_count": breaker_metrics["current_failure_count"],
             "success_rate": breaker_metrics["success_rate"],
+            "failure_rate": breaker_metrics["failure_rate"],
+            "slow_call_rate": breaker_metrics["slow_call_rate"],
+            "outcomes": breaker_metrics["outcomes"],
+            "last_trip_reason": breaker_metrics["last_trip_reason"],
             "total_requests": breaker_metrics["total_requests"],
             "last_failure": breaker_metrics["last_failure_time"],
             "adaptive_strategy": provider_breaker.adaptive_config.strategy.value,
@@ -408,11 +415,7 @@ class CircuitBreakerPool:
             provider_breaker = self._provider_breakers[provider_name]
 
             # Reset circuit breaker state
-            async with provider_breaker.circuit_breaker.lock:
-                from .circuit_breaker import CircuitState
-                await provider_breaker.circuit_breaker._change_state(CircuitState.CLOSED)
-                provider_breaker.circuit_breaker.failure_count = 0
-                provider_breaker.circuit_breaker.half_open_success_count = 0
+            provider_breaker.circuit_breaker.reset()
 
             # Reset adaptive timeout
             provider_breaker.current_timeout = provider_breaker.adaptive_config.base_timeout
@@ -0,0 +1,96 @@
+"""
+Memory-compact building blocks for hot in-memory structures
+
+- ``DATACLASS_SLOTS``: ``@dataclass(**DATACLASS_SLOTS)`` gives a record class
+  ``__slots__`` instead of a per-instance ``__dict__`` on Python 3.10+, and
+  stays an ordinary dataclass on older interpreters.
+- ``FloatRing``: fixed-capacity ring buffer of floats stored in a C double
+  array (8 bytes per value instead of a boxed float plus a list or deque
+  slot), with a running sum so the mean is O(1). It grows to its capacity
+  on demand, so rarely used rings stay small.
+"""
+
+import math
+import sys
+from array import array
+from itertools import chain
+from typing import Iterable, Iterator
+
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+class FloatRing:
+    """Bounded ring buffer of floats; appending to a full ring drops the oldest value"""
+
+    __slots__ = ("capacity", "_data", "_start", "_sum")
+
+    def __init__(self, capacity: int, values: Iterable[float] = ()):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._data = array('d')
+        self._start = 0
+        self._sum = 0.0
+        for value in values:
+            self.append(value)
+
+    def append(self, value: float) -> None:
+        data = self._data
+        if len(data) < self.capacity:
+            data.append(value)
+            self._sum += value
+            return
+
+        start = self._start
+        self._sum += value - data[start]
+        data[start] = value
+        start += 1
+        if start == self.capacity:
+            start = 0
+            # Re-sum once per lap so floating-point drift cannot accumulate
+            self._sum = math.fsum(data)
+        self._start = start
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __bool__(self) -> bool:
+        return len(self._data) > 0
+
+    def __iter__(self) -> Iterator[float]:
+        """Values from oldest to newest"""
+        start = self._start
+        if start == 0:
+            return iter(self._data)
+        return chain(self._data[start:], self._data[:start])
+
+    def __getitem__(self, index: int) -> float:
+        size = len(self._data)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("FloatRing index out of range")
+        return self._data[(self._start + index) % size]
+
+    def __repr__(self) -> str:
+        return f"FloatRing(capacity={self.capacity}, values={list(self)!r})"
+
+    def total(self) -> float:
+        return self._sum
+
+    def mean(self) -> float:
+        return self._sum / len(self._data) if self._data else 0.0
+
+    def count_since(self, cutoff: float) -> int:
+        """Values greater than ``cutoff``, for rings of ascending timestamps (newest first scan)"""
+        count = 0
+        for index in range(len(self._data) - 1, -1, -1):
+            if self[index] <= cutoff:
+                break
+            count += 1
+        return count
+
+    def clear(self) -> None:
+        self._data = array('d')
+        self._start = 0
+        self._sum = 0.0
@@ -24,8 +24,10 @@ class Settings(BaseSettings):
     api_key_header: str = "X-API-Key"
     allowed_origins: List[str] = ["http://localhost:3000", "http://127.0.0.1:3000"]
     proxy_api_keys: List[str] = []
+    # Keys for the /v1/admin endpoints (profiler, loop monitor); none disables them
+    admin_api_keys: List[str] = []
 
-    @field_validator('proxy_api_keys', mode='before')
+    @field_validator('proxy_api_keys', 'admin_api_keys', mode='before')
     @classmethod
     def parse_proxy_keys(cls, v):
         """Parse proxy_api_keys from string to list if necessary.
@@ -173,7 +173,125 @@ CONFIG_SCHEMA = {
                 "failure_threshold": {"type": "integer", "minimum": 1},
                 "recovery_timeout": {"type": "integer", "minimum": 1},
                 "half_open_max_calls": {"type": "integer", "minimum": 1},
-                "expected_exception": {"type": "string"}
+                "expected_exception": {"type": "string"},
+                "window_seconds": {"type": "number", "minimum": 1},
+                "bucket_count": {"type": "integer", "minimum": 1},
+                "minimum_calls": {"type": "integer", "minimum": 1},
+                "failure_rate_threshold": {"type": "number", "exclusiveMinimum": 0, "maximum": 1},
+                "slow_call_rate_threshold": {"type": "number", "exclusiveMinimum": 0, "maximum": 1},
+                "slow_call_duration": {"type": "number", "exclusiveMinimum": 0}
+            }
+        },
+
+        # Retry budgets and request deadlines
+        "retry_budget": {
+            "type": "object",
+            "properties": {
+                "retry_ratio": {"type": "number", "minimum": 0, "maximum": 1},
+                "min_retries_per_second": {"type": "number", "minimum": 0},
+                "window_seconds": {"type": "number", "minimum": 1},
+                "max_retry_after": {"type": "number", "minimum": 0},
+                "deadline_header": {"type": "string"}
+            }
+        },
+
+        # Embeddings pipeline
+        "embeddings": {
+            "type": "object",
+            "properties": {
+                "batching_enabled": {"type": "boolean"},
+                "batch_window_ms": {"type": "number", "minimum": 0, "maximum": 1000},
+                "max_batch_inputs": {"type": "integer", "minimum": 1, "maximum": 2048},
+                "upstream_base64": {"type": "boolean"},
+                "cache_enabled": {"type": "boolean"},
+                "cache_max_mb": {"type": "integer", "minimum": 1},
+                "cache_ttl": {"type": ["integer", "null"], "minimum": 60}
+            }
+        },
+
+        # Response compression
+        "compression": {
+            "type": "object",
+            "properties": {
+                "enabled": {"type": "boolean"},
+                "encodings": {
+                    "type": "array",
+                    "items": {"type": "string", "enum": ["zstd", "br", "gzip"]}
+                },
+                "minimum_size": {"type": "integer", "minimum": 0},
+                "content_types": {"type": "array", "items": {"type": "string"}},
+                "compress_sse": {"type": "boolean"},
+                "gzip_level": {"type": "integer", "minimum": 1, "maximum": 9},
+                "brotli_quality": {"type": "integer", "minimum": 0, "maximum": 11},
+                "zstd_level": {"type": "integer", "minimum": 1, "maximum": 22},
+                "cache_max_entries": {"type": "integer", "minimum": 0},
+                "routes": {
+                    "type": "object",
+                    "additionalProperties": {
+                        "type": "object",
+                        "properties": {
+                            "enabled": {"type": "boolean"},
+                            "minimum_size": {"type": "integer", "minimum": 0},
+                            "compress_sse": {"type": "boolean"},
+                            "cache": {"type": "boolean"}
+                        }
+                    }
+                }
+            }
+        },
+
+        # Multi-worker mode
+        "workers": {
+            "type": "object",
+            "properties": {
+                "count": {"type": "integer", "minimum": 1, "maximum": 256},
+                "shared_state_path": {"type": ["string", "null"]},
+                "shared_state_slots": {"type": "integer", "minimum": 64},
+                "graceful_timeout": {"type": "number", "minimum": 0},
+                "restart_delay": {"type": "number", "minimum": 0}
+            }
+        },
+
+        # Tiered cache storage
+        "cache_tiers": {
+            "type": "object",
+            "properties": {
+                "enabled": {"type": "boolean"},
+                "shared_cache_mb": {"type": "integer", "minimum": 0},
+                "shared_cache_slots": {"type": "integer", "minimum": 64},
+                "shared_cache_path": {"type": ["string", "null"]},
+                "disk_tier_enabled": {"type": "boolean"},
+                "disk_max_mb": {"type": "integer", "minimum": 1},
+                "disk_segment_mb": {"type": "integer", "minimum": 1},
+                "hot_access_count": {"type": "integer", "minimum": 1, "maximum": 16},
+                "warm_access_count": {"type": "integer", "minimum": 1, "maximum": 16},
+                "l1_max_ttl": {"type": "integer", "minimum": 1},
+                "rebalance_interval": {"type": "integer", "minimum": 0}
+            }
+        },
+
+        # Per-request phase timing
+        "phase_timing": {
+            "type": "object",
+            "properties": {
+                "enabled": {"type": "boolean"},
+                "server_timing_header": {"type": "boolean"},
+                "histograms": {"type": "boolean"},
+                "span_attributes": {"type": "boolean"}
+            }
+        },
+
+        # Sampling profiler and event-loop monitor
+        "profiling": {
+            "type": "object",
+            "properties": {
+                "enabled": {"type": "boolean"},
+                "max_duration_s": {"type": "number", "exclusiveMinimum": 0, "maximum": 600},
+                "default_interval_ms": {"type": "number", "minimum": 1, "maximum": 1000},
+                "loop_monitor_interval_ms": {"type": "number", "minimum": 10, "maximum": 10000},
+                "slow_callback_threshold_ms": {"type": "number", "minimum": 10},
+                "max_slow_callbacks": {"type": "integer", "minimum": 1, "maximum": 10000},
+                "blocking_io_detection": {"type": "string", "enum": ["off", "log", "raise"]}
             }
         },
 
@@ -188,6 +306,13 @@ CONFIG_SCHEMA = {
                 "cache_ttl": {"type": "integer", "minimum": 60},
                 "cache_persist": {"type": "boolean"},
                 "cache_redis_url": {"type": "string"},
+                "cache_flush_interval": {"type": "number", "minimum": 0},
+                "cache_eviction_policy": {"type": "string", "enum": ["tinylfu", "slru", "lru"]},
+                "map_reduce_enabled": {"type": "boolean"},
+                "map_reduce_window_tokens": {"type": "integer", "minimum": 256},
+                "map_reduce_summary_tokens": {"type": "integer", "minimum": 32},
+                "map_reduce_concurrency": {"type": "integer", "minimum": 1},
+                "prefix_cache_enabled": {"type": "boolean"},
                 "error_patterns": {
                     "type": "array",
                     "items": {"type": "string"}
@@ -223,6 +348,7 @@ CONFIG_SCHEMA = {
         "memory": {
             "type": "object",
             "properties": {
+                "enabled": {"type": "boolean"},
                 "max_usage_percent": {"type": "integer", "minimum": 1, "maximum": 100},
                 "gc_threshold_percent": {"type": "integer", "minimum": 1, "maximum": 100},
                 "monitoring_interval": {"type": "integer", "minimum": 1},
@@ -230,6 +356,24 @@ CONFIG_SCHEMA = {
             }
         },
 
+        # Alert monitoring (started after the request path is ready)
+        "alerting": {
+            "type": "object",
+            "properties": {
+                "enabled": {"type": "boolean"}
+            }
+        },
+
+        # Management web UI
+        "web_ui": {
+            "type": "object",
+            "properties": {
+                "enabled": {"type": "boolean"},
+                "host": {"type": "string"},
+                "port": {"type": "integer", "minimum": 1, "maximum": 65535}
+            }
+        },
+
         # HTTP client
         "http_client": {
             "type": "object",
@@ -7,7 +7,8 @@ functionality into a single, unified system with advanced features.
 Features:
 - Single cache instance for all use cases
 - Category-based organization (models, responses, summaries, metrics)
-- Basic tiering logic (hot, warm, cold)
+- Tiered storage: hot keys in a per-worker L1, warm keys in an L2 shared by
+  the workers on the host, cold keys in an L3 disk segment store
 - Integrated warming and monitoring
 - Backward compatibility adapters
 - Memory and disk persistence
@@ -17,26 +18,31 @@ Features:
 
 import asyncio
 import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 from enum import Enum
 
 from .cache_interface import CacheStats, ICache
 from .cache_migration import CacheMigrationService
 from .cache_monitor import CacheMonitor
+from .cache_policy import FrequencySketch, serialize_value
+from .cache_tiers import (CacheTierError, DiskSegmentStore, SharedCacheTier,
+                          deserialize_value, get_shared_cache_tier)
 from .cache_warmer import CacheWarmer
 from .logging import ContextualLogger
 from .unified_cache import get_unified_cache
+from .unified_config import config_manager
 
 logger = ContextualLogger(__name__)
 
 
 class CacheTier(Enum):
     """Cache tier levels for data organization"""
-    HOT = "hot"       # Frequently accessed, fast storage
-    WARM = "warm"     # Moderately accessed, balanced storage
-    COLD = "cold"     # Rarely accessed, cost-effective storage
+    HOT = "hot"       # Frequently accessed: per-worker memory (L1)
+    WARM = "warm"     # Moderately accessed: memory shared by the workers on the host (L2)
+    COLD = "cold"     # Rarely accessed: disk segments (L3)
 
 
 class CacheCategory:
@@ -68,6 +74,10 @@ class CacheCategory:
         ]
 
 
+# Distinct keys the access-frequency sketch is sized for
+DEFAULT_TRACKED_KEYS = 10000
+
+
 class ConsolidatedCacheManager:
     """
     Enhanced Consolidated Cache Manager - Single source of truth for all caching needs
@@ -75,11 +85,28 @@ class ConsolidatedCacheManager:
     This manager provides:
     - Unified interface for all cache operations
     - Category-based cache organization
-    - Basic tiering logic (hot/warm/cold)
+    - Tiered storage (hot/warm/cold)
     - Integrated warming and monitoring
     - Automatic migration support
     - Performance optimization
     - Backward compatibility
+
+    With tiering enabled, reads go L1 -> L2 -> L3 and a hit is copied into
+    the faster tiers its key belongs to:
+
+    - L1 (HOT): the per-worker ``UnifiedCache``; no serialization or locking.
+    - L2 (WARM): ``SharedCacheTier``, shared by the workers on the host.
+      Present when the supervisor created it (or ``shared_cache_path`` is
+      given); without it L1 also holds the warm keys.
+    - L3 (COLD): ``DiskSegmentStore`` under ``cache_dir``; every write lands
+      here, so it takes over persistence from the unified cache's JSON files.
+
+    A key's tier starts at its category's default and follows its access
+    frequency (a decaying count-min sketch): it is promoted on access once it
+    reaches ``warm_access_count`` / ``hot_access_count``, and the periodic
+    rebalance demotes it again when its frequency decays. L1 copies live at
+    most ``l1_max_ttl`` seconds while an L2 exists, since a write in another
+    worker does not invalidate them.
     """
 
     def __init__(
@@ -91,7 +118,13 @@ class ConsolidatedCacheManager:
         max_memory_mb: int = 512,
         default_ttl: int = 1800,
         enable_tiering: bool = True,
-        tier_thresholds: Optional[Dict[str, int]] = None
+        tier_thresholds: Optional[Dict[str, int]] = None,
+        shared_cache_path: Optional[str] = None,
+        enable_disk_tier: bool = True,
+        disk_tier_max_mb: int = 1024,
+        disk_segment_mb: int = 64,
+        l1_max_ttl: int = 60,
+        rebalance_interval: int = 60
     ):
         self.cache_dir = cache_dir or Path.cwd() / ".cache" / "consolidated"
         self.enable_warming = enable_warming
@@ -102,12 +135,19 @@ class ConsolidatedCacheManager:
         self.enable_tiering = enable_tiering
 
         # Tier configuration
-        self.tier_thresholds = tier_thresholds or {
-            'hot_access_count': 10,      # Moves to hot tier after 10 accesses
-            'warm_access_count': 3,      # Moves to warm tier after 3 accesses
+        self.tier_thresholds = {
+            'hot_access_count': 10,      # Moves to hot tier after 10 recent accesses
+            'warm_access_count': 3,      # Moves to warm tier after 3 recent accesses
             'cold_ttl_multiplier': 0.5,  # Cold tier has 50% shorter TTL
             'hot_ttl_multiplier': 2.0,   # Hot tier has 2x longer TTL
+            **(tier_thresholds or {})
         }
+        self.shared_cache_path = shared_cache_path
+        self.enable_disk_tier = enable_disk_tier
+        self.disk_tier_max_mb = disk_tier_max_mb
+        self.disk_segment_mb = disk_segment_mb
+        self.l1_max_ttl = l1_max_ttl
+        self.rebalance_interval = rebalance_interval
 
         # Core components
         self._cache: Optional[ICache] = None
@@ -115,11 +155,19 @@ class ConsolidatedCacheManager:
         self._monitor: Optional[CacheMonitor] = None
         self._migrator: Optional[CacheMigrationService] = None
 
+        # Storage below the unified cache (L1), opened in initialize()
+        self._shared_tier: Optional[SharedCacheTier] = None
+        self._owns_shared_tier = False
+        self._disk_tier: Optional[DiskSegmentStore] = None
+        self._rebalance_task: Optional[asyncio.Task] = None
+
         # Tier management
         self._tier_assignments: Dict[str, CacheTier] = {}
+        self._assignment_categories: Dict[str, str] = {}
         self._category_tiers: Dict[str, CacheTier] = {}
-        self._tier_stats: Dict[str, Dict[str, Any]] = {
-            tier.value: {'entries': 0, 'memory_usage': 0, 'hit_rate': 0.0}
+        self._frequency = FrequencySketch(DEFAULT_TRACKED_KEYS)
+        self._tier_stats: Dict[str, Dict[str, int]] = {
+            tier.value: {'hits': 0, 'lookups': 0}
             for tier in CacheTier
         }
 
@@ -182,6 +230,12 @@ class ConsolidatedCacheManager:
                     if hasattr(unified, 'default_ttl'):
                         unified.default_ttl = self.default_ttl
 
+                if self.enable_tiering:
+                    self._open_tiers()
+                    if self._disk_tier is not None and getattr(self._cache, 'enable_disk_cache', False):
+                        # L3 takes over persistence from the per-key JSON files
+                        self._cache.enable_disk_cache = False
+
                 # Initialize warmer
                 if self.enable_warming:
                     self._warmer = CacheWarmer(
@@ -204,7 +258,13 @@ class ConsolidatedCacheManager:
                     self._migrator = CacheMigrationService()
 
                 self._running = True
-                logger.info("ConsolidatedCacheManager fully initialized")
+                if self.enable_tiering and self.rebalance_interval > 0:
+                    self._rebalance_task = asyncio.create_task(self._rebalance_loop())
+                logger.info(
+                    "ConsolidatedCacheManager fully initialized",
+                    shared_tier=self._shared_tier is not None,
+                    disk_tier=self._disk_tier is not None
+                )
 
             except Exception as e:
                 logger.error(f"Failed to initialize ConsolidatedCacheManager: {e}")
@@ -219,6 +279,37 @@ class ConsolidatedCacheManager:
             await self._monitor.stop_monitoring()
         if self._cache:
             await self._cache.stop()
+        self._close_tiers()
+
+    def _open_tiers(self) -> None:
+        """Open the shared (L2) and disk (L3) tiers; a tier that cannot be opened is skipped"""
+        try:
+            if self.shared_cache_path:
+                self._shared_tier = SharedCacheTier(self.shared_cache_path)
+                self._owns_shared_tier = True
+            else:
+                self._shared_tier = get_shared_cache_tier()
+        except (OSError, CacheTierError) as e:
+            logger.error(f"Shared cache tier unavailable, using L1 for warm keys: {e}")
+
+        if self.enable_disk_tier:
+            try:
+                self._disk_tier = DiskSegmentStore(
+                    self.cache_dir / "segments",
+                    max_bytes=self.disk_tier_max_mb * 1024 * 1024,
+                    segment_bytes=self.disk_segment_mb * 1024 * 1024
+                )
+            except (OSError, CacheTierError, ValueError) as e:
+                logger.error(f"Disk cache tier unavailable: {e}")
+
+    def _close_tiers(self) -> None:
+        if self._disk_tier is not None:
+            self._disk_tier.close()
+            self._disk_tier = None
+        if self._shared_tier is not None and self._owns_shared_tier:
+            self._shared_tier.close()
+        self._shared_tier = None
+        self._owns_shared_tier = False
 
     def _get_tier_for_category(self, category: str) -> CacheTier:
         """Get the assigned tier for a category"""
@@ -248,22 +339,116 @@ class ConsolidatedCacheManager:
         else:  # WARM
             return base_ttl
 
-    def _update_tier_assignment(self, key: str, category: str, access_count: int) -> None:
-        """Update tier assignment based on access patterns"""
+    def _update_tier_assignment(self, key: str, category: str, access_count: int) -> CacheTier:
+        """Update tier assignment based on access patterns; returns the key's tier"""
         if not self.enable_tiering:
-            return
+            return self._get_tier_for_category(category)
 
         current_tier = self._tier_assignments.get(key, self._get_tier_for_category(category))
 
         # Promote to higher tiers based on access count
         if (access_count >= self.tier_thresholds['hot_access_count'] and
             current_tier != CacheTier.HOT):
-            self._tier_assignments[key] = CacheTier.HOT
+            self._assign_tier(key, category, CacheTier.HOT)
             logger.debug(f"Promoted key {key} to HOT tier")
+            return CacheTier.HOT
         elif (access_count >= self.tier_thresholds['warm_access_count'] and
               current_tier == CacheTier.COLD):
-            self._tier_assignments[key] = CacheTier.WARM
+            self._assign_tier(key, category, CacheTier.WARM)
             logger.debug(f"Promoted key {key} to WARM tier")
+            return CacheTier.WARM
+        return current_tier
+
+    def _assign_tier(self, key: str, category: str, tier: CacheTier) -> None:
+        """Record a dynamic tier; a key back at its category's tier needs no entry"""
+        if tier == self._get_tier_for_category(category):
+            self._forget_assignment(key)
+        else:
+            self._tier_assignments[key] = tier
+            self._assignment_categories[key] = category
+
+    def _forget_assignment(self, key: str) -> None:
+        self._tier_assignments.pop(key, None)
+        self._assignment_categories.pop(key, None)
+
+    def _l1_holds(self, tier: CacheTier) -> bool:
+        """Whether keys of this tier are kept in the per-worker L1"""
+        if not self.enable_tiering or tier == CacheTier.HOT:
+            return True
+        # Without a shared tier L1 also serves the warm keys
+        return tier == CacheTier.WARM and self._shared_tier is None
+
+    def _l1_ttl(self, ttl: int) -> int:
+        """Writes in other workers do not reach this L1, so bound how long it may serve a value"""
+        return min(ttl, self.l1_max_ttl) if self._shared_tier is not None else ttl
+
+    def _count_lookup(self, tier: CacheTier, hit: bool) -> None:
+        counts = self._tier_stats[tier.value]
+        counts['lookups'] += 1
+        if hit:
+            counts['hits'] += 1
+
+    async def _get_from_tiers(self, key: str, category: str, tier: CacheTier) -> Optional[Any]:
+        """Read through L1 -> L2 -> L3, copying a hit into the faster tiers the key belongs to"""
+        value = await self._cache.get(key, category)
+        self._count_lookup(CacheTier.HOT, value is not None)
+        if value is not None or not self.enable_tiering:
+            return value
+
+        found: Optional[Tuple[bytes, float]] = None
+        if self._shared_tier is not None:
+            found = self._shared_tier.get(key)
+            self._count_lookup(CacheTier.WARM, found is not None)
+        if found is None and self._disk_tier is not None:
+            found = await asyncio.to_thread(self._disk_tier.get, key)
+            self._count_lookup(CacheTier.COLD, found is not None)
+            if found is not None and self._shared_tier is not None and tier != CacheTier.COLD:
+                self._shared_tier.set(key, found[0], found[1] - time.time(), category)
+        if found is None:
+            return None
+
+        payload, expires_at = found
+        value = deserialize_value(payload)
+        if self._l1_holds(tier):
+            remaining = max(1, int(expires_at - time.time()))
+            await self._cache.set(key, value, self._l1_ttl(remaining), category, size_bytes=len(payload))
+        return value
+
+    async def _set_in_tiers(
+        self,
+        key: str,
+        value: Any,
+        ttl: int,
+        category: str,
+        priority: int,
+        tier: CacheTier
+    ) -> bool:
+        """Write to L1 if the key is hot, to L2 unless it is cold, and always to L3"""
+        if not self.enable_tiering:
+            return await self._cache.set(key, value, ttl, category, priority)
+
+        payload = serialize_value(value)
+        stored = False
+        if self._l1_holds(tier):
+            stored = await self._cache.set(key, value, self._l1_ttl(ttl), category, priority,
+                                           size_bytes=len(payload))
+        else:
+            # A copy from when the key was hotter must not shadow the new value
+            await self._cache.delete(key)
+        if self._shared_tier is not None and tier != CacheTier.COLD:
+            stored = self._shared_tier.set(key, payload, ttl, category) or stored
+        if self._disk_tier is not None:
+            stored = await asyncio.to_thread(self._disk_tier.set, key, payload, ttl, category) or stored
+        return stored
+
+    async def _delete_from_tiers(self, key: str) -> bool:
+        self._forget_assignment(key)
+        deleted = await self._cache.delete(key)
+        if self._shared_tier is not None:
+            deleted = self._shared_tier.delete(key) or deleted
+        if self._disk_tier is not None:
+            deleted = await asyncio.to_thread(self._disk_tier.delete, key) or deleted
+        return deleted
 
     # Core ICache interface implementation with tiering support
 
@@ -275,24 +460,19 @@ class ConsolidatedCacheManager:
         self._stats.total_requests += 1
 
         try:
-            # Determine tier for this key
-            tier = self._get_tier_for_key(key, category)
+            # Every lookup counts towards the key's frequency, so a key that
+            # keeps missing in L1 is promoted before its next read
+            self._frequency.increment(key)
+            tier = self._update_tier_assignment(key, category, self._frequency.estimate(key))
+
+            # Misses count too: a key that keeps missing is what warming should fetch
+            if self._warmer:
+                self._warmer.record_access(key, category)
 
-            value = await self._cache.get(key, category)
+            value = await self._get_from_tiers(key, category, tier)
 
             if value is not None:
                 self._stats.hits += 1
-
-                # Update tier assignment based on access
-                self._update_tier_assignment(key, category, getattr(value, 'access_count', 1))
-
-                # Record access for warming
-                if self._warmer:
-                    self._warmer.record_access(key, category)
-
-                # Update tier statistics
-                self._tier_stats[tier.value]['entries'] += 1
-
             else:
                 self._stats.misses += 1
 
@@ -320,12 +500,10 @@ class ConsolidatedCacheManager:
             tier = self._get_tier_for_key(key, category)
             effective_ttl = self._calculate_tier_ttl(ttl or self.default_ttl, tier)
 
-            success = await self._cache.set(key, value, effective_ttl, category, priority)
+            success = await self._set_in_tiers(key, value, effective_ttl, category, priority, tier)
 
             if success:
                 self._stats.sets += 1
-                # Update tier statistics
-                self._tier_stats[tier.value]['entries'] += 1
 
             return success
 
@@ -339,10 +517,7 @@ class ConsolidatedCacheManager:
             raise RuntimeError("Cache not initialized")
 
         try:
-            # Remove from tier assignments
-            self._tier_assignments.pop(key, None)
-
-            success = await self._cache.delete(key)
+            success = await self._delete_from_tiers(key)
             if success:
                 self._stats.deletes += 1
             return success
@@ -358,13 +533,18 @@ class ConsolidatedCacheManager:
 
         try:
             count = await self._cache.clear(category)
+            if self._shared_tier is not None:
+                count = max(count, self._shared_tier.clear(category))
+            if self._disk_tier is not None:
+                count = max(count, await asyncio.to_thread(self._disk_tier.clear, category))
 
             # Clear tier assignments for cleared entries
             if category:
-                keys_to_remove = [k for k, t in self._tier_assignments.items()
-                                if k.startswith(f"{category}:")]
-                for key in keys_to_remove:
-                    del self._tier_assignments[key]
+                keys_to_remove = [k for k, c in self._assignment_categories.items() if c == category]
+            else:
+                keys_to_remove = list(self._tier_assignments)
+            for key in keys_to_remove:
+                self._forget_assignment(key)
 
             return count
         except Exception as e:
@@ -387,7 +567,12 @@ class ConsolidatedCacheManager:
             raise RuntimeError("Cache not initialized")
 
         try:
-            return await self._cache.get_many(keys, category)
+            results = {}
+            for key in keys:
+                value = await self.get(key, category)
+                if value is not None:
+                    results[key] = value
+            return results
         except Exception as e:
             logger.error(f"Cache get_many error: {e}")
             return {}
@@ -403,21 +588,11 @@ class ConsolidatedCacheManager:
             raise RuntimeError("Cache not initialized")
 
         try:
-            # Apply tiering to all keys
-            tiered_pairs = {}
-            for key, value in key_value_pairs.items():
-                tier = self._get_tier_for_key(key, category)
-                effective_ttl = self._calculate_tier_ttl(ttl or self.default_ttl, tier)
-                tiered_pairs[key] = (value, effective_ttl)
-
-            # Set with individual TTLs
+            # Each key gets its own tier and tier-specific TTL
             success_count = 0
-            for key, (value, effective_ttl) in tiered_pairs.items():
-                if await self._cache.set(key, value, effective_ttl, category):
+            for key, value in key_value_pairs.items():
+                if await self.set(key, value, ttl, category):
                     success_count += 1
-                    self._tier_stats[tier.value]['entries'] += 1
-
-            self._stats.sets += success_count
             return success_count
 
         except Exception as e:
@@ -430,11 +605,10 @@ class ConsolidatedCacheManager:
             raise RuntimeError("Cache not initialized")
 
         try:
-            # Remove from tier assignments
+            count = 0
             for key in keys:
-                self._tier_assignments.pop(key, None)
-
-            count = await self._cache.delete_many(keys)
+                if await self._delete_from_tiers(key):
+                    count += 1
             self._stats.deletes += count
             return count
 
@@ -479,7 +653,7 @@ class ConsolidatedCacheManager:
                 "uptime_seconds": (datetime.now() - self._start_time).total_seconds(),
                 "tiering_enabled": self.enable_tiering,
                 "tier_assignments": len(self._tier_assignments),
-                "tier_stats": self._tier_stats,
+                "tier_stats": await self._collect_tier_stats(),
                 "category_tiers": {cat: tier.value for cat, tier in self._category_tiers.items()},
                 "components": {
                     "cache": self._cache is not None,
@@ -548,15 +722,7 @@ class ConsolidatedCacheManager:
             raise RuntimeError("Cache not initialized")
 
         try:
-            count = await self._cache.clear_category(category)
-
-            # Clear tier assignments for this category
-            keys_to_remove = [k for k, t in self._tier_assignments.items()
-                            if k.startswith(f"{category}:")]
-            for key in keys_to_remove:
-                del self._tier_assignments[key]
-
-            return count
+            return await self.clear(category)
         except Exception as e:
             return 0
 
@@ -603,27 +769,91 @@ class ConsolidatedCacheManager:
             return {"tiering_disabled": True}
 
         try:
-            # Analyze access patterns and reassign tiers
-            optimizations = {
-                "reassigned_to_hot": 0,
-                "reassigned_to_warm": 0,
-                "reassigned_to_cold": 0,
-                "total_analyzed": len(self._tier_assignments)
-            }
-
-            # This is a simplified optimization - in practice, you'd analyze
-            # access patterns over time
-            for key, tier in list(self._tier_assignments.items()):
-                # Logic to reassign tiers based on recent activity
-                # For now, just maintain current assignments
-                pass
-
+            total_analyzed = len(self._tier_assignments)
+            optimizations = await self._rebalance()
+            optimizations["total_analyzed"] = total_analyzed
             return optimizations
 
         except Exception as e:
             logger.error(f"Tier optimization error: {e}")
             return {"error": str(e)}
 
+    async def _rebalance(self) -> Dict[str, int]:
+        """
+        Demote promoted keys whose access frequency has decayed.
+
+        Promotions happen on access; here a hot key that fell below the warm
+        threshold leaves L1 (copied down to L2 first), and a warm key with no
+        recent accesses leaves the memory tiers (L3 keeps its copy).
+        """
+        moved = {"reassigned_to_hot": 0, "reassigned_to_warm": 0, "reassigned_to_cold": 0}
+        for key, tier in list(self._tier_assignments.items()):
+            category = self._assignment_categories.get(key, "default")
+            estimate = self._frequency.estimate(key)
+
+            if tier == CacheTier.HOT and estimate < self.tier_thresholds['warm_access_count']:
+                await self._demote_from_l1(key, category)
+                self._assign_tier(key, category, CacheTier.WARM)
+                moved["reassigned_to_warm"] += 1
+            elif tier == CacheTier.WARM and estimate == 0:
+                if self._shared_tier is not None:
+                    self._shared_tier.delete(key)
+                elif self._disk_tier is not None:
+                    await self._cache.delete(key)
+                self._assign_tier(key, category, CacheTier.COLD)
+                moved["reassigned_to_cold"] += 1
+
+        if any(moved.values()):
+            logger.debug("Tier rebalance", **moved)
+        return moved
+
+    async def _demote_from_l1(self, key: str, category: str) -> None:
+        """Move a key's L1 copy down to L2; without an L2, L1 keeps serving it"""
+        if self._shared_tier is None:
+            return
+        entry = getattr(self._cache, '_memory_cache', {}).get(key)
+        if entry is not None:
+            remaining = entry.ttl - (time.time() - entry.timestamp)
+            if remaining > 0:
+                self._shared_tier.set(key, serialize_value(entry.value), remaining, category)
+        await self._cache.delete(key)
+
+    async def _rebalance_loop(self) -> None:
+        """Background tier rebalancing loop"""
+        while self._running:
+            try:
+                await asyncio.sleep(self.rebalance_interval)
+                await self._rebalance()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Tier rebalancing error: {e}")
+
+    async def _collect_tier_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Entries, bytes and read hit rate of each tier"""
+        stats = {}
+        for tier in CacheTier:
+            counts = self._tier_stats[tier.value]
+            stats[tier.value] = {
+                "entries": 0,
+                "memory_usage": 0,
+                "hits": counts['hits'],
+                "lookups": counts['lookups'],
+                "hit_rate": round(counts['hits'] / counts['lookups'], 4) if counts['lookups'] else 0.0
+            }
+
+        if self._cache is not None:
+            l1_stats = await self._cache.get_stats()
+            stats[CacheTier.HOT.value].update(
+                entries=l1_stats.get("entries", 0),
+                memory_usage=l1_stats.get("memory_usage_bytes", 0)
+            )
+        if self._shared_tier is not None:
+            stats[CacheTier.WARM.value].update(self._shared_tier.get_stats())
+        if self._disk_tier is not None:
+            stats[CacheTier.COLD.value].update(await asyncio.to_thread(self._disk_tier.get_stats))
+        return stats
+
     # Enhanced migration methods
 
     async def migrate_legacy_caches(self) -> Dict[str, Any]:
@@ -714,7 +944,7 @@ class ConsolidatedCacheManager:
 
             # Add tier-specific health metrics
             health["tier_health"] = {}
-            for tier_name, stats in self._tier_stats.items():
+            for tier_name, stats in (await self._collect_tier_stats()).items():
                 tier_health = {
                     "entries": stats["entries"],
                     "memory_usage": stats["memory_usage"],
@@ -742,7 +972,7 @@ class ConsolidatedCacheManager:
                     tier: len([k for k, t in self._tier_assignments.items() if t.value == tier])
                     for tier in [t.value for t in CacheTier]
                 },
-                "tier_performance": self._tier_stats,
+                "tier_performance": await self._collect_tier_stats(),
                 "category_tier_mapping": {
                     cat: tier.value for cat, tier in self._category_tiers.items()
                 }
@@ -767,12 +997,17 @@ class ConsolidatedCacheManager:
 
             try:
                 # Stop components
+                if self._rebalance_task:
+                    self._rebalance_task.cancel()
+                    await asyncio.gather(self._rebalance_task, return_exceptions=True)
+                    self._rebalance_task = None
                 if self._warmer:
                     await self._warmer.stop()
                 if self._monitor:
                     await self._monitor.stop_monitoring()
                 if self._cache:
                     await self._cache.stop()
+                self._close_tiers()
 
                 self._running = False
                 logger.info("ConsolidatedCacheManager stopped")
@@ -841,7 +1076,9 @@ class ConsolidatedCacheManager:
             return {"tiering_disabled": True}
 
         try:
-            # Analyze current tier distribution and rebalance
+            moved = await self._rebalance()
+
+            # Tier distribution after rebalancing
             rebalance_stats = {
                 "hot_tier_entries": len([k for k, t in self._tier_assignments.items()
                                        if t == CacheTier.HOT]),
@@ -849,11 +1086,8 @@ class ConsolidatedCacheManager:
                                         if t == CacheTier.WARM]),
                 "cold_tier_entries": len([k for k, t in self._tier_assignments.items()
                                         if t == CacheTier.COLD]),
-                "reassignments": 0
+                "reassignments": sum(moved.values())
             }
-
-            # Simple rebalancing logic - could be enhanced
-            # For now, just return current stats
             return rebalance_stats
 
         except Exception as e:
@@ -870,7 +1104,25 @@ async def get_consolidated_cache_manager() -> ConsolidatedCacheManager:
     global _cache_manager
 
     if _cache_manager is None:
-        _cache_manager = ConsolidatedCacheManager()
+        config = config_manager.load_config()
+
+        # Configure tiers based on unified config
+        tier_config = getattr(config.settings, 'cache_tiers', None)
+        if tier_config:
+            _cache_manager = ConsolidatedCacheManager(
+                enable_tiering=tier_config.enabled,
+                tier_thresholds={
+                    'hot_access_count': tier_config.hot_access_count,
+                    'warm_access_count': tier_config.warm_access_count
+                },
+                enable_disk_tier=tier_config.disk_tier_enabled,
+                disk_tier_max_mb=tier_config.disk_max_mb,
+                disk_segment_mb=tier_config.disk_segment_mb,
+                l1_max_ttl=tier_config.l1_max_ttl,
+                rebalance_interval=tier_config.rebalance_interval
+            )
+        else:
+            _cache_manager = ConsolidatedCacheManager()
         await _cache_manager.initialize()
 
     return _cache_manager
@@ -0,0 +1,384 @@
+"""
+Embeddings pipeline for LLM Proxy API
+Keeps embedding vectors out of Python float lists and cuts upstream calls for
+workloads that send many short inputs (e.g. indexing jobs).
+
+- Vectors are handled as little-endian float32 bytes, the same layout OpenAI
+  uses for ``encoding_format=base64``. Upstream calls ask for base64, so the
+  proxy never parses float lists; base64 clients get the vectors passed
+  through and float clients get NumPy arrays that orjson serializes natively.
+- ``EmbeddingCache``: LRU of vectors keyed by (model, dimensions, input hash)
+  and bounded by bytes, so duplicate chunks are embedded once.
+- ``EmbeddingBatcher``: coalesces the cache misses of concurrent requests for
+  the same provider and parameters into one upstream call within a short
+  window, then splits the vectors (and token usage) back per request.
+"""
+
+import asyncio
+import base64
+import hashlib
+import sys
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.core.exceptions import APIConnectionError, InvalidRequestError
+from src.core.logging import ContextualLogger
+
+# NumPy-backed vectors if available
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# orjson serializes NumPy arrays without converting them to lists
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = ContextualLogger(__name__)
+
+VECTOR_DTYPE = '<f4'
+_BIG_ENDIAN = sys.byteorder == 'big'
+
+
+def embedding_key(model: str, dimensions: Optional[int], text: str) -> bytes:
+    """Cache key of one input: model, output dimensions and the input text"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{model}\0{dimensions or ''}\0".encode('utf-8'))
+    digest.update(text.encode('utf-8'))
+    return digest.digest()
+
+
+def decode_vector(embedding: Any) -> bytes:
+    """Upstream embedding (base64 string or float list) as float32 bytes"""
+    if isinstance(embedding, str):
+        return base64.b64decode(embedding)
+    if np is not None:
+        return np.asarray(embedding, dtype=VECTOR_DTYPE).tobytes()
+    vector = array('f', embedding)
+    if _BIG_ENDIAN:
+        vector.byteswap()
+    return vector.tobytes()
+
+
+def encode_vector(data: bytes, encoding_format: str) -> Any:
+    """float32 bytes in the representation the client asked for"""
+    if encoding_format == 'base64':
+        return base64.b64encode(data).decode('ascii')
+    if np is not None and orjson is not None:
+        return np.frombuffer(data, dtype=VECTOR_DTYPE)
+    vector = array('f')
+    vector.frombytes(data)
+    if _BIG_ENDIAN:
+        vector.byteswap()
+    return vector.tolist()
+
+
+class EmbeddingCache:
+    """LRU cache of float32 vectors bounded by total size in bytes"""
+
+    def __init__(self, max_bytes: int, ttl: Optional[float] = None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[bytes, float]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is not None and self.ttl is not None and time.monotonic() - entry[1] >= self.ttl:
+            self._remove(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: bytes, vector: bytes) -> None:
+        if len(vector) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (vector, time.monotonic())
+        self._bytes += len(vector)
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def _remove(self, key: bytes) -> None:
+        vector, _ = self._entries.pop(key)
+        self._bytes -= len(vector)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+@dataclass
+class EmbeddingResult:
+    """Vectors for one submitted input list, in input order"""
+    vectors: List[bytes]
+    prompt_tokens: int
+    model: str
+
+
+@dataclass
+class _PendingEmbedding:
+    inputs: List[str]
+    future: asyncio.Future
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent embedding calls for one provider and parameter set"""
+
+    def __init__(self,
+                 provider: Any,
+                 params: Dict[str, Any],
+                 window: float,
+                 max_inputs: int,
+                 upstream_base64: bool = True):
+        self.provider = provider
+        self.params = params
+        self.window = window
+        self.max_inputs = max_inputs
+        self.upstream_base64 = upstream_base64
+        self._pending: List[_PendingEmbedding] = []
+        self._pending_inputs = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+        self.upstream_calls = 0
+        self.batched_requests = 0
+
+    async def embed(self, inputs: List[str]) -> EmbeddingResult:
+        """Queue inputs for the next batch and wait for their vectors"""
+        loop = asyncio.get_running_loop()
+        entry = _PendingEmbedding(inputs, loop.create_future())
+        self._pending.append(entry)
+        self._pending_inputs += len(inputs)
+        if self._pending_inputs >= self.max_inputs:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await entry.future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        entries, self._pending, self._pending_inputs = self._pending, [], 0
+        if not entries:
+            return
+        task = asyncio.get_running_loop().create_task(self._run(entries))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, entries: List[_PendingEmbedding]) -> None:
+        try:
+            await self._call(entries)
+        except InvalidRequestError as e:
+            if len(entries) == 1:
+                self._fail(entries, e)
+                return
+            # One bad request must not fail the requests batched with it
+            logger.info("Embedding batch rejected, retrying requests individually",
+                        provider=self.provider.name, requests=len(entries))
+            await asyncio.gather(*(self._run([entry]) for entry in entries))
+        except Exception as e:
+            self._fail(entries, e)
+
+    def _fail(self, entries: List[_PendingEmbedding], error: BaseException) -> None:
+        for entry in entries:
+            if not entry.future.done():
+                entry.future.set_exception(error)
+
+    async def _call(self, entries: List[_PendingEmbedding]) -> None:
+        # Inputs shared between requests are embedded once
+        positions: Dict[str, int] = {}
+        for entry in entries:
+            for text in entry.inputs:
+                positions.setdefault(text, len(positions))
+        texts = list(positions)
+
+        request = dict(self.params, input=texts)
+        if self.upstream_base64:
+            request['encoding_format'] = 'base64'
+        self.upstream_calls += 1
+        self.batched_requests += len(entries)
+        response = await self.provider.create_embeddings(request)
+
+        vectors: List[Optional[bytes]] = [None] * len(texts)
+        for item in response.get('data', []):
+            index = item.get('index')
+            if isinstance(index, int) and 0 <= index < len(texts):
+                vectors[index] = decode_vector(item['embedding'])
+        missing = vectors.count(None)
+        if missing:
+            raise APIConnectionError(f"Upstream returned {len(texts) - missing} of {len(texts)} embeddings")
+
+        # Usage is split by input length; shared inputs are charged to each request
+        prompt_tokens = response.get('usage', {}).get('prompt_tokens', 0)
+        total_chars = sum(len(text) for text in texts) or 1
+        model = response.get('model') or self.params.get('model', '')
+        for entry in entries:
+            if entry.future.done():
+                continue
+            chars = sum(len(text) for text in entry.inputs)
+            entry.future.set_result(EmbeddingResult(
+                vectors=[vectors[positions[text]] for text in entry.inputs],
+                prompt_tokens=round(prompt_tokens * chars / total_chars),
+                model=model
+            ))
+
+
+class EmbeddingsPipeline:
+    """Cache lookup, per-provider batching and response assembly for embeddings"""
+
+    def __init__(self,
+                 batching_enabled: bool = True,
+                 batch_window: float = 0.005,
+                 max_batch_inputs: int = 512,
+                 upstream_base64: bool = True,
+                 cache: Optional[EmbeddingCache] = None):
+        self.batching_enabled = batching_enabled
+        self.batch_window = batch_window
+        self.max_batch_inputs = max_batch_inputs
+        self.upstream_base64 = upstream_base64
+        self.cache = cache
+        self._batchers: Dict[Tuple[str, Tuple], EmbeddingBatcher] = {}
+
+    def _batcher(self, provider: Any, params: Dict[str, Any]) -> EmbeddingBatcher:
+        key = (provider.name, tuple(sorted((k, repr(v)) for k, v in params.items())))
+        batcher = self._batchers.get(key)
+        if batcher is None or batcher.provider is not provider:
+            batcher = self._batchers[key] = EmbeddingBatcher(
+                provider, params,
+                window=self.batch_window if self.batching_enabled else 0.0,
+                max_inputs=self.max_batch_inputs if self.batching_enabled else 1,
+                upstream_base64=self.upstream_base64
+            )
+        return batcher
+
+    async def embed_with(self, provider: Any, request: Dict[str, Any]) -> EmbeddingResult:
+        """Embed ``request['input']`` with one provider (router method for embeddings)"""
+        params = {k: v for k, v in request.items() if k not in ('input', 'encoding_format')}
+        return await self._batcher(provider, params).embed(list(request['input']))
+
+    async def create(self,
+                     request_data: Dict[str, Any],
+                     route: Callable[[Dict[str, Any]], Awaitable[EmbeddingResult]]) -> Tuple[Dict[str, Any], int]:
+        """
+        Build an OpenAI embeddings response, sending only uncached inputs to ``route``.
+        Returns the response body and how many inputs were served from the cache.
+        """
+        inputs = request_data['input']
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        for index, text in enumerate(inputs):
+            if not isinstance(text, str) or not text:
+                raise InvalidRequestError("Embedding inputs must be non-empty strings",
+                                          param=f"input[{index}]", code="invalid_input")
+        encoding_format = request_data.get('encoding_format') or 'float'
+        if encoding_format not in ('float', 'base64'):
+            raise InvalidRequestError("encoding_format must be 'float' or 'base64'",
+                                      param="encoding_format", code="invalid_value")
+        model = request_data['model']
+        dimensions = request_data.get('dimensions')
+
+        keys = [embedding_key(model, dimensions, text) for text in inputs]
+        vectors = [self.cache.get(key) for key in keys] if self.cache is not None else [None] * len(inputs)
+        misses = list(dict.fromkeys(text for text, vector in zip(inputs, vectors) if vector is None))
+        cached = len(inputs) - sum(1 for vector in vectors if vector is None)
+
+        prompt_tokens = 0
+        if misses:
+            params = {k: v for k, v in request_data.items() if k not in ('input', 'encoding_format')}
+            result = await route(dict(params, input=misses))
+            fresh = dict(zip(misses, result.vectors))
+            for i, text in enumerate(inputs):
+                if vectors[i] is None:
+                    vectors[i] = fresh[text]
+            if self.cache is not None:
+                for text, vector in fresh.items():
+                    self.cache.put(embedding_key(model, dimensions, text), vector)
+            prompt_tokens = result.prompt_tokens
+            model = result.model or model
+
+        body = {
+            "object": "list",
+            "data": [
+                {"object": "embedding", "index": i, "embedding": encode_vector(vector, encoding_format)}
+                for i, vector in enumerate(vectors)
+            ],
+            "model": model,
+            "usage": {"prompt_tokens": prompt_tokens, "total_tokens": prompt_tokens}
+        }
+        return body, cached
+
+    def get_stats(self) -> Dict[str, Any]:
+        upstream_calls = sum(b.upstream_calls for b in self._batchers.values())
+        batched_requests = sum(b.batched_requests for b in self._batchers.values())
+        return {
+            "batching_enabled": self.batching_enabled,
+            "upstream_calls": upstream_calls,
+            "batched_requests": batched_requests,
+            "requests_per_call": batched_requests / upstream_calls if upstream_calls else 0.0,
+            "cache": self.cache.get_stats() if self.cache is not None else None
+        }
+
+
+# Global embeddings pipeline
+_embeddings_pipeline: Optional[EmbeddingsPipeline] = None
+
+
+def _embeddings_settings() -> Any:
+    """Embeddings settings from the unified config (defaults if unavailable)"""
+    try:
+        settings = getattr(config_manager.load_config().settings, 'embeddings', None)
+        if isinstance(settings, EmbeddingsSettings):
+            return settings
+    except Exception as e:
+        logger.debug(f"Using default embeddings settings: {e}")
+    return EmbeddingsSettings()
+
+
+def get_embeddings_pipeline() -> EmbeddingsPipeline:
+    """Get or create the global embeddings pipeline"""
+    global _embeddings_pipeline
+    if _embeddings_pipeline is None:
+        settings = _embeddings_settings()
+        cache = None
+        if settings.cache_enabled:
+            cache = EmbeddingCache(settings.cache_max_mb * 1024 * 1024, ttl=settings.cache_ttl)
+        _embeddings_pipeline = EmbeddingsPipeline(
+            batching_enabled=settings.batching_enabled,
+            batch_window=settings.batch_window_ms / 1000.0,
+            max_batch_inputs=settings.max_batch_inputs,
+            upstream_base64=settings.upstream_base64,
+            cache=cache
+        )
+    return _embeddings_pipeline
+
+
+# Import at the end to avoid circular imports
+from src.core.unified_config import EmbeddingsSettings, config_manager
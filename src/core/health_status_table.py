@@ -0,0 +1,244 @@
+"""
+Shared-memory provider health table for LLM Proxy API
+Lets the health worker push provider status to proxy workers on the same host
+without any polling or network round-trips on the request path.
+
+Layout of the backing file (memory-mapped by writer and readers):
+
+    magic (4s) | version (H) | reserved (H) | seq (Q) | published_at (d) | length (I) | payload
+
+The writer uses a seqlock: ``seq`` is odd while a snapshot is being written and
+even once it is complete.  Readers only decode the payload when ``seq`` has
+changed since their last read, so the steady-state cost of a lookup is a single
+8-byte read from the mapping.
+
+This module only depends on the standard library so that the standalone
+health worker can import it.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+TABLE_MAGIC = b"LPHS"
+TABLE_VERSION = 1
+HEADER_FORMAT = "<4sHHQdI"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+SEQ_OFFSET = 8
+DEFAULT_CAPACITY = 256 * 1024
+DEFAULT_MAX_AGE = 180.0  # seconds before a snapshot is considered stale
+
+
+class StatusTableError(Exception):
+    """Raised when the status table cannot be written or has an invalid layout"""
+
+
+def default_table_path() -> str:
+    """Resolve the status table location shared by the health worker and proxy"""
+    path = os.getenv("HEALTH_STATUS_TABLE_PATH")
+    if path:
+        return path
+    shm_dir = "/dev/shm"
+    base_dir = shm_dir if os.path.isdir(shm_dir) else tempfile.gettempdir()
+    return os.path.join(base_dir, "llm_proxy_health.tbl")
+
+
+class StatusTableWriter:
+    """Single-writer side of the health table (owned by the health worker)"""
+
+    def __init__(self, path: Optional[str] = None, capacity: int = DEFAULT_CAPACITY):
+        if capacity <= HEADER_SIZE:
+            raise ValueError(f"capacity must be larger than {HEADER_SIZE} bytes")
+
+        self.path = path or default_table_path()
+        self.capacity = capacity
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(self._fd).st_size != capacity:
+            os.ftruncate(self._fd, capacity)
+        self._map = mmap.mmap(self._fd, capacity)
+
+        # Continue the sequence of a previous writer so readers see a change
+        magic, version, _, seq, _, _ = struct.unpack_from(HEADER_FORMAT, self._map, 0)
+        self._seq = seq + (seq & 1) if magic == TABLE_MAGIC and version == TABLE_VERSION else 0
+
+    @property
+    def sequence(self) -> int:
+        """Sequence number of the last completed snapshot"""
+        return self._seq
+
+    def publish(self, providers: Dict[str, Dict[str, Any]]) -> int:
+        """Publish a full provider status snapshot and return its sequence number"""
+        if self._map is None:
+            raise StatusTableError("Status table writer is closed")
+
+        payload = json.dumps({"providers": providers}, separators=(",", ":"), default=str).encode("utf-8")
+        if HEADER_SIZE + len(payload) > self.capacity:
+            raise StatusTableError(
+                f"Health snapshot of {len(payload)} bytes exceeds table capacity {self.capacity}"
+            )
+
+        # Mark the snapshot as in-progress (odd sequence) before touching anything else,
+        # and only publish the even sequence once payload and length are in place
+        struct.pack_into(HEADER_FORMAT, self._map, 0,
+                         TABLE_MAGIC, TABLE_VERSION, 0, self._seq + 1, time.time(), len(payload))
+        self._map[HEADER_SIZE:HEADER_SIZE + len(payload)] = payload
+        self._seq += 2
+        struct.pack_into("<Q", self._map, SEQ_OFFSET, self._seq)
+        return self._seq
+
+    def close(self) -> None:
+        """Release the mapping (the file is kept so readers retain the last snapshot)"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class StatusTableReader:
+    """
+    Read side of the health table used on the proxy hot path.
+    Decoded snapshots are cached until the writer publishes a new sequence.
+    """
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 max_age: float = DEFAULT_MAX_AGE,
+                 reopen_interval: float = 5.0):
+        self.path = path or default_table_path()
+        self.max_age = max_age
+        self.reopen_interval = reopen_interval
+
+        self._map: Optional[mmap.mmap] = None
+        self._inode = 0
+        self._last_open_attempt = 0.0
+        self._seq = -1
+        self._published_at = 0.0
+        self._providers: Dict[str, Dict[str, Any]] = {}
+
+    def _ensure_open(self) -> bool:
+        """Map the table file, retrying at most once per reopen interval"""
+        if self._map is not None:
+            return True
+
+        now = time.monotonic()
+        if self._last_open_attempt and now - self._last_open_attempt < self.reopen_interval:
+            return False
+        self._last_open_attempt = now
+
+        try:
+            with open(self.path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                if stat.st_size <= HEADER_SIZE:
+                    return False
+                self._map = mmap.mmap(f.fileno(), stat.st_size, access=mmap.ACCESS_READ)
+                self._inode = stat.st_ino
+            return True
+        except OSError:
+            return False
+
+    def _remap_if_resized(self) -> bool:
+        """Remap the table if a restarted writer resized or recreated the file"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return True  # keep the snapshot we can still read
+        if stat.st_size == len(self._map) and stat.st_ino == self._inode:
+            return True
+
+        self.close()
+        self._last_open_attempt = 0.0
+        return self._ensure_open()
+
+    def _refresh(self) -> None:
+        """Decode the payload if the writer published a new snapshot"""
+        if not self._ensure_open():
+            return
+
+        seq = struct.unpack_from("<Q", self._map, SEQ_OFFSET)[0]
+        if seq == self._seq or seq & 1:
+            # Unchanged, or the writer is mid-update: keep the previous snapshot
+            return
+        if not self._remap_if_resized():
+            return
+
+        for _ in range(3):
+            magic, version, _, seq, published_at, length = struct.unpack_from(HEADER_FORMAT, self._map, 0)
+            if magic != TABLE_MAGIC or version != TABLE_VERSION:
+                return
+            if seq & 1 or HEADER_SIZE + length > len(self._map):
+                continue
+            payload = self._map[HEADER_SIZE:HEADER_SIZE + length]
+            if struct.unpack_from("<Q", self._map, SEQ_OFFSET)[0] != seq:
+                continue  # torn read, writer published in between
+
+            try:
+                decoded = json.loads(payload)
+            except ValueError as e:
+                logger.warning(f"Discarding undecodable health snapshot: {e}")
+                return
+
+            self._seq = seq
+            self._published_at = published_at
+            self._providers = decoded.get("providers", {})
+            return
+
+    @property
+    def sequence(self) -> int:
+        """Sequence number of the snapshot currently held by this reader"""
+        return self._seq
+
+    def is_fresh(self) -> bool:
+        """Whether the last snapshot is recent enough to be trusted"""
+        self._refresh()
+        return self._seq >= 0 and time.time() - self._published_at <= self.max_age
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return the current provider status map, or an empty dict when stale"""
+        if not self.is_fresh():
+            return {}
+        return self._providers
+
+    def get(self, provider_name: str) -> Optional[Dict[str, Any]]:
+        """Return the pushed status entry for a provider, if known and fresh"""
+        return self.snapshot().get(provider_name)
+
+    def close(self) -> None:
+        """Release the mapping"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+# Provider states published by the health worker that should be routed around
+UNHEALTHY_STATES = frozenset({"unhealthy", "circuit_open"})
+
+_status_table_reader: Optional[StatusTableReader] = None
+
+
+def get_status_table_reader() -> StatusTableReader:
+    """Get the process-wide reader for the pushed health table"""
+    global _status_table_reader
+    if _status_table_reader is None:
+        max_age = float(os.getenv("HEALTH_STATUS_MAX_AGE", DEFAULT_MAX_AGE))
+        _status_table_reader = StatusTableReader(max_age=max_age)
+    return _status_table_reader
+
+
+def is_provider_marked_unhealthy(provider_name: str) -> bool:
+    """Whether the health worker's latest fresh snapshot marks a provider as down"""
+    entry = get_status_table_reader().get(provider_name)
+    return entry is not None and entry.get("status") in UNHEALTHY_STATES
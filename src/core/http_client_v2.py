@@ -14,9 +14,15 @@ import httpx
 logger = logging.getLogger(__name__)
 
 # Import retry strategies
+from src.core.phase_timing import current_timer, trace_extensions
+from src.core.retry_budget import (current_deadline, get_retry_budget,
+                                   retry_after_from_response)
 from src.core.retry_strategies import (RetryConfig, create_retry_strategy,
                                        retry_strategy_registry)
 
+# Upstream statuses whose Retry-After header is honored across requests
+RETRY_AFTER_STATUSES = frozenset({429, 503})
+
 
 class AdvancedHTTPClient:
     """
@@ -27,6 +33,7 @@ class AdvancedHTTPClient:
     - Adaptive strategies based on success/failure history
     - Provider-specific retry configurations
     - Comprehensive error classification and handling
+    - Request deadline propagation and upstream Retry-After tracking
     """
 
     def __init__(
@@ -150,6 +157,49 @@ class AdvancedHTTPClient:
             data=data, params=params, stream=stream, **kwargs
         )
 
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ):
+        """
+        Open a streaming response (``async with client.stream(...) as response``).
+
+        The caller consumes the body, so the request is not retried; failover
+        for streams happens at the provider level.
+        """
+        if self._client is None:
+            await self.initialize()
+
+        if self._closed:
+            raise RuntimeError("HTTP client is closed")
+
+        deadline = current_deadline()
+        if deadline is not None:
+            deadline.check(f"calling {self.provider_name or url}")
+
+        timer = current_timer()
+        if timer is not None:
+            kwargs['extensions'] = trace_extensions(kwargs.get('extensions'))
+
+        start_time = time.time()
+        async with self._client.stream(method, url, headers=headers, json=json,
+                                       data=data, params=params, **kwargs) as response:
+            elapsed = time.time() - start_time
+            self.request_count += 1
+            self.total_response_time += elapsed
+            if timer is not None:
+                # Until the response headers; the body is timed as streaming
+                timer.add("upstream", elapsed)
+            yield response
+
     async def _make_request_with_retry(
         self,
         method: str,
@@ -167,6 +217,22 @@ class AdvancedHTTPClient:
         async def execute_request():
             start_time = time.time()
 
+            # Never let a single attempt outlive the request deadline
+            request_kwargs = kwargs
+            deadline = current_deadline()
+            if deadline is not None:
+                deadline.check(f"calling {self.provider_name or url}")
+                timeout = kwargs.get('timeout', self.timeout)
+                if not isinstance(timeout, (int, float)):
+                    timeout = self.timeout
+                request_kwargs = dict(kwargs)
+                request_kwargs['timeout'] = deadline.clamp(timeout)
+
+            # Queue, connect and upstream TTFB of this attempt for timed requests
+            if current_timer() is not None:
+                request_kwargs = dict(request_kwargs)
+                request_kwargs['extensions'] = trace_extensions(request_kwargs.get('extensions'))
+
             # Track connection info before request
             connection_info = None
             if self._client and hasattr(self._client, '_pool'):
@@ -185,11 +251,16 @@ class AdvancedHTTPClient:
                 json=json,
                 data=data,
                 params=params,
-                **kwargs
+                **request_kwargs
             )
 
             response_time = time.time() - start_time
 
+            if response.status_code in RETRY_AFTER_STATUSES:
+                retry_after = retry_after_from_response(response)
+                if retry_after is not None:
+                    get_retry_budget(self.provider_name or "default").defer(retry_after)
+
             # Track connection reuse (simplified approach)
             # Since httpx's pool structure is complex, we'll track based on request patterns
             # In a real scenario, connection reuse would be evident from reduced latency on subsequent requests
@@ -13,6 +13,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Dict, List, Optional, Set
 
+from .compact import DATACLASS_SLOTS
 from .logging import ContextualLogger
 from .provider_discovery import ProviderHealth, provider_discovery
 
@@ -41,7 +42,7 @@ class ProviderScore:
         pass
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ProviderLoadMetrics:
     """Real-time load metrics for a provider"""
     active_connections: int = 0
@@ -9,9 +9,9 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-import psutil
-
+from .compact import DATACLASS_SLOTS, FloatRing
 from .logging import ContextualLogger
+from .shared_state import get_shared_state
 
 logger = ContextualLogger(__name__)
 
@@ -173,6 +173,19 @@ class MetricsHistory:
     failed_requests: int
 
 
+@dataclass(**DATACLASS_SLOTS)
+class RequestRecord:
+    """Request history entry (slotted: the history keeps the last 10k requests)"""
+    timestamp: float
+    provider: str
+    model: Optional[str]
+    success: bool
+    sampled: bool
+    response_time: Optional[float] = None
+    tokens: int = 0
+    error_type: Optional[str] = None
+
+
 class MetricsPersistence:
     """Handle persistence of metrics data"""
 
@@ -489,7 +502,8 @@ class MetricsCollector:
                  enable_adaptive_sampling: bool = True):
         self.providers: Dict[str, ProviderMetrics] = {}
         self.summarization_metrics = SummarizationMetrics()
-        self.request_history = deque(maxlen=10000)  # Keep last 10k requests
+        self.request_history: deque = deque(maxlen=10000)  # Last 10k RequestRecords
+        self._sampled_in_history = 0
         self.start_time = datetime.now()
 
         # New enhanced metrics
@@ -511,7 +525,7 @@ class MetricsCollector:
         self.adaptive_sampling_target_overhead = 0.02  # Target 2% overhead
 
         # Request volume tracking for adaptive sampling
-        self._request_timestamps = deque(maxlen=1000)  # Track last 1000 request timestamps
+        self._request_timestamps = FloatRing(1000)  # Track last 1000 request timestamps
         self._adaptive_update_interval = 60  # Update sampling rate every 60 seconds
         self._last_adaptive_update = 0
         self._adaptive_task = None
@@ -601,7 +615,8 @@ class MetricsCollector:
         provider = self.get_or_create_provider(provider_name)
 
         # Track request timestamp for volume calculation
-        self._request_timestamps.append(time.time())
+        now = time.time()
+        self._request_timestamps.append(now)
 
         # Always update basic counters
         provider.total_requests += 1
@@ -618,6 +633,12 @@ class MetricsCollector:
         # Update tokens
         provider.total_tokens += tokens
 
+        # Cluster-wide totals when running under the multi-worker supervisor
+        shared = get_shared_state()
+        if shared is not None:
+            shared.incr("requests.total")
+            shared.incr("requests.successful" if success else "requests.failed")
+
         # Determine if this request should be sampled for detailed metrics
         should_sample = not self.enable_sampling or (self._sampling_counter % int(1 / self.sampling_rate)) == 0
         self._sampling_counter += 1
@@ -655,25 +676,20 @@ class MetricsCollector:
                 model_metrics.total_tokens += tokens
 
             # Add to request history (sampled)
-            self.request_history.append({
-                "timestamp": datetime.now().isoformat(),
-                "provider": provider_name,
-                "model": model_name,
-                "success": success,
-                "response_time": response_time,
-                "tokens": tokens,
-                "error_type": error_type,
-                "sampled": True
-            })
+            self._append_history(RequestRecord(now, provider_name, model_name, success, True,
+                                               response_time, tokens, error_type))
         else:
             # Add minimal entry to request history for non-sampled requests
-            self.request_history.append({
-                "timestamp": datetime.now().isoformat(),
-                "provider": provider_name,
-                "model": model_name,
-                "success": success,
-                "sampled": False
-            })
+            self._append_history(RequestRecord(now, provider_name, model_name, success, False))
+
+    def _append_history(self, record: RequestRecord) -> None:
+        """Append to the bounded request history, keeping the sampled count current"""
+        history = self.request_history
+        if len(history) == history.maxlen and history[0].sampled:
+            self._sampled_in_history -= 1
+        history.append(record)
+        if record.sampled:
+            self._sampled_in_history += 1
 
     def _categorize_error(self, error_type: str):
         """Categorize error for detailed error rate metrics"""
@@ -755,6 +771,8 @@ class MetricsCollector:
     def update_system_health(self):
         """Update system health metrics"""
         try:
+            import psutil  # Deferred: only the health monitor needs it
+
             # CPU usage
             self.system_health_metrics.cpu_percent = psutil.cpu_percent(interval=1)
 
@@ -793,7 +811,7 @@ class MetricsCollector:
         one_minute_ago = now - 60
 
         # Count requests in the last minute
-        recent_requests = sum(1 for ts in self._request_timestamps if ts > one_minute_ago)
+        recent_requests = self._request_timestamps.count_since(one_minute_ago)
         return recent_requests / 60.0
 
     def _calculate_system_load_score(self) -> float:
@@ -872,7 +890,7 @@ class MetricsCollector:
         failed_requests = sum(p.failed_requests for p in self.providers.values())
 
         # Calculate sampling statistics
-        sampled_requests = sum(1 for req in self.request_history if req.get("sampled", False))
+        sampled_requests = self._sampled_in_history
         total_history_requests = len(self.request_history)
 
         return {
@@ -889,6 +907,7 @@ class MetricsCollector:
             "failed_requests": failed_requests,
             "overall_success_rate": (successful_requests / total_requests) if total_requests > 0 else 0,
             "request_history_size": len(self.request_history),
+            "cluster": self.get_cluster_stats(),
             "sampling": {
                 "enabled": self.enable_sampling,
                 "sampling_rate": self.sampling_rate,
@@ -907,6 +926,19 @@ class MetricsCollector:
             }
         }
 
+    def get_cluster_stats(self) -> Optional[Dict[str, Any]]:
+        """Request totals across all workers (None in single-process mode)"""
+        shared = get_shared_state()
+        if shared is None:
+            return None
+        counters = shared.get_counters(["requests.total", "requests.successful", "requests.failed"])
+        return {
+            "workers": shared.workers,
+            "total_requests": counters["requests.total"],
+            "successful_requests": counters["requests.successful"],
+            "failed_requests": counters["requests.failed"],
+        }
+
     def get_model_stats(self, provider_name: str, model_name: str) -> Optional[Dict[str, Any]]:
         """Get stats for a specific model"""
         provider = self.providers.get(provider_name)
@@ -1027,6 +1059,7 @@ class MetricsCollector:
         """Reset all metrics"""
         self.providers.clear()
         self.request_history.clear()
+        self._sampled_in_history = 0
         self.start_time = datetime.now()
         self.summarization_metrics = SummarizationMetrics()
 
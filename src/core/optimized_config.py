@@ -14,6 +14,7 @@ import asyncio
 import hashlib
 import json
 import logging
+import os
 import time
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
@@ -149,7 +150,7 @@ class OptimizedConfigLoader:
     NON_CRITICAL_SECTIONS = {
         'telemetry', 'chaos_engineering', 'templates',
         'condensation', 'caching', 'memory', 'http_client',
-        'load_testing', 'network_simulation'
+        'load_testing', 'network_simulation', 'alerting', 'web_ui'
     }
 
     def __init__(self, config_path: Path, enable_watching: bool = True):
@@ -341,7 +342,7 @@ class OptimizedConfigLoader:
         self.cache.clear()
 
 # Global instance
-config_loader = OptimizedConfigLoader(Path("config.yaml"))
+config_loader = OptimizedConfigLoader(Path(os.getenv("PROXY_API_CONFIG_FILE", "config.yaml")))
 
 # Convenience functions
 async def load_critical_config() -> Dict[str, Any]:
@@ -11,10 +11,12 @@ from enum import Enum
 from typing import Any, Dict, List, Optional
 
 from .circuit_breaker import get_circuit_breaker
+from .compact import DATACLASS_SLOTS
 from .exceptions import ProviderError
 from .logging import ContextualLogger
 from .provider_discovery import provider_discovery
 from .provider_factory import BaseProvider, provider_factory
+from .retry_budget import current_deadline, deadline_scope, get_retry_budget
 
 logger = ContextualLogger(__name__)
 
@@ -38,7 +40,7 @@ class ParallelExecutionResult:
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ProviderAttempt:
     """Record of a single provider attempt"""
     provider_name: str
@@ -100,6 +102,9 @@ class ParallelFallbackEngine:
         self._execution_count += 1
 
         timeout = timeout or self.default_timeout
+        deadline = current_deadline()
+        if deadline is not None:
+            timeout = deadline.clamp(timeout)
         max_providers = min(max_providers or self.max_concurrent_providers, self.max_concurrent_providers)
 
         # Get healthy providers for the model
@@ -112,8 +117,15 @@ class ParallelFallbackEngine:
                 latency_ms=(time.time() - start_time) * 1000
             )
 
-        # Limit to max_providers
-        selected_providers = candidate_providers[:max_providers]
+        # Limit to max_providers, then drop providers backing off and hedges the budget can't pay for
+        selected_providers = self._apply_retry_budgets(candidate_providers[:max_providers])
+
+        if not selected_providers:
+            return ParallelExecutionResult(
+                success=False,
+                error="All providers requested a backoff (Retry-After)",
+                latency_ms=(time.time() - start_time) * 1000
+            )
 
         logger.info(
             f"Starting parallel execution {execution_id}",
@@ -127,24 +139,26 @@ class ParallelFallbackEngine:
         )
 
         try:
-            if execution_mode == ParallelExecutionMode.FIRST_SUCCESS:
-                return await self._execute_first_success(
-                    execution_id, selected_providers, request_data, timeout
-                )
-            elif execution_mode == ParallelExecutionMode.BEST_RESPONSE:
-                return await self._execute_best_response(
-                    execution_id, selected_providers, request_data, timeout
-                )
-            elif execution_mode == ParallelExecutionMode.LOAD_BALANCED:
-                return await self._execute_load_balanced(
-                    execution_id, selected_providers, request_data, timeout
-                )
-            elif execution_mode == ParallelExecutionMode.ADAPTIVE:
-                return await self._execute_adaptive(
-                    execution_id, selected_providers, request_data, timeout
-                )
-            else:
-                raise ValueError(f"Unsupported execution mode: {execution_mode}")
+            # Provider calls inherit the deadline so their retries stop with it
+            with deadline_scope(timeout):
+                if execution_mode == ParallelExecutionMode.FIRST_SUCCESS:
+                    return await self._execute_first_success(
+                        execution_id, selected_providers, request_data, timeout
+                    )
+                elif execution_mode == ParallelExecutionMode.BEST_RESPONSE:
+                    return await self._execute_best_response(
+                        execution_id, selected_providers, request_data, timeout
+                    )
+                elif execution_mode == ParallelExecutionMode.LOAD_BALANCED:
+                    return await self._execute_load_balanced(
+                        execution_id, selected_providers, request_data, timeout
+                    )
+                elif execution_mode == ParallelExecutionMode.ADAPTIVE:
+                    return await self._execute_adaptive(
+                        execution_id, selected_providers, request_data, timeout
+                    )
+                else:
+                    raise ValueError(f"Unsupported execution mode: {execution_mode}")
 
         except Exception as e:
             logger.error(f"Parallel execution {execution_id} failed: {e}")
@@ -154,6 +168,23 @@ class ParallelFallbackEngine:
                 latency_ms=(time.time() - start_time) * 1000
             )
 
+    def _apply_retry_budgets(self, providers: List[str]) -> List[str]:
+        """
+        Hedged parallel calls are extra upstream load: the first provider is the
+        primary request, every additional one has to be paid for by its retry budget.
+        Providers that answered with Retry-After are skipped until it has elapsed.
+        """
+        selected: List[str] = []
+        for provider_name in providers:
+            budget = get_retry_budget(provider_name)
+            if budget.retry_after() > 0:
+                continue
+            if selected and not budget.try_acquire():
+                logger.debug(f"Retry budget exhausted, not hedging to {provider_name}")
+                continue
+            selected.append(provider_name)
+        return selected
+
     async def _execute_first_success(
         self,
         execution_id: str,
@@ -0,0 +1,278 @@
+"""
+Per-request phase timing for LLM Proxy API
+
+Splits a request's latency into named phases, so a slow request can be
+attributed to the proxy or to the upstream:
+
+    rate_limit, auth     gateway checks
+    validation           request body parsing and validation
+    routing              provider selection, config, deadline and budget checks
+    upstream             the provider's HTTP call (retries included)
+      queue              waiting for a pooled connection
+      connect            TCP connect and TLS handshake
+      upstream_ttfb      request sent until the upstream response headers
+    streaming            first to last streamed chunk
+    post_processing      building the response
+    metrics              recording request metrics
+
+- ``PhaseTimer``: phase durations of one request, bound to the request by the
+  gateway through a context variable (tasks created inside inherit it).
+- ``phase(name)``: times a block into the current request's timer. Outside a
+  timed request it returns a shared no-op, so disabled timing costs one
+  context variable lookup per phase.
+- ``HTTPTrace``: httpx ``trace`` extension that derives queue, connect and
+  upstream TTFB from httpcore's connection events.
+- ``phase_histograms``: per-phase latency histograms, fed once per finished
+  request and exported as JSON and Prometheus text.
+"""
+
+import bisect
+import contextvars
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+# Phases that wait on the upstream; everything else is proxy time
+UPSTREAM_PHASES = ("upstream", "streaming")
+
+# Histogram bucket upper bounds in milliseconds
+DEFAULT_BUCKETS_MS: Tuple[float, ...] = (
+    0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000
+)
+
+
+class PhaseTimer:
+    """Accumulated phase durations (seconds) of one request"""
+
+    __slots__ = ("started", "durations")
+
+    def __init__(self, started: Optional[float] = None):
+        self.started = time.perf_counter() if started is None else started
+        self.durations: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add time to a phase; phases entered several times (retries, fallbacks) accumulate"""
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def phase(self, name: str) -> "_Phase":
+        return _Phase(self, name)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def milliseconds(self, total: Optional[float] = None) -> Dict[str, float]:
+        """Phase durations in ms, plus ``proxy`` (time outside upstream phases) and ``total``"""
+        total = self.elapsed() if total is None else total
+        result = {name: seconds * 1000.0 for name, seconds in self.durations.items()}
+        upstream = sum(self.durations.get(name, 0.0) for name in UPSTREAM_PHASES)
+        result["proxy"] = max(0.0, total - upstream) * 1000.0
+        result["total"] = total * 1000.0
+        return result
+
+    def server_timing(self, total: Optional[float] = None) -> str:
+        """``Server-Timing`` header value for the phases recorded so far"""
+        return ", ".join(f"{name};dur={ms:.2f}" for name, ms in self.milliseconds(total).items())
+
+
+class _Phase:
+    __slots__ = ("timer", "name", "started")
+
+    def __init__(self, timer: PhaseTimer, name: str):
+        self.timer = timer
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self) -> "_Phase":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.timer.add(self.name, time.perf_counter() - self.started)
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullPhase":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        return None
+
+
+_NULL_PHASE = _NullPhase()
+
+_current_timer: contextvars.ContextVar[Optional[PhaseTimer]] = contextvars.ContextVar(
+    'request_phase_timer', default=None
+)
+
+
+def current_timer() -> Optional[PhaseTimer]:
+    """Phase timer of the current request, if timing is enabled"""
+    return _current_timer.get()
+
+
+def bind_timer(timer: Optional[PhaseTimer]) -> contextvars.Token:
+    """Make ``timer`` the current request's timer; undo with ``unbind_timer``"""
+    return _current_timer.set(timer)
+
+
+def unbind_timer(token: contextvars.Token) -> None:
+    _current_timer.reset(token)
+
+
+def phase(name: str):
+    """Time the enclosed block as ``name`` for the current request (no-op when untimed)"""
+    timer = _current_timer.get()
+    if timer is None:
+        return _NULL_PHASE
+    return _Phase(timer, name)
+
+
+def time_stream(stream: AsyncIterator[Any], name: str = "streaming") -> AsyncIterator[Any]:
+    """Wrap a response stream so the time from its first to last chunk is recorded"""
+    timer = _current_timer.get()
+    if timer is None:
+        return stream
+    return _timed_stream(stream, timer, name)
+
+
+async def _timed_stream(stream: AsyncIterator[Any], timer: PhaseTimer, name: str) -> AsyncIterator[Any]:
+    first = None
+    try:
+        async for chunk in stream:
+            if first is None:
+                first = time.perf_counter()
+            yield chunk
+    finally:
+        if first is not None:
+            timer.add(name, time.perf_counter() - first)
+
+
+class HTTPTrace:
+    """
+    httpx ``trace`` extension for one upstream attempt.
+
+    Queue time runs until httpcore starts connecting or, on a reused
+    connection, starts sending the request.
+    """
+
+    __slots__ = ("timer", "started", "_queued", "_connecting", "_sent")
+
+    def __init__(self, timer: PhaseTimer):
+        self.timer = timer
+        self.started = time.perf_counter()
+        self._queued = False
+        self._connecting = 0.0
+        self._sent = 0.0
+
+    async def __call__(self, event_name: str, info: Dict[str, Any]) -> None:
+        now = time.perf_counter()
+        if event_name in ("connection.connect_tcp.started", "connection.connect_unix_socket.started",
+                          "connection.start_tls.started"):
+            self._mark_queued(now)
+            self._connecting = now
+        elif event_name in ("connection.connect_tcp.complete", "connection.connect_unix_socket.complete",
+                            "connection.start_tls.complete"):
+            if self._connecting:
+                self.timer.add("connect", now - self._connecting)
+                self._connecting = 0.0
+        elif event_name.endswith(".send_request_headers.started"):
+            self._mark_queued(now)
+            self._sent = now
+        elif event_name.endswith(".receive_response_headers.complete"):
+            if self._sent:
+                self.timer.add("upstream_ttfb", now - self._sent)
+                self._sent = 0.0
+
+    def _mark_queued(self, now: float) -> None:
+        if not self._queued:
+            self._queued = True
+            self.timer.add("queue", now - self.started)
+
+
+def trace_extensions(extensions: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """httpx request extensions with a trace callback when the request is timed"""
+    timer = _current_timer.get()
+    if timer is None:
+        return extensions
+    return {**(extensions or {}), "trace": HTTPTrace(timer)}
+
+
+class PhaseHistograms:
+    """Fixed-bucket latency histograms per phase"""
+
+    def __init__(self, buckets_ms: Tuple[float, ...] = DEFAULT_BUCKETS_MS):
+        self.buckets_ms = tuple(sorted(buckets_ms))
+        self.reset()
+
+    def reset(self) -> None:
+        # phase -> [count per bucket (+ overflow), total count, sum in ms]
+        self._counts: Dict[str, List[int]] = {}
+        self._totals: Dict[str, List[float]] = {}
+
+    def observe(self, name: str, ms: float) -> None:
+        counts = self._counts.get(name)
+        if counts is None:
+            counts = self._counts[name] = [0] * (len(self.buckets_ms) + 1)
+            self._totals[name] = [0, 0.0]
+        counts[bisect.bisect_left(self.buckets_ms, ms)] += 1
+        totals = self._totals[name]
+        totals[0] += 1
+        totals[1] += ms
+
+    def record(self, timer: PhaseTimer, total: Optional[float] = None) -> None:
+        """Observe every phase of a finished request"""
+        for name, ms in timer.milliseconds(total).items():
+            self.observe(name, ms)
+
+    def quantile(self, name: str, q: float) -> float:
+        """Approximate quantile (0..1) in ms, interpolated within the bucket"""
+        counts = self._counts.get(name)
+        if not counts:
+            return 0.0
+        rank = q * self._totals[name][0]
+        seen = 0
+        for index, count in enumerate(counts):
+            if count and seen + count >= rank:
+                lower = self.buckets_ms[index - 1] if index > 0 else 0.0
+                if index >= len(self.buckets_ms):
+                    return lower
+                return lower + (self.buckets_ms[index] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets_ms[-1]
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = {}
+        for name, (count, total_ms) in self._totals.items():
+            stats[name] = {
+                "count": count,
+                "mean_ms": round(total_ms / count, 3) if count else 0.0,
+                "p50_ms": round(self.quantile(name, 0.50), 3),
+                "p90_ms": round(self.quantile(name, 0.90), 3),
+                "p99_ms": round(self.quantile(name, 0.99), 3),
+            }
+        return stats
+
+    def to_prometheus(self,
+                      metric: str = "proxy_api_request_phase_duration_ms",
+                      label: Optional[str] = "phase",
+                      help_text: str = "Request latency per phase in milliseconds") -> str:
+        """Prometheus histogram text; with ``label=None`` the histogram names are not exported"""
+        lines = [f"# HELP {metric} {help_text}",
+                 f"# TYPE {metric} histogram"]
+        for name, counts in self._counts.items():
+            prefix = f'{label}="{name}",' if label else ""
+            selector = f'{{{label}="{name}"}}' if label else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets_ms, counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{prefix}le="{bound:g}"}} {cumulative}')
+            count, total_ms = self._totals[name]
+            lines.append(f'{metric}_bucket{{{prefix}le="+Inf"}} {count}')
+            lines.append(f'{metric}_sum{selector} {total_ms:.3f}')
+            lines.append(f'{metric}_count{selector} {count}')
+        return "\n".join(lines) + "\n"
+
+
+# Global phase histograms
+phase_histograms = PhaseHistograms()
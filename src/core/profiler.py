@@ -0,0 +1,630 @@
+"""
+Sampling profiler and event-loop monitor for LLM Proxy API
+
+- ``SamplingProfiler``: time-bounded statistical profiler. A background
+  thread reads every thread's current frame (``sys._current_frames``) at a
+  fixed interval and counts the stacks, so profiled code runs untouched and
+  the cost is one stack walk per thread per sample. Results are collapsed
+  stacks (``thread;outer;...;inner count``), the input format of
+  flamegraph.pl, inferno and speedscope.
+- ``LoopMonitor``: always-on event-loop lag and slow-callback detector. A
+  coroutine sleeps for a fixed interval and records how late it wakes up
+  (actual minus scheduled time). A watchdog thread notices when the loop has
+  not woken up for longer than the slow-callback threshold and records the
+  task that is holding the loop, with its stack, while it is still blocked.
+  Lag is also kept as a histogram for ``/v1/metrics`` and Prometheus.
+- ``BlockingIODetector``: debug mode of the loop monitor. An audit hook
+  (``sys.addaudithook``) flags synchronous file and socket I/O, ``time.sleep``
+  and subprocess starts made on the event-loop thread, with the call site and
+  the task that made them; in ``raise`` mode the call fails, so CI catches
+  new blocking calls.
+- ``GCPauseTracker``: garbage collection pauses per generation, so a stall
+  can be told apart from a GC pause.
+
+Unlike asyncio debug mode (``slow_callback_duration``), nothing here wraps
+callbacks, so the profiler and the lag monitor stay cheap enough for
+production; blocking I/O detection is meant for CI and canaries.
+"""
+
+import asyncio
+import gc
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from src.core.logging import ContextualLogger
+from src.core.phase_timing import PhaseHistograms
+
+logger = ContextualLogger(__name__)
+
+DEFAULT_SAMPLE_INTERVAL = 0.005  # 200 Hz
+MAX_STACK_DEPTH = 128
+LOOP_THREAD_LABEL = "event-loop"
+
+# Leaf frames of a thread that is waiting rather than running
+IDLE_LEAVES = frozenset({
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+})
+
+# Event-loop lag histogram bucket upper bounds in milliseconds
+LAG_BUCKETS_MS: Tuple[float, ...] = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+BLOCKING_IO_MODES = ("off", "log", "raise")
+
+# Audit events that are blocking calls when raised on the event-loop thread
+BLOCKING_IO_EVENTS = frozenset({
+    "open", "os.listdir", "os.scandir", "os.remove", "os.rename", "os.mkdir",
+    "shutil.copyfile", "shutil.rmtree", "sqlite3.connect",
+    "socket.connect", "socket.sendto", "socket.sendmsg",
+    "socket.getaddrinfo", "socket.gethostbyname", "socket.gethostbyaddr",
+    "subprocess.Popen", "time.sleep",
+})
+
+# Files opened by the import system; a lazy import is not flagged
+IMPORT_SUFFIXES = (".py", ".pyc", ".pth", ".so", ".pyd")
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class ProfilerBusyError(RuntimeError):
+    """A profile is already running"""
+
+
+class BlockingCallError(RuntimeError):
+    """Blocking I/O on the event-loop thread (blocking I/O detection in ``raise`` mode)"""
+
+
+def _short_filename(filename: str) -> str:
+    """Project-relative path for project files, ``package/module.py`` otherwise"""
+    if filename.startswith(_ROOT + os.sep):
+        return filename[len(_ROOT) + 1:]
+    head, tail = os.path.split(filename)
+    return f"{os.path.basename(head)}/{tail}" if head else tail
+
+
+def _frame_label(code) -> str:
+    # Semicolons separate frames in the collapsed format
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({_short_filename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+def _is_idle(code) -> bool:
+    return (os.path.basename(code.co_filename), code.co_name) in IDLE_LEAVES
+
+
+def format_stack(frame, limit: int = 20) -> List[str]:
+    """Innermost ``limit`` frames of a stack, outermost first, with current line numbers"""
+    stack = []
+    while frame is not None and len(stack) < limit:
+        code = frame.f_code
+        stack.append(f"{getattr(code, 'co_qualname', code.co_name)} "
+                     f"({_short_filename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def describe_task(task: Optional[asyncio.Task]) -> Dict[str, Optional[str]]:
+    """Task name and coroutine of the task that is running (None for plain callbacks)"""
+    if task is None:
+        return {"task": None, "coroutine": None}
+    coro = task.get_coro()
+    return {"task": task.get_name(), "coroutine": getattr(coro, "__qualname__", repr(coro))}
+
+
+class GCPauseTracker:
+    """Garbage collection pause times, from ``gc.callbacks``"""
+
+    def __init__(self):
+        self._started = 0.0
+        self.collecting = False
+        self.pauses: Dict[int, List[float]] = {}  # generation -> [count, total seconds, max seconds]
+
+    def install(self) -> None:
+        if self._callback not in gc.callbacks:
+            gc.callbacks.append(self._callback)
+
+    def uninstall(self) -> None:
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+
+    def _callback(self, phase: str, info: Dict[str, Any]) -> None:
+        if phase == "start":
+            self.collecting = True
+            self._started = time.perf_counter()
+            return
+        self.collecting = False
+        pause = time.perf_counter() - self._started
+        stats = self.pauses.setdefault(info.get("generation", 0), [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += pause
+        stats[2] = max(stats[2], pause)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            f"gen{generation}": {
+                "collections": count,
+                "total_ms": round(total * 1000, 3),
+                "max_ms": round(longest * 1000, 3),
+            }
+            for generation, (count, total, longest) in sorted(self.pauses.items())
+        }
+
+
+@dataclass
+class ProfileResult:
+    """Stack counts of one profiling run"""
+    started_at: float
+    duration: float
+    interval: float
+    samples: int = 0
+    stacks: Counter = field(default_factory=Counter)
+    threads: Counter = field(default_factory=Counter)
+    idle_samples: int = 0
+    sampling_time: float = 0.0
+    gc_pauses: Dict[str, Any] = field(default_factory=dict)
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, one ``frame;frame;... count`` line per distinct stack"""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+
+    def top_functions(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Functions with the most samples on top of the stack (self time)"""
+        leaves: Counter = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack[-1]] += count
+        total = sum(self.stacks.values()) or 1
+        return [{"function": name, "samples": count, "percent": round(100.0 * count / total, 2)}
+                for name, count in leaves.most_common(limit)]
+
+    def to_dict(self, top: int = 20) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at,
+            "duration_s": round(self.duration, 3),
+            "interval_ms": round(self.interval * 1000, 3),
+            "samples": self.samples,
+            "idle_samples": self.idle_samples,
+            "threads": dict(self.threads.most_common()),
+            # Share of the profiling window spent taking samples (held the GIL)
+            "overhead_percent": round(100.0 * self.sampling_time / self.duration, 3) if self.duration else 0.0,
+            "gc_pauses": self.gc_pauses,
+            "top_functions": self.top_functions(top),
+            "distinct_stacks": len(self.stacks),
+        }
+
+
+class SamplingProfiler:
+    """Statistical profiler over the event-loop thread and worker threads"""
+
+    def __init__(self, max_depth: int = MAX_STACK_DEPTH):
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self._labels: Dict[Any, str] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def profile(self,
+                duration: float,
+                interval: float = DEFAULT_SAMPLE_INTERVAL,
+                loop_thread_id: Optional[int] = None,
+                loop_only: bool = False,
+                include_idle: bool = False) -> ProfileResult:
+        """
+        Sample all threads for ``duration`` seconds (blocking; run it in a
+        worker thread). One profile runs at a time; a concurrent call raises
+        ``ProfilerBusyError``.
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+
+        gc_tracker = GCPauseTracker()
+        gc_tracker.install()
+        try:
+            return self._sample(duration, interval, loop_thread_id, loop_only, include_idle, gc_tracker)
+        finally:
+            gc_tracker.uninstall()
+            self._lock.release()
+
+    def _sample(self, duration: float, interval: float, loop_thread_id: Optional[int],
+                loop_only: bool, include_idle: bool, gc_tracker: GCPauseTracker) -> ProfileResult:
+        result = ProfileResult(started_at=time.time(), duration=0.0, interval=interval)
+        own_thread = threading.get_ident()
+        names = self._thread_names(loop_thread_id)
+        labels = self._labels
+        max_depth = self.max_depth
+
+        start = time.perf_counter()
+        deadline = start + duration
+        next_sample = start
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread or (loop_only and thread_id != loop_thread_id):
+                    continue
+                if not include_idle and _is_idle(frame.f_code):
+                    result.idle_samples += 1
+                    continue
+
+                stack = []
+                while frame is not None and len(stack) < max_depth:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = _frame_label(code)
+                    stack.append(label)
+                    frame = frame.f_back
+
+                thread_name = names.get(thread_id)
+                if thread_name is None:
+                    names = self._thread_names(loop_thread_id)
+                    thread_name = names.get(thread_id, f"thread-{thread_id}")
+                stack.append(thread_name)
+                stack.reverse()
+                result.stacks[tuple(stack)] += 1
+                result.threads[thread_name] += 1
+
+            result.samples += 1
+            result.sampling_time += time.perf_counter() - now
+
+            next_sample += interval
+            delay = next_sample - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind (GIL contention); skip the missed ticks
+                next_sample = time.perf_counter()
+
+        result.duration = time.perf_counter() - start
+        result.gc_pauses = gc_tracker.get_stats()
+        # Code objects of reloaded or unloaded modules should not live forever
+        if len(labels) > 50_000:
+            labels.clear()
+        return result
+
+    @staticmethod
+    def _thread_names(loop_thread_id: Optional[int]) -> Dict[int, str]:
+        names = {thread.ident: thread.name.replace(";", ":") for thread in threading.enumerate()}
+        if loop_thread_id is not None:
+            names[loop_thread_id] = LOOP_THREAD_LABEL
+        return names
+
+
+class BlockingIODetector:
+    """
+    Flags synchronous file and socket I/O made on the event-loop thread.
+
+    Audit hooks cannot be removed, so the hook is installed on first use and
+    returns immediately while detection is off; while on, it costs a set
+    lookup per audited event in every thread.
+    """
+
+    def __init__(self, max_events: int = 100):
+        self.mode = "off"
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
+        self.call_sites: Counter = Counter()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._recording = False
+        self._hook_installed = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def enable(self, loop: asyncio.AbstractEventLoop, loop_thread_id: int, mode: str = "log") -> None:
+        if mode not in BLOCKING_IO_MODES:
+            raise ValueError(f"Unknown blocking I/O detection mode '{mode}', expected one of {BLOCKING_IO_MODES}")
+        self._loop = loop
+        self._loop_thread_id = loop_thread_id
+        self.mode = mode
+        if mode != "off" and not self._hook_installed:
+            sys.addaudithook(self._audit)
+            self._hook_installed = True
+
+    def disable(self) -> None:
+        self.mode = "off"
+
+    def _audit(self, event: str, args: Tuple[Any, ...]) -> None:
+        if event not in BLOCKING_IO_EVENTS or self.mode == "off" or self._recording:
+            return
+        if threading.get_ident() != self._loop_thread_id or not self._is_blocking(event, args):
+            return
+
+        self._recording = True
+        try:
+            record = self._record(event, args)
+        finally:
+            self._recording = False
+        if self.mode == "raise":
+            raise BlockingCallError(f"Blocking call on the event loop: {event} {record['target']} "
+                                    f"at {record['call_site']}")
+
+    @staticmethod
+    def _is_blocking(event: str, args: Tuple[Any, ...]) -> bool:
+        if event == "open":
+            path = args[0] if args else None
+            # File descriptors and imports
+            return isinstance(path, (str, bytes, os.PathLike)) and not os.fsdecode(path).endswith(IMPORT_SUFFIXES)
+        if event in ("socket.connect", "socket.sendto", "socket.sendmsg"):
+            # asyncio's own socket calls are non-blocking
+            sock = args[0] if args else None
+            return sock is not None and sock.gettimeout() != 0.0
+        return True
+
+    def _record(self, event: str, args: Tuple[Any, ...]) -> Dict[str, Any]:
+        frame = sys._getframe(2)
+        call_site = self._call_site(frame)
+        task = describe_task(asyncio.current_task(self._loop))
+        record = {
+            "detected_at": time.time(),
+            "event": event,
+            "target": self._target(event, args),
+            "call_site": call_site,
+            **task,
+            "stack": format_stack(frame),
+        }
+        self.events.append(record)
+        self.call_sites[(event, call_site)] += 1
+        if self.call_sites[(event, call_site)] == 1:
+            logger.warning("Blocking call on the event loop",
+                           audit_event=event,
+                           target=record["target"],
+                           call_site=call_site,
+                           coroutine=task["coroutine"])
+        return record
+
+    @staticmethod
+    def _call_site(frame) -> str:
+        """Innermost project frame (falls back to the innermost frame)"""
+        first = None
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            label = f"{_short_filename(filename)}:{frame.f_lineno}"
+            if first is None:
+                first = label
+            if filename.startswith(_ROOT + os.sep) and "site-packages" not in filename:
+                return label
+            frame = frame.f_back
+        return first or "unknown"
+
+    @staticmethod
+    def _target(event: str, args: Tuple[Any, ...]) -> str:
+        if event.startswith("socket.") and event not in ("socket.getaddrinfo", "socket.gethostbyname",
+                                                           "socket.gethostbyaddr"):
+            target = args[1] if len(args) > 1 else None
+        else:
+            target = args[0] if args else None
+        text = os.fsdecode(target) if isinstance(target, (bytes, os.PathLike)) else repr(target)
+        return text if len(text) <= 200 else text[:197] + "..."
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "blocking_calls": sum(self.call_sites.values()),
+            "call_sites": [
+                {"event": event, "call_site": site, "count": count}
+                for (event, site), count in self.call_sites.most_common(20)
+            ],
+        }
+
+    def reset(self) -> None:
+        self.events.clear()
+        self.call_sites.clear()
+
+
+class LoopMonitor:
+    """Event-loop lag and slow-callback detector"""
+
+    def __init__(self,
+                 interval: float = 0.1,
+                 slow_callback_threshold: float = 0.1,
+                 max_slow_callbacks: int = 100):
+        self.interval = interval
+        self.slow_callback_threshold = slow_callback_threshold
+        self.slow_callbacks: Deque[Dict[str, Any]] = deque(maxlen=max_slow_callbacks)
+        self.gc_tracker = GCPauseTracker()
+        self.lag_histogram = PhaseHistograms(buckets_ms=LAG_BUCKETS_MS)
+        self.blocking_io = BlockingIODetector()
+        self.blocking_io_mode = "off"
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._heartbeat = 0.0
+        self._pending: Optional[Dict[str, Any]] = None
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self.lag_count = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+        self.lag_last = 0.0
+        self.slow_callback_count = 0
+        self.slow_coroutines: Counter = Counter()
+
+    def configure(self, section: Dict[str, Any]) -> None:
+        """Apply the ``profiling`` config section"""
+        self.interval = float(section.get("loop_monitor_interval_ms", self.interval * 1000)) / 1000
+        self.slow_callback_threshold = float(
+            section.get("slow_callback_threshold_ms", self.slow_callback_threshold * 1000)) / 1000
+        max_events = int(section.get("max_slow_callbacks", self.slow_callbacks.maxlen))
+        if max_events != self.slow_callbacks.maxlen:
+            self.slow_callbacks = deque(self.slow_callbacks, maxlen=max_events)
+
+        # PROXY_API_BLOCKING_IO_DETECTION turns detection on for a CI or canary run
+        mode = os.getenv("PROXY_API_BLOCKING_IO_DETECTION") or section.get("blocking_io_detection", self.blocking_io_mode)
+        # YAML reads an unquoted off as False
+        mode = "off" if mode is False or mode is None else str(mode).lower()
+        if mode not in BLOCKING_IO_MODES:
+            raise ValueError(f"Unknown blocking I/O detection mode '{mode}', expected one of {BLOCKING_IO_MODES}")
+        self.blocking_io_mode = mode
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start monitoring the running loop"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._stopped.clear()
+        self.gc_tracker.install()
+        self._task = asyncio.create_task(self._run(), name="loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor-watchdog", daemon=True)
+        self._watchdog.start()
+        if self.blocking_io_mode != "off":
+            self.blocking_io.enable(self._loop, self._loop_thread_id, self.blocking_io_mode)
+        logger.info("Event loop monitor started",
+                    interval_ms=self.interval * 1000,
+                    slow_callback_threshold_ms=self.slow_callback_threshold * 1000,
+                    blocking_io_detection=self.blocking_io_mode)
+
+    async def stop(self) -> None:
+        self.blocking_io.disable()
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join, 1.0)
+            self._watchdog = None
+        self.gc_tracker.uninstall()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record_lag(max(0.0, loop.time() - scheduled))
+
+    def record_lag(self, lag: float) -> None:
+        """Record one wake-up; lags over the threshold finish or create a slow-callback event"""
+        self._heartbeat = time.perf_counter()
+        self.lag_count += 1
+        self.lag_total += lag
+        self.lag_last = lag
+        if lag > self.lag_max:
+            self.lag_max = lag
+        self.lag_histogram.observe("lag", lag * 1000.0)
+
+        pending, self._pending = self._pending, None
+        if lag < self.slow_callback_threshold:
+            return
+        if pending is None:
+            # Shorter than the watchdog's polling granularity; the culprit is gone
+            pending = self._slow_callback_event(None, during_gc=False)
+            self.slow_callbacks.append(pending)
+            self.slow_callback_count += 1
+        pending["duration_ms"] = round(lag * 1000, 3)
+        logger.warning("Slow event loop callback",
+                       duration_ms=pending["duration_ms"],
+                       task=pending["task"],
+                       coroutine=pending["coroutine"])
+
+    def _watch(self) -> None:
+        """Watchdog thread: capture whatever blocks the loop while it is blocked"""
+        poll = max(0.005, min(self.interval, self.slow_callback_threshold) / 4)
+        while not self._stopped.wait(poll):
+            heartbeat = self._heartbeat
+            blocked = time.perf_counter() - heartbeat - self.interval
+            if blocked < self.slow_callback_threshold or self._pending is not None:
+                continue
+            if self._heartbeat != heartbeat:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            event = self._slow_callback_event(frame, during_gc=self.gc_tracker.collecting)
+            event["task"], event["coroutine"] = self._current_task_info()
+            self._pending = event
+            self.slow_callbacks.append(event)
+            self.slow_callback_count += 1
+            self.slow_coroutines[event["coroutine"] or "<callback>"] += 1
+
+    def _current_task_info(self) -> Tuple[Optional[str], Optional[str]]:
+        try:
+            info = describe_task(asyncio.current_task(self._loop))
+        except RuntimeError:
+            # The task table changed while it was read from this thread
+            return None, None
+        return info["task"], info["coroutine"]
+
+    def _slow_callback_event(self, frame, during_gc: bool) -> Dict[str, Any]:
+        return {
+            "detected_at": time.time(),
+            "duration_ms": None,
+            "task": None,
+            "coroutine": None,
+            "during_gc": during_gc,
+            "stack": format_stack(frame) if frame is not None else [],
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "interval_ms": round(self.interval * 1000, 3),
+            "slow_callback_threshold_ms": round(self.slow_callback_threshold * 1000, 3),
+            "lag_ms": {
+                "last": round(self.lag_last * 1000, 3),
+                "mean": round(self.lag_total / self.lag_count * 1000, 3) if self.lag_count else 0.0,
+                "max": round(self.lag_max * 1000, 3),
+                "p50": round(self.lag_histogram.quantile("lag", 0.50), 3),
+                "p90": round(self.lag_histogram.quantile("lag", 0.90), 3),
+                "p99": round(self.lag_histogram.quantile("lag", 0.99), 3),
+                "samples": self.lag_count,
+            },
+            "slow_callbacks": self.slow_callback_count,
+            "slow_callbacks_by_coroutine": dict(self.slow_coroutines.most_common(10)),
+            "blocking_io": self.blocking_io.get_stats(),
+            "gc_pauses": self.gc_tracker.get_stats(),
+        }
+
+    def to_prometheus(self) -> str:
+        """Lag histogram plus slow-callback and blocking-call counters"""
+        lines = [
+            self.lag_histogram.to_prometheus(metric="proxy_api_event_loop_lag_ms", label=None,
+                                             help_text="Event loop lag (actual minus scheduled wake-up) in milliseconds"),
+            "# HELP proxy_api_event_loop_slow_callbacks_total Callbacks that held the event loop past the threshold",
+            "# TYPE proxy_api_event_loop_slow_callbacks_total counter",
+            f"proxy_api_event_loop_slow_callbacks_total {self.slow_callback_count}",
+            "# HELP proxy_api_event_loop_blocking_calls_total Blocking I/O calls made on the event loop thread",
+            "# TYPE proxy_api_event_loop_blocking_calls_total counter",
+            f"proxy_api_event_loop_blocking_calls_total {sum(self.blocking_io.call_sites.values())}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def get_slow_callbacks(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Most recent slow-callback events first"""
+        events = list(reversed(self.slow_callbacks))
+        return events[:limit] if limit is not None else events
+
+    def get_blocking_calls(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Most recent blocking-call events first"""
+        events = list(reversed(self.blocking_io.events))
+        return events[:limit] if limit is not None else events
+
+    def reset(self) -> None:
+        self._reset_stats()
+        self.slow_callbacks.clear()
+        self.lag_histogram.reset()
+        self.blocking_io.reset()
+
+
+# Global profiler and loop monitor
+sampling_profiler = SamplingProfiler()
+loop_monitor = LoopMonitor()
@@ -0,0 +1,170 @@
+"""
+Precompiled request dispatch for LLM Proxy API providers
+
+Everything about an upstream call that does not depend on the request is
+resolved once, when the provider is constructed:
+
+- the API key (``PROXY_API_<ENV>`` first, then ``<ENV>``)
+- the header set (auth scheme, User-Agent and configured custom headers),
+  kept as a read-only mapping that is handed to the HTTP client as is
+- the endpoint URLs, joined from the base URL and the provider's paths
+- the pooled HTTP client for the provider
+
+Payload transforms are described as tables of ``FieldRule`` entries and
+compiled into a single function, so a provider's request mapping is one loop
+over a tuple instead of hand-written ``request.get`` chains.
+"""
+
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+from src.core.http_client_v2 import AdvancedHTTPClient, get_advanced_http_client
+from src.core.logging import ContextualLogger
+
+logger = ContextualLogger(__name__)
+
+USER_AGENT_TEMPLATE = "LLM-Proxy-API/2.0 ({name})"
+
+# Marker for "copy the field only when the request has it"
+MISSING = object()
+
+
+def resolve_api_key(api_key_env: Optional[str]) -> str:
+    """API key for a provider, preferring the PROXY_API_ prefixed variable"""
+    if not api_key_env:
+        return ""
+    return os.getenv(f"PROXY_API_{api_key_env}") or os.getenv(api_key_env, "")
+
+
+class ProviderDispatcher:
+    """Frozen headers, prebuilt URLs and a resolved client for one provider"""
+
+    __slots__ = ("provider_name", "base_url", "headers", "_base_headers",
+                 "_custom_headers", "_urls", "_client", "_client_options")
+
+    def __init__(self,
+                 provider_name: str,
+                 base_url: str,
+                 auth_headers: Mapping[str, str],
+                 custom_headers: Optional[Mapping[str, str]] = None,
+                 endpoints: Optional[Mapping[str, str]] = None,
+                 client_options: Optional[Dict[str, Any]] = None):
+        self.provider_name = provider_name
+        self.base_url = base_url.rstrip("/")
+
+        base = dict(auth_headers)
+        base["User-Agent"] = USER_AGENT_TEMPLATE.format(name=provider_name)
+        custom = dict(custom_headers or {})
+        self._base_headers = base
+        self._custom_headers = custom
+        # Custom headers from config always win, as they did per request
+        self.headers: Mapping[str, str] = MappingProxyType({**base, **custom})
+
+        self._urls: Dict[str, str] = {
+            name: self.join(path) for name, path in (endpoints or {}).items()
+        }
+        self._client_options = client_options or {}
+        self._client: AdvancedHTTPClient = get_advanced_http_client(
+            provider_name=provider_name, **self._client_options
+        )
+
+    def join(self, path: str) -> str:
+        """Absolute URL for a path relative to the base URL"""
+        if not path:
+            return self.base_url
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def url(self, endpoint: str) -> str:
+        """Prebuilt URL of a named endpoint"""
+        return self._urls[endpoint]
+
+    @property
+    def endpoints(self) -> Mapping[str, str]:
+        return MappingProxyType(self._urls)
+
+    @property
+    def client(self) -> AdvancedHTTPClient:
+        """The provider's pooled client, replaced only if it was closed"""
+        if getattr(self._client, "_closed", False) is True:
+            self._client = get_advanced_http_client(
+                provider_name=self.provider_name, **self._client_options
+            )
+        return self._client
+
+    def merge_headers(self, extra: Optional[Mapping[str, str]]) -> Mapping[str, str]:
+        """Frozen headers, or a merged copy when the call adds its own"""
+        if not extra:
+            return self.headers
+        return {**self._base_headers, **extra, **self._custom_headers}
+
+    async def request(self, method: str, url: str, headers: Optional[Mapping[str, str]] = None, **kwargs):
+        """Send one request through the provider's client"""
+        return await self.client.request(method, url, headers=self.merge_headers(headers), **kwargs)
+
+    def stream(self, method: str, url: str, headers: Optional[Mapping[str, str]] = None, **kwargs):
+        """Open a streaming response through the provider's client (async context manager)"""
+        return self.client.stream(method, url, headers=self.merge_headers(headers), **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "provider": self.provider_name,
+            "base_url": self.base_url,
+            "endpoints": dict(self._urls),
+            "header_names": sorted(self.headers),
+        }
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    """Copy ``source`` from the request to ``target`` in the upstream payload"""
+    source: str
+    target: Optional[str] = None
+    default: Any = MISSING
+    convert: Optional[Callable[[Any], Any]] = None
+    drop_none: bool = False
+
+
+PayloadTransform = Callable[[Mapping[str, Any]], Dict[str, Any]]
+
+
+def compile_payload_map(rules: Iterable[FieldRule],
+                        computed: Optional[Mapping[str, Callable[[Mapping[str, Any]], Any]]] = None,
+                        constants: Optional[Mapping[str, Any]] = None) -> PayloadTransform:
+    """
+    Compile a field mapping table into a transform function.
+
+    ``computed`` fields are produced by a function of the whole request and are
+    evaluated first, so they can reject a request before anything is copied.
+    ``constants`` are added to every payload.  Mutable defaults (lists, dicts)
+    are copied per call.
+    """
+    table: Tuple[Tuple[str, str, Any, Any, bool, bool], ...] = tuple(
+        (rule.source, rule.target or rule.source, rule.default, rule.convert,
+         rule.drop_none, isinstance(rule.default, (list, dict)))
+        for rule in rules
+    )
+    computed_items = tuple((computed or {}).items())
+    constant_items = tuple((constants or {}).items())
+
+    def transform(request: Mapping[str, Any]) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {}
+        for target, build in computed_items:
+            payload[target] = build(request)
+        for source, target, default, convert, drop_none, copy_default in table:
+            value = request.get(source, MISSING)
+            if value is MISSING:
+                if default is MISSING:
+                    continue
+                value = default.copy() if copy_default else default
+            elif convert is not None:
+                value = convert(value)
+            if value is None and drop_none:
+                continue
+            payload[target] = value
+        for target, value in constant_items:
+            payload[target] = value
+        return payload
+
+    return transform
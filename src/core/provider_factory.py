@@ -10,12 +10,13 @@ from typing import Any, Dict, List, Optional, Set, Type
 
 import httpx
 
-from src.core.http_client_v2 import (AdvancedHTTPClient,
-                                     get_advanced_http_client)
+from src.core.health_status_table import is_provider_marked_unhealthy
+from src.core.http_client_v2 import AdvancedHTTPClient
 from src.core.logging import ContextualLogger
 from src.core.metrics import metrics_collector
-from src.core.unified_config import (ProviderConfig, ProviderType,
-                                     config_manager)
+from src.core.phase_timing import phase
+from src.core.provider_dispatch import ProviderDispatcher, resolve_api_key
+from src.core.unified_config import ProviderConfig, ProviderType
 from src.models.model_info import ModelInfo
 
 logger = ContextualLogger(__name__)
@@ -53,18 +54,56 @@ class ProviderInfo:
 
 class BaseProvider(ABC):
     """Enhanced base provider with better resource management"""
-    
+
+    # Used when the config has no base URL
+    DEFAULT_BASE_URL = ""
+    # Named endpoint paths, joined to the base URL once at init
+    ENDPOINTS: Dict[str, str] = {}
+
     def __init__(self, config: ProviderConfig):
         self.config = config
         self.name = config.name
         self.models = config.models
         self.priority = config.priority
-        # Use centralized HTTP client with connection pooling
-        self._http_client: Optional[AdvancedHTTPClient] = None
+        self.api_key = resolve_api_key(config.api_key_env)
+        self.base_url = str(config.base_url or self.DEFAULT_BASE_URL).rstrip("/")
+        self.logger = ContextualLogger(f"provider.{config.name}")
+
+        self._status = ProviderStatus.HEALTHY
+        self._last_health_check = 0.0
+        self._error_count = 0
+        self._last_error: Optional[str] = None
+
+        # Headers, URLs and the pooled client are resolved once per provider
+        self.dispatcher = self._build_dispatcher()
+        self._http_client: Optional[AdvancedHTTPClient] = self.dispatcher.client
 
         # Initialize provider capabilities
         self._capabilities = self._get_capabilities()
 
+    def _auth_headers(self) -> Dict[str, str]:
+        """Authentication headers sent with every request - override for non-Bearer schemes"""
+        return {"Authorization": f"Bearer {self.api_key}"}
+
+    def _endpoints(self) -> Dict[str, str]:
+        """Endpoint paths by name - override when paths depend on config"""
+        return self.ENDPOINTS
+
+    def _build_dispatcher(self) -> ProviderDispatcher:
+        return ProviderDispatcher(
+            provider_name=self.name,
+            base_url=self.base_url,
+            auth_headers=self._auth_headers(),
+            custom_headers=getattr(self.config, 'custom_headers', None),
+            endpoints=self._endpoints(),
+            client_options={
+                "max_keepalive_connections": self.config.max_keepalive_connections,
+                "max_connections": self.config.max_connections,
+                "keepalive_expiry": self.config.keepalive_expiry,
+                "timeout": self.config.timeout,
+            },
+        )
+
     @property
     def capabilities(self) -> Set[ProviderCapability]:
         """Get provider capabilities"""
@@ -96,28 +135,7 @@ class BaseProvider(ABC):
     @property
     async def http_client(self) -> AdvancedHTTPClient:
         """Get centralized HTTP client with connection pooling"""
-        if self._http_client is None:
-            # Get configuration from config manager
-            config = config_manager.load_config()
-            http_config = config.get('http_client', {})
-
-            # Use provider-specific settings with fallback to global config
-            max_keepalive = getattr(self.config, 'max_keepalive_connections',
-                                  http_config.get('pool_limits', {}).get('max_keepalive_connections', 30))
-            max_connections = getattr(self.config, 'max_connections',
-                                    http_config.get('pool_limits', {}).get('max_connections', 100))
-            keepalive_expiry = getattr(self.config, 'keepalive_expiry',
-                                     http_config.get('pool_limits', {}).get('keepalive_timeout', 30.0))
-            timeout = getattr(self.config, 'timeout', http_config.get('timeout', 30.0))
-
-            self._http_client = get_advanced_http_client(
-                provider_name=self.name,
-                max_keepalive_connections=max_keepalive,
-                max_connections=max_connections,
-                keepalive_expiry=keepalive_expiry,
-                timeout=timeout
-            )
-
+        self._http_client = self.dispatcher.client
         return self._http_client
 
     async def close(self) -> None:
@@ -238,25 +256,20 @@ class BaseProvider(ABC):
                           method: str,
                           url: str,
                           **kwargs) -> httpx.Response:
-        """Make HTTP request using centralized HTTP client with connection pooling"""
-        client = await self.http_client
+        """Make HTTP request using centralized HTTP client with connection pooling
 
-        # Add authorization header if not present
-        if 'headers' not in kwargs:
-            kwargs['headers'] = {}
-        if 'Authorization' not in kwargs['headers'] and hasattr(self, 'api_key'):
-            kwargs['headers']['Authorization'] = f"Bearer {self.api_key}"
-
-        # Add User-Agent if not present
-        if 'User-Agent' not in kwargs['headers']:
-            kwargs['headers']['User-Agent'] = f"LLM-Proxy-API/2.0 ({self.name})"
+        Uses the provider's frozen header set; headers passed by the caller are
+        merged over the auth and User-Agent defaults, and configured custom
+        headers are applied last.
+        """
+        # The centralized client's request method includes retry logic
+        with phase("upstream"):
+            return await self.dispatcher.request(method, url, **kwargs)
 
-        # Add custom headers from config
-        if hasattr(self.config, 'custom_headers'):
-            kwargs['headers'].update(self.config.custom_headers)
+    def stream_request(self, method: str, url: str, **kwargs):
+        """Open a streaming upstream response: ``async with provider.stream_request(...) as response``"""
+        return self.dispatcher.stream(method, url, **kwargs)
 
-        # Use the centralized client's request method which includes retry logic
-        return await client.request(method, url, **kwargs)
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.close()
 
@@ -466,6 +479,12 @@ class ProviderFactory:
                     continue  # Skip providers that don't support required capability
                 providers.append(provider)
 
+        # Route around providers the health worker has pushed as down, but never
+        # leave the caller with nothing to try if every candidate is marked
+        reachable = [p for p in providers if not is_provider_marked_unhealthy(p.name)]
+        if reachable:
+            providers = reachable
+
         # Sort by priority (lower number = higher priority)
         return sorted(providers, key=lambda p: p.priority)
     
@@ -9,6 +9,7 @@ from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
 from src.core.logging import ContextualLogger
+from src.core.shared_state import get_shared_state
 
 logger = ContextualLogger(__name__)
 
@@ -68,9 +69,14 @@ class TokenBucketRateLimiter:
         self._cleanup_interval = 300  # Clean up old buckets every 5 minutes
         self._last_cleanup = time.time()
 
+        # With several workers, buckets live in the shared state plane so a
+        # client gets one budget per host instead of one per worker
+        self.shared = get_shared_state()
+
         logger.info("Token bucket rate limiter initialized",
                    capacity=self.capacity,
-                   refill_rate=self.refill_rate)
+                   refill_rate=self.refill_rate,
+                   shared=self.shared is not None)
 
     def is_allowed(self, key: str) -> tuple[bool, float]:
         """
@@ -79,6 +85,15 @@ class TokenBucketRateLimiter:
         Returns:
             Tuple of (allowed: bool, reset_time: float)
         """
+        if self.shared is not None:
+            result = self.shared.consume_token(f"rate:{key}", self.capacity, self.refill_rate)
+            if result is not None:
+                allowed, remaining = result
+                reset_time = (self.capacity - remaining) / self.refill_rate
+                if not allowed:
+                    logger.warning("Rate limit exceeded", key=key, reset_in_seconds=reset_time)
+                return allowed, reset_time
+
         # Periodic cleanup of old buckets
         self._cleanup_old_buckets()
 
@@ -134,7 +149,8 @@ class TokenBucketRateLimiter:
             "capacity": self.capacity,
             "refill_rate": self.refill_rate,
             "requests_per_minute": self.requests_per_minute,
-            "last_cleanup": self._last_cleanup
+            "last_cleanup": self._last_cleanup,
+            "shared": self.shared is not None
         }
 
     # TODO: Redis integration - placeholder for future implementation
@@ -294,6 +310,10 @@ async def token_bucket_rate_limit(request: Request) -> None:
         # If token bucket limiter is not initialized, allow the request
         return
 
+    # Already counted by the gateway middleware
+    if getattr(request.state, 'rate_limit_checked', False) is True:
+        return
+
     # Get client IP address
     client_ip = request.client.host if request.client else "unknown"
 
@@ -0,0 +1,308 @@
+"""
+Retry budgets and request deadlines for LLM Proxy API
+Bounds the extra upstream load generated by retries, provider fallbacks and
+parallel hedging, so a partial provider outage cannot turn into a retry storm.
+
+- ``Deadline``: request-scoped time limit propagated through a context variable,
+  so every layer (router, parallel engine, retry strategy, HTTP client) sees the
+  same remaining time instead of applying its own timeout.
+- ``RetryBudget``: per-provider allowance of retries, limited to a share of the
+  provider's recent successful calls plus a small floor. It also remembers
+  upstream ``Retry-After`` hints so callers do not hit a provider that asked
+  them to back off.
+"""
+
+import contextvars
+import email.utils
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from src.core.exceptions import TimeoutError as ProviderTimeoutError
+from src.core.logging import ContextualLogger
+
+logger = ContextualLogger(__name__)
+
+
+class DeadlineExceededError(ProviderTimeoutError):
+    """Raised when the request deadline expires before an upstream call is made"""
+
+    def __init__(self, message: str = "Request deadline exceeded", code: str = "deadline_exceeded"):
+        super().__init__(message, code=code)
+
+
+class Deadline:
+    """Absolute, monotonic point in time by which a request must complete"""
+
+    __slots__ = ('timeout', 'expires_at')
+
+    def __init__(self, timeout: float, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        self.timeout = timeout
+        self.expires_at = now + timeout
+
+    def remaining(self, now: Optional[float] = None) -> float:
+        """Seconds left before the deadline (never negative)"""
+        now = time.monotonic() if now is None else now
+        return max(0.0, self.expires_at - now)
+
+    def expired(self, now: Optional[float] = None) -> bool:
+        return self.remaining(now) <= 0.0
+
+    def allows(self, delay: float, now: Optional[float] = None) -> bool:
+        """Whether waiting ``delay`` seconds still leaves time for another call"""
+        return delay < self.remaining(now)
+
+    def clamp(self, timeout: Optional[float], now: Optional[float] = None) -> float:
+        """Shorten a per-call timeout so it never outlives the deadline"""
+        remaining = self.remaining(now)
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def check(self, operation: str = "request") -> None:
+        """Raise DeadlineExceededError if no time is left"""
+        if self.expired():
+            raise DeadlineExceededError(f"Deadline of {self.timeout:.1f}s exceeded before {operation}")
+
+
+_current_deadline: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar(
+    'request_deadline', default=None
+)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Deadline bound to the current request, if any"""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(timeout: float) -> Iterator[Deadline]:
+    """
+    Bind a deadline for the enclosed calls (including tasks created inside).
+    Nested scopes can only shorten the deadline, never extend it.
+    """
+    deadline = Deadline(timeout)
+    parent = _current_deadline.get()
+    if parent is not None and parent.expires_at <= deadline.expires_at:
+        deadline = parent
+
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def parse_retry_after(value: Any, now: Optional[float] = None) -> Optional[float]:
+    """Parse a Retry-After value (delta-seconds or HTTP-date) into seconds"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return max(0.0, float(value))
+    if isinstance(value, bytes):
+        value = value.decode('latin-1')
+    if not isinstance(value, str) or not value.strip():
+        return None
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    now = time.time() if now is None else now
+    return max(0.0, retry_at.timestamp() - now)
+
+
+def retry_after_from_response(response: Any) -> Optional[float]:
+    """Read the Retry-After header from an HTTP response, if present"""
+    headers = getattr(response, 'headers', None)
+    if headers is None:
+        return None
+    try:
+        value = headers.get('Retry-After') or headers.get('retry-after')
+    except Exception:
+        return None
+    return parse_retry_after(value)
+
+
+def retry_after_from_error(error: BaseException) -> Optional[float]:
+    """
+    Extract an upstream backoff hint from an exception: an explicit
+    ``retry_after`` attribute, the failed response's headers, or the
+    exception it was raised from (providers wrap httpx status errors).
+    """
+    for candidate in (error, error.__cause__, error.__context__):
+        if candidate is None:
+            continue
+        retry_after = parse_retry_after(getattr(candidate, 'retry_after', None))
+        if retry_after is None:
+            retry_after = retry_after_from_response(getattr(candidate, 'response', None))
+        if retry_after is not None:
+            return retry_after
+    return None
+
+
+class RetryBudget:
+    """
+    Per-provider retry budget.
+
+    A retry is allowed while retries in the rolling window stay below
+    ``retry_ratio`` of the successful calls in the same window, plus
+    ``min_retries_per_second`` so that quiet providers can still retry.
+    Counts live in a ring of one-second buckets with running totals, so
+    checks are O(1).
+    """
+
+    __slots__ = (
+        'name', 'retry_ratio', 'min_retries_per_second', 'window_seconds', 'bucket_count',
+        '_bucket_width', '_successes', '_retries', '_head',
+        'total_successes', 'total_retries', 'rejected_retries', '_not_before'
+    )
+
+    def __init__(self,
+                 name: str,
+                 retry_ratio: float = 0.2,
+                 min_retries_per_second: float = 1.0,
+                 window_seconds: float = 10.0):
+        if window_seconds <= 0:
+            raise ValueError("window_seconds must be positive")
+
+        self.name = name
+        self.retry_ratio = retry_ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.window_seconds = window_seconds
+        self.bucket_count = max(1, int(round(window_seconds)))
+        self._bucket_width = window_seconds / self.bucket_count
+        self._successes = [0] * self.bucket_count
+        self._retries = [0] * self.bucket_count
+        self._head = -1
+        self.total_successes = 0
+        self.total_retries = 0
+        self.rejected_retries = 0
+        self._not_before = 0.0
+
+    def _expire(self, slot: int) -> None:
+        self.total_successes -= self._successes[slot]
+        self.total_retries -= self._retries[slot]
+        self._successes[slot] = self._retries[slot] = 0
+
+    def _advance(self, now: float) -> int:
+        epoch = int(now / self._bucket_width)
+        if epoch != self._head:
+            if self._head < 0 or epoch - self._head >= self.bucket_count:
+                for slot in range(self.bucket_count):
+                    self._expire(slot)
+            else:
+                for stale_epoch in range(self._head + 1, epoch + 1):
+                    self._expire(stale_epoch % self.bucket_count)
+            self._head = epoch
+
+        return epoch % self.bucket_count
+
+    def allowed_retries(self, now: Optional[float] = None) -> float:
+        """Retries the window can currently pay for"""
+        self._advance(time.monotonic() if now is None else now)
+        return self.min_retries_per_second * self.window_seconds + self.retry_ratio * self.total_successes
+
+    def record_success(self, now: Optional[float] = None) -> None:
+        """Deposit a successful upstream call"""
+        slot = self._advance(time.monotonic() if now is None else now)
+        self._successes[slot] += 1
+        self.total_successes += 1
+
+    def can_retry(self, now: Optional[float] = None) -> bool:
+        allowed = self.allowed_retries(now)  # advances the window first
+        return self.total_retries < allowed
+
+    def try_acquire(self, now: Optional[float] = None) -> bool:
+        """Withdraw one retry from the budget; returns False when it is exhausted"""
+        now = time.monotonic() if now is None else now
+        if not self.can_retry(now):
+            self.rejected_retries += 1
+            return False
+
+        slot = self._advance(now)
+        self._retries[slot] += 1
+        self.total_retries += 1
+        return True
+
+    def defer(self, seconds: float, now: Optional[float] = None) -> None:
+        """Honor an upstream Retry-After: avoid the provider for ``seconds``"""
+        now = time.monotonic() if now is None else now
+        self._not_before = max(self._not_before, now + seconds)
+
+    def retry_after(self, now: Optional[float] = None) -> float:
+        """Seconds until the provider's Retry-After backoff ends (0 when not deferred)"""
+        now = time.monotonic() if now is None else now
+        return max(0.0, self._not_before - now)
+
+    def reset(self) -> None:
+        for slot in range(self.bucket_count):
+            self._expire(slot)
+        self._head = -1
+        self.rejected_retries = 0
+        self._not_before = 0.0
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'window_seconds': self.window_seconds,
+            'successes': self.total_successes,
+            'retries': self.total_retries,
+            'allowed_retries': round(self.allowed_retries(), 2),
+            'rejected_retries': self.rejected_retries,
+            'retry_after': round(self.retry_after(), 2),
+        }
+
+
+# Global retry budget registry
+_retry_budgets: Dict[str, RetryBudget] = {}
+
+
+def _budget_settings() -> Any:
+    """Retry budget settings from the unified config (defaults if unavailable)"""
+    try:
+        settings = getattr(config_manager.load_config().settings, 'retry_budget', None)
+        if isinstance(settings, RetryBudgetSettings):
+            return settings
+    except Exception as e:
+        logger.debug(f"Using default retry budget settings: {e}")
+    return RetryBudgetSettings()
+
+
+def get_retry_budget(name: str) -> RetryBudget:
+    """Get or create the retry budget for a provider"""
+    budget = _retry_budgets.get(name)
+    if budget is None:
+        settings = _budget_settings()
+        budget = _retry_budgets[name] = RetryBudget(
+            name,
+            retry_ratio=settings.retry_ratio,
+            min_retries_per_second=settings.min_retries_per_second,
+            window_seconds=settings.window_seconds
+        )
+    return budget
+
+
+def get_max_retry_after() -> float:
+    """Longest Retry-After worth waiting for before failing over to another provider"""
+    return _budget_settings().max_retry_after
+
+
+def get_retry_budget_metrics() -> Dict[str, Dict[str, Any]]:
+    """Get metrics for all retry budgets"""
+    return {name: budget.get_metrics() for name, budget in _retry_budgets.items()}
+
+
+def reset_all_retry_budgets() -> None:
+    """Reset all retry budgets"""
+    for budget in _retry_budgets.values():
+        budget.reset()
+
+
+# Import at the end to avoid circular imports
+from src.core.unified_config import RetryBudgetSettings, config_manager
@@ -12,9 +12,12 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Callable, Dict, Optional, Type
 
+from src.core.compact import DATACLASS_SLOTS
 from src.core.exceptions import (AuthenticationError, RateLimitError,
                                  ServiceUnavailableError)
 from src.core.logging import ContextualLogger
+from src.core.retry_budget import (current_deadline, get_max_retry_after,
+                                   get_retry_budget, retry_after_from_error)
 
 logger = ContextualLogger(__name__)
 
@@ -30,7 +33,7 @@ class ErrorType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class RetryAttempt:
     """Information about a retry attempt"""
     attempt_number: int
@@ -225,21 +228,35 @@ class RetryStrategy(ABC):
         return ErrorType.UNKNOWN
 
     async def execute_with_retry(self, func: Callable, *args, **kwargs):
-        """Execute function with retry logic"""
+        """
+        Execute function with retry logic.
+        Retries are additionally bounded by the request deadline and the
+        provider's retry budget, and never come sooner than an upstream Retry-After.
+        """
         last_exception = None
         effective_config = self.get_effective_config()  # Get general config for max_attempts
         max_attempts = effective_config['max_attempts']
+        deadline = current_deadline()
+        budget = get_retry_budget(self.provider_name or "default")
 
         for attempt in range(max_attempts + 1):
+            if deadline is not None:
+                deadline.check(f"calling {self.provider_name or 'upstream'}")
+
             try:
                 result = await func(*args, **kwargs)
                 self.history.record_success()
+                budget.record_success()
                 return result
 
             except Exception as e:
                 error_type = self.classify_error(e)
                 last_exception = e
 
+                retry_after = retry_after_from_error(e)
+                if retry_after is not None:
+                    budget.defer(retry_after)
+
                 # Don't retry on certain errors
                 if not await self.should_retry(e, attempt):
                     logger.debug(
@@ -254,8 +271,27 @@ class RetryStrategy(ABC):
 
                 # Record failure
                 delay = await self.get_delay(e, attempt)
+                if retry_after is not None:
+                    delay = max(delay, retry_after)
                 self.history.record_failure(error_type, e, delay)
 
+                if attempt >= max_attempts:
+                    break
+
+                blocked_reason = self._retry_blocked_reason(delay, retry_after, deadline, budget)
+                if blocked_reason:
+                    logger.warning(
+                        f"Not retrying {self.provider_name}",
+                        extra={
+                            'attempt': attempt,
+                            'error_type': error_type.value,
+                            'reason': blocked_reason,
+                            'delay': round(delay, 2),
+                            'error': str(e)
+                        }
+                    )
+                    break
+
                 logger.warning(
                     f"Request failed, retrying {self.provider_name}",
                     extra={
@@ -267,12 +303,23 @@ class RetryStrategy(ABC):
                     }
                 )
 
-                if attempt < max_attempts:
-                    await asyncio.sleep(delay)
+                await asyncio.sleep(delay)
 
         # All retries exhausted
         raise last_exception
 
+    def _retry_blocked_reason(self, delay: float, retry_after: Optional[float],
+                              deadline, budget) -> Optional[str]:
+        """Return why a retry must not happen, or None when it may proceed"""
+        if retry_after is not None and retry_after > get_max_retry_after():
+            return "retry_after_too_long"
+        if deadline is not None and not deadline.allows(delay):
+            return "deadline"
+        # Withdraw last so a blocked retry never consumes budget
+        if not budget.try_acquire():
+            return "retry_budget_exhausted"
+        return None
+
 
 class ExponentialBackoffStrategy(RetryStrategy):
     """Exponential backoff strategy optimized for rate limiting"""
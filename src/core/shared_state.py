@@ -0,0 +1,304 @@
+"""
+Shared state plane for multi-worker deployments of LLM Proxy API
+
+When the supervisor runs several worker processes on one host, the pieces of
+state that must agree across workers live in one memory-mapped file:
+
+- counters (cluster-wide request totals)
+- token buckets (rate limits are enforced per client, not per worker)
+- circuit breaker state (a breaker tripped in one worker opens in all)
+
+Provider health is already shared through ``health_status_table``.
+
+Layout of the backing file:
+
+    magic (4s) | version (H) | reserved (H) | slots (I) | workers (I) | slot * slots
+
+Each slot is ``key (16s) | kind (B) | aux (B) | pad (6x) | value (q) | a (d) | b (d)``
+where ``key`` is a BLAKE2b digest of the entry name.  Slots are found by linear
+probing and never deleted (idle token buckets are recycled in place), so a
+lookup is a handful of unpacks of a 48-byte struct.  Writers take an exclusive
+``flock`` on the file for the duration of one read-modify-write.
+
+This module only depends on the standard library.  Timestamps for breakers
+use ``time.monotonic()``, which is comparable between processes on one host.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: multi-worker mode is not supported
+    fcntl = None
+
+from src.core.logging import ContextualLogger
+
+logger = ContextualLogger(__name__)
+
+PLANE_MAGIC = b"LPSS"
+PLANE_VERSION = 1
+HEADER_FORMAT = "<4sHHII"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+SLOT_FORMAT = "<16sBB6xqdd"
+SLOT_SIZE = struct.calcsize(SLOT_FORMAT)
+DEFAULT_SLOTS = 65536
+MAX_PROBE = 64
+
+KIND_EMPTY = 0
+KIND_COUNTER = 1
+KIND_BUCKET = 2
+KIND_BREAKER = 3
+
+# Breaker states as stored in the aux byte
+BREAKER_CLOSED = 0
+BREAKER_OPEN = 1
+
+SHARED_STATE_ENV = "PROXY_SHARED_STATE_PATH"
+
+
+class SharedStateError(Exception):
+    """Raised when the shared state file cannot be used"""
+
+
+def default_plane_path() -> str:
+    """Location of the shared state file for this host"""
+    shm_dir = "/dev/shm"
+    base_dir = shm_dir if os.path.isdir(shm_dir) else tempfile.gettempdir()
+    return os.path.join(base_dir, f"llm_proxy_state_{os.getpid()}.bin")
+
+
+def _digest(name: str) -> bytes:
+    return hashlib.blake2b(name.encode("utf-8"), digest_size=16).digest()
+
+
+class SharedStatePlane:
+    """Cross-process counters, token buckets and breaker state in one mapped file"""
+
+    def __init__(self, path: str):
+        if fcntl is None:
+            raise SharedStateError("Shared state requires fcntl (POSIX only)")
+
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR)
+        size = os.fstat(self._fd).st_size
+        if size < HEADER_SIZE:
+            os.close(self._fd)
+            raise SharedStateError(f"Shared state file {path} is not initialized")
+        self._map = mmap.mmap(self._fd, size)
+
+        magic, version, _, slots, workers = struct.unpack_from(HEADER_FORMAT, self._map, 0)
+        if magic != PLANE_MAGIC or version != PLANE_VERSION or HEADER_SIZE + slots * SLOT_SIZE > size:
+            self.close()
+            raise SharedStateError(f"Shared state file {path} has an invalid layout")
+
+        self.slots = slots
+        self.workers = workers
+        # flock does not exclude threads sharing this descriptor
+        self._thread_lock = threading.Lock()
+        self._warned_full = False
+
+    @classmethod
+    def create(cls, path: str, slots: int = DEFAULT_SLOTS, workers: int = 1) -> "SharedStatePlane":
+        """Create (or reset) the shared state file and open it"""
+        if slots < 1:
+            raise ValueError("slots must be positive")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.ftruncate(fd, HEADER_SIZE + slots * SLOT_SIZE)
+            os.pwrite(fd, struct.pack(HEADER_FORMAT, PLANE_MAGIC, PLANE_VERSION, 0, slots, workers), 0)
+        finally:
+            os.close(fd)
+        return cls(path)
+
+    # Locking and slot lookup
+
+    def _lock(self) -> None:
+        self._thread_lock.acquire()
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+    def _unlock(self) -> None:
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+    def _offset(self, index: int) -> int:
+        return HEADER_SIZE + index * SLOT_SIZE
+
+    def _find(self, key: bytes, kind: int, create: bool) -> int:
+        """Index of the slot for ``key``, claiming an empty one if ``create``; -1 if none"""
+        start = int.from_bytes(key[:8], "little") % self.slots
+        oldest_bucket, oldest_refill = -1, float("inf")
+
+        for probe in range(min(MAX_PROBE, self.slots)):
+            index = (start + probe) % self.slots
+            slot_key, slot_kind, _, _, _, b = struct.unpack_from(SLOT_FORMAT, self._map, self._offset(index))
+            if slot_kind == KIND_EMPTY:
+                if not create:
+                    return -1
+                struct.pack_into(SLOT_FORMAT, self._map, self._offset(index), key, kind, 0, 0, 0.0, 0.0)
+                return index
+            if slot_key == key and slot_kind == kind:
+                return index
+            if slot_kind == KIND_BUCKET and b < oldest_refill:
+                oldest_bucket, oldest_refill = index, b
+
+        # Probe run is full: a new bucket replaces the least recently refilled one
+        if create and kind == KIND_BUCKET and oldest_bucket >= 0:
+            struct.pack_into(SLOT_FORMAT, self._map, self._offset(oldest_bucket), key, kind, 0, 0, 0.0, 0.0)
+            return oldest_bucket
+
+        if create and not self._warned_full:
+            self._warned_full = True
+            logger.warning("Shared state table is full; falling back to per-worker state", slots=self.slots)
+        return -1
+
+    # Counters
+
+    def incr(self, name: str, delta: int = 1) -> Optional[int]:
+        """Add ``delta`` to a cluster-wide counter and return the new value"""
+        key = _digest(name)
+        self._lock()
+        try:
+            index = self._find(key, KIND_COUNTER, create=True)
+            if index < 0:
+                return None
+            offset = self._offset(index)
+            value = struct.unpack_from(SLOT_FORMAT, self._map, offset)[3] + delta
+            struct.pack_into("<q", self._map, offset + 24, value)
+            return value
+        finally:
+            self._unlock()
+
+    def get_counters(self, names: Iterable[str]) -> Dict[str, int]:
+        """Current values of the given counters (0 when never incremented)"""
+        result = {}
+        self._lock()
+        try:
+            for name in names:
+                index = self._find(_digest(name), KIND_COUNTER, create=False)
+                result[name] = struct.unpack_from(SLOT_FORMAT, self._map, self._offset(index))[3] if index >= 0 else 0
+        finally:
+            self._unlock()
+        return result
+
+    # Token buckets
+
+    def consume_token(self, name: str, capacity: float, refill_rate: float,
+                      tokens: float = 1.0, now: Optional[float] = None) -> Optional[Tuple[bool, float]]:
+        """
+        Take ``tokens`` from a shared bucket.
+
+        Returns (allowed, tokens_remaining), or None if the table has no room
+        for this bucket and the caller should use a local one.
+        """
+        now = time.time() if now is None else now
+        key = _digest(name)
+        self._lock()
+        try:
+            index = self._find(key, KIND_BUCKET, create=True)
+            if index < 0:
+                return None
+            offset = self._offset(index)
+            _, _, initialized, _, level, last_refill = struct.unpack_from(SLOT_FORMAT, self._map, offset)
+            if not initialized:
+                level, last_refill = capacity, now
+            level = min(capacity, level + max(0.0, now - last_refill) * refill_rate)
+
+            allowed = level >= tokens
+            if allowed:
+                level -= tokens
+            struct.pack_into(SLOT_FORMAT, self._map, offset, key, KIND_BUCKET, 1, 0, level, now)
+            return allowed, level
+        finally:
+            self._unlock()
+
+    # Circuit breakers
+
+    def publish_breaker(self, name: str, state: int, opened_at: float) -> Optional[int]:
+        """Publish a breaker transition; returns the new generation of that breaker"""
+        key = _digest(name)
+        self._lock()
+        try:
+            index = self._find(key, KIND_BREAKER, create=True)
+            if index < 0:
+                return None
+            offset = self._offset(index)
+            generation = struct.unpack_from(SLOT_FORMAT, self._map, offset)[3] + 1
+            struct.pack_into(SLOT_FORMAT, self._map, offset, key, KIND_BREAKER, state, generation, opened_at, time.time())
+            return generation
+        finally:
+            self._unlock()
+
+    def read_breaker(self, name: str) -> Optional[Tuple[int, int, float]]:
+        """Latest published (generation, state, opened_at) of a breaker, if any"""
+        key = _digest(name)
+        self._lock()
+        try:
+            index = self._find(key, KIND_BREAKER, create=False)
+            if index < 0:
+                return None
+            _, _, state, generation, opened_at, _ = struct.unpack_from(SLOT_FORMAT, self._map, self._offset(index))
+            return generation, state, opened_at
+        finally:
+            self._unlock()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Slot usage by kind"""
+        kinds = {KIND_COUNTER: 0, KIND_BUCKET: 0, KIND_BREAKER: 0}
+        for index in range(self.slots):
+            kind = self._map[self._offset(index) + 16]
+            if kind in kinds:
+                kinds[kind] += 1
+        return {
+            "slots": self.slots,
+            "workers": self.workers,
+            "counters": kinds[KIND_COUNTER],
+            "buckets": kinds[KIND_BUCKET],
+            "breakers": kinds[KIND_BREAKER],
+        }
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+_shared_state: Optional[SharedStatePlane] = None
+_shared_state_pid: Optional[int] = None
+
+
+def get_shared_state() -> Optional[SharedStatePlane]:
+    """
+    The shared state plane of this worker, or None in single-process mode.
+
+    Opened lazily in each worker process (after fork) from the path exported by
+    the supervisor, so every worker holds its own descriptor and lock.
+    """
+    global _shared_state, _shared_state_pid
+    if _shared_state is not None and _shared_state_pid == os.getpid():
+        return _shared_state
+
+    path = os.getenv(SHARED_STATE_ENV)
+    if not path:
+        return None
+    try:
+        _shared_state = SharedStatePlane(path)
+        _shared_state_pid = os.getpid()
+    except (OSError, SharedStateError) as e:
+        logger.error(f"Shared state unavailable, using per-worker state: {e}")
+        os.environ.pop(SHARED_STATE_ENV, None)
+        _shared_state = None
+    return _shared_state
@@ -12,6 +12,9 @@ from dataclasses import dataclass, field
 from threading import Lock
 from typing import Any, Dict, Optional
 
+from .cache_policy import (DEFAULT_EVICTION_POLICY, create_policy,
+                           serialized_size)
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,8 +43,8 @@ class SmartCache:
     """
     Production-ready cache with:
     - TTL (Time To Live) support
-    - Size limits with LRU eviction
-    - Memory usage monitoring
+    - Size limits with W-TinyLFU eviction and admission (O(1) per eviction)
+    - Memory accounting by serialized size, with running totals
     - Cache statistics
     - Thread-safe operations
     - Intelligent key generation
@@ -53,7 +56,8 @@ class SmartCache:
         default_ttl: int = 3600,  # 1 hour
         max_memory_mb: int = 512,
         cleanup_interval: int = 300,  # 5 minutes
-        enable_compression: bool = True
+        enable_compression: bool = True,
+        eviction_policy: str = DEFAULT_EVICTION_POLICY
     ):
         self.max_size = max_size
         self.default_ttl = default_ttl
@@ -63,6 +67,8 @@ class SmartCache:
 
         # Thread-safe storage
         self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        # Eviction order, admission and byte totals
+        self._policy = create_policy(eviction_policy, self.max_memory_bytes, max_entries=max_size)
         self._lock = Lock()
 
         # Statistics
@@ -129,21 +135,6 @@ class SmartCache:
         # Generate hash for consistent key length
         return hashlib.md5(key_string.encode()).hexdigest()
 
-    def _estimate_size(self, obj: Any) -> int:
-        """Estimate memory size of object in bytes"""
-        if isinstance(obj, (str, bytes)):
-            return len(obj)
-        elif isinstance(obj, (list, tuple)):
-            return sum(self._estimate_size(item) for item in obj)
-        elif isinstance(obj, dict):
-            return sum(
-                len(str(k)) + self._estimate_size(v)
-                for k, v in obj.items()
-            )
-        else:
-            # Rough estimate for other objects
-            return 256
-
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
         with self._lock:
@@ -151,14 +142,16 @@ class SmartCache:
 
             if key not in self._cache:
                 self.misses += 1
+                self._policy.record_access(key)
                 return None
 
             entry = self._cache[key]
 
             if entry.is_expired():
                 # Remove expired entry
-                del self._cache[key]
+                self._remove_locked(key)
                 self.misses += 1
+                self._policy.record_access(key)
                 return None
 
             # Update access statistics
@@ -166,6 +159,7 @@ class SmartCache:
 
             # Move to end (most recently used)
             self._cache.move_to_end(key)
+            self._policy.touch(key)
 
             self.hits += 1
             return entry.value
@@ -175,36 +169,42 @@ class SmartCache:
         key: str,
         value: Any,
         ttl: Optional[int] = None,
-        skip_memory_check: bool = False
+        skip_memory_check: bool = False,
+        size_bytes: Optional[int] = None
     ) -> bool:
-        """Set value in cache"""
+        """
+        Set value in cache.
+
+        The entry is sized once by its serialized length; callers that
+        already hold the serialized payload (e.g. raw upstream bytes) pass
+        ``size_bytes`` to skip serialization. Entries too large for the
+        admission filter are refused unless ``skip_memory_check`` is set;
+        otherwise older entries are evicted to make room.
+        """
         if ttl is None:
             ttl = self.default_ttl
+        if size_bytes is None:
+            size_bytes = serialized_size(value)
 
         entry = CacheEntry(
             key=key,
             value=value,
             timestamp=time.time(),
             ttl=ttl,
-            size_bytes=self._estimate_size(value)
+            size_bytes=size_bytes
         )
 
         with self._lock:
-            # Check memory limits
-            if not skip_memory_check and not await self._check_memory_limit(entry.size_bytes):
-                logger.warning("Cache memory limit exceeded, skipping cache set")
+            if not skip_memory_check and not self._policy.admits(size_bytes):
+                logger.debug(f"Cache entry too large to admit: {size_bytes} bytes")
+                self._remove_locked(key)  # A stale smaller value must not outlive the update
                 return False
 
-            # Remove existing entry if present
-            if key in self._cache:
-                del self._cache[key]
-
-            # Add new entry
+            # Replace any existing entry, then evict down to the limits
             self._cache[key] = entry
             self._cache.move_to_end(key)
-
-            # Enforce size limits
-            await self._enforce_size_limit()
+            self._policy.add(key, size_bytes)
+            self._evict_locked()
 
             return True
 
@@ -212,7 +212,7 @@ class SmartCache:
         """Delete key from cache"""
         with self._lock:
             if key in self._cache:
-                del self._cache[key]
+                self._remove_locked(key)
                 return True
             return False
 
@@ -220,6 +220,7 @@ class SmartCache:
         """Clear all cache entries"""
         with self._lock:
             self._cache.clear()
+            self._policy.clear()
             logger.info("Cache cleared")
 
     async def _cleanup_expired(self):
@@ -231,59 +232,62 @@ class SmartCache:
             ]
 
             for key in expired_keys:
-                del self._cache[key]
+                self._remove_locked(key)
 
             if expired_keys:
                 logger.info(f"Cleaned up {len(expired_keys)} expired cache entries")
 
+    def _remove_locked(self, key: str) -> Optional[CacheEntry]:
+        """Drop an entry and its policy slot (caller holds the lock)"""
+        self._policy.remove(key)
+        return self._cache.pop(key, None)
+
+    def _evict_locked(self) -> int:
+        """Evict in policy order until within the entry and byte limits (caller holds the lock)"""
+        evicted = 0
+        while len(self._cache) > self.max_size or self._policy.over_budget():
+            key = self._policy.pop_victim()
+            if key is None:
+                if not self._cache:
+                    break
+                # Entries stored without going through the policy
+                key, _ = self._cache.popitem(last=False)
+            else:
+                self._cache.pop(key, None)
+            evicted += 1
+            logger.debug(f"Evicted cache entry: {key}")
+
+        self.evictions += evicted
+        return evicted
+
     async def _enforce_size_limit(self):
-        """Enforce maximum cache size using LRU eviction"""
+        """Enforce maximum cache size in eviction-policy order"""
         with self._lock:
-            while len(self._cache) > self.max_size:
-                # Remove least recently used item
-                key, entry = self._cache.popitem(last=False)
-                self.evictions += 1
-
-                logger.debug(f"Evicted cache entry: {key}")
+            self._evict_locked()
 
     async def _enforce_memory_limit(self):
-        """Enforce memory limits by evicting least recently used items"""
+        """Enforce memory limits using the running byte total"""
         with self._lock:
-            current_memory = sum(entry.size_bytes for entry in self._cache.values())
-
-            if current_memory > self.max_memory_bytes:
-                # Calculate how much memory to free (target 80% of max)
-                target_memory = int(self.max_memory_bytes * 0.8)
-                memory_to_free = current_memory - target_memory
-
-                freed_memory = 0
-                evicted_count = 0
-
-                # Evict items until we free enough memory
-                while freed_memory < memory_to_free and self._cache:
-                    key, entry = self._cache.popitem(last=False)
-                    freed_memory += entry.size_bytes
-                    evicted_count += 1
-                    self.evictions += 1
-
+            before = self._policy.total_bytes
+            evicted = self._evict_locked()
+            if evicted:
                 logger.info(
                     "Memory limit enforced",
                     extra={
-                        'freed_bytes': freed_memory,
-                        'evicted_count': evicted_count,
-                        'current_memory': current_memory - freed_memory
+                        'freed_bytes': before - self._policy.total_bytes,
+                        'evicted_count': evicted,
+                        'current_memory': self._policy.total_bytes
                     }
                 )
 
     async def _check_memory_limit(self, additional_bytes: int) -> bool:
         """Check if adding additional bytes would exceed memory limit"""
-        current_memory = sum(entry.size_bytes for entry in self._cache.values())
-        return current_memory + additional_bytes <= self.max_memory_bytes
+        return not self._policy.over_budget(additional_bytes)
 
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         with self._lock:
-            current_memory = sum(entry.size_bytes for entry in self._cache.values())
+            current_memory = self._policy.total_bytes
             hit_rate = self.hits / self.total_requests if self.total_requests > 0 else 0
 
             return {
@@ -297,7 +301,8 @@ class SmartCache:
                 'total_requests': self.total_requests,
                 'hit_rate': round(hit_rate, 4),
                 'evictions': self.evictions,
-                'default_ttl': self.default_ttl
+                'default_ttl': self.default_ttl,
+                'eviction_policy': self._policy.get_stats()
             }
 
     async def get_or_set(
@@ -0,0 +1,321 @@
+"""
+Staged startup for the LLM Proxy API
+
+The request path (config, provider factory, HTTP client, caches, auth, rate
+limiting) is initialized before the server accepts traffic. Optional
+subsystems (telemetry, memory manager, event-loop monitor, chaos engineering,
+alerting, web UI) are imported and started afterwards in a background task,
+each gated by the ``enabled`` flag of its ``config.yaml`` section, so their
+import cost never delays readiness.
+
+Also provides an import-time profile of the application, built from the
+interpreter's ``-X importtime`` output.
+"""
+
+import asyncio
+import re
+import subprocess
+import sys
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.core.logging import ContextualLogger
+
+logger = ContextualLogger(__name__)
+
+
+class StageStatus(Enum):
+    """Status of a startup stage or subsystem"""
+    PENDING = "pending"
+    RUNNING = "running"
+    READY = "ready"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+
+
+@dataclass
+class StageRecord:
+    """Timing and outcome of one startup step"""
+    name: str
+    stage: str
+    status: StageStatus = StageStatus.PENDING
+    started_at: Optional[float] = None
+    duration_ms: float = 0.0
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "stage": self.stage,
+            "status": self.status.value,
+            "duration_ms": round(self.duration_ms, 2),
+            "error": self.error,
+        }
+
+
+@dataclass
+class Subsystem:
+    """An optional subsystem started after the request path is ready"""
+    name: str
+    section: str
+    start: Callable[[Any, Dict[str, Any]], Awaitable[None]]
+    stop: Optional[Callable[[Any], Awaitable[None]]] = None
+    enabled_by_default: bool = True
+
+    def is_enabled(self, section_config: Any) -> bool:
+        if isinstance(section_config, dict):
+            return bool(section_config.get("enabled", self.enabled_by_default))
+        return self.enabled_by_default
+
+
+@dataclass
+class StartupManager:
+    """Runs the core and optional startup stages and reports their timings"""
+    subsystems: List[Subsystem] = field(default_factory=list)
+    records: List[StageRecord] = field(default_factory=list)
+    process_start: float = field(default_factory=time.time)
+    ready_at: Optional[float] = None
+    optional_done_at: Optional[float] = None
+    _started: List[Subsystem] = field(default_factory=list)
+    _task: Optional[asyncio.Task] = None
+
+    def register(self, subsystem: Subsystem) -> None:
+        self.subsystems = [s for s in self.subsystems if s.name != subsystem.name]
+        self.subsystems.append(subsystem)
+
+    def reset(self) -> None:
+        """Forget previous runs (a new lifespan starts from scratch)"""
+        self.records.clear()
+        self._started.clear()
+        self.process_start = time.time()
+        self.ready_at = None
+        self.optional_done_at = None
+        self._task = None
+
+    @asynccontextmanager
+    async def step(self, name: str, stage: str = "core"):
+        """Time one startup step; failures are recorded and re-raised"""
+        record = StageRecord(name=name, stage=stage, status=StageStatus.RUNNING, started_at=time.time())
+        self.records.append(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        except Exception as e:
+            record.status = StageStatus.FAILED
+            record.error = str(e)
+            raise
+        else:
+            record.status = StageStatus.READY
+        finally:
+            record.duration_ms = (time.perf_counter() - start) * 1000
+
+    def mark_ready(self) -> None:
+        """The request path is initialized; the server may accept traffic"""
+        self.ready_at = time.time()
+        logger.info("Request path ready",
+                    startup_ms=round((self.ready_at - self.process_start) * 1000, 1))
+
+    @property
+    def ready(self) -> bool:
+        return self.ready_at is not None
+
+    def is_started(self, name: str) -> bool:
+        return any(s.name == name for s in self._started)
+
+    async def start_optional(self, app: Any) -> None:
+        """Start every enabled optional subsystem; one failure does not stop the rest"""
+        from src.core.optimized_config import load_config_section
+
+        for subsystem in self.subsystems:
+            try:
+                section_config = await load_config_section(subsystem.section)
+            except Exception as e:
+                logger.warning(f"Could not read config section '{subsystem.section}': {e}")
+                section_config = None
+
+            if not subsystem.is_enabled(section_config):
+                self.records.append(StageRecord(name=subsystem.name, stage="optional",
+                                                status=StageStatus.SKIPPED))
+                continue
+
+            try:
+                async with self.step(subsystem.name, stage="optional"):
+                    await subsystem.start(app, section_config if isinstance(section_config, dict) else {})
+                self._started.append(subsystem)
+                logger.info(f"Optional subsystem '{subsystem.name}' started")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Optional subsystem '{subsystem.name}' failed to start: {e}")
+
+        self.optional_done_at = time.time()
+
+    def start_optional_background(self, app: Any) -> asyncio.Task:
+        self._task = asyncio.create_task(self.start_optional(app), name="startup.optional")
+        return self._task
+
+    async def wait_optional(self) -> None:
+        """Wait until every optional subsystem has started or failed"""
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def shutdown(self, app: Any) -> None:
+        """Stop started subsystems in reverse order"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+        for subsystem in reversed(self._started):
+            if subsystem.stop is None:
+                continue
+            try:
+                await subsystem.stop(app)
+            except Exception as e:
+                logger.error(f"Error stopping subsystem '{subsystem.name}': {e}")
+        self._started.clear()
+
+    def get_report(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "time_to_ready_ms": round((self.ready_at - self.process_start) * 1000, 1) if self.ready else None,
+            "optional_complete": self.optional_done_at is not None,
+            "started_subsystems": [s.name for s in self._started],
+            "stages": [r.to_dict() for r in self.records],
+        }
+
+
+# Optional subsystems. Imports stay inside the functions so an unused
+# subsystem costs nothing at import time.
+
+async def _start_telemetry(app: Any, section: Dict[str, Any]) -> None:
+    from src.core.config import settings
+    from src.core.telemetry import telemetry
+    telemetry.configure(settings)
+    telemetry.instrument_fastapi(app)
+    telemetry.instrument_httpx()
+
+
+async def _start_memory_manager(app: Any, section: Dict[str, Any]) -> None:
+    from src.core.memory_manager import get_memory_manager
+    app.state.memory_manager = await get_memory_manager()
+
+
+async def _stop_memory_manager(app: Any) -> None:
+    from src.core.memory_manager import shutdown_memory_manager
+    await shutdown_memory_manager()
+
+
+async def _start_loop_monitor(app: Any, section: Dict[str, Any]) -> None:
+    from src.core.profiler import loop_monitor
+    loop_monitor.configure(section)
+    await loop_monitor.start()
+    app.state.loop_monitor = loop_monitor
+
+
+async def _stop_loop_monitor(app: Any) -> None:
+    from src.core.profiler import loop_monitor
+    await loop_monitor.stop()
+
+
+async def _start_chaos_engineering(app: Any, section: Dict[str, Any]) -> None:
+    from src.core.chaos_engineering import chaos_monkey
+    chaos_monkey.configure(section)
+
+
+async def _start_alerting(app: Any, section: Dict[str, Any]) -> None:
+    from src.core.alerting import alert_manager
+    await alert_manager.start_monitoring()
+
+
+async def _stop_alerting(app: Any) -> None:
+    from src.core.alerting import alert_manager
+    await alert_manager.stop_monitoring()
+
+
+async def _start_web_ui(app: Any, section: Dict[str, Any]) -> None:
+    host = section.get("host", "0.0.0.0")
+    port = int(section.get("port", 10000))
+
+    def run_web_ui():
+        try:
+            from web_ui import app as web_app
+            logger.info(f"Starting web UI on port {port}")
+            web_app.run(host=host, port=port, debug=False, use_reloader=False)
+        except Exception as e:
+            logger.error(f"Failed to start web UI: {e}")
+
+    # TODO: The web UI should be run as a separate process in production.
+    # Running as a daemon thread is not recommended for production systems
+    # as it can be terminated abruptly on shutdown.
+    threading.Thread(target=run_web_ui, name="web-ui", daemon=True).start()
+
+
+DEFAULT_SUBSYSTEMS = [
+    Subsystem("telemetry", "telemetry", _start_telemetry),
+    Subsystem("memory_manager", "memory", _start_memory_manager, _stop_memory_manager),
+    Subsystem("loop_monitor", "profiling", _start_loop_monitor, _stop_loop_monitor),
+    Subsystem("chaos_engineering", "chaos_engineering", _start_chaos_engineering, enabled_by_default=False),
+    Subsystem("alerting", "alerting", _start_alerting, _stop_alerting),
+    Subsystem("web_ui", "web_ui", _start_web_ui),
+]
+
+startup_manager = StartupManager(subsystems=list(DEFAULT_SUBSYSTEMS))
+
+
+# Import-time profiling
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+@dataclass
+class ImportTiming:
+    """One module from ``-X importtime`` output (times in microseconds)"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    timings = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            timings.append(ImportTiming(module, int(self_us), int(cumulative_us), max(0, (len(indent) - 1) // 2)))
+    return timings
+
+
+def profile_imports(module: str = "main", python: Optional[str] = None) -> List[ImportTiming]:
+    """Import ``module`` in a fresh interpreter and collect per-module import times"""
+    result = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True
+    )
+    timings = parse_importtime(result.stderr)
+    if result.returncode != 0 and not timings:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr.strip()}")
+    return timings
+
+
+def format_import_report(timings: List[ImportTiming], top: int = 30) -> str:
+    """Total import time, the slowest top-level packages and the slowest modules"""
+    total_us = sum(t.self_us for t in timings)
+    packages: Dict[str, int] = {}
+    for t in timings:
+        root = t.module.split(".")[0]
+        packages[root] = packages.get(root, 0) + t.self_us
+
+    lines = [f"Imported {len(timings)} modules in {total_us / 1000:.1f} ms", "",
+             f"{'package':<40} {'self ms':>10}"]
+    for name, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        lines.append(f"{name:<40} {us / 1000:10.1f}")
+
+    lines += ["", f"{'module':<60} {'self ms':>10} {'cumulative ms':>14}"]
+    for t in sorted(timings, key=lambda t: t.cumulative_us, reverse=True)[:top]:
+        lines.append(f"{t.module:<60} {t.self_us / 1000:10.1f} {t.cumulative_us / 1000:14.1f}")
+    return "\n".join(lines)
@@ -0,0 +1,226 @@
+"""
+Pre-fork multi-worker supervisor for LLM Proxy API
+
+The supervisor imports the application once, creates the shared state plane
+(and the shared cache tier, unless its size is 0) and forks ``count`` workers.  Each worker binds its own listening socket with
+SO_REUSEPORT so the kernel spreads connections across workers, then runs a
+uvicorn server on it.  Where SO_REUSEPORT is unavailable the supervisor binds
+one socket before forking and the workers share it.
+
+Crashed workers are restarted (with a short delay so a worker that cannot
+start does not spin).  SIGTERM/SIGINT are forwarded to all workers, which
+finish in-flight requests and run their lifespan shutdown; stragglers are
+killed after the graceful timeout.
+
+POSIX only: on platforms without ``os.fork`` the server runs in one process.
+"""
+
+import os
+import signal
+import socket
+import time
+from typing import Any, Dict, List, Optional
+
+from src.core.cache_tiers import (SHARED_CACHE_ENV, SharedCacheTier,
+                                  default_shared_cache_path)
+from src.core.logging import ContextualLogger
+from src.core.shared_state import (SHARED_STATE_ENV, SharedStatePlane,
+                                   default_plane_path)
+
+logger = ContextualLogger(__name__)
+
+# A worker exiting sooner than this after its start counts as a failed start
+MIN_WORKER_UPTIME = 5.0
+MAX_FAILED_STARTS = 5
+
+
+def supports_multiple_workers() -> bool:
+    return hasattr(os, "fork")
+
+
+def bind_socket(host: str, port: int, reuse_port: bool) -> socket.socket:
+    """Create a listening TCP socket for a worker"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Supervisor:
+    """Forks, watches and restarts uvicorn worker processes"""
+
+    def __init__(self,
+                 app: Any,
+                 host: str,
+                 port: int,
+                 workers: int,
+                 log_level: str = "info",
+                 shared_state_path: Optional[str] = None,
+                 shared_state_slots: int = 65536,
+                 graceful_timeout: float = 30.0,
+                 restart_delay: float = 1.0,
+                 shared_cache_path: Optional[str] = None,
+                 shared_cache_mb: int = 0,
+                 shared_cache_slots: int = 65536):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.log_level = log_level
+        self.shared_state_path = shared_state_path or default_plane_path()
+        self.shared_state_slots = shared_state_slots
+        self.graceful_timeout = graceful_timeout
+        self.restart_delay = restart_delay
+        self.shared_cache_path = shared_cache_path or default_shared_cache_path()
+        self.shared_cache_mb = shared_cache_mb
+        self.shared_cache_slots = shared_cache_slots
+
+        self.reuse_port = hasattr(socket, "SO_REUSEPORT")
+        self._shared_socket: Optional[socket.socket] = None
+        self._children: Dict[int, Dict[str, Any]] = {}  # pid -> {"slot", "started"}
+        self._failed_starts = 0
+        self._stopping = False
+
+    # Worker side
+
+    def _run_worker(self, slot: int) -> None:
+        """Body of a forked worker; never returns"""
+        import uvicorn
+
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGCHLD):
+            signal.signal(sig, signal.SIG_DFL)
+
+        exit_code = 0
+        try:
+            sock = self._shared_socket or bind_socket(self.host, self.port, reuse_port=True)
+            config = uvicorn.Config(self.app, log_level=self.log_level.lower(), lifespan="on")
+            server = uvicorn.Server(config)
+            logger.info("Worker started", worker=slot, pid=os.getpid())
+            server.run(sockets=[sock])
+        except BaseException as e:
+            logger.error(f"Worker {slot} failed: {e}")
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    # Supervisor side
+
+    def _spawn(self, slot: int) -> int:
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker(slot)
+        self._children[pid] = {"slot": slot, "started": time.monotonic()}
+        return pid
+
+    def _handle_stop(self, signum, frame) -> None:
+        self._stopping = True
+
+    def _reap(self) -> List[Dict[str, Any]]:
+        """Collect exited workers without blocking"""
+        exited = []
+        while self._children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            child = self._children.pop(pid, None)
+            if child is not None:
+                child["pid"] = pid
+                child["exit_code"] = os.waitstatus_to_exitcode(status)
+                exited.append(child)
+        return exited
+
+    def _stop_workers(self) -> None:
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self._children.pop(pid, None)
+
+        deadline = time.monotonic() + self.graceful_timeout
+        while self._children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+
+        for pid in list(self._children):
+            logger.warning("Worker did not stop in time, killing it", pid=pid)
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+        self._children.clear()
+
+    def run(self) -> int:
+        """Run the workers until SIGTERM/SIGINT; returns the process exit code"""
+        if not supports_multiple_workers():
+            raise RuntimeError("Multi-worker mode requires os.fork")
+
+        SharedStatePlane.create(self.shared_state_path, slots=self.shared_state_slots,
+                                workers=self.workers).close()
+        os.environ[SHARED_STATE_ENV] = self.shared_state_path
+        if self.shared_cache_mb > 0:
+            SharedCacheTier.create(self.shared_cache_path, self.shared_cache_mb * 1024 * 1024,
+                                   slots=self.shared_cache_slots).close()
+            os.environ[SHARED_CACHE_ENV] = self.shared_cache_path
+
+        if not self.reuse_port:
+            self._shared_socket = bind_socket(self.host, self.port, reuse_port=False)
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+
+        logger.info("Starting workers",
+                    workers=self.workers,
+                    host=self.host,
+                    port=self.port,
+                    reuse_port=self.reuse_port,
+                    shared_state=self.shared_state_path,
+                    shared_cache=self.shared_cache_path if self.shared_cache_mb > 0 else None)
+        for slot in range(self.workers):
+            self._spawn(slot)
+
+        exit_code = 0
+        try:
+            while not self._stopping:
+                for child in self._reap():
+                    uptime = time.monotonic() - child["started"]
+                    logger.error("Worker exited",
+                                 worker=child["slot"], pid=child["pid"],
+                                 exit_code=child["exit_code"], uptime=round(uptime, 1))
+                    if uptime < MIN_WORKER_UPTIME:
+                        self._failed_starts += 1
+                        if self._failed_starts >= MAX_FAILED_STARTS:
+                            logger.error("Workers keep failing to start, giving up")
+                            self._stopping = True
+                            exit_code = 1
+                            break
+                    else:
+                        self._failed_starts = 0
+                    time.sleep(self.restart_delay)
+                    if not self._stopping:
+                        self._spawn(child["slot"])
+                time.sleep(0.2)
+        finally:
+            logger.info("Stopping workers", workers=len(self._children))
+            self._stop_workers()
+            if self._shared_socket is not None:
+                self._shared_socket.close()
+            paths = [self.shared_state_path]
+            if self.shared_cache_mb > 0:
+                paths.append(self.shared_cache_path)
+            for path in paths:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+        return exit_code
@@ -13,6 +13,12 @@ from typing import Any, Callable, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# Optional OpenTelemetry API, used to annotate the active span
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:
+    otel_trace = None
+
 # Import metrics collector for integration
 try:
     from .metrics import metrics_collector
@@ -184,6 +190,15 @@ def traced(operation: str = None, attributes: Optional[Dict[str, Any]] = None):
         return sync_wrapper
     return decorator
 
+def set_span_phase_attributes(phases_ms: Dict[str, float]) -> None:
+    """Add request phase durations to the active OpenTelemetry span, if one is recording."""
+    if otel_trace is None:
+        return
+    span = otel_trace.get_current_span()
+    if not span.is_recording():
+        return
+    span.set_attributes({f"proxy.phase.{name}_ms": round(ms, 3) for name, ms in phases_ms.items()})
+
 class MockStatus:
     """Mock status for spans."""
     def __init__(self):
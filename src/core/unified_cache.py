@@ -8,7 +8,7 @@ Features:
 - Intelligent cache warming strategy
 - Cache consistency monitoring and alerting
 - Performance metrics and optimization
-- Memory-aware LRU eviction
+- Memory-aware W-TinyLFU eviction and admission (serialized-size accounting, O(1) evictions)
 - Background cleanup and maintenance
 - Thread-safe operations
 - Multi-level caching (memory + disk)
@@ -19,12 +19,10 @@ import asyncio
 import hashlib
 import json
 import logging
-import statistics
 import threading
 import time
 from collections import OrderedDict, defaultdict
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
 
@@ -33,14 +31,20 @@ try:
 except ImportError:
     CACHE_AVAILABLE = False
 
+from .cache_policy import (DEFAULT_EVICTION_POLICY, create_policy,
+                           serialize_value)
+from .compact import DATACLASS_SLOTS, FloatRing
 from .unified_config import config_manager
 
 logger = logging.getLogger(__name__)
 
+# Entries at or above this priority skip the admission window and probation
+PROTECTED_PRIORITY = 3
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class CacheEntry:
-    """Enhanced cache entry with metadata and access patterns"""
+    """Enhanced cache entry with metadata and access patterns (slotted: one per cached key)"""
 
     key: str
     value: Any
@@ -99,6 +103,7 @@ class CacheMetrics:
     consistency_checks: int = 0
     inconsistencies_found: int = 0
     memory_pressure_events: int = 0
+    admission_rejections: int = 0
     disk_operations: int = 0
     average_access_time: float = 0.0
     peak_memory_usage: int = 0
@@ -134,7 +139,8 @@ class UnifiedCache:
         cleanup_interval: int = 300,  # 5 minutes
         enable_smart_ttl: bool = True,
         enable_predictive_warming: bool = True,
-        enable_consistency_monitoring: bool = True
+        enable_consistency_monitoring: bool = True,
+        eviction_policy: str = DEFAULT_EVICTION_POLICY
     ):
         # Core configuration
         self.max_size = max_size
@@ -148,6 +154,8 @@ class UnifiedCache:
 
         # Cache storage
         self._memory_cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        # Eviction order, admission and byte totals
+        self._policy = create_policy(eviction_policy, self.max_memory_bytes, max_entries=max_size)
         self._lock = threading.RLock()
 
         # Disk cache setup
@@ -163,11 +171,10 @@ class UnifiedCache:
 
         # Metrics and statistics
         self.metrics = CacheMetrics()
-        self._access_times: List[float] = []
+        self._access_times = FloatRing(1000)  # Last 1000 access times
         self._category_stats: Dict[str, Dict[str, Any]] = defaultdict(dict)
 
-        # Predictive warming data
-        self._access_patterns: Dict[str, List[datetime]] = defaultdict(list)
+        # Predictive warming data (popularity comes from the entries' access counts)
         self._popular_keys: Set[str] = set()
         self._warming_queue: asyncio.Queue = asyncio.Queue()
 
@@ -238,20 +245,6 @@ class UnifiedCache:
         key_string = "|".join(key_parts)
         return hashlib.md5(key_string.encode()).hexdigest()
 
-    def _estimate_size(self, obj: Any) -> int:
-        """Estimate memory size of object in bytes"""
-        if isinstance(obj, (str, bytes)):
-            return len(obj)
-        elif isinstance(obj, (list, tuple)):
-            return sum(self._estimate_size(item) for item in obj)
-        elif isinstance(obj, dict):
-            return sum(
-                len(str(k)) + self._estimate_size(v)
-                for k, v in obj.items()
-            )
-        else:
-            return 256  # Rough estimate for other objects
-
     async def get(self, key: str, category: str = "default") -> Optional[Any]:
         """Get value from cache with smart TTL management"""
         start_time = time.time()
@@ -261,14 +254,15 @@ class UnifiedCache:
 
             if key not in self._memory_cache:
                 self.metrics.misses += 1
+                self._policy.record_access(key)
 
                 # Try loading from disk if enabled
                 if self.enable_disk_cache:
                     entry = await self._load_from_disk(key)
                     if entry:
                         # Add to memory cache
-                        self._memory_cache[key] = entry
-                        self._memory_cache.move_to_end(key)
+                        self._insert_locked(entry)
+                        self._evict_locked()
                         entry.touch()
                         self.metrics.hits += 1
 
@@ -284,16 +278,17 @@ class UnifiedCache:
 
             if entry.is_expired():
                 # Remove expired entry
-                del self._memory_cache[key]
+                self._remove_locked(key)
                 self.metrics.expirations += 1
                 self.metrics.misses += 1
+                self._policy.record_access(key)
 
                 # Try loading from disk
                 if self.enable_disk_cache:
                     entry = await self._load_from_disk(key)
                     if entry and not entry.is_expired():
-                        self._memory_cache[key] = entry
-                        self._memory_cache.move_to_end(key)
+                        self._insert_locked(entry)
+                        self._evict_locked()
                         entry.touch()
                         self.metrics.hits += 1
 
@@ -311,11 +306,9 @@ class UnifiedCache:
             # Update access patterns
             entry.touch()
             self._memory_cache.move_to_end(key)
+            self._policy.touch(key)
             self.metrics.hits += 1
 
-            # Record access pattern for predictive warming
-            self._record_access_pattern(key)
-
             access_time = time.time() - start_time
             self._record_access_time(access_time)
 
@@ -327,36 +320,50 @@ class UnifiedCache:
         value: Any,
         ttl: Optional[int] = None,
         category: str = "default",
-        priority: int = 1
+        priority: int = 1,
+        size_bytes: Optional[int] = None
     ) -> bool:
-        """Set value in cache with smart management"""
+        """
+        Set value in cache with smart management.
+
+        The entry is sized once by its serialized length (the same bytes are
+        written to the disk cache); callers that already hold the serialized
+        form can pass ``size_bytes`` instead. Entries too large for the
+        admission filter are not cached and ``False`` is returned.
+        """
         if ttl is None:
             ttl = self.default_ttl
 
+        payload: Optional[bytes] = None
+        if self.enable_disk_cache and not isinstance(value, (bytes, bytearray)):
+            payload = serialize_value(value)
+            size_bytes = len(payload)
+        elif size_bytes is None:
+            size_bytes = len(value) if isinstance(value, (bytes, bytearray)) else len(serialize_value(value))
+
         entry = CacheEntry(
             key=key,
             value=value,
             timestamp=time.time(),
             ttl=ttl,
-            size_bytes=self._estimate_size(value),
+            size_bytes=size_bytes,
             category=category,
             priority=priority
         )
 
         with self._lock:
-            # Check memory limits
-            if not await self._check_memory_limit(entry.size_bytes):
-                logger.warning("Cache memory limit exceeded, evicting entries")
-                await self._enforce_memory_limit()
+            if not self._policy.admits(size_bytes):
+                self.metrics.admission_rejections += 1
+                self._remove_locked(key)  # A stale smaller value must not outlive the update
+                logger.debug(f"Cache entry {key} not admitted ({size_bytes} bytes)")
+                return False
+
+            # Replace any existing entry, then evict down to the limits
+            self._insert_locked(entry)
+            if self._policy.over_budget():
                 self.metrics.memory_pressure_events += 1
-
-            # Remove existing entry
-            if key in self._memory_cache:
-                del self._memory_cache[key]
-
-            # Add new entry
-            self._memory_cache[key] = entry
-            self._memory_cache.move_to_end(key)
+            self._evict_locked()
+            self.metrics.peak_memory_usage = max(self.metrics.peak_memory_usage, self._policy.total_bytes)
 
             # Update metrics
             self.metrics.sets += 1
@@ -368,18 +375,21 @@ class UnifiedCache:
 
             # Save to disk if enabled
             if self.enable_disk_cache:
-                await self._save_to_disk(entry)
-
-            # Enforce size limits
-            await self._enforce_size_limit()
+                await self._save_to_disk(entry, payload)
 
             return True
 
+    def is_fresh(self, key: str) -> bool:
+        """Check if the memory cache holds an entry for key that is not stale"""
+        with self._lock:
+            entry = self._memory_cache.get(key)
+            return entry is not None and not entry.is_stale()
+
     async def delete(self, key: str) -> bool:
         """Delete key from cache"""
         with self._lock:
             if key in self._memory_cache:
-                del self._memory_cache[key]
+                self._remove_locked(key)
                 self.metrics.deletes += 1
 
                 # Remove from disk if enabled
@@ -398,13 +408,14 @@ class UnifiedCache:
                     if entry.category == category
                 ]
                 for key in keys_to_remove:
-                    del self._memory_cache[key]
+                    self._remove_locked(key)
                     if self.enable_disk_cache:
                         await self._delete_from_disk(key)
                 return len(keys_to_remove)
             else:
                 count = len(self._memory_cache)
                 self._memory_cache.clear()
+                self._policy.clear()
 
                 # Clear disk cache if enabled
                 if self.enable_disk_cache:
@@ -470,7 +481,7 @@ class UnifiedCache:
     async def get_stats(self) -> Dict[str, Any]:
         """Get comprehensive cache statistics"""
         with self._lock:
-            current_memory = sum(entry.size_bytes for entry in self._memory_cache.values())
+            current_memory = self._policy.total_bytes
             total_requests = getattr(self.metrics, 'total_requests', 0)
 
             return {
@@ -491,6 +502,9 @@ class UnifiedCache:
                 "consistency_checks": self.metrics.consistency_checks,
                 "inconsistencies_found": self.metrics.inconsistencies_found,
                 "memory_pressure_events": self.metrics.memory_pressure_events,
+                "admission_rejections": self.metrics.admission_rejections,
+                "memory_by_category": dict(self._policy.bytes_by_category),
+                "eviction_policy": self._policy.get_stats(),
                 "disk_operations": self.metrics.disk_operations,
                 "average_access_time": round(self.metrics.average_access_time, 4),
                 "peak_memory_usage": self.metrics.peak_memory_usage,
@@ -551,58 +565,61 @@ class UnifiedCache:
             ]
 
             for key in expired_keys:
-                del self._memory_cache[key]
+                self._remove_locked(key)
                 self.metrics.expirations += 1
 
             if expired_keys:
                 logger.info(f"Cleaned up {len(expired_keys)} expired cache entries")
 
-    async def _enforce_size_limit(self) -> None:
-        """Enforce maximum cache size using intelligent eviction"""
-        with self._lock:
-            while len(self._memory_cache) > self.max_size:
-                # Evict based on priority and LRU
-                candidates = list(self._memory_cache.items())
-
-                # Sort by priority (lower priority first) then by last access
-                candidates.sort(key=lambda x: (x[1].priority, x[1].last_accessed))
+    def _insert_locked(self, entry: CacheEntry) -> None:
+        """Store an entry and track it in the eviction policy (caller holds the lock)"""
+        self._memory_cache[entry.key] = entry
+        self._memory_cache.move_to_end(entry.key)
+        self._policy.add(entry.key, entry.size_bytes, entry.category,
+                         protected=entry.priority >= PROTECTED_PRIORITY)
+
+    def _remove_locked(self, key: str) -> Optional[CacheEntry]:
+        """Drop an entry and its policy slot (caller holds the lock)"""
+        self._policy.remove(key)
+        return self._memory_cache.pop(key, None)
+
+    def _evict_locked(self) -> int:
+        """Evict in policy order until within the entry and byte limits; O(1) per eviction"""
+        evicted = 0
+        while len(self._memory_cache) > self.max_size or self._policy.over_budget():
+            key = self._policy.pop_victim()
+            if key is None:
+                if not self._memory_cache:
+                    break
+                # Entries stored without going through the policy
+                key, _ = self._memory_cache.popitem(last=False)
+            else:
+                self._memory_cache.pop(key, None)
+            evicted += 1
+            logger.debug(f"Evicted cache entry: {key}")
 
-                key, entry = candidates[0]
-                del self._memory_cache[key]
-                self.metrics.evictions += 1
+        self.metrics.evictions += evicted
+        return evicted
 
-                logger.debug(f"Evicted cache entry: {key} (priority: {entry.priority})")
+    async def _enforce_size_limit(self) -> None:
+        """Enforce maximum cache size in eviction-policy order"""
+        with self._lock:
+            self._evict_locked()
 
     async def _enforce_memory_limit(self) -> None:
-        """Enforce memory limits by evicting least recently used items"""
+        """Enforce memory limits using the running byte total"""
         with self._lock:
-            current_memory = sum(entry.size_bytes for entry in self._memory_cache.values())
-
-            if current_memory > self.max_memory_bytes:
-                # Calculate target memory (80% of max)
-                target_memory = int(self.max_memory_bytes * 0.8)
-                memory_to_free = current_memory - target_memory
-
-                freed_memory = 0
-                evicted_count = 0
-
-                # Evict items until we free enough memory
-                while freed_memory < memory_to_free and self._memory_cache:
-                    # Evict oldest accessed item
-                    key, entry = self._memory_cache.popitem(last=False)
-                    freed_memory += entry.size_bytes
-                    evicted_count += 1
-                    self.metrics.evictions += 1
-
+            before = self._policy.total_bytes
+            evicted = self._evict_locked()
+            if evicted:
                 logger.info(
-                    f"Memory limit enforced: freed {freed_memory} bytes, "
-                    f"evicted {evicted_count} entries"
+                    f"Memory limit enforced: freed {before - self._policy.total_bytes} bytes, "
+                    f"evicted {evicted} entries"
                 )
 
     async def _check_memory_limit(self, additional_bytes: int) -> bool:
         """Check if adding additional bytes would exceed memory limit"""
-        current_memory = sum(entry.size_bytes for entry in self._memory_cache.values())
-        return current_memory + additional_bytes <= self.max_memory_bytes
+        return not self._policy.over_budget(additional_bytes)
 
     async def _optimize_ttl(self) -> None:
         """Optimize TTL values based on access patterns"""
@@ -660,24 +677,7 @@ class UnifiedCache:
     def _record_access_time(self, access_time: float) -> None:
         """Record access time for performance monitoring"""
         self._access_times.append(access_time)
-
-        # Keep only last 1000 measurements
-        if len(self._access_times) > 1000:
-            self._access_times = self._access_times[-1000:]
-
-        # Update average
-        if self._access_times:
-            self.metrics.average_access_time = statistics.mean(self._access_times)
-
-    def _record_access_pattern(self, key: str) -> None:
-        """Record access pattern for predictive warming"""
-        self._access_patterns[key].append(datetime.now())
-
-        # Keep only recent patterns (last 24 hours)
-        cutoff = datetime.now() - timedelta(hours=24)
-        self._access_patterns[key] = [
-            ts for ts in self._access_patterns[key] if ts > cutoff
-        ]
+        self.metrics.average_access_time = self._access_times.mean()
 
     def _record_miss_pattern(self, key: str) -> None:
         """Record cache miss pattern"""
@@ -711,6 +711,7 @@ class UnifiedCache:
                 value=data['value'],
                 timestamp=data['timestamp'],
                 ttl=data['ttl'],
+                size_bytes=data.get('size_bytes') or cache_file.stat().st_size,
                 access_count=data.get('access_count', 0),
                 category=data.get('category', 'default'),
                 priority=data.get('priority', 1)
@@ -723,25 +724,30 @@ class UnifiedCache:
             logger.error(f"Error loading from disk cache for key {key}: {e}")
             return None
 
-    async def _save_to_disk(self, entry: CacheEntry) -> None:
-        """Save entry to disk cache"""
+    async def _save_to_disk(self, entry: CacheEntry, payload: Optional[bytes] = None) -> None:
+        """Save entry to disk cache, reusing the value's serialized bytes when given"""
         if not self.enable_disk_cache:
             return
+        if payload is None:
+            if isinstance(entry.value, (bytes, bytearray)):
+                return  # Binary values stay memory-only
+            payload = serialize_value(entry.value)
 
         try:
             cache_file = self.cache_dir / f"{entry.key}.json"
-            data = {
+            metadata = serialize_value({
                 'key': entry.key,
-                'value': entry.value,
                 'timestamp': entry.timestamp,
                 'ttl': entry.ttl,
                 'access_count': entry.access_count,
                 'category': entry.category,
-                'priority': entry.priority
-            }
+                'priority': entry.priority,
+                'size_bytes': entry.size_bytes
+            })
 
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            # Splice the value in rather than serializing it a second time
+            with open(cache_file, 'wb') as f:
+                f.write(metadata[:-1] + b',"value":' + payload + b'}')
 
             self.metrics.disk_operations += 1
 
@@ -79,6 +79,8 @@ class CondensationSettings(BaseModel):
     cache_ttl: int = Field(default=3600, ge=60, le=86400, description="Cache TTL in seconds")
     cache_size: int = Field(default=1000, ge=100, le=10000, description="Max cache size for LRU")
     cache_persist: bool = Field(default=False, description="Enable persistent cache (e.g., file/Redis)")
+    cache_flush_interval: float = Field(default=1.0, ge=0.0, le=60.0, description="Seconds between write-behind flushes of the persistent cache (0 flushes as soon as possible)")
+    cache_eviction_policy: str = Field(default="tinylfu", pattern=r'^(tinylfu|slru|lru)$', description="Summary cache eviction: tinylfu (frequency-aware admission), slru or lru")
     adaptive_enabled: bool = Field(default=True, description="Enable adaptive token limit calculation")
     adaptive_factor: float = Field(default=0.5, ge=0.1, le=1.0, description="Factor for adaptive max_tokens")
     truncation_threshold: int = Field(default=2000, ge=500, le=10000, description="Content length threshold for proactive truncation before summarization")
@@ -87,6 +89,11 @@ class CondensationSettings(BaseModel):
     fallback_strategies: List[str] = Field(default_factory=lambda: ["truncate", "secondary_provider"], description="Fallback strategies on failure")
     parallel_providers: int = Field(default=3, ge=1, le=5, description="Max concurrent providers for parallelism")
     dynamic_reload: bool = Field(default=True, description="Enable dynamic config reloading")
+    map_reduce_enabled: bool = Field(default=True, description="Condense oversized context with map-reduce over token-counted windows instead of truncating")
+    map_reduce_window_tokens: int = Field(default=3000, ge=256, le=200000, description="Tokens per window, sized to the summarizer's context")
+    map_reduce_summary_tokens: int = Field(default=256, ge=32, le=4096, description="Max tokens for each window summary")
+    map_reduce_concurrency: int = Field(default=4, ge=1, le=32, description="Max window summaries running in parallel")
+    prefix_cache_enabled: bool = Field(default=True, description="Reuse the summary of the longest already-condensed conversation prefix and only condense the new messages")
     
     @field_validator('fallback_strategies')
     @classmethod
@@ -97,6 +104,108 @@ class CondensationSettings(BaseModel):
             raise ValueError(f"Invalid fallback strategies: {invalid}. Must be one of {valid_strategies}")
         return v
 
+class CircuitBreakerSettings(BaseModel):
+    """Sliding-window circuit breaker settings (the `circuit_breaker` config section)"""
+    window_seconds: float = Field(default=30.0, ge=1.0, le=3600.0, description="Rolling window used for failure and slow-call ratios")
+    bucket_count: int = Field(default=30, ge=1, le=3600, description="Number of time buckets in the rolling window")
+    minimum_calls: int = Field(default=10, ge=1, description="Calls required in the window before ratios can trip the breaker")
+    failure_rate_threshold: float = Field(default=0.5, gt=0.0, le=1.0, description="Failure ratio that trips the breaker")
+    slow_call_rate_threshold: float = Field(default=0.4, gt=0.0, le=1.0, description="Slow-call ratio that trips the breaker")
+    slow_call_duration: float = Field(default=10.0, gt=0.0, description="Seconds after which a call counts as slow")
+    half_open_max_calls: int = Field(default=3, ge=1, le=100, description="Concurrent probes allowed while half-open")
+
+class RetryBudgetSettings(BaseModel):
+    """Retry budget and request deadline settings (the `retry_budget` config section)"""
+    retry_ratio: float = Field(default=0.2, ge=0.0, le=1.0, description="Retries allowed as a share of recent successful calls per provider")
+    min_retries_per_second: float = Field(default=1.0, ge=0.0, description="Retry floor per provider so low-traffic providers can still retry")
+    window_seconds: float = Field(default=10.0, ge=1.0, le=600.0, description="Window over which successes and retries are counted")
+    max_retry_after: float = Field(default=30.0, ge=0.0, le=3600.0, description="Longest upstream Retry-After worth waiting for before failing over")
+    deadline_header: str = Field(default="X-Request-Timeout", pattern=r'^[A-Za-z0-9\-_]+$', description="Client header that can shorten the request deadline (seconds)")
+
+class EmbeddingsSettings(BaseModel):
+    """Embeddings pipeline settings (the `embeddings` config section)"""
+    batching_enabled: bool = Field(default=True, description="Coalesce concurrent embedding requests into one upstream call per provider")
+    batch_window_ms: float = Field(default=5.0, ge=0.0, le=1000.0, description="How long a batch waits for more inputs before it is sent")
+    max_batch_inputs: int = Field(default=512, ge=1, le=2048, description="Inputs that trigger an immediate flush of a batch")
+    upstream_base64: bool = Field(default=True, description="Request base64 float32 vectors upstream instead of JSON float lists")
+    cache_enabled: bool = Field(default=True, description="Cache vectors by (model, dimensions, input hash)")
+    cache_max_mb: int = Field(default=256, ge=1, le=65536, description="Memory budget for cached vectors in MB")
+    cache_ttl: Optional[int] = Field(default=None, ge=60, description="Cached vector lifetime in seconds (no expiry if unset)")
+
+class CompressionRouteSettings(BaseModel):
+    """Compression overrides for routes under one path prefix"""
+    enabled: bool = Field(default=True, description="Compress responses of these routes")
+    minimum_size: Optional[int] = Field(default=None, ge=0, description="Smallest body worth compressing (global default if unset)")
+    compress_sse: Optional[bool] = Field(default=None, description="Compress event streams, flushing after every event (global default if unset)")
+    cache: bool = Field(default=False, description="Keep compressed forms of repeated GET payloads")
+
+class CompressionSettings(BaseModel):
+    """Response compression settings (the `compression` config section)"""
+    enabled: bool = Field(default=True, description="Enable response compression")
+    encodings: List[str] = Field(default_factory=lambda: ["zstd", "br", "gzip"], description="Encodings in server preference order (zstd/br only if their package is installed)")
+    minimum_size: int = Field(default=1400, ge=0, description="Smallest body worth compressing; below one packet compression saves no round trips")
+    content_types: List[str] = Field(default_factory=lambda: ["application/json", "text/", "application/javascript"], description="Content-type prefixes that are compressed")
+    compress_sse: bool = Field(default=False, description="Compress text/event-stream responses, flushing after every event")
+    gzip_level: int = Field(default=6, ge=1, le=9, description="gzip compression level")
+    brotli_quality: int = Field(default=4, ge=0, le=11, description="Brotli quality")
+    zstd_level: int = Field(default=3, ge=1, le=22, description="zstd compression level")
+    cache_max_entries: int = Field(default=256, ge=0, le=100000, description="Compressed payloads kept for routes with cache enabled")
+    routes: Dict[str, CompressionRouteSettings] = Field(
+        default_factory=lambda: {
+            "/v1/models": CompressionRouteSettings(cache=True),
+            "/v1/providers": CompressionRouteSettings(cache=True),
+            "/v1/health": CompressionRouteSettings(enabled=False),
+        },
+        description="Per-route overrides keyed by path prefix (longest prefix wins)"
+    )
+
+    @field_validator('encodings')
+    @classmethod
+    def validate_encodings(cls, v):
+        invalid = [e for e in v if e not in {"zstd", "br", "gzip"}]
+        if invalid:
+            raise ValueError(f"Unsupported encodings: {invalid}")
+        return v
+
+class WorkerSettings(BaseModel):
+    """Multi-worker process settings (the `workers` config section)"""
+    count: int = Field(default=1, ge=1, le=256, description="Worker processes; more than one starts the pre-fork supervisor")
+    shared_state_path: Optional[str] = Field(default=None, description="Shared state file for counters, rate buckets and breakers (under /dev/shm if unset)")
+    shared_state_slots: int = Field(default=65536, ge=64, le=16777216, description="Entries in the shared state table (48 bytes each)")
+    graceful_timeout: float = Field(default=30.0, ge=0.0, le=600.0, description="Seconds workers get to finish in-flight requests on shutdown")
+    restart_delay: float = Field(default=1.0, ge=0.0, le=60.0, description="Pause before replacing a worker that exited")
+
+class CacheTierSettings(BaseModel):
+    """Tiered cache storage settings (the `cache_tiers` config section)"""
+    enabled: bool = Field(default=True, description="Keep hot keys in per-worker memory, warm keys in host-shared memory, cold keys on disk")
+    shared_cache_mb: int = Field(default=256, ge=0, le=65536, description="Size of the host-shared warm tier created by the supervisor; 0 disables it")
+    shared_cache_slots: int = Field(default=65536, ge=64, le=16777216, description="Index entries in the shared warm tier (40 bytes each)")
+    shared_cache_path: Optional[str] = Field(default=None, description="Shared warm tier file (under /dev/shm if unset)")
+    disk_tier_enabled: bool = Field(default=True, description="Store every entry in the cold disk segment tier")
+    disk_max_mb: int = Field(default=1024, ge=1, description="Disk budget of the cold tier; the oldest segment is dropped beyond it")
+    disk_segment_mb: int = Field(default=64, ge=1, description="Size at which the cold tier starts a new segment file")
+    hot_access_count: int = Field(default=10, ge=1, le=16, description="Recent accesses that promote a key to the per-worker hot tier")
+    warm_access_count: int = Field(default=3, ge=1, le=16, description="Recent accesses that promote a cold key to the shared warm tier")
+    l1_max_ttl: int = Field(default=60, ge=1, description="Longest a worker serves its own copy while a shared tier exists")
+    rebalance_interval: int = Field(default=60, ge=0, description="Seconds between demotions of keys whose access frequency decayed; 0 disables")
+
+class PhaseTimingSettings(BaseModel):
+    """Per-request phase timing settings (the `phase_timing` config section)"""
+    enabled: bool = Field(default=True, description="Time request phases (auth, routing, upstream TTFB, streaming, ...)")
+    server_timing_header: bool = Field(default=True, description="Send the phases finished before the response starts in a Server-Timing header")
+    histograms: bool = Field(default=True, description="Record per-phase latency histograms (/v1/metrics, /v1/metrics/prometheus)")
+    span_attributes: bool = Field(default=False, description="Add phase durations to the active OpenTelemetry span")
+
+class ProfilingSettings(BaseModel):
+    """Sampling profiler and event-loop monitor settings (the `profiling` config section)"""
+    enabled: bool = Field(default=True, description="Run the event-loop monitor and serve the admin profiling endpoints")
+    max_duration_s: float = Field(default=60.0, gt=0, le=600, description="Longest profile an admin may request")
+    default_interval_ms: float = Field(default=5.0, ge=1, le=1000, description="Default sampling interval")
+    loop_monitor_interval_ms: float = Field(default=100.0, ge=10, le=10000, description="How often the event-loop lag is measured")
+    slow_callback_threshold_ms: float = Field(default=100.0, ge=10, description="A callback holding the loop longer than this is recorded")
+    max_slow_callbacks: int = Field(default=100, ge=1, le=10000, description="Slow-callback events kept in memory")
+    blocking_io_detection: str = Field(default="off", pattern=r'^(off|log|raise)$', description="Flag sync file/socket I/O on the event-loop thread: off, log, or raise (CI)")
+
 class CacheSettings(BaseModel):
     """Model discovery cache settings"""
     cache_enabled: bool = Field(default=True, description="Enable model discovery caching")
@@ -142,6 +251,14 @@ class GlobalSettings(BaseModel):
     config_file: Path = Field(default=Path("config.yaml"))
     condensation: CondensationSettings = Field(default_factory=CondensationSettings, description="Settings for context condensation optimizations")
     cache: CacheSettings = Field(default_factory=CacheSettings, description="Settings for model discovery caching")
+    circuit_breaker: CircuitBreakerSettings = Field(default_factory=CircuitBreakerSettings, description="Settings for sliding-window circuit breakers")
+    retry_budget: RetryBudgetSettings = Field(default_factory=RetryBudgetSettings, description="Settings for retry budgets and request deadlines")
+    embeddings: EmbeddingsSettings = Field(default_factory=EmbeddingsSettings, description="Settings for embeddings batching and caching")
+    compression: CompressionSettings = Field(default_factory=CompressionSettings, description="Settings for response compression")
+    workers: WorkerSettings = Field(default_factory=WorkerSettings, description="Settings for multi-worker mode")
+    cache_tiers: CacheTierSettings = Field(default_factory=CacheTierSettings, description="Settings for tiered cache storage")
+    phase_timing: PhaseTimingSettings = Field(default_factory=PhaseTimingSettings, description="Settings for per-request phase timing")
+    profiling: ProfilingSettings = Field(default_factory=ProfilingSettings, description="Settings for the sampling profiler and event-loop monitor")
     
     class Config:
         env_prefix = "PROXY_API_"
@@ -194,7 +311,7 @@ class ConfigManager:
     """Centralized configuration manager with optimized loading and validation"""
 
     def __init__(self, config_path: Optional[Path] = None):
-        self.config_path = config_path or Path("config.yaml")
+        self.config_path = config_path or Path(os.getenv("PROXY_API_CONFIG_FILE", "config.yaml"))
         self._config: Optional[UnifiedConfig] = None
         self._critical_config: Optional[Dict[str, Any]] = None
         self._lazy_loaded_sections: Dict[str, Any] = {}
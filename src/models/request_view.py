@@ -0,0 +1,123 @@
+"""
+Fast-path ingestion for chat completion requests.
+
+The raw body is parsed once (orjson when available) and validated in a single
+pass against the same constraints as ``ChatCompletionRequest``. The result is
+a ``ChatRequestView``: the parsed dict itself, frozen, so it can be handed to
+providers and serialized upstream without being copied, re-built or
+re-validated. Code that needs to change the request takes ``mutable_copy()``.
+"""
+
+import json
+from typing import Any, Dict, NoReturn
+
+from src.core.exceptions import InvalidRequestError
+
+# Use orjson for faster JSON parsing if available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Numeric fields validated like the Pydantic model: name -> (min, max)
+_NUMBER_RANGES = {
+    'temperature': (0.0, 2.0),
+    'top_p': (0.0, 1.0),
+    'presence_penalty': (-2.0, 2.0),
+    'frequency_penalty': (-2.0, 2.0),
+}
+_POSITIVE_INTS = ('max_tokens', 'n')
+
+
+class ChatRequestView(dict):
+    """Validated, read-only chat completion request"""
+
+    __slots__ = ('raw_size',)
+
+    def _readonly(self, *args, **kwargs) -> NoReturn:
+        raise TypeError("ChatRequestView is read-only; use mutable_copy() to modify the request")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __ior__(self, other):
+        self._readonly()
+
+    def __copy__(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+    def mutable_copy(self) -> Dict[str, Any]:
+        """Shallow, writable copy of the request"""
+        return dict(self)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _validate_chat_payload(data: Any) -> None:
+    if not isinstance(data, dict):
+        raise InvalidRequestError("Request body must be a JSON object", param="body", code="invalid_body")
+
+    model = data.get('model')
+    if not isinstance(model, str) or not model:
+        raise InvalidRequestError("Missing required 'model' parameter", param="model", code="missing_model")
+
+    messages = data.get('messages')
+    if not isinstance(messages, list) or not messages:
+        raise InvalidRequestError("Missing required 'messages' parameter", param="messages", code="missing_messages")
+    for index, message in enumerate(messages):
+        if not isinstance(message, dict) or 'role' not in message or 'content' not in message:
+            raise InvalidRequestError(
+                "Each message must have 'role' and 'content'",
+                param=f"messages[{index}]",
+                code="invalid_message"
+            )
+
+    for field in _POSITIVE_INTS:
+        value = data.get(field)
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 1):
+            raise InvalidRequestError(f"{field} must be a positive integer", param=field, code="invalid_type")
+
+    for field, (low, high) in _NUMBER_RANGES.items():
+        value = data.get(field)
+        if value is not None and (not _is_number(value) or not low <= value <= high):
+            raise InvalidRequestError(
+                f"{field} must be a number between {low:g} and {high:g}",
+                param=field,
+                code="invalid_value"
+            )
+
+    stream = data.get('stream')
+    if stream is not None and not isinstance(stream, bool):
+        raise InvalidRequestError("stream must be a boolean", param="stream", code="invalid_type")
+
+    logit_bias = data.get('logit_bias')
+    if logit_bias is not None:
+        if not isinstance(logit_bias, dict) or not all(_is_number(v) and -100 <= v <= 100 for v in logit_bias.values()):
+            raise InvalidRequestError(
+                "Logit bias values must be between -100 and 100",
+                param="logit_bias",
+                code="invalid_value"
+            )
+
+
+def parse_chat_request(body: bytes) -> ChatRequestView:
+    """Parse and validate a raw chat completion body in one pass"""
+    try:
+        data = orjson.loads(body) if orjson is not None else json.loads(body)
+    except ValueError as e:
+        raise InvalidRequestError(f"Invalid JSON body: {e}", param="body", code="invalid_json")
+
+    _validate_chat_payload(data)
+    view = ChatRequestView(data)
+    view.raw_size = len(body)
+    return view
+
+
+def is_validated_request(request: Any) -> bool:
+    """Whether the request already passed ingestion validation"""
+    return isinstance(request, ChatRequestView)
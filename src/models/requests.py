@@ -73,7 +73,8 @@ class EmbeddingRequest(BaseModel):
     model: str = Field(..., min_length=1)
     input: Union[str, List[str]] = Field(..., min_length=1)
     user: Optional[str] = None
-    encoding_format: Optional[str] = "float"
+    encoding_format: Optional[str] = Field("float", pattern=r"^(float|base64)$")
+    dimensions: Optional[int] = Field(None, ge=1)
 
 class ImageGenerationRequest(BaseModel):
     """Pydantic model for image generation request"""
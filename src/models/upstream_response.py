@@ -0,0 +1,87 @@
+"""
+Upstream JSON responses that keep their original bytes.
+
+Providers whose upstream already speaks the OpenAI format return an
+``UpstreamResponse``: the decoded body (so routing, caching and metrics can
+read it like any dict) plus the raw bytes it was decoded from. As long as
+nothing modifies it, the API layer forwards ``raw`` verbatim instead of
+encoding the dict again. Any top-level modification drops ``raw``; nested
+edits must be made on a copy (``dict(response)`` / ``copy.deepcopy``).
+"""
+
+import json
+from typing import Any, Optional
+
+# Use orjson for faster JSON parsing if available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class UpstreamResponse(dict):
+    """Decoded upstream JSON body that remembers its raw bytes while unmodified"""
+
+    __slots__ = ('raw',)
+
+    def __init__(self, *args, raw: Optional[bytes] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.raw = raw
+
+    def _modified(self) -> None:
+        self.raw = None
+
+    def __setitem__(self, key, value):
+        self._modified()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._modified()
+        super().__delitem__(key)
+
+    def __ior__(self, other):
+        self._modified()
+        return super().__ior__(other)
+
+    def update(self, *args, **kwargs):
+        self._modified()
+        super().update(*args, **kwargs)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._modified()
+        return super().setdefault(key, default)
+
+    def pop(self, *args):
+        self._modified()
+        return super().pop(*args)
+
+    def popitem(self):
+        self._modified()
+        return super().popitem()
+
+    def clear(self):
+        self._modified()
+        super().clear()
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+def loads_json(content: bytes) -> Any:
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
+
+def parse_upstream_json(response: Any) -> Any:
+    """
+    Decode an httpx response body once. JSON objects come back as an
+    ``UpstreamResponse`` that can be forwarded without re-encoding.
+    """
+    content = getattr(response, 'content', None)
+    if not isinstance(content, (bytes, bytearray)):
+        # Not a real body (e.g. a test double); nothing raw to keep
+        return response.json()
+    data = loads_json(content)
+    if isinstance(data, dict):
+        return UpstreamResponse(data, raw=bytes(content))
+    return data
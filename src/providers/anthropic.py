@@ -6,17 +6,67 @@ import httpx
 
 from src.core.exceptions import (APIConnectionError, AuthenticationError,
                                  InvalidRequestError, RateLimitError)
+from src.core.provider_dispatch import FieldRule, compile_payload_map
 from src.core.provider_factory import BaseProvider, ProviderCapability
 from src.core.unified_config import ProviderConfig
 from src.api.errors.error_handlers import error_handler
+from src.models.request_view import is_validated_request
+
+
+ANTHROPIC_VERSION = "2023-06-01"
+DEFAULT_STOP_SEQUENCES = ["Human:", "\n\nHuman:"]
+
+
+def _messages_to_prompt(request: Dict[str, Any]) -> str:
+    """Render OpenAI-style messages as an Anthropic Human/Assistant prompt"""
+    messages = request.get('messages', [])
+    if not messages:
+        raise InvalidRequestError("No messages provided", code="no_messages")
+
+    prompt_parts = []
+    for msg in messages:
+        role = msg.get('role', '')
+        content = msg.get('content', '')
+        if role == 'user':
+            prompt_parts.append(f"Human: {content}")
+        elif role == 'assistant':
+            prompt_parts.append(f"Assistant: {content}")
+        else:
+            prompt_parts.append(f"{role.capitalize()}: {content}")
+    return "\n\n".join(prompt_parts) + "\n\nAssistant:"
+
+
+def _stop_sequences(request: Dict[str, Any]) -> list:
+    stop = request.get('stop', DEFAULT_STOP_SEQUENCES)
+    if isinstance(stop, str):
+        stop = [stop]
+    return list(stop or []) + list(request.get('stop_sequences', []))
+
+
+# OpenAI request field -> Anthropic payload field
+_transform_request = compile_payload_map(
+    [
+        FieldRule("model", default=None),
+        FieldRule("max_tokens", "max_tokens_to_sample", default=1024),
+        FieldRule("temperature", default=0.7),
+        FieldRule("stream", default=False),
+        FieldRule("top_p"),
+    ],
+    computed={"prompt": _messages_to_prompt, "stop_sequences": _stop_sequences},
+)
 
 
 class AnthropicProvider(BaseProvider):
     """Anthropic API provider implementation"""
-    
+
+    ENDPOINTS = {"messages": "/v1/messages"}
+
     def __init__(self, config: ProviderConfig):
         super().__init__(config)
 
+    def _auth_headers(self) -> Dict[str, str]:
+        return {"x-api-key": self.api_key, "anthropic-version": ANTHROPIC_VERSION}
+
     def _get_capabilities(self) -> Set[ProviderCapability]:
         """Get Anthropic provider capabilities"""
         from src.core.provider_factory import ProviderCapability
@@ -30,15 +80,9 @@ class AnthropicProvider(BaseProvider):
     async def _perform_health_check(self) -> Dict[str, Any]:
         """Health check for Anthropic API - use a simple messages request"""
         try:
-            headers = {
-                "x-api-key": self.api_key,
-                "anthropic-version": "2023-06-01",
-                "Content-Type": "application/json"
-            }
             response = await self.make_request(
-                "POST", f"{self.config.base_url}/v1/messages",
-                json={"model": "claude-3-opus-20240229", "max_tokens": 1, "messages": [{"role": "user", "content": "Hello"}]},
-                headers=headers
+                "POST", self.dispatcher.url("messages"),
+                json={"model": "claude-3-opus-20240229", "max_tokens": 1, "messages": [{"role": "user", "content": "Hello"}]}
             )
             return {
                 "healthy": response.status_code == 200,
@@ -52,6 +96,11 @@ class AnthropicProvider(BaseProvider):
 
     def _validate_request(self, request: Dict[str, Any]):
         """Validate required parameters for Anthropic requests"""
+        if is_validated_request(request):
+            # Generic checks were done at ingestion; only this provider's temperature range remains
+            if (request.get('temperature') or 0) > 1:
+                raise InvalidRequestError("temperature must be a number between 0 and 1", param="temperature", code="invalid_value")
+            return
         if not request.get('model'):
             raise InvalidRequestError("Missing required 'model' parameter", param="model", code="missing_model")
         if not request.get('messages'):
@@ -63,34 +112,7 @@ class AnthropicProvider(BaseProvider):
 
     def _transform_payload(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Transform OpenAI-style messages to Anthropic prompt format"""
-        messages = request.get('messages', [])
-        if not messages:
-            raise InvalidRequestError("No messages provided", code="no_messages")
-        
-        prompt_parts = []
-        for msg in messages:
-            role = msg.get('role', '')
-            content = msg.get('content', '')
-            if role == 'user':
-                prompt_parts.append(f"Human: {content}")
-            elif role == 'assistant':
-                prompt_parts.append(f"Assistant: {content}")
-            else:
-                prompt_parts.append(f"{role.capitalize()}: {content}")
-        
-        prompt = "\n\n".join(prompt_parts) + "\n\nAssistant:"
-        
-        anthropic_request = {
-            "model": request.get('model'),
-            "prompt": prompt,
-            "max_tokens_to_sample": request.get('max_tokens', 1024),
-            "temperature": request.get('temperature', 0.7),
-            "stop_sequences": request.get('stop', ["Human:", "\n\nHuman:"]) + request.get('stop_sequences', []),
-            "stream": request.get('stream', False)
-        }
-        if 'top_p' in request:
-            anthropic_request['top_p'] = request['top_p']
-        return anthropic_request
+        return _transform_request(request)
 
     def _parse_response(self, anthropic_response: Dict[str, Any]) -> Dict[str, Any]:
         """Parse Anthropic response to OpenAI-compatible format"""
@@ -121,24 +143,16 @@ class AnthropicProvider(BaseProvider):
     async def create_completion(self, request: Dict[str, Any]) -> Union[Dict[str, Any], AsyncGenerator]:
         """Create chat completion using Anthropic API with streaming support"""
         self._validate_request(request)
-        headers = {
-            "x-api-key": self.api_key,
-            "anthropic-version": "2023-06-01",
-            "Content-Type": "application/json"
-        }
-        
         anthropic_request = self._transform_payload(request)
         
         if request.get('stream', False):
             # Streaming response
             async def stream_generator():
                 try:
-                    async with self.make_request(
+                    async with self.stream_request(
                         "POST",
-                        f"{self.config.base_url}/v1/messages",
-                        json=anthropic_request,
-                        headers=headers,
-                        stream=True
+                        self.dispatcher.url("messages"),
+                        json=anthropic_request
                     ) as response:
                         if response.status_code == 401:
                             raise AuthenticationError("Anthropic Authentication failed", code="unauthorized")
@@ -203,9 +217,8 @@ class AnthropicProvider(BaseProvider):
             try:
                 response = await self.make_request(
                     "POST",
-                    f"{self.config.base_url}/v1/messages",
-                    json=anthropic_request,
-                    headers=headers
+                    self.dispatcher.url("messages"),
+                    json=anthropic_request
                 )
                 data = response.json()
                 
@@ -17,30 +17,44 @@ from src.core.logging import ContextualLogger
 from src.core.metrics import metrics_collector
 from src.core.provider_factory import BaseProvider
 from src.core.unified_config import ProviderConfig
+from src.models.request_view import is_validated_request
+from src.models.upstream_response import parse_upstream_json
 
 
 class AzureOpenAIProvider(BaseProvider):
     """Azure OpenAI provider with deployment-based endpoint"""
 
+    # For Azure, we expect the base_url to be properly configured
+    # If not provided, we'll use a placeholder that should be overridden
+    DEFAULT_BASE_URL = "https://your-resource.openai.azure.com"
+
     def __init__(self, config: ProviderConfig):
-        super().__init__(config)
-        # For Azure, we expect the base_url to be properly configured
-        # If not provided, we'll use a placeholder that should be overridden
-        self.base_url = str(config.base_url) if config.base_url else "https://your-resource.openai.azure.com"
         # Use first model as deployment_id if not specified in custom_headers
         self.deployment_id = config.custom_headers.get('deployment_id', config.models[0] if config.models else 'your-deployment')
         self.api_version = config.custom_headers.get('api_version', '2023-12-01-preview')
+        # Endpoints embed the deployment and api-version, so both are set before the dispatcher is built
+        super().__init__(config)
         self.logger = ContextualLogger(f"provider.{config.name}")
 
+    def _auth_headers(self) -> Dict[str, str]:
+        return {"api-key": self.api_key}
+
+    def _endpoints(self) -> Dict[str, str]:
+        query = urlencode({'api-version': self.api_version})
+        deployment = f"/openai/deployments/{self.deployment_id}"
+        return {
+            "deployments": f"/openai/deployments?{query}",
+            "chat": f"{deployment}/chat/completions?{query}",
+            "completions": f"{deployment}/completions?{query}",
+            "embeddings": f"{deployment}/embeddings?{query}",
+        }
+
     async def _perform_health_check(self) -> Dict[str, Any]:
         """Health check for Azure OpenAI using deployments list"""
         try:
-            params = {'api-version': self.api_version}
-            headers = {"api-key": self.api_key}
             response = await self.make_request(
                 "GET",
-                f"{self.base_url}/openai/deployments?{urlencode(params)}",
-                headers=headers
+                self.dispatcher.url("deployments")
             )
             return {
                 "healthy": response.status_code == 200,
@@ -52,6 +66,8 @@ class AzureOpenAIProvider(BaseProvider):
 
     def _validate_request(self, request: Dict[str, Any]):
         """Validate required parameters for Azure OpenAI requests"""
+        if is_validated_request(request):
+            return  # already checked at ingestion
         if not request.get('model'):
             raise InvalidRequestError("Missing required 'model' parameter (deployment name)", param="model", code="missing_model")
         if not request.get('messages') and not request.get('prompt'):
@@ -65,20 +81,16 @@ class AzureOpenAIProvider(BaseProvider):
         """Create chat completion using Azure OpenAI (supports streaming)"""
         self._validate_request(request)
         start_time = time.time()
-        params = {'api-version': self.api_version}
-        endpoint = f"{self.base_url}/openai/deployments/{self.deployment_id}/chat/completions"
-        headers = {"api-key": self.api_key, "Content-Type": "application/json"}
+        endpoint = self.dispatcher.url("chat")
         
         if request.get('stream', False):
             # Streaming response
             async def stream_generator():
                 try:
-                    async with self.make_request(
+                    async with self.stream_request(
                         "POST",
-                        f"{endpoint}?{urlencode(params)}",
-                        json=request,
-                        headers=headers,
-                        stream=True
+                        endpoint,
+                        json=request
                     ) as response:
                         if response.status_code == 401:
                             raise AuthenticationError("Azure OpenAI Authentication failed", code="unauthorized")
@@ -129,11 +141,10 @@ class AzureOpenAIProvider(BaseProvider):
             try:
                 response = await self.make_request(
                     "POST",
-                    f"{endpoint}?{urlencode(params)}",
-                    json=request,
-                    headers=headers
+                    endpoint,
+                    json=request
                 )
-                data = response.json()
+                data = parse_upstream_json(response)
                 
                 # Specific error handling
                 if 'error' in data:
@@ -184,20 +195,16 @@ class AzureOpenAIProvider(BaseProvider):
         """Create text completion using Azure OpenAI completions endpoint"""
         self._validate_request(request)
         start_time = time.time()
-        params = {'api-version': self.api_version}
-        endpoint = f"{self.base_url}/openai/deployments/{self.deployment_id}/completions"
-        headers = {"api-key": self.api_key, "Content-Type": "application/json"}
+        endpoint = self.dispatcher.url("completions")
         
         if request.get('stream', False):
             # Streaming for text completion
             async def stream_generator():
                 try:
-                    async with self.make_request(
+                    async with self.stream_request(
                         "POST",
-                        f"{endpoint}?{urlencode(params)}",
-                        json=request,
-                        headers=headers,
-                        stream=True
+                        endpoint,
+                        json=request
                     ) as response:
                         if response.status_code == 401:
                             raise AuthenticationError("Azure OpenAI Authentication failed", code="unauthorized")
@@ -248,11 +255,10 @@ class AzureOpenAIProvider(BaseProvider):
             try:
                 response = await self.make_request(
                     "POST",
-                    f"{endpoint}?{urlencode(params)}",
-                    json=request,
-                    headers=headers
+                    endpoint,
+                    json=request
                 )
-                data = response.json()
+                data = parse_upstream_json(response)
                 
                 # Specific error handling
                 if 'error' in data:
@@ -305,17 +311,14 @@ class AzureOpenAIProvider(BaseProvider):
         if not request.get('input'):
             raise InvalidRequestError("Missing required 'input' parameter for embeddings", param="input", code="missing_input")
         start_time = time.time()
-        params = {'api-version': self.api_version}
-        endpoint = f"{self.base_url}/openai/deployments/{self.deployment_id}/embeddings"
-        headers = {"api-key": self.api_key, "Content-Type": "application/json"}
+        endpoint = self.dispatcher.url("embeddings")
         try:
             response = await self.make_request(
                 "POST",
-                f"{endpoint}?{urlencode(params)}",
-                json=request,
-                headers=headers
+                endpoint,
+                json=request
             )
-            data = response.json()
+            data = parse_upstream_json(response)
             
             # Specific error handling
             if 'error' in data:
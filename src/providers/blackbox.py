@@ -14,16 +14,37 @@ from src.core.exceptions import (APIConnectionError, AuthenticationError,
                                  InvalidRequestError, RateLimitError)
 from src.core.logging import ContextualLogger
 from src.core.metrics import metrics_collector
+from src.core.provider_dispatch import FieldRule, compile_payload_map
 from src.core.provider_factory import BaseProvider, ProviderCapability
 from src.core.unified_config import ProviderConfig
 
+# OpenAI request field -> Blackbox chat payload field
+_chat_payload = compile_payload_map([
+    FieldRule("model", default="blackbox-chat"),
+    FieldRule("messages", default=[]),
+    FieldRule("max_tokens", default=1024),
+    FieldRule("temperature", default=0.7),
+    FieldRule("top_p", default=1.0),
+    FieldRule("stream", default=False),
+    FieldRule("tools", default=[]),
+    FieldRule("tool_choice", default=None),
+])
+
 
 class BlackboxProvider(BaseProvider):
     """Blackbox.ai provider with unified API interface"""
 
+    DEFAULT_BASE_URL = "https://api.blackbox.ai"
+    ENDPOINTS = {
+        "models": "/v1/models",
+        "chat": "/v1/chat/completions",
+        "tool_chat": "/v1/chat/completions/tool",
+        "images": "/v1/images/generations",
+        "videos": "/v1/video/generations",
+    }
+
     def __init__(self, config: ProviderConfig):
         super().__init__(config)
-        self.base_url = config.base_url or "https://api.blackbox.ai"
         self.logger = ContextualLogger(f"provider.{config.name}")
 
     def _get_capabilities(self) -> Set[ProviderCapability]:
@@ -46,11 +67,7 @@ class BlackboxProvider(BaseProvider):
             # Try to get available models as health check
             response = await self.make_request(
                 "GET",
-                f"{self.base_url}/v1/models",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
+                self.dispatcher.url("models")
             )
             return {"models_available": len(response.json().get("data", []))}
         except Exception as e:
@@ -82,31 +99,15 @@ class BlackboxProvider(BaseProvider):
 
         try:
             # Prepare request for Blackbox API
-            blackbox_request = {
-                "model": request.get("model", "blackbox-chat"),
-                "messages": request.get("messages", []),
-                "max_tokens": request.get("max_tokens", 1024),
-                "temperature": request.get("temperature", 0.7),
-                "top_p": request.get("top_p", 1.0),
-                "stream": request.get("stream", False),
-                "tools": request.get("tools", []),
-                "tool_choice": request.get("tool_choice", None)
-            }
+            blackbox_request = _chat_payload(request)
 
             # Determine endpoint based on request type
-            endpoint = "/v1/chat/completions"
-            if request.get("tools"):
-                endpoint = "/v1/chat/completions/tool"
+            endpoint = "tool_chat" if request.get("tools") else "chat"
 
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
             response = await self.make_request(
                 "POST",
-                f"{self.base_url}{endpoint}",
-                json=blackbox_request,
-                headers=headers
+                self.dispatcher.url(endpoint),
+                json=blackbox_request
             )
 
             # Error handling
@@ -185,15 +186,10 @@ class BlackboxProvider(BaseProvider):
                 "n": request.get("n", 1)
             }
 
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
             response = await self.make_request(
                 "POST",
-                f"{self.base_url}/v1/images/generations",
-                json=image_request,
-                headers=headers
+                self.dispatcher.url("images"),
+                json=image_request
             )
 
             # Error handling
@@ -256,15 +252,10 @@ class BlackboxProvider(BaseProvider):
                 "resolution": request.get("resolution", "720p")
             }
 
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
             response = await self.make_request(
                 "POST",
-                f"{self.base_url}/v1/video/generations",
-                json=video_request,
-                headers=headers
+                self.dispatcher.url("videos"),
+                json=video_request
             )
 
             # Error handling
@@ -12,27 +12,42 @@ from src.core.exceptions import (APIConnectionError, AuthenticationError,
                                  InvalidRequestError, RateLimitError)
 from src.core.logging import ContextualLogger
 from src.core.metrics import metrics_collector
+from src.core.provider_dispatch import FieldRule, compile_payload_map
 from src.core.provider_factory import BaseProvider
 from src.core.unified_config import ProviderConfig
+from src.models.request_view import is_validated_request
+
+# OpenAI request field -> /v1/generate payload field (the prompt is built separately)
+_generate_payload = compile_payload_map(
+    [
+        FieldRule("model", default="command-xlarge-nightly"),
+        FieldRule("max_tokens", default=1024),
+        FieldRule("temperature", default=0.7),
+        FieldRule("top_p", default=1.0),
+    ],
+    constants={"num_generations": 1},
+)
 
 
 class CohereProvider(BaseProvider):
     """Cohere provider with /v1/generate interface mapped to OpenAI-compatible"""
 
+    DEFAULT_BASE_URL = "https://api.cohere.ai"
+    ENDPOINTS = {
+        "generate": "/v1/generate",
+    }
+
     def __init__(self, config: ProviderConfig):
         super().__init__(config)
-        self.base_url = config.base_url or "https://api.cohere.ai"
         self.logger = ContextualLogger(f"provider.{config.name}")
 
     async def _perform_health_check(self) -> Dict[str, Any]:
         """Health check for Cohere API using minimal generate request"""
         try:
-            headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
             response = await self.make_request(
                 "POST",
-                f"{self.base_url}/v1/generate",
-                json={"model": "command-xlarge-nightly", "prompt": "Hello", "max_tokens": 1},
-                headers=headers
+                self.dispatcher.url("generate"),
+                json={"model": "command-xlarge-nightly", "prompt": "Hello", "max_tokens": 1}
             )
             return {
                 "healthy": response.status_code == 200,
@@ -44,6 +59,11 @@ class CohereProvider(BaseProvider):
 
     def _validate_request(self, request: Dict[str, Any]):
         """Validate required parameters for Cohere requests"""
+        if is_validated_request(request):
+            # Generic checks were done at ingestion; only this provider's temperature range remains
+            if (request.get('temperature') or 0) > 1:
+                raise InvalidRequestError("temperature must be a number between 0 and 1", param="temperature", code="invalid_value")
+            return
         if not request.get('model'):
             raise InvalidRequestError("Missing required 'model' parameter (e.g., command-xlarge-nightly)", param="model", code="missing_model")
         if not request.get('messages') and not request.get('prompt'):
@@ -102,20 +122,12 @@ class CohereProvider(BaseProvider):
             if not prompt:
                 raise InvalidRequestError("Empty prompt after transformation", code="empty_prompt")
             
-            cohere_request = {
-                "model": request.get("model", "command-xlarge-nightly"),
-                "prompt": prompt,
-                "max_tokens": request.get("max_tokens", 1024),
-                "temperature": request.get("temperature", 0.7),
-                "top_p": request.get("top_p", 1.0),
-                "num_generations": 1
-            }
-            headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+            cohere_request = _generate_payload(request)
+            cohere_request["prompt"] = prompt
             response = await self.make_request(
                 "POST",
-                f"{self.base_url}/v1/generate",
-                json=cohere_request,
-                headers=headers
+                self.dispatcher.url("generate"),
+                json=cohere_request
             )
             
             # Error handling
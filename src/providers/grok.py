@@ -13,13 +13,28 @@ from src.core.exceptions import (APIConnectionError, AuthenticationError,
                                  InvalidRequestError, RateLimitError)
 from src.core.logging import ContextualLogger
 from src.core.metrics import metrics_collector
+from src.core.provider_dispatch import FieldRule, compile_payload_map
 from src.core.provider_factory import BaseProvider
 from src.core.unified_config import ProviderConfig
+from src.models.request_view import is_validated_request
+
+# OpenAI request field -> /v1/complete payload field (the prompt is built separately)
+_complete_payload = compile_payload_map([
+    FieldRule("model", default="grok-beta"),
+    FieldRule("max_tokens", default=1024),
+    FieldRule("temperature", default=0.7),
+    FieldRule("top_p", default=1.0),
+])
 
 
 class GrokProvider(BaseProvider):
     """Grok (xAI) provider with /v1/complete interface"""
 
+    ENDPOINTS = {
+        "models": "/v1/models",
+        "complete": "/v1/complete",
+    }
+
     def __init__(self, config: ProviderConfig):
         super().__init__(config)
         self.logger = ContextualLogger(f"provider.{config.name}")
@@ -27,11 +42,9 @@ class GrokProvider(BaseProvider):
     async def _perform_health_check(self) -> Dict[str, Any]:
         """Health check for Grok API using GET /v1/models"""
         try:
-            headers = {"Authorization": f"Bearer {self.api_key}"}
             response = await self.make_request(
                 "GET",
-                f"{self.config.base_url}/v1/models",
-                headers=headers
+                self.dispatcher.url("models")
             )
             return {
                 "healthy": response.status_code == 200,
@@ -46,6 +59,8 @@ class GrokProvider(BaseProvider):
 
     def _validate_request(self, request: Dict[str, Any]):
         """Validate required parameters for Grok requests"""
+        if is_validated_request(request):
+            return  # already checked at ingestion
         if not request.get('model'):
             raise InvalidRequestError("Missing required 'model' parameter (e.g., grok-beta)", param="model", code="missing_model")
         if not request.get('messages') and not request.get('prompt'):
@@ -104,19 +119,12 @@ class GrokProvider(BaseProvider):
             if not prompt:
                 raise InvalidRequestError("Empty prompt after transformation", code="empty_prompt")
             
-            grok_request = {
-                "model": request.get("model", "grok-beta"),
-                "prompt": prompt,
-                "max_tokens": request.get("max_tokens", 1024),
-                "temperature": request.get("temperature", 0.7),
-                "top_p": request.get("top_p", 1.0)
-            }
-            headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+            grok_request = _complete_payload(request)
+            grok_request["prompt"] = prompt
             response = await self.make_request(
                 "POST",
-                f"{self.config.base_url}/v1/complete",
-                json=grok_request,
-                headers=headers
+                self.dispatcher.url("complete"),
+                json=grok_request
             )
             
             # Error handling
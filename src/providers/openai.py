@@ -14,11 +14,20 @@ from src.core.provider_factory import BaseProvider, ProviderCapability
 from src.core.unified_config import ProviderConfig
 from src.models.model_info import ModelInfo
 from src.api.errors.error_handlers import error_handler
+from src.models.request_view import is_validated_request
+from src.models.upstream_response import parse_upstream_json
 
 
 class OpenAIProvider(BaseProvider):
     """OpenAI API provider implementation with model discovery support"""
-    
+
+    ENDPOINTS = {
+        "models": "/models",
+        "chat": "/chat/completions",
+        "completions": "/completions",
+        "embeddings": "/embeddings",
+    }
+
     def __init__(self, config: ProviderConfig):
         super().__init__(config)
         self._discovery_service = None
@@ -57,8 +66,7 @@ class OpenAIProvider(BaseProvider):
         """Health check for OpenAI API"""
         try:
             response = await self.make_request(
-                "GET", f"{self.config.base_url}/models",
-                headers={"Authorization": f"Bearer {self.api_key}"}
+                "GET", self.dispatcher.url("models")
             )
             return {
                 "healthy": response.status_code == 200,
@@ -72,6 +80,8 @@ class OpenAIProvider(BaseProvider):
 
     def _validate_request(self, request: Dict[str, Any], is_chat: bool = True):
         """Validate required parameters for OpenAI requests"""
+        if is_validated_request(request):
+            return  # already checked at ingestion
         required = ['model']
         if is_chat:
             required.append('messages')
@@ -96,18 +106,15 @@ class OpenAIProvider(BaseProvider):
         """Create chat completion using OpenAI API with streaming support"""
         self._validate_request(request, is_chat=True)
         start_time = time.time()
-        headers = {"Authorization": f"Bearer {self.api_key}"}
         
         if request.get('stream', False):
             # Streaming response
             async def stream_generator():
                 try:
-                    async with self.make_request(
+                    async with self.stream_request(
                         "POST",
-                        f"{self.config.base_url}/chat/completions",
-                        json=request,
-                        headers=headers,
-                        stream=True
+                        self.dispatcher.url("chat"),
+                        json=request
                     ) as response:
                         if response.status_code == 401:
                             raise AuthenticationError("OpenAI Authentication failed", code="unauthorized")
@@ -152,11 +159,10 @@ class OpenAIProvider(BaseProvider):
             try:
                 response = await self.make_request(
                     "POST",
-                    f"{self.config.base_url}/chat/completions",
-                    json=request,
-                    headers=headers
+                    self.dispatcher.url("chat"),
+                    json=request
                 )
-                data = response.json()
+                data = parse_upstream_json(response)
                 
                 # Specific error handling
                 if 'error' in data:
@@ -172,14 +178,6 @@ class OpenAIProvider(BaseProvider):
                     else:
                         raise APIConnectionError(message, code=error_type)
                 
-                # Handle usage
-                if 'usage' in data:
-                    data['usage'] = {
-                        'prompt_tokens': data['usage']['prompt_tokens'],
-                        'completion_tokens': data['usage']['completion_tokens'],
-                        'total_tokens': data['usage']['total_tokens']
-                    }
-
                 # Record metrics and log success
                 usage = data.get('usage', {})
                 total_tokens = usage.get('total_tokens', 0)
@@ -275,8 +273,7 @@ class OpenAIProvider(BaseProvider):
             try:
                 response = await self.make_request(
                     "GET",
-                    f"{self.config.base_url}/models/{model_id}",
-                    headers={"Authorization": f"Bearer {self.api_key}"}
+                    f"{self.dispatcher.url('models')}/{model_id}"
                 )
                 
                 if response.status_code == 404:
@@ -308,18 +305,15 @@ class OpenAIProvider(BaseProvider):
     async def create_text_completion(self, request: Dict[str, Any]) -> Union[Dict[str, Any], AsyncGenerator]:
         """Create text completion using OpenAI API with streaming support"""
         self._validate_request(request, is_chat=False)
-        headers = {"Authorization": f"Bearer {self.api_key}"}
         
         if request.get('stream', False):
             # Streaming response
             async def stream_generator():
                 try:
-                    async with self.make_request(
+                    async with self.stream_request(
                         "POST",
-                        f"{self.config.base_url}/completions",
-                        json=request,
-                        headers=headers,
-                        stream=True
+                        self.dispatcher.url("completions"),
+                        json=request
                     ) as response:
                         if response.status_code == 401:
                             raise AuthenticationError("OpenAI Authentication failed", code="unauthorized")
@@ -364,11 +358,10 @@ class OpenAIProvider(BaseProvider):
             try:
                 response = await self.make_request(
                     "POST",
-                    f"{self.config.base_url}/completions",
-                    json=request,
-                    headers=headers
+                    self.dispatcher.url("completions"),
+                    json=request
                 )
-                data = response.json()
+                data = parse_upstream_json(response)
                 
                 # Specific error handling
                 if 'error' in data:
@@ -384,13 +377,6 @@ class OpenAIProvider(BaseProvider):
                     else:
                         raise APIConnectionError(message, code=error_type)
                 
-                # Handle usage
-                if 'usage' in data:
-                    data['usage'] = {
-                        'prompt_tokens': data['usage']['prompt_tokens'],
-                        'completion_tokens': data['usage']['completion_tokens'],
-                        'total_tokens': data['usage']['total_tokens']
-                    }
                 
                 return data
             except httpx.HTTPStatusError as e:
@@ -409,15 +395,13 @@ class OpenAIProvider(BaseProvider):
         self._validate_request(request, is_chat=False)  # Reuse for model and input
         if not request.get('input'):
             raise InvalidRequestError("Missing required 'input' parameter", param="input", code="missing_input")
-        headers = {"Authorization": f"Bearer {self.api_key}"}
         try:
             response = await self.make_request(
                 "POST",
-                f"{self.config.base_url}/embeddings",
-                json=request,
-                headers=headers
+                self.dispatcher.url("embeddings"),
+                json=request
             )
-            data = response.json()
+            data = parse_upstream_json(response)
             
             # Specific error handling
             if 'error' in data:
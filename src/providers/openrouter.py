@@ -14,16 +14,45 @@ from src.core.exceptions import (APIConnectionError, AuthenticationError,
                                  InvalidRequestError, RateLimitError)
 from src.core.logging import ContextualLogger
 from src.core.metrics import metrics_collector
+from src.core.provider_dispatch import FieldRule, compile_payload_map
 from src.core.provider_factory import BaseProvider
 from src.core.unified_config import ProviderConfig
+from src.models.request_view import is_validated_request
+from src.models.upstream_response import parse_upstream_json
+
+# OpenAI request field -> OpenRouter payload field; unset (None) fields are not sent
+_chat_payload = compile_payload_map([
+    FieldRule("model", default="openai/gpt-3.5-turbo", drop_none=True),
+    FieldRule("messages", default=[], drop_none=True),
+    FieldRule("max_tokens", default=1024, drop_none=True),
+    FieldRule("temperature", default=0.7, drop_none=True),
+    FieldRule("top_p", default=1.0, drop_none=True),
+    FieldRule("top_k", drop_none=True),
+    FieldRule("frequency_penalty", default=0.0, drop_none=True),
+    FieldRule("presence_penalty", default=0.0, drop_none=True),
+    FieldRule("repetition_penalty", default=1.0, drop_none=True),
+    FieldRule("stop", drop_none=True),
+    FieldRule("logit_bias", drop_none=True),
+    FieldRule("logprobs", drop_none=True),
+    FieldRule("response_format", drop_none=True),
+    FieldRule("tools", drop_none=True),
+    FieldRule("tool_choice", drop_none=True),
+    FieldRule("parallel_tool_calls", drop_none=True),
+    FieldRule("stream", default=False, drop_none=True),
+])
 
 
 class OpenRouterProvider(BaseProvider):
     """OpenRouter provider with unified model access"""
 
+    DEFAULT_BASE_URL = "https://openrouter.ai/api"
+    ENDPOINTS = {
+        "models": "/v1/models",
+        "chat": "/v1/chat/completions",
+    }
+
     def __init__(self, config: ProviderConfig):
         super().__init__(config)
-        self.base_url = config.base_url or "https://openrouter.ai/api"
         self.logger = ContextualLogger(f"provider.{config.name}")
         self._models_cache = None
         self._models_cache_time = 0
@@ -36,11 +65,7 @@ class OpenRouterProvider(BaseProvider):
             # Try to get available models as health check
             response = await self.make_request(
                 "GET",
-                f"{self.base_url}/v1/models",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
+                self.dispatcher.url("models")
             )
             models_data = response.json()
             return {
@@ -53,6 +78,8 @@ class OpenRouterProvider(BaseProvider):
 
     def _validate_request(self, request: Dict[str, Any]):
         """Validate required parameters for OpenRouter requests"""
+        if is_validated_request(request):
+            return  # already checked at ingestion
         if not request.get('model'):
             raise InvalidRequestError("Missing required 'model' parameter", param="model", code="missing_model")
         if not request.get('messages') and not request.get('prompt'):
@@ -71,14 +98,9 @@ class OpenRouterProvider(BaseProvider):
                 return self._models_cache
 
             try:
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
                 response = await self.make_request(
                     "GET",
-                    f"{self.base_url}/v1/models",
-                    headers=headers
+                    self.dispatcher.url("models")
                 )
 
                 # Error handling for models fetch
@@ -113,40 +135,17 @@ class OpenRouterProvider(BaseProvider):
 
         try:
             # Prepare request for OpenRouter API
-            openrouter_request = {
-                "model": request.get("model", "openai/gpt-3.5-turbo"),
-                "messages": request.get("messages", []),
-                "max_tokens": request.get("max_tokens", 1024),
-                "temperature": request.get("temperature", 0.7),
-                "top_p": request.get("top_p", 1.0),
-                "top_k": request.get("top_k"),
-                "frequency_penalty": request.get("frequency_penalty", 0.0),
-                "presence_penalty": request.get("presence_penalty", 0.0),
-                "repetition_penalty": request.get("repetition_penalty", 1.0),
-                "stop": request.get("stop"),
-                "logit_bias": request.get("logit_bias"),
-                "logprobs": request.get("logprobs"),
-                "response_format": request.get("response_format"),
-                "tools": request.get("tools"),
-                "tool_choice": request.get("tool_choice"),
-                "parallel_tool_calls": request.get("parallel_tool_calls"),
-                "stream": request.get("stream", False)
-            }
+            openrouter_request = _chat_payload(request)
 
-            # Remove None values
-            openrouter_request = {k: v for k, v in openrouter_request.items() if v is not None}
-
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-                "HTTP-Referer": request.get("extra_body", {}).get("referer", ""),
-                "X-Title": request.get("extra_body", {}).get("title", "")
-            }
+            extra_body = request.get("extra_body") or {}
             response = await self.make_request(
                 "POST",
-                f"{self.base_url}/v1/chat/completions",
+                self.dispatcher.url("chat"),
                 json=openrouter_request,
-                headers=headers
+                headers={
+                    "HTTP-Referer": extra_body.get("referer", ""),
+                    "X-Title": extra_body.get("title", "")
+                }
             )
 
             # Error handling
@@ -158,7 +157,7 @@ class OpenRouterProvider(BaseProvider):
                 error_data = response.text
                 raise InvalidRequestError(f"OpenRouter Invalid Request: {error_data}", code="invalid_request")
 
-            result = response.json()
+            result = parse_upstream_json(response)
             response_time = time.time() - start_time
 
             # Record metrics
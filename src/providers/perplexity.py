@@ -10,28 +10,42 @@ from typing import Any, Dict
 from src.core.exceptions import APIConnectionError, InvalidRequestError
 from src.core.logging import ContextualLogger
 from src.core.metrics import metrics_collector
+from src.core.provider_dispatch import FieldRule, compile_payload_map
 from src.core.provider_factory import BaseProvider
 from src.core.unified_config import ProviderConfig
 
+# OpenAI request field -> /v1/ask payload field (the query is built separately)
+_ask_payload = compile_payload_map([
+    FieldRule("model", default="llama-3.1-sonar-small-128k-online"),
+    FieldRule("max_tokens", default=1024),
+    FieldRule("temperature", default=0.7),
+    FieldRule("top_p", default=0.9),
+])
+
 
 class PerplexityProvider(BaseProvider):
     """Perplexity.ai provider with /v1/ask interface mapped to OpenAI-compatible"""
+
+    DEFAULT_BASE_URL = "https://api.perplexity.ai"
+    ENDPOINTS = {
+        "models": "/v1/models",
+        "ask": "/v1/ask",
+    }
  
     def __init__(self, config: ProviderConfig):
         super().__init__(config)
-        self.base_url = config.base_url or "https://api.perplexity.ai"
         self.logger = ContextualLogger(f"provider.{config.name}")
 
+    def _auth_headers(self) -> Dict[str, str]:
+        # /v1/models takes a bearer token, /v1/ask the key header (per docs)
+        return {"Authorization": f"Bearer {self.api_key}", "x-perplexity-api-key": self.api_key}
+
     async def _perform_health_check(self) -> Dict[str, Any]:
         """Check Perplexity API health using /v1/models"""
         try:
             response = await self.make_request(
                 "GET",
-                f"{self.base_url}/v1/models",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
+                self.dispatcher.url("models")
             )
             return {"models_available": len(response.json().get("data", []))}
         except Exception as e:
@@ -58,13 +72,8 @@ class PerplexityProvider(BaseProvider):
         else:
             query = request.get('prompt', '')
         
-        ask_request = {
-            "model": request.get("model", "llama-3.1-sonar-small-128k-online"),
-            "query": query,
-            "max_tokens": request.get("max_tokens", 1024),
-            "temperature": request.get("temperature", 0.7),
-            "top_p": request.get("top_p", 0.9)
-        }
+        ask_request = _ask_payload(request)
+        ask_request["query"] = query
         return ask_request
 
     def _parse_ask_response(self, ask_response: Dict[str, Any]) -> Dict[str, Any]:
@@ -105,15 +114,10 @@ class PerplexityProvider(BaseProvider):
         start_time = time.time()
         try:
             ask_request = self._transform_to_ask(request)
-            headers = {
-                "x-perplexity-api-key": self.api_key,  # Use header as per docs
-                "Content-Type": "application/json"
-            }
             response = await self.make_request(
                 "POST",
-                f"{self.base_url}/v1/ask",
-                json=ask_request,
-                headers=headers
+                self.dispatcher.url("ask"),
+                json=ask_request
             )
             result = response.json()
             response_time = time.time() - start_time
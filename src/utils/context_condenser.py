@@ -5,14 +5,17 @@ import os
 import re
 import time
 from collections import OrderedDict
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from fastapi import Request
 
+from src.core.cache_policy import DEFAULT_EVICTION_POLICY, create_policy
 from src.core.logging import ContextualLogger
 from src.core.metrics import metrics_collector
 from src.core.provider_factory import provider_factory
 from src.core.unified_config import config_manager
+from src.utils.prefix_summary_store import (get_prefix_summary_store,
+                                            incremental_chunks, prefix_hashes)
 
 # Optional Redis import for distributed caching in high-load environments
 try:
@@ -24,6 +27,82 @@ except ImportError:
 
 logger = ContextualLogger(__name__)
 
+# Optional tokenizer for accurate window sizing; falls back to a character heuristic
+try:
+    import tiktoken  # type: ignore
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    tiktoken = None
+    _ENCODING = None
+
+CHARS_PER_TOKEN = 4
+MAX_REDUCE_LEVELS = 3
+WINDOW_SEPARATOR = "\n\n---\n\n"
+
+# Keys per pipelined Redis MSET/DEL/MGET and per SCAN page
+PERSIST_BATCH_SIZE = 500
+# Retry delays (seconds) while the write-behind backend keeps failing
+FLUSH_RETRY_MIN = 1.0
+FLUSH_RETRY_MAX = 60.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Count tokens with tiktoken when available, otherwise estimate from length"""
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _split_oversized(text: str, max_tokens: int) -> List[str]:
+    """Split a single message larger than a window, preferring paragraph and word boundaries"""
+    total_tokens = estimate_tokens(text)
+    if total_tokens <= max_tokens:
+        return [text]
+
+    # Size pieces by this text's own chars-per-token ratio so we tokenize only once
+    max_chars = max(1, len(text) * max_tokens // total_tokens)
+    pieces = []
+    while len(text) > max_chars:
+        cut = text.rfind("\n\n", 0, max_chars)
+        if cut <= max_chars // 2:
+            cut = text.rfind(" ", 0, max_chars)
+        if cut <= max_chars // 2:
+            cut = max_chars
+        pieces.append(text[:cut])
+        text = text[cut:].lstrip()
+    if text:
+        pieces.append(text)
+    return pieces
+
+
+def build_windows(chunks: List[str], window_tokens: int) -> List[str]:
+    """
+    Pack messages in order into windows of at most ``window_tokens``.
+    Packing is deterministic and greedy from the start, so appending messages
+    to a conversation only changes its last window.
+    """
+    separator_tokens = estimate_tokens(WINDOW_SEPARATOR)
+    windows: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for chunk in chunks:
+        for piece in _split_oversized(chunk, window_tokens):
+            piece_tokens = estimate_tokens(piece)
+            added = piece_tokens + (separator_tokens if current else 0)
+            if current and current_tokens + added > window_tokens:
+                windows.append(WINDOW_SEPARATOR.join(current))
+                current, current_tokens = [], 0
+                added = piece_tokens
+            current.append(piece)
+            current_tokens += added
+
+    if current:
+        windows.append(WINDOW_SEPARATOR.join(current))
+    return windows
+
 async def call_provider_with_timeout(provider, cfg, request_body):
     """Helper to call provider with timeout"""
     try:
@@ -35,13 +114,41 @@ async def call_provider_with_timeout(provider, cfg, request_body):
         raise e
 
 class AsyncLRUCache:
-    """Async-compatible LRU Cache with persistence support (file or Redis)"""
-    def __init__(self, maxsize: int = 1000, persist_file: Optional[str] = None, redis_url: Optional[str] = None):
+    """
+    Async-compatible cache with write-behind persistence (file or Redis).
+
+    Eviction follows ``eviction_policy`` (W-TinyLFU by default, ``lru`` for
+    plain recency) with every entry counted as one unit of ``maxsize``.
+
+    ``set`` only marks keys dirty; a debounced background flush persists the
+    changes every ``flush_interval`` seconds. Redis flushes are pipelined
+    ``MSET``/``EXPIRE``/``DEL`` batches, file flushes append to a log next to
+    the JSON snapshot, which is compacted once the log grows past the cache size.
+    """
+    def __init__(self, maxsize: int = 1000, persist_file: Optional[str] = None, redis_url: Optional[str] = None,
+                 flush_interval: float = 1.0, ttl: Optional[int] = None,
+                 eviction_policy: str = DEFAULT_EVICTION_POLICY):
         self.maxsize = maxsize
         self.cache = OrderedDict()
+        self.eviction_policy = eviction_policy
+        self._policy = create_policy(eviction_policy, maxsize, max_entries=maxsize)
         self.persist_file = persist_file
+        self.log_file = f"{persist_file}.log" if persist_file else None
         self.redis_url = redis_url
         self.redis_client = None
+        self.flush_interval = flush_interval
+        self.ttl = ttl
+
+        # Write-behind state: keys changed or evicted since the last flush
+        self._dirty: set = set()
+        self._evicted: set = set()
+        self._log_entries = 0
+        self._flush_task: Optional[asyncio.Task] = None
+        self._persist_lock = asyncio.Lock()
+        self.flush_count = 0
+        self.flushed_keys = 0
+        self.flush_errors = 0
+        self.consecutive_flush_failures = 0
 
         # Background task management
         self._background_tasks: set = set()
@@ -54,24 +161,29 @@ class AsyncLRUCache:
         elif self.redis_url and not REDIS_AVAILABLE:
             logger.warning("Redis URL provided but redis package not available, falling back to in-memory cache")
 
+    @property
+    def persistent(self) -> bool:
+        return bool(self.redis_client or self.persist_file)
+
     async def load(self):
         """Load cache from file or Redis if persistence enabled"""
         if self.redis_client:
-            # Load from Redis
+            # Load from Redis with incremental SCAN and batched MGET
             try:
-                keys = await self.redis_client.keys("cache:*")
-                if keys:
-                    for key in keys:
-                        value = await self.redis_client.get(key)
-                        if value:
-                            cache_key = key.decode('utf-8').replace("cache:", "")
-                            data = json.loads(value.decode('utf-8'))
-                            self.cache[cache_key] = tuple(data)
-                    logger.info(f"Loaded {len(self.cache)} items from Redis")
+                batch = []
+                async for key in self.redis_client.scan_iter(match="cache:*", count=PERSIST_BATCH_SIZE):
+                    batch.append(key)
+                    if len(batch) >= PERSIST_BATCH_SIZE:
+                        await self._load_redis_batch(batch)
+                        batch = []
+                if batch:
+                    await self._load_redis_batch(batch)
+                self._trim()
+                logger.info(f"Loaded {len(self.cache)} items from Redis")
             except Exception as e:
                 logger.error(f"Failed to load Redis cache: {e}")
         elif self.persist_file:
-            # Load from file
+            # Load the snapshot, then replay the append log written since it
             try:
                 with open(self.persist_file, 'r', encoding='utf-8', errors='ignore') as f:
                     data = json.load(f)
@@ -89,70 +201,216 @@ class AsyncLRUCache:
                     logger.error(f"Failed to rename corrupted cache file: {rename_error}")
             except Exception as e:
                 logger.error(f"Failed to load persistent cache: {e}")
+            self._replay_log()
+            self._trim()
+
+    async def _load_redis_batch(self, keys: list):
+        values = await self.redis_client.mget(keys)
+        for key, value in zip(keys, values):
+            if value:
+                key = key.decode('utf-8') if isinstance(key, bytes) else key
+                self.cache[key[len("cache:"):]] = tuple(json.loads(value))
+
+    def _replay_log(self):
+        """Apply ``[key, value]`` (set) and ``[key]`` (delete) records from the append log"""
+        try:
+            with open(self.log_file, 'r', encoding='utf-8', errors='ignore') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn write at the end of the log
+                    if len(record) == 2:
+                        self.cache[record[0]] = tuple(record[1])
+                        self.cache.move_to_end(record[0])
+                    else:
+                        self.cache.pop(record[0], None)
+                    self._log_entries += 1
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.error(f"Failed to replay cache log: {e}")
+        if self._log_entries:
+            logger.info(f"Replayed {self._log_entries} records from {self.log_file}")
+
+    def _trim(self):
+        """Drop the oldest loaded entries beyond ``maxsize`` and index the rest"""
+        while len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
+        self._policy.clear()
+        for key in self.cache:
+            self._policy.add(key, 1)
+
+    async def flush(self) -> int:
+        """
+        Persist keys changed since the last flush; returns the number of keys
+        written. A failed write keeps the keys pending and counts in
+        ``consecutive_flush_failures`` until a flush succeeds.
+        """
+        async with self._persist_lock:
+            if not (self._dirty or self._evicted) or not self.persistent:
+                return 0
+            dirty, evicted = self._dirty, self._evicted
+            self._dirty, self._evicted = set(), set()
+            entries = {key: self.cache[key] for key in dirty if key in self.cache}
+            evicted = evicted - entries.keys()
 
-    async def save(self):
-        """Save cache to file or Redis if persistence enabled"""
-        if self.redis_client:
-            # Save to Redis
-            if len(self.cache) == 0:
-                return
             try:
-                for key, value in self.cache.items():
-                    redis_key = f"cache:{key}"
-                    await self.redis_client.set(redis_key, json.dumps(value))
-                logger.debug(f"Saved {len(self.cache)} items to Redis")
+                if self.redis_client:
+                    await self._flush_redis(entries, evicted)
+                else:
+                    await asyncio.to_thread(self._append_log, entries, evicted)
             except Exception as e:
-                logger.error(f"Failed to save Redis cache: {e}")
-        elif self.persist_file:
-            # Save to file
-            if len(self.cache) == 0:
-                return
+                logger.error(f"Failed to flush cache: {e}")
+                # Keep the changes pending unless they were superseded meanwhile
+                self._dirty |= {key for key in entries if key not in self._evicted}
+                self._evicted |= {key for key in evicted if key not in self._dirty}
+                self.flush_errors += 1
+                self.consecutive_flush_failures += 1
+                return 0
+
+            self.consecutive_flush_failures = 0
+            self.flush_count += 1
+            self.flushed_keys += len(entries) + len(evicted)
+            logger.debug(f"Flushed {len(entries)} updates and {len(evicted)} evictions")
+
+        if self.persist_file and not self.redis_client and self._log_entries > max(self.maxsize, len(self.cache)):
+            await self.compact()
+        return len(entries) + len(evicted)
+
+    async def _flush_redis(self, entries: dict, evicted: set):
+        """Write all pending changes in one pipelined round-trip"""
+        pipe = self.redis_client.pipeline(transaction=False)
+        items = list(entries.items())
+        for start in range(0, len(items), PERSIST_BATCH_SIZE):
+            batch = items[start:start + PERSIST_BATCH_SIZE]
+            pipe.mset({f"cache:{key}": json.dumps(value) for key, value in batch})
+            if self.ttl:
+                for key, _ in batch:
+                    pipe.expire(f"cache:{key}", self.ttl)
+        evicted_keys = [f"cache:{key}" for key in evicted]
+        for start in range(0, len(evicted_keys), PERSIST_BATCH_SIZE):
+            pipe.delete(*evicted_keys[start:start + PERSIST_BATCH_SIZE])
+        await pipe.execute()
+
+    def _append_log(self, entries: dict, evicted: set):
+        records = [json.dumps([key, value], ensure_ascii=False) for key, value in entries.items()]
+        records.extend(json.dumps([key], ensure_ascii=False) for key in evicted)
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(records) + '\n')
+        self._log_entries += len(records)
+
+    async def compact(self):
+        """Rewrite the file snapshot from memory and truncate the append log"""
+        if not self.persist_file:
+            return
+        async with self._persist_lock:
+            snapshot = dict(self.cache)
             try:
-                with open(self.persist_file, 'w', encoding='utf-8') as f:
-                    json.dump(dict(self.cache), f, ensure_ascii=False)
-                logger.debug(f"Saved {len(self.cache)} items to {self.persist_file}")
+                await asyncio.to_thread(self._write_snapshot, snapshot)
+                self._log_entries = 0
+                logger.debug(f"Compacted {len(snapshot)} items to {self.persist_file}")
             except Exception as e:
                 logger.error(f"Failed to save persistent cache: {e}")
 
+    def _write_snapshot(self, snapshot: dict):
+        tmp_file = f"{self.persist_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(tmp_file, self.persist_file)
+        # Every logged change is now in the snapshot
+        open(self.log_file, 'w').close()
+
+    async def save(self):
+        """Persist the whole cache (file snapshot or pipelined Redis write)"""
+        if self.redis_client:
+            self._dirty.update(self.cache.keys())
+            await self.flush()
+        elif self.persist_file:
+            await self.flush()
+            await self.compact()
+
+    def _schedule_flush(self):
+        """Start the debounced write-behind flush unless one is already pending"""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+            self._background_tasks.add(self._flush_task)
+            self._flush_task.add_done_callback(self._background_tasks.discard)
+
+    async def _flush_later(self):
+        delay = self.flush_interval
+        while True:
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self.flush()
+            failures = self.consecutive_flush_failures
+            if failures:
+                # Back off while the backend is down instead of retrying in a tight loop
+                delay = min(max(self.flush_interval, FLUSH_RETRY_MIN) * 2 ** (failures - 1), FLUSH_RETRY_MAX)
+                continue
+            delay = self.flush_interval
+            # Keys changed while flushing go out with the next batch
+            if not (self._dirty or self._evicted):
+                break
+
     def get(self, key: str):
         """Get item, move to end (MRU)"""
         if key in self.cache:
             self.cache.move_to_end(key)
+            self._policy.touch(key)
             return self.cache[key]
+        self._policy.record_access(key)
         return None
 
     def set(self, key: str, value: tuple):
-        """Set item, evict if full"""
+        """Set item, evict if full; persistence happens in the background"""
         if key in self.cache:
             self.cache.move_to_end(key)
-        else:
-            if len(self.cache) >= self.maxsize:
-                oldest_key, _ = self.cache.popitem(last=False)
-                logger.debug(f"Evicted cache item: {oldest_key}")
-                # Also remove from Redis if using Redis
-                if self.redis_client:
-                    task = asyncio.create_task(self.redis_client.delete(f"cache:{oldest_key}"))
-                    self._background_tasks.add(task)
-                    task.add_done_callback(self._background_tasks.discard)
-            self.cache[key] = value
-        # Async save on set
-        task = asyncio.create_task(self.save())
-        self._background_tasks.add(task)
-        task.add_done_callback(self._background_tasks.discard)
+        self.cache[key] = value
+        self._policy.add(key, 1)
+        while len(self.cache) > self.maxsize:
+            evicted_key = self._policy.pop_victim()
+            if evicted_key is None:
+                evicted_key, _ = self.cache.popitem(last=False)
+            else:
+                self.cache.pop(evicted_key, None)
+            logger.debug(f"Evicted cache item: {evicted_key}")
+            if self.persistent:
+                self._dirty.discard(evicted_key)
+                self._evicted.add(evicted_key)
+        if key not in self.cache:
+            return  # Refused admission: the new key was the least valuable
+        if self.persistent:
+            self._evicted.discard(key)
+            self._dirty.add(key)
+            self._schedule_flush()
 
     def clear(self):
+        if self.persistent:
+            self._evicted.update(self.cache.keys())
+            self._dirty.clear()
+            self._schedule_flush()
         self.cache.clear()
-        # Async save on clear
-        task = asyncio.create_task(self.save())
-        self._background_tasks.add(task)
-        task.add_done_callback(self._background_tasks.discard)
+        self._policy.clear()
+
+    def get_stats(self) -> dict:
+        return {
+            'size': len(self.cache),
+            'maxsize': self.maxsize,
+            'eviction_policy': self._policy.get_stats(),
+            'pending_writes': len(self._dirty) + len(self._evicted),
+            'flush_count': self.flush_count,
+            'flushed_keys': self.flushed_keys,
+            'flush_errors': self.flush_errors,
+            'log_entries': self._log_entries,
+        }
 
     async def initialize(self):
         """Initialize cache by loading from persistence if enabled"""
         await self.load()
 
     async def shutdown(self):
-        """Shutdown cache and save to file/Redis if persistence enabled"""
+        """Shutdown cache and flush pending writes to file/Redis if persistence enabled"""
         # Cancel all pending background tasks
         if self._background_tasks:
             logger.info(f"Cancelling {len(self._background_tasks)} background tasks")
@@ -165,8 +423,10 @@ class AsyncLRUCache:
                 await asyncio.gather(*self._background_tasks, return_exceptions=True)
             logger.info("All background tasks cancelled")
 
-        # Final save
-        await self.save()
+        # Final flush; the file backend also folds its log into the snapshot
+        await self.flush()
+        if self.persist_file and not self.redis_client:
+            await self.compact()
         if self.redis_client:
             await self.redis_client.close()
         logger.info(f"Cache shutdown, saved {len(self.cache)} items")
@@ -198,7 +458,13 @@ async def condense_context(request: Request, chunks: List[str], max_tokens: int
     # Initialize or get LRU cache from app state
     if not hasattr(request.app.state, 'lru_cache') or request.app.state.lru_cache is None:
         persist_file = 'cache.json' if condensation_config.cache_persist else None
-        request.app.state.lru_cache = AsyncLRUCache(maxsize=condensation_config.cache_size, persist_file=persist_file)
+        request.app.state.lru_cache = AsyncLRUCache(
+            maxsize=condensation_config.cache_size,
+            persist_file=persist_file,
+            flush_interval=condensation_config.cache_flush_interval,
+            ttl=condensation_config.cache_ttl,
+            eviction_policy=condensation_config.cache_eviction_policy
+        )
         # Initialize cache loading if persistence is enabled
         if persist_file:
             await request.app.state.lru_cache.initialize()
@@ -224,13 +490,58 @@ async def condense_context(request: Request, chunks: List[str], max_tokens: int
             metrics_collector.record_summary(True, 0.0)
             return summary
 
-    # Proactive truncation if content would be too long
-    content = "\n\n---\n\n".join(chunks)
-    if len(content) > condensation_config.truncation_threshold:
-        truncate_len = condensation_config.truncation_threshold // 2
-        content = content[-truncate_len:]
-        use_max_tokens = min(use_max_tokens, truncate_len // 4)
-        logger.info(f"Proactively truncated content from {len(content) + truncate_len} to {len(content)} chars due to threshold {condensation_config.truncation_threshold}")
+    # Reuse the summary of the longest already-condensed prefix of the conversation
+    prefix_store = None
+    hashes: List[str] = []
+    if condensation_config.prefix_cache_enabled:
+        prefix_store = get_prefix_summary_store(request.app.state, condensation_config)
+        hashes = prefix_hashes(chunks)
+        reused, prefix_summary = prefix_store.longest_prefix(hashes)
+        if chunks and reused == len(chunks):
+            logger.debug(f"Prefix cache hit for all {reused} messages")
+            metrics_collector.record_summary(True, 0.0)
+            lru_cache.set(chunk_hash, (prefix_summary, time.time()))
+            return prefix_summary
+        if reused:
+            logger.debug(f"Reusing summary of {reused}/{len(chunks)} messages, condensing the tail only")
+            chunks = incremental_chunks(prefix_summary, chunks[reused:])
+
+    content = WINDOW_SEPARATOR.join(chunks)
+    if condensation_config.map_reduce_enabled:
+        if estimate_tokens(content) > condensation_config.map_reduce_window_tokens:
+            # Too large for one summarization call: summarize windows in parallel, then reduce
+            summary = await map_reduce_condense(request, lru_cache, chunks, use_max_tokens)
+        else:
+            summary = await summarize_content(request, content, use_max_tokens)
+    else:
+        # Proactive truncation if content would be too long
+        if len(content) > condensation_config.truncation_threshold:
+            truncate_len = condensation_config.truncation_threshold // 2
+            content = content[-truncate_len:]
+            use_max_tokens = min(use_max_tokens, truncate_len // 4)
+            logger.info(f"Proactively truncated content from {len(content) + truncate_len} to {len(content)} chars due to threshold {condensation_config.truncation_threshold}")
+        summary = await summarize_content(request, content, use_max_tokens)
+
+    # Record latency for cache miss
+    end_time = time.time()
+    latency = end_time - start_time
+    metrics_collector.record_summary(False, latency)
+    
+    # Store in cache
+    lru_cache.set(chunk_hash, (summary, time.time()))
+    if prefix_store is not None:
+        prefix_store.put(hashes, summary)
+    logger.debug(f"Cache miss, stored for chunk hash: {chunk_hash}")
+    
+    return summary
+
+
+async def summarize_content(request: Request, content: str, use_max_tokens: int, instruction: Optional[str] = None) -> str:
+    """
+    Summarize a single piece of content with the highest-priority provider(s),
+    applying the configured fallback strategies on failure.
+    """
+    condensation_config = request.app.state.condensation_config
 
     # Prepare providers for parallel or sequential
     enabled_providers = [p for p in request.app.state.config.providers if p.enabled]
@@ -242,7 +553,7 @@ async def condense_context(request: Request, chunks: List[str], max_tokens: int
     request_body = {
         "model": "",  # Will be set per provider
         "messages": [
-            {"role": "system", "content": f"Resuma mantendo entidades e intents, limitando a {use_max_tokens} tokens."},
+            {"role": "system", "content": instruction or f"Resuma mantendo entidades e intents, limitando a {use_max_tokens} tokens."},
             {"role": "user", "content": content}
         ],
         "max_tokens": use_max_tokens
@@ -331,15 +642,71 @@ async def condense_context(request: Request, chunks: List[str], max_tokens: int
                         continue
             raise ValueError(error_msg)
     
-    summary = resp["choices"][0]["message"]["content"]
-    
-    # Record latency for cache miss
-    end_time = time.time()
-    latency = end_time - start_time
-    metrics_collector.record_summary(False, latency)
-    
-    # Store in cache
-    lru_cache.set(chunk_hash, (summary, time.time()))
-    logger.debug(f"Cache miss, stored for chunk hash: {chunk_hash}")
-    
-    return summary
\ No newline at end of file
+    return resp["choices"][0]["message"]["content"]
+
+
+async def _summarize_window(request: Request, lru_cache: AsyncLRUCache, window: str,
+                            max_tokens: int, semaphore: asyncio.Semaphore) -> Tuple[str, bool]:
+    """Summarize one window, reusing a cached summary of identical content"""
+    condensation_config = request.app.state.condensation_config
+    window_hash = hashlib.md5(f"{max_tokens}:{window}".encode()).hexdigest()
+    cache_key = f"window:{window_hash}"
+
+    cached = lru_cache.get(cache_key)
+    if cached:
+        summary, timestamp = cached
+        if time.time() - timestamp < condensation_config.cache_ttl:
+            return summary, True
+
+    async with semaphore:
+        summary = await summarize_content(
+            request, window, max_tokens,
+            instruction=f"Resuma este trecho de uma conversa mais longa mantendo entidades, intents e decisões, limitando a {max_tokens} tokens."
+        )
+    lru_cache.set(cache_key, (summary, time.time()))
+    return summary, False
+
+
+async def map_reduce_condense(request: Request, lru_cache: AsyncLRUCache, chunks: List[str], use_max_tokens: int) -> str:
+    """
+    Condense content that does not fit one summarization call.
+
+    Map: messages are packed in order into token-counted windows that are
+    summarized in parallel (bounded by ``map_reduce_concurrency``). Windows are
+    cached by content hash, so the unchanged prefix of a growing conversation
+    is never summarized twice.
+    Reduce: window summaries are combined into the final summary, repeating the
+    map step if the summaries themselves are still too large.
+    """
+    condensation_config = request.app.state.condensation_config
+    window_tokens = condensation_config.map_reduce_window_tokens
+    window_summary_tokens = min(condensation_config.map_reduce_summary_tokens, window_tokens // 2)
+    semaphore = asyncio.Semaphore(condensation_config.map_reduce_concurrency)
+
+    texts = chunks
+    for level in range(MAX_REDUCE_LEVELS):
+        windows = build_windows(texts, window_tokens)
+        if len(windows) <= 1:
+            break
+
+        results = await asyncio.gather(*(
+            _summarize_window(request, lru_cache, window, window_summary_tokens, semaphore)
+            for window in windows
+        ))
+        texts = [summary for summary, _ in results]
+        logger.info(
+            "Condensed context windows",
+            level=level,
+            windows=len(windows),
+            cached_windows=sum(1 for _, hit in results if hit)
+        )
+
+    content = WINDOW_SEPARATOR.join(texts)
+    if estimate_tokens(content) > window_tokens:
+        # Summaries did not converge within the level limit; keep the most recent part
+        content = content[-window_tokens * CHARS_PER_TOKEN:]
+
+    return await summarize_content(
+        request, content, use_max_tokens,
+        instruction=f"Combine os resumos parciais a seguir, em ordem, em um único resumo mantendo entidades e intents, limitando a {use_max_tokens} tokens."
+    )
@@ -0,0 +1,128 @@
+"""
+Prefix-aware summary store for context condensation.
+
+Chat sessions grow by appending messages, so keying summaries on a hash of the
+whole conversation turns every new message into a full miss. Here every
+message boundary gets a rolling hash
+
+    h_0 = H(seed),  h_i = H(h_{i-1} || H(message_i))
+
+so ``h_i`` identifies ``messages[:i]`` exactly. Summaries are stored under the
+hash of the prefix they cover; a new request looks up the longest prefix that
+was already summarized and only condenses the messages after it.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.logging import ContextualLogger
+
+logger = ContextualLogger(__name__)
+
+_HASH_SEED = b"llm-proxy-prefix-v1"
+
+# Header placed in front of a reused prefix summary when condensing the tail
+PREFIX_SUMMARY_HEADER = "Resumo da parte anterior da conversa:"
+
+
+def prefix_hashes(chunks: List[str]) -> List[str]:
+    """Rolling hash at every message boundary: element ``i`` covers ``chunks[:i + 1]``"""
+    hashes = []
+    state = hashlib.blake2b(_HASH_SEED, digest_size=16).digest()
+    for chunk in chunks:
+        message_digest = hashlib.blake2b(chunk.encode('utf-8'), digest_size=16).digest()
+        state = hashlib.blake2b(state + message_digest, digest_size=16).digest()
+        hashes.append(state.hex())
+    return hashes
+
+
+def incremental_chunks(prefix_summary: Optional[str], tail: List[str]) -> List[str]:
+    """Chunks to condense when a summary of the earlier messages can be reused"""
+    if not prefix_summary:
+        return list(tail)
+    return [f"{PREFIX_SUMMARY_HEADER}\n{prefix_summary}"] + list(tail)
+
+
+class PrefixSummaryStore:
+    """Bounded LRU of summaries keyed by conversation-prefix hash"""
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[str, int, float]]" = OrderedDict()
+
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+        self.reused_messages = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: str) -> Optional[Tuple[str, int, float]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry[2] >= self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def longest_prefix(self, hashes: List[str]) -> Tuple[int, Optional[str]]:
+        """
+        Return ``(message_count, summary)`` for the longest summarized prefix,
+        or ``(0, None)`` when no prefix of the conversation is cached.
+        """
+        for index in range(len(hashes) - 1, -1, -1):
+            entry = self._get(hashes[index])
+            if entry is not None:
+                count = index + 1
+                if count == len(hashes):
+                    self.hits += 1
+                else:
+                    self.partial_hits += 1
+                self.reused_messages += count
+                return count, entry[0]
+
+        self.misses += 1
+        return 0, None
+
+    def put(self, hashes: List[str], summary: str) -> None:
+        """Store the summary of the whole conversation described by ``hashes``"""
+        if not hashes:
+            return
+        key = hashes[-1]
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        elif len(self._entries) >= self.maxsize:
+            self._entries.popitem(last=False)
+        self._entries[key] = (summary, len(hashes), time.time())
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.partial_hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'partial_hits': self.partial_hits,
+            'misses': self.misses,
+            'reuse_rate': (self.hits + self.partial_hits) / lookups if lookups else 0.0,
+            'reused_messages': self.reused_messages,
+        }
+
+
+def get_prefix_summary_store(state: Any, condensation_config: Any = None) -> PrefixSummaryStore:
+    """Get the app-wide prefix summary store, creating it on first use"""
+    store = getattr(state, 'prefix_summary_store', None)
+    if not isinstance(store, PrefixSummaryStore):
+        maxsize = getattr(condensation_config, 'cache_size', 1000)
+        ttl = getattr(condensation_config, 'cache_ttl', 3600)
+        store = PrefixSummaryStore(maxsize=maxsize, ttl=ttl)
+        state.prefix_summary_store = store
+    return store
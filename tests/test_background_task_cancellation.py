@@ -25,8 +25,9 @@ class TestAsyncLRUCacheCancellation:
 
     @pytest.fixture
     def cache(self):
-        """Create a cache instance for testing"""
-        return AsyncLRUCache(maxsize=10, persist_file="test_cache.json")
+        """Create a cache instance for testing (LRU, so evictions are predictable)"""
+        return AsyncLRUCache(maxsize=10, persist_file="test_cache.json", flush_interval=0.01,
+                             eviction_policy="lru")
 
     @pytest.mark.asyncio
     async def test_background_task_tracking(self, cache):
@@ -34,7 +35,7 @@ class TestAsyncLRUCacheCancellation:
         # Initially no background tasks
         assert len(cache._background_tasks) == 0
 
-        # Add an item (triggers background save)
+        # Add an item (schedules a write-behind flush)
         cache.set("test_key", ("test_value", time.time()))
 
         # Should have a background task
@@ -47,19 +48,18 @@ class TestAsyncLRUCacheCancellation:
     @pytest.mark.asyncio
     async def test_shutdown_cancels_tasks(self, cache):
         """Test that shutdown cancels all pending background tasks"""
-        # Mock the save method to take some time
-        original_save = cache.save
-        async def slow_save():
-            await asyncio.sleep(1.0)  # Simulate slow save
-            await original_save()
-
-        with patch.object(cache, 'save', side_effect=slow_save):
-            # Add multiple items to create background tasks
+        # Mock the flush method to take some time
+        original_flush = cache.flush
+        async def slow_flush():
+            await asyncio.sleep(1.0)  # Simulate slow flush
+            return await original_flush()
+
+        with patch.object(cache, 'flush', side_effect=slow_flush):
+            # Writes are debounced into a single pending flush
             for i in range(5):
                 cache.set(f"key_{i}", (f"value_{i}", time.time()))
 
-            # Should have background tasks
-            assert len(cache._background_tasks) == 5
+            assert len(cache._background_tasks) == 1
 
             # Start shutdown
             shutdown_task = asyncio.create_task(cache.shutdown())
@@ -91,23 +91,26 @@ class TestAsyncLRUCacheCancellation:
 
     @pytest.mark.asyncio
     async def test_eviction_creates_cancellable_task(self, cache):
-        """Test that Redis eviction creates a cancellable task"""
+        """Test that Redis eviction is flushed as a pipelined delete"""
         # Mock Redis client
         mock_redis = AsyncMock()
+        mock_pipeline = MagicMock()
+        mock_pipeline.execute = AsyncMock()
+        mock_redis.pipeline = MagicMock(return_value=mock_pipeline)
         cache.redis_client = mock_redis
 
         # Fill cache to max size
         for i in range(11):  # maxsize is 10
             cache.set(f"key_{i}", (f"value_{i}", time.time()))
 
-        # Should have created a background task for Redis deletion
-        assert len(cache._background_tasks) >= 1
+        # Should have created a background flush task
+        assert len(cache._background_tasks) == 1
 
-        # Shutdown should cancel the task
+        # Shutdown cancels the task and flushes pending writes
         await cache.shutdown()
 
-        # Verify Redis delete was called (but cancelled)
-        mock_redis.delete.assert_called()
+        mock_pipeline.delete.assert_called_with("cache:key_0")
+        mock_pipeline.execute.assert_awaited()
 
 
 class TestUnifiedCacheCancellation:
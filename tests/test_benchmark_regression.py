@@ -0,0 +1,150 @@
+"""
+Tests for the benchmark result store and regression gate
+"""
+
+import random
+
+import pytest
+
+from src.benchmarks.micro import (MicroBenchmark, run_micro_suite,
+                                  select_benchmarks)
+from src.benchmarks.regression import (IMPROVEMENT, MISSING, NEW, NOISE,
+                                       REGRESSION, UNCHANGED, ResultStore,
+                                       compare_results, mann_whitney_p)
+
+
+def micro_result(commit="abc", **benchmarks):
+    """Micro suite document with one entry per keyword (name=samples)"""
+    return {
+        "suite": "micro",
+        "started_at": 1700000000.0,
+        "environment": {"git_commit": commit, "python": "3.11.0", "implementation": "CPython",
+                        "platform": "Linux", "cpu_count": 4},
+        "benchmarks": {
+            name: {"unit": "ns/op", "median": sorted(samples)[len(samples) // 2], "samples": samples}
+            for name, samples in benchmarks.items()
+        },
+    }
+
+
+def noisy(center, spread, count=20, seed=0):
+    rng = random.Random(seed)
+    return [center + rng.uniform(-spread, spread) for _ in range(count)]
+
+
+class TestMannWhitney:
+    """Test the rank test used to separate shifts from noise"""
+
+    def test_separated_samples_are_significant(self):
+        assert mann_whitney_p(noisy(100, 5), noisy(150, 5, seed=1)) < 0.001
+
+    def test_same_distribution_is_not_significant(self):
+        assert mann_whitney_p(noisy(100, 20), noisy(100, 20, seed=1)) > 0.05
+
+    def test_identical_values(self):
+        assert mann_whitney_p([1.0] * 10, [1.0] * 10) == 1.0
+
+
+class TestCompareResults:
+    """Test verdicts of the regression gate"""
+
+    def test_slowdown_beyond_threshold_is_regression(self):
+        report = compare_results(micro_result(cache=noisy(100, 2)), micro_result(cache=noisy(130, 2, seed=1)))
+        assert [c.verdict for c in report.comparisons] == [REGRESSION]
+        assert not report.passed
+
+    def test_speedup_is_improvement(self):
+        report = compare_results(micro_result(cache=noisy(100, 2)), micro_result(cache=noisy(60, 2, seed=1)))
+        assert report.comparisons[0].verdict == IMPROVEMENT
+        assert report.passed
+
+    def test_small_change_is_unchanged(self):
+        report = compare_results(micro_result(cache=noisy(100, 2)), micro_result(cache=noisy(104, 2, seed=1)))
+        assert report.comparisons[0].verdict == UNCHANGED
+
+    def test_overlapping_noisy_samples_are_noise(self):
+        baseline = [100.0] * 11 + [200.0] * 9
+        current = [100.0] * 9 + [200.0] * 11
+        report = compare_results(micro_result(cache=baseline), micro_result(cache=current))
+        assert report.comparisons[0].verdict == NOISE
+        assert report.passed
+
+    def test_threshold_precedence(self):
+        baseline = micro_result(cache=noisy(100, 2))
+        current = micro_result(cache=noisy(130, 2, seed=1))
+        current["benchmarks"]["cache"]["threshold"] = 0.5
+        assert compare_results(baseline, current).passed
+        assert not compare_results(baseline, current, thresholds={"cache": 0.1}).passed
+
+    def test_new_and_missing_benchmarks(self):
+        report = compare_results(micro_result(old=noisy(100, 2)), micro_result(new=noisy(100, 2)))
+        assert {c.name: c.verdict for c in report.comparisons} == {"new": NEW, "old": MISSING}
+        assert report.passed
+
+    def test_e2e_throughput_drop_is_regression(self):
+        def e2e(rps, p99):
+            return {"suite": "e2e", "scenarios": {"chat": {"rps": rps, "latency_ms": {"p50": 5.0, "p99": p99}}}}
+        report = compare_results(e2e(1000.0, 10.0), e2e(800.0, 10.5))
+        assert {c.name: c.verdict for c in report.comparisons} == {
+            "chat.rps": REGRESSION, "chat.p50": UNCHANGED, "chat.p99": UNCHANGED}
+
+    def test_environment_mismatch_is_reported(self):
+        current = micro_result(cache=noisy(100, 2))
+        current["environment"]["cpu_count"] = 64
+        report = compare_results(micro_result(cache=noisy(100, 2)), current)
+        assert report.environment_mismatch == ["cpu_count"]
+
+    def test_suites_must_match(self):
+        with pytest.raises(ValueError):
+            compare_results(micro_result(), {"suite": "e2e", "scenarios": {}})
+
+
+class TestResultStore:
+    """Test recording runs and baselines"""
+
+    def test_record_and_baseline(self, tmp_path):
+        store = ResultStore(tmp_path)
+        first = store.record(micro_result("aaa", cache=[1.0] * 5))
+        second = store.record(micro_result("aaa", cache=[2.0] * 5))
+
+        assert first != second
+        assert store.runs("micro") == [first, second]
+        assert store.latest("micro")["benchmarks"]["cache"]["median"] == 2.0
+        assert store.baseline("micro") is None
+
+        store.set_baseline(store.load(first))
+        assert store.baseline("micro")["benchmarks"]["cache"]["median"] == 1.0
+        assert [point["value"] for point in store.history("micro", "cache")] == [1.0, 2.0]
+
+
+class TestMicroRunner:
+    """Test calibration and sampling of micro-benchmarks"""
+
+    def test_sync_and_async_benchmarks(self):
+        counter = []
+
+        def setup_sync():
+            return lambda: counter.append(1)
+
+        async def setup_async():
+            async def operation():
+                counter.append(1)
+            return operation
+
+        result = run_micro_suite([MicroBenchmark("sync", setup_sync, threshold=0.3),
+                                  MicroBenchmark("async", setup_async)],
+                                 samples=5, min_sample_time=0.001).to_dict()
+
+        assert result["suite"] == "micro"
+        assert list(result["benchmarks"]) == ["sync", "async"]
+        sync = result["benchmarks"]["sync"]
+        assert len(sync["samples"]) == 5
+        assert sync["loops"] > 1
+        assert sync["threshold"] == 0.3
+        assert sync["ops_per_sec"] > 0
+
+    def test_select_benchmarks(self):
+        assert [b.name for b in select_benchmarks(["config_load"])] == ["config_load"]
+        assert len(select_benchmarks()) == 5
+        with pytest.raises(ValueError):
+            select_benchmarks(["missing"])
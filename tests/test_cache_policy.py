@@ -0,0 +1,217 @@
+"""
+Tests for cache size accounting and the segmented LRU eviction policy
+"""
+
+import json
+from dataclasses import dataclass
+
+import pytest
+
+from src.benchmarks.cache_replay import (compare_policies, parse_trace,
+                                         synthetic_trace)
+from src.core.cache_policy import (FrequencySketch, SegmentedLRU, WTinyLFU,
+                                   create_policy, serialize_value,
+                                   serialized_size)
+from src.core.smart_cache import SmartCache
+
+
+@dataclass
+class Usage:
+    prompt_tokens: int
+    completion_tokens: int
+
+
+class TestSerializedSize:
+    """Test sizing by serialized length"""
+
+    def test_size_is_the_compact_json_length(self):
+        value = {"choices": [{"message": {"content": "héllo"}}], "usage": Usage(3, 5)}
+
+        payload = serialize_value(value)
+        assert json.loads(payload)["usage"] == {"prompt_tokens": 3, "completion_tokens": 5}
+        assert serialized_size(value) == len(payload)
+
+    def test_raw_bytes_are_not_reserialized(self):
+        assert serialized_size(b"x" * 1000) == 1000
+        assert serialize_value({"ids": {1}}) == b'{"ids":[1]}'
+
+
+class TestSegmentedLRU:
+    """Test eviction order and byte accounting"""
+
+    def test_one_off_keys_do_not_flush_reused_keys(self):
+        policy = SegmentedLRU(max_bytes=1000)
+        policy.add("hot", 100)
+        policy.touch("hot")
+        for i in range(5):
+            policy.add(f"scan-{i}", 100)
+
+        victims = [policy.pop_victim() for _ in range(5)]
+        assert victims == [f"scan-{i}" for i in range(5)]
+        assert "hot" in policy
+
+    def test_protected_overflow_is_demoted_to_probation(self):
+        policy = SegmentedLRU(max_bytes=1000, protected_ratio=0.2)
+        for key in ("a", "b", "c"):
+            policy.add(key, 100)
+            policy.touch(key)
+
+        assert policy.protected_bytes == 200
+        assert policy.demotions == 1
+        assert policy.victim() == "a"
+
+    def test_running_totals_per_category(self):
+        policy = SegmentedLRU(max_bytes=1000)
+        policy.add("m1", 300, category="models")
+        policy.add("r1", 200, category="responses")
+        policy.add("m1", 100, category="models")  # Replacement
+
+        assert policy.total_bytes == 300
+        assert policy.bytes_by_category == {"models": 100, "responses": 200}
+        assert policy.remove("r1") == 200
+        assert policy.bytes_by_category == {"models": 100}
+        assert not policy.over_budget(900)
+        assert policy.over_budget(901)
+
+    def test_admission_filter_refuses_oversized_entries(self):
+        policy = SegmentedLRU(max_bytes=1000, max_entry_ratio=0.1)
+
+        assert policy.admits(100)
+        assert not policy.admits(101)
+        assert policy.get_stats()["admission_rejections"] == 1
+
+
+class TestFrequencySketch:
+    """Test the count-min sketch and its doorkeeper"""
+
+    def test_first_sighting_stays_in_the_doorkeeper(self):
+        sketch = FrequencySketch(expected_entries=100)
+        sketch.increment("prompt")
+        assert sketch.estimate("prompt") == 1
+        assert sketch.estimate("other") == 0
+
+        for _ in range(5):
+            sketch.increment("prompt")
+        assert sketch.estimate("prompt") == 6
+
+    def test_counts_age_by_halving(self):
+        sketch = FrequencySketch(expected_entries=64)
+        for _ in range(20):
+            sketch.increment("hot")
+        assert sketch.estimate("hot") == 16  # 15 saturated + doorkeeper
+
+        for i in range(sketch.sample_size):
+            sketch.increment(f"noise-{i}")
+        assert sketch.resets >= 1
+        assert sketch.estimate("hot") <= 8
+
+    def test_wider_counters_saturate_later(self):
+        sketch = FrequencySketch(expected_entries=1000, max_count=255)
+        for _ in range(100):
+            sketch.increment("hot")
+        assert sketch.estimate("hot") == 100
+
+        with pytest.raises(ValueError):
+            FrequencySketch(expected_entries=10, max_count=256)
+
+
+class TestWTinyLFU:
+    """Test window admission against the main-space victim"""
+
+    def test_scan_does_not_displace_frequent_keys(self):
+        policy = WTinyLFU(max_bytes=100, max_entries=100)
+        for i in range(100):
+            for _ in range(4):
+                policy.record_access(f"hot-{i}")
+            policy.add(f"hot-{i}", 1)
+
+        for i in range(1000):
+            policy.record_access(f"scan-{i}")
+            policy.add(f"scan-{i}", 1)
+            while policy.over_budget():
+                policy.pop_victim()
+
+        survivors = sum(f"hot-{i}" in policy for i in range(100))
+        assert survivors >= 90  # Plain LRU keeps none
+        assert len(policy) == 100
+        assert policy.get_stats()["refused"] > 900
+
+    def test_more_frequent_candidate_is_admitted(self):
+        policy = WTinyLFU(max_bytes=10, max_entries=10)
+        for i in range(10):
+            policy.add(f"old-{i}", 1)
+        for _ in range(5):
+            policy.record_access("new")
+
+        # The window's oldest key (old-9) ties with the victim and is refused
+        policy.add("new", 1)
+        assert policy.pop_victim() == "old-9"
+        # "new" was seen more often than the probation victim, so it displaces it
+        policy.add("newer", 1)
+        assert policy.pop_victim() == "old-0"
+        assert "new" in policy
+        assert policy.admitted == 1
+
+    def test_replacing_a_main_key_keeps_it_out_of_the_window(self):
+        policy = WTinyLFU(max_bytes=1000, max_entries=10)
+        policy.add("a", 10)
+        policy.add("b", 10)
+        policy.touch("a")
+        policy.add("a", 30)
+
+        assert policy.window_bytes == 10
+        assert policy.total_bytes == 40
+        assert policy.protected_bytes == 30
+
+    def test_create_policy_by_name(self):
+        assert create_policy("lru", 100).name == "lru"
+        assert create_policy("tinylfu", 100, max_entries=50).sketch.width == 256
+        with pytest.raises(ValueError):
+            create_policy("arc", 100)
+
+
+class TestCacheReplay:
+    """Test trace parsing and the policy comparison"""
+
+    def test_parse_log_lines_and_plain_keys(self):
+        lines = [
+            '{"message": "Request completed", "path": "/v1/chat/completions"}',
+            '{"message": "Cache set", "cache_key": "abc", "size_bytes": 512}',
+            'plain-key',
+            '',
+        ]
+        assert parse_trace(lines) == [("abc", 512), ("plain-key", 1)]
+
+    def test_tinylfu_beats_lru_on_zipf_with_scans(self):
+        trace = synthetic_trace(length=40000, keys=2000, scan_every=8000, scan_length=1500)
+        results = {r.policy: r for r in compare_policies(trace, 200)}
+
+        assert results["tinylfu"].hit_rate > results["lru"].hit_rate + 0.03
+        assert results["lru"].requests == 40000
+
+
+class TestSmartCacheAccounting:
+    """Test SmartCache memory limits with the running byte total"""
+
+    @pytest.mark.asyncio
+    async def test_sets_evict_to_the_byte_budget(self):
+        cache = SmartCache(max_size=1000, max_memory_mb=1)
+        value = "x" * 50000  # ~50KB serialized, under the 10% admission limit
+        for i in range(30):
+            assert await cache.set(f"k{i}", value)
+
+        stats = cache.get_stats()
+        assert stats["memory_usage_bytes"] <= cache.max_memory_bytes
+        assert stats["memory_usage_bytes"] == sum(e.size_bytes for e in cache._cache.values())
+        assert stats["evictions"] == 30 - stats["entries"]
+        assert await cache.get("k29") == value
+
+    @pytest.mark.asyncio
+    async def test_oversized_entry_is_not_admitted(self):
+        cache = SmartCache(max_size=10, max_memory_mb=1)
+        await cache.set("doc", "small")
+
+        assert not await cache.set("doc", "x" * 200000)
+        assert await cache.get("doc") is None
+        assert await cache.set("doc", b"raw", size_bytes=3)
+        assert cache.get_stats()["memory_usage_bytes"] == 3
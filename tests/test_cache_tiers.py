@@ -0,0 +1,153 @@
+"""
+Tests for the shared (L2) and disk (L3) cache tiers
+"""
+
+import os
+
+import pytest
+
+from src.core.cache_policy import serialize_value
+from src.core.cache_tiers import (CacheTierError, DiskSegmentStore,
+                                  SharedCacheTier, deserialize_value)
+
+
+@pytest.fixture
+def shared_path(tmp_path):
+    path = str(tmp_path / "cache.bin")
+    SharedCacheTier.create(path, capacity_bytes=4096, slots=64).close()
+    return path
+
+
+class TestSharedCacheTier:
+    """Test the host-wide memory tier seen through several handles"""
+
+    def test_values_are_shared_between_handles(self, shared_path):
+        worker_a, worker_b = SharedCacheTier(shared_path), SharedCacheTier(shared_path)
+        payload = serialize_value({"choices": [{"text": "hi"}]})
+        assert worker_a.set("resp:1", payload, ttl=60)
+        value, expires_at = worker_b.get("resp:1")
+        assert deserialize_value(value) == {"choices": [{"text": "hi"}]}
+        assert expires_at > 0
+        assert worker_b.get("resp:2") is None
+
+    def test_values_across_processes(self, shared_path):
+        if not hasattr(os, "fork"):
+            pytest.skip("requires os.fork")
+        pids = []
+        for worker in range(4):
+            pid = os.fork()
+            if pid == 0:
+                tier = SharedCacheTier(shared_path)
+                for i in range(5):
+                    tier.set(f"w{worker}:{i}", b"%d" % (worker * 10 + i), ttl=60)
+                os._exit(0)
+            pids.append(pid)
+        for pid in pids:
+            os.waitpid(pid, 0)
+        tier = SharedCacheTier(shared_path)
+        assert all(tier.get(f"w{worker}:{i}")[0] == b"%d" % (worker * 10 + i)
+                   for worker in range(4) for i in range(5))
+
+    def test_overwrite_and_delete(self, shared_path):
+        tier = SharedCacheTier(shared_path)
+        tier.set("k", b"old", ttl=60)
+        tier.set("k", b"new", ttl=60)
+        assert tier.get("k")[0] == b"new"
+        assert tier.get_stats()["entries"] == 1
+        assert tier.delete("k")
+        assert tier.get("k") is None
+        assert not tier.delete("k")
+
+    def test_expired_entries_miss(self, shared_path):
+        tier = SharedCacheTier(shared_path)
+        tier.set("k", b"value", ttl=10, now=1000.0)
+        assert tier.get("k", now=1005.0) is not None
+        assert tier.get("k", now=1011.0) is None
+
+    def test_log_wrap_evicts_oldest_values(self, shared_path):
+        tier = SharedCacheTier(shared_path)
+        for i in range(20):
+            assert tier.set(f"k{i}", bytes([i]) * 400, ttl=60)
+        # 4096 bytes hold ten 400-byte values; the first writes were overwritten
+        assert tier.get("k0") is None
+        assert tier.get("k19")[0] == bytes([19]) * 400
+        assert tier.get_stats()["memory_usage"] <= tier.capacity
+
+    def test_oversized_values_are_not_admitted(self, shared_path):
+        tier = SharedCacheTier(shared_path)
+        assert not tier.set("big", b"x" * (tier.max_entry_bytes + 1), ttl=60)
+        assert tier.get("big") is None
+
+    def test_clear_by_category(self, shared_path):
+        tier = SharedCacheTier(shared_path)
+        tier.set("m", b"1", ttl=60, category="models")
+        tier.set("r", b"2", ttl=60, category="responses")
+        assert tier.clear("models") == 1
+        assert tier.get("m") is None
+        assert tier.get("r") is not None
+        assert tier.clear() == 1
+
+    def test_rejects_foreign_files(self, tmp_path):
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"\0" * 128)
+        with pytest.raises(CacheTierError):
+            SharedCacheTier(str(path))
+
+
+class TestDiskSegmentStore:
+    """Test the cold tier: persistence, cross-process visibility and budget"""
+
+    def test_set_get_and_reopen(self, tmp_path):
+        store = DiskSegmentStore(tmp_path / "segments", refresh_interval=0)
+        store.set("summary:1", serialize_value("short summary"), ttl=60, category="summaries")
+        assert deserialize_value(store.get("summary:1")[0]) == "short summary"
+        store.close()
+
+        reopened = DiskSegmentStore(tmp_path / "segments", refresh_interval=0)
+        assert deserialize_value(reopened.get("summary:1")[0]) == "short summary"
+        assert reopened.get_stats()["entries"] == 1
+
+    def test_writes_by_another_store_become_visible(self, tmp_path):
+        worker_a = DiskSegmentStore(tmp_path / "segments", refresh_interval=0)
+        worker_b = DiskSegmentStore(tmp_path / "segments", refresh_interval=0)
+        worker_a.set("k", b"1", ttl=60)
+        assert worker_b.get("k")[0] == b"1"
+        worker_b.set("k", b"2", ttl=60)
+        assert worker_a.get("k")[0] == b"2"
+        assert worker_a.delete("k")
+        assert worker_b.get("k") is None
+
+    def test_expired_entries_miss(self, tmp_path):
+        store = DiskSegmentStore(tmp_path / "segments", refresh_interval=0)
+        store.set("k", b"value", ttl=10, now=1000.0)
+        assert store.get("k", now=1005.0) is not None
+        assert store.get("k", now=1011.0) is None
+
+    def test_oldest_segments_are_dropped_over_budget(self, tmp_path):
+        store = DiskSegmentStore(tmp_path / "segments", max_bytes=4096, segment_bytes=1024, refresh_interval=0)
+        for i in range(40):
+            store.set(f"k{i}", bytes([i]) * 200, ttl=60)
+        stats = store.get_stats()
+        assert stats["disk_usage_bytes"] <= 4096 + 1024
+        assert stats["segments"] > 1
+        assert store.get("k0") is None
+        assert store.get("k39")[0] == bytes([39]) * 200
+
+    def test_clear_by_category(self, tmp_path):
+        store = DiskSegmentStore(tmp_path / "segments", refresh_interval=0)
+        store.set("m", b"1", ttl=60, category="models")
+        store.set("r", b"2", ttl=60, category="responses")
+        assert store.clear("models") == 1
+        assert store.get("m") is None
+        assert store.get("r") is not None
+        assert store.clear() == 1
+        assert store.get_stats()["segments"] == 0
+
+    def test_partial_record_is_ignored_until_complete(self, tmp_path):
+        store = DiskSegmentStore(tmp_path / "segments", refresh_interval=0)
+        store.set("k", b"value", ttl=60)
+        segment = next((tmp_path / "segments").glob("*.seg"))
+        with open(segment, "ab") as f:
+            f.write(b"\x05\x00")  # Torn header of a record still being written
+        reader = DiskSegmentStore(tmp_path / "segments", refresh_interval=0)
+        assert reader.get("k")[0] == b"value"
@@ -135,6 +135,15 @@ class TestUnifiedCacheCore:
         missed = await unified_cache.get("nonexistent:key")
         assert missed is None
 
+    def test_cache_entry_is_compact(self):
+        """Test cache entries carry no per-instance __dict__"""
+        import sys
+        entry = CacheEntry(key="k", value=1, timestamp=time.time(), ttl=60)
+        if sys.version_info >= (3, 10):
+            assert not hasattr(entry, "__dict__")
+        entry.touch()
+        assert entry.access_count == 1
+
     @pytest.mark.asyncio
     async def test_cache_ttl_and_expiration(self, unified_cache):
         """Test TTL functionality and expiration"""
@@ -344,10 +353,6 @@ class TestCacheWarmer:
             last_accessed=time.time()
         )
 
-        # Set some access times
-        now = time.time()
-        pattern.access_times = [now - i * 3600 for i in range(10)]  # 10 accesses in last 10 hours
-
         score = pattern.get_predictive_score()
         assert score > 0  # Should have positive score
 
@@ -0,0 +1,77 @@
+"""
+Tests for the cache warmer's access tracking, predictive warming and rate budgets
+"""
+
+import pytest
+
+from src.core.cache_warmer import CacheWarmer
+from src.core.unified_cache import UnifiedCache
+
+
+@pytest.fixture
+def unified_cache(tmp_path):
+    """Memory-only cache; the warmer tests never start its background tasks"""
+    return UnifiedCache(max_size=100, default_ttl=300, max_memory_mb=1, enable_disk_cache=False,
+                        cache_dir=tmp_path, enable_predictive_warming=False,
+                        enable_consistency_monitoring=False)
+
+
+class TestAccessTracking:
+    """Test the frequency sketch and the top-K pattern records"""
+
+    def test_access_tracking_keeps_only_top_keys(self, unified_cache):
+        """Test that pattern records are bounded and heavy hitters displace rare keys"""
+        warmer = CacheWarmer(cache=unified_cache, top_k=4, tracked_keys=1000)
+
+        for i in range(50):
+            warmer.record_access(f"rare:{i}")
+        assert len(warmer._access_patterns) == 4
+
+        for _ in range(5):
+            warmer.record_access("hot:key")
+        top = warmer.get_top_keys()
+        assert len(top) == 4
+        assert top[0].key == "hot:key"
+        assert top[0].access_count == 5
+
+    def test_access_counts_decay_with_the_sketch(self, unified_cache):
+        """Test that top-K counts halve when the sketch ages"""
+        warmer = CacheWarmer(cache=unified_cache, top_k=4, tracked_keys=10)
+        for _ in range(40):
+            warmer.record_access("hot:key")
+        before = warmer._access_patterns["hot:key"].access_count
+
+        for i in range(warmer._frequency.sample_size):
+            warmer.record_access(f"noise:{i}")
+
+        assert warmer._frequency.resets >= 1
+        assert warmer._access_patterns["hot:key"].access_count <= before // 2
+
+
+class TestPredictiveWarming:
+    """Test candidate selection and the per-provider warming budget"""
+
+    @pytest.mark.asyncio
+    async def test_predictive_warming_skips_fresh_keys(self, unified_cache):
+        """Test that only missing or stale top keys are queued"""
+        warmer = CacheWarmer(cache=unified_cache, top_k=8)
+        fresh, missing = "models:openai:https://api.openai.com", "models:groq:https://api.groq.com"
+        await unified_cache.set(fresh, ["gpt-4"], ttl=300)
+        for _ in range(10):
+            warmer.record_access(fresh)
+            warmer.record_access(missing)
+
+        await warmer._queue_predictive_warming()
+
+        queued = [warmer._warming_queue.get_nowait()["key"] for _ in range(warmer._warming_queue.qsize())]
+        assert queued == [missing]
+
+    def test_warming_respects_provider_budget(self, unified_cache):
+        """Test that warming stops once the provider's share of its rate limit is spent"""
+        # 600 requests/hour at a 10% share: one warming request per minute
+        warmer = CacheWarmer(cache=unified_cache, provider_rate_limits={"groq": 600})
+        task = {"key": "models:groq:https://api.groq.com"}
+
+        assert warmer._take_warming_budget(task)
+        assert not warmer._take_warming_budget(task)
+        assert warmer._take_warming_budget({"key": "test:no:provider"})
@@ -7,8 +7,12 @@ import asyncio
 import time
 from unittest.mock import AsyncMock, MagicMock, patch
 from src.core.circuit_breaker import (
+    CallOutcome,
     CircuitBreaker,
     ProductionCircuitBreaker,
+    SlidingWindowCircuitBreaker,
+    SlidingWindowConfig,
+    classify_outcome,
     CircuitState,
     CircuitBreakerOpenException,
     get_circuit_breaker,
@@ -1589,3 +1593,114 @@ class TestRealisticFailurePatterns:
                                    if not isinstance(r, Exception))
             # Should have some successes
             assert provider_successes > 0
+
+
+
+class TestSlidingWindowCircuitBreaker:
+    """Test ratio-based tripping, outcome classification and bounded probes"""
+
+    @pytest.fixture
+    def window_breaker(self):
+        return SlidingWindowCircuitBreaker(
+            name="window_test",
+            config=SlidingWindowConfig(
+                window_seconds=10,
+                bucket_count=10,
+                minimum_calls=5,
+                failure_rate_threshold=0.5,
+                slow_call_rate_threshold=0.4,
+                slow_call_duration=1.0,
+                consecutive_failure_threshold=100,
+                open_timeout=5,
+                half_open_max_probes=2
+            )
+        )
+
+    def test_trips_on_slow_call_rate(self, window_breaker):
+        """40% slow calls in the window trips the breaker even without errors"""
+        for _ in range(6):
+            window_breaker.record_outcome(CallOutcome.SUCCESS, 0.1, now=1000.0)
+        for _ in range(4):
+            window_breaker.record_outcome(CallOutcome.SUCCESS, 2.0, now=1000.0)
+
+        assert window_breaker.is_open()
+        assert window_breaker.last_trip_reason == "slow_call_rate"
+
+    def test_trips_on_failure_rate(self, window_breaker):
+        """Interleaved failures trip on ratio, not on consecutive count"""
+        for _ in range(3):
+            window_breaker.record_outcome(CallOutcome.SUCCESS, 0.1, now=1000.0)
+            window_breaker.record_outcome(CallOutcome.SERVER_ERROR, 0.1, now=1000.0)
+
+        assert window_breaker.is_open()
+        assert window_breaker.last_trip_reason == "failure_rate"
+
+    def test_client_errors_do_not_count(self, window_breaker):
+        """Caller mistakes never trip a provider's breaker"""
+        for _ in range(20):
+            window_breaker.record_outcome(CallOutcome.CLIENT_ERROR, 0.1, now=1000.0)
+
+        assert window_breaker.is_closed()
+        assert window_breaker.get_metrics()["outcomes"]["client_error"] == 20
+
+    def test_old_buckets_expire(self, window_breaker):
+        """Outcomes older than the window no longer affect the ratios"""
+        for _ in range(4):
+            window_breaker.record_outcome(CallOutcome.TIMEOUT, 0.1, now=1000.0)
+        assert window_breaker.window.total_failures == 4
+
+        window_breaker.record_outcome(CallOutcome.SUCCESS, 0.1, now=1011.0)
+        assert window_breaker.window.total_calls == 1
+        assert window_breaker.window.total_failures == 0
+
+    def test_half_open_probes_are_bounded(self, window_breaker):
+        """Only half_open_max_probes calls are admitted while half-open"""
+        for _ in range(5):
+            window_breaker.record_outcome(CallOutcome.SERVER_ERROR, 0.1, now=1000.0)
+        assert not window_breaker.allow_request(now=1001.0)
+
+        assert window_breaker.allow_request(now=1006.0)
+        assert window_breaker.is_half_open()
+        assert window_breaker.allow_request(now=1006.0)
+        assert not window_breaker.allow_request(now=1006.0)
+
+        window_breaker.record_outcome(CallOutcome.SUCCESS, 0.1, now=1006.5)
+        window_breaker.record_outcome(CallOutcome.SUCCESS, 0.1, now=1006.5)
+        assert window_breaker.is_closed()
+
+    def test_failed_probe_reopens(self, window_breaker):
+        """A failing probe sends the breaker straight back to open"""
+        for _ in range(5):
+            window_breaker.record_outcome(CallOutcome.SERVER_ERROR, 0.1, now=1000.0)
+        assert window_breaker.allow_request(now=1006.0)
+
+        window_breaker.record_outcome(CallOutcome.TIMEOUT, 0.1, now=1006.5)
+        assert window_breaker.is_open()
+        assert window_breaker.last_trip_reason == "half_open_probe_failed"
+
+    @pytest.mark.asyncio
+    async def test_execute_rejects_when_open(self, window_breaker):
+        """execute() raises CircuitBreakerOpenException while open"""
+        async def failing():
+            raise ConnectionError("refused")
+
+        for _ in range(5):
+            with pytest.raises(ConnectionError):
+                await window_breaker.execute(failing)
+
+        with pytest.raises(CircuitBreakerOpenException):
+            await window_breaker.execute(failing)
+        assert window_breaker.get_metrics()["rejected_requests"] == 1
+
+    def test_classify_outcome(self):
+        """Exceptions are mapped to outcome classes"""
+        class StatusError(Exception):
+            def __init__(self, status_code):
+                self.status_code = status_code
+
+        assert classify_outcome(StatusError(429)) == CallOutcome.RATE_LIMITED
+        assert classify_outcome(StatusError(503)) == CallOutcome.SERVER_ERROR
+        assert classify_outcome(StatusError(400)) == CallOutcome.CLIENT_ERROR
+        assert classify_outcome(asyncio.TimeoutError()) == CallOutcome.TIMEOUT
+        assert classify_outcome(ConnectionRefusedError()) == CallOutcome.CONNECTION_ERROR
+        assert classify_outcome(ValueError("boom")) == CallOutcome.ERROR
@@ -0,0 +1,51 @@
+"""
+Tests for the memory-compact record helpers
+"""
+
+import pytest
+
+from src.core.compact import FloatRing
+
+
+class TestFloatRing:
+    """Test the array-backed ring buffer"""
+
+    def test_keeps_the_newest_values_in_order(self):
+        ring = FloatRing(3)
+        for value in [1.0, 2.0, 3.0, 4.0, 5.0]:
+            ring.append(value)
+
+        assert list(ring) == [3.0, 4.0, 5.0]
+        assert len(ring) == 3
+        assert ring[0] == 3.0
+        assert ring[-1] == 5.0
+        with pytest.raises(IndexError):
+            ring[3]
+
+    def test_running_sum_and_mean(self):
+        ring = FloatRing(4, [0.1] * 10)
+        ring.append(0.5)
+
+        assert ring.total() == pytest.approx(0.8)
+        assert ring.mean() == pytest.approx(0.2)
+        assert FloatRing(4).mean() == 0.0
+
+    def test_count_since_over_ascending_timestamps(self):
+        ring = FloatRing(5, [10.0, 20.0, 30.0, 40.0, 50.0, 60.0])
+
+        assert ring.count_since(35.0) == 3
+        assert ring.count_since(60.0) == 0
+        assert ring.count_since(0.0) == 5
+
+    def test_grows_lazily_and_clears(self):
+        ring = FloatRing(1000)
+        ring.append(1.0)
+        assert len(ring._data) == 1
+
+        ring.clear()
+        assert not ring
+        assert list(ring) == []
+
+    def test_capacity_must_be_positive(self):
+        with pytest.raises(ValueError):
+            FloatRing(0)
@@ -0,0 +1,124 @@
+"""
+Tests for negotiated, streaming-aware response compression
+"""
+
+import asyncio
+import gzip
+import zlib
+
+import pytest
+
+from src.api.compression import (CompressionMiddleware, compression_metrics,
+                                 negotiate_encoding)
+from src.core.unified_config import (CompressionRouteSettings,
+                                     CompressionSettings)
+
+JSON_BODY = b'{"data": [' + b'{"id": "model", "object": "model"}, ' * 100 + b'{}]}'
+
+
+def json_app(body=JSON_BODY, content_type=b"application/json"):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+async def sse_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200,
+                "headers": [(b"content-type", b"text/event-stream; charset=utf-8")]})
+    for i in range(3):
+        await send({"type": "http.response.body", "body": f"data: token {i}\n\n".encode(), "more_body": True})
+    await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def run(middleware, path="/v1/models", accept=b"gzip", method="GET"):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": [(b"accept-encoding", accept)]}
+    asyncio.run(middleware(scope, receive, send))
+    return messages
+
+
+def gzip_only(**overrides):
+    return CompressionSettings(encodings=["gzip"], **overrides)
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    compression_metrics.reset()
+    yield
+
+
+class TestNegotiation:
+    """Test Accept-Encoding negotiation"""
+
+    @pytest.mark.parametrize("header,expected", [
+        ("gzip, deflate, br, zstd", "zstd"),
+        ("gzip;q=1.0, zstd;q=0.5", "gzip"),
+        ("br;q=0, gzip", "gzip"),
+        ("*", "zstd"),
+        ("identity", None),
+        ("", None),
+    ])
+    def test_negotiate(self, header, expected):
+        assert negotiate_encoding(header, ["zstd", "br", "gzip"]) == expected
+
+
+class TestCompressionMiddleware:
+    """Test thresholds, SSE handling and the payload cache"""
+
+    def test_large_json_is_gzipped(self):
+        messages = run(CompressionMiddleware(json_app(), gzip_only()))
+        headers = dict(messages[0]["headers"])
+        assert headers[b"content-encoding"] == b"gzip"
+        assert int(headers[b"content-length"]) == len(messages[1]["body"])
+        assert gzip.decompress(messages[1]["body"]) == JSON_BODY
+        stats = compression_metrics.get_stats()["encodings"]["gzip"]
+        assert stats["bytes_in"] == len(JSON_BODY)
+        assert stats["cpu_ns_per_byte"] >= 0
+
+    def test_small_json_is_not_compressed(self):
+        messages = run(CompressionMiddleware(json_app(b'{"ok": true}'), gzip_only()))
+        headers = dict(messages[0]["headers"])
+        assert b"content-encoding" not in headers
+        assert headers[b"vary"] == b"Accept-Encoding"
+        assert compression_metrics.get_stats()["skipped"] == {"below_minimum_size": 1}
+
+    def test_route_threshold_override(self):
+        settings = gzip_only(routes={"/v1/internal": CompressionRouteSettings(minimum_size=10 ** 6)})
+        messages = run(CompressionMiddleware(json_app(), settings), path="/v1/internal/state")
+        assert b"content-encoding" not in dict(messages[0]["headers"])
+
+    def test_sse_is_passed_through_by_default(self):
+        messages = run(CompressionMiddleware(sse_app, gzip_only()), path="/v1/v1/chat/completions")
+        assert b"content-encoding" not in dict(messages[0]["headers"])
+        assert [m["body"] for m in messages[1:4]] == [b"data: token 0\n\n", b"data: token 1\n\n", b"data: token 2\n\n"]
+
+    def test_sse_compression_flushes_every_event(self):
+        messages = run(CompressionMiddleware(sse_app, gzip_only(compress_sse=True)), path="/v1/v1/chat/completions")
+        assert dict(messages[0]["headers"])[b"content-encoding"] == b"gzip"
+
+        # Every event is decodable as soon as its chunk arrives
+        decompressor = zlib.decompressobj(31)
+        for i, message in enumerate(messages[1:4]):
+            assert decompressor.decompress(message["body"]) == f"data: token {i}\n\n".encode()
+        assert messages[-1]["more_body"] is False
+
+    def test_repeated_get_payload_uses_cache(self):
+        middleware = CompressionMiddleware(json_app(), gzip_only())
+        first = run(middleware)
+        second = run(middleware)
+        assert first[1]["body"] == second[1]["body"]
+        assert compression_metrics.get_stats()["cache_hits"] == 1
+
+    def test_disabled_route_and_unsupported_client(self):
+        middleware = CompressionMiddleware(json_app(), gzip_only())
+        assert b"content-encoding" not in dict(run(middleware, path="/v1/health")[0]["headers"])
+        assert b"content-encoding" not in dict(run(middleware, accept=b"identity")[0]["headers"])
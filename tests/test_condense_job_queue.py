@@ -0,0 +1,185 @@
+"""
+Tests for the context service condensation job queue
+"""
+
+import asyncio
+
+import pytest
+
+from context_service.utils.job_queue import (CondenseJobQueue, QueueFullError,
+                                             SQLiteJobStore, job_id_for)
+
+
+def make_queue(condense_fn, **kwargs):
+    kwargs.setdefault("poll_interval", 0.01)
+    return CondenseJobQueue(condense_fn, **kwargs)
+
+
+class TestCondenseJobQueue:
+    """Test batching, deduplication, backpressure and worker bounds"""
+
+    @pytest.mark.asyncio
+    async def test_batch_jobs_complete(self):
+        async def condense(chunks, max_tokens):
+            return f"summary of {len(chunks)}"
+
+        queue = make_queue(condense, workers=2)
+        jobs = await queue.submit_batch([(["a"], 100), (["b", "c"], 100)])
+        results = [await queue.wait(job.job_id, timeout=2) for job in jobs]
+        await queue.stop()
+
+        assert [job.status for job in results] == ["done", "done"]
+        assert [job.summary for job in results] == ["summary of 1", "summary of 2"]
+
+    @pytest.mark.asyncio
+    async def test_identical_jobs_are_deduplicated(self):
+        calls = []
+
+        async def condense(chunks, max_tokens):
+            calls.append(chunks)
+            await asyncio.sleep(0.05)
+            return "summary"
+
+        queue = make_queue(condense)
+        jobs = await queue.submit_batch([(["same"], 100), (["same"], 100)])
+        again = await queue.submit(["same"], 100)
+        await queue.wait(jobs[0].job_id, timeout=2)
+        await queue.stop()
+
+        assert jobs[0].job_id == jobs[1].job_id == again.job_id
+        assert [job.deduplicated for job in jobs] == [False, True]
+        assert again.deduplicated
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_backpressure_rejects_whole_batch(self):
+        async def condense(chunks, max_tokens):
+            await asyncio.sleep(1)
+            return "summary"
+
+        queue = make_queue(condense, workers=1, max_pending=2)
+        await queue.submit_batch([(["a"], 100), (["b"], 100)])
+        with pytest.raises(QueueFullError) as exc_info:
+            await queue.submit_batch([(["c"], 100)])
+        stats = await queue.get_stats()
+        await queue.stop()
+
+        assert exc_info.value.retry_after >= 1
+        assert stats["pending"] == 2
+        assert stats["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_worker_concurrency_is_bounded(self):
+        running = 0
+        peak = 0
+
+        async def condense(chunks, max_tokens):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return "summary"
+
+        queue = make_queue(condense, workers=3)
+        jobs = await queue.submit_batch([([str(i)], 100) for i in range(12)])
+        for job in jobs:
+            await queue.wait(job.job_id, timeout=5)
+        await queue.stop()
+
+        assert peak <= 3
+
+    @pytest.mark.asyncio
+    async def test_failed_job_reports_error_and_can_be_resubmitted(self):
+        attempts = 0
+
+        async def condense(chunks, max_tokens):
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise ValueError("All parallel providers failed")
+            return "summary"
+
+        queue = make_queue(condense)
+        job = await queue.submit(["x"], 100)
+        failed = await queue.wait(job.job_id, timeout=2)
+        retried = await queue.submit(["x"], 100)
+        done = await queue.wait(retried.job_id, timeout=2)
+        await queue.stop()
+
+        assert failed.status == "failed" and failed.error_status == 400
+        assert not retried.deduplicated
+        assert done.status == "done" and done.attempts == 2
+
+    @pytest.mark.asyncio
+    async def test_watch_streams_status_changes(self):
+        async def condense(chunks, max_tokens):
+            await asyncio.sleep(0.05)
+            return "summary"
+
+        queue = make_queue(condense)
+        job = await queue.submit(["x"], 100)
+        statuses = [update.status async for update in queue.watch(job.job_id, timeout=2)]
+        await queue.stop()
+
+        assert statuses[-1] == "done"
+        assert len(statuses) == len(set(statuses))
+
+    @pytest.mark.asyncio
+    async def test_long_running_job_is_not_requeued(self):
+        started = asyncio.Event()
+        release = asyncio.Event()
+        calls = 0
+
+        async def condense(chunks, max_tokens):
+            nonlocal calls
+            calls += 1
+            started.set()
+            await release.wait()
+            return "summary"
+
+        queue = make_queue(condense, workers=1, stale_after=0.06)
+        job = await queue.submit(["a"], 100)
+        await started.wait()
+
+        # Several stale windows pass while the job runs; its heartbeat keeps it claimed
+        for _ in range(5):
+            await asyncio.sleep(0.05)
+            assert queue.store.requeue_stale(queue.stale_after) == 0
+        release.set()
+        result = await queue.wait(job.job_id, timeout=2)
+        await queue.stop()
+
+        assert result.status == "done"
+        assert result.attempts == 1
+        assert calls == 1
+
+
+class TestSharedJobStore:
+    """Test several replicas sharing one queue file"""
+
+    def test_replicas_claim_each_job_once(self, tmp_path):
+        path = str(tmp_path / "jobs.db")
+        replica_a, replica_b = SQLiteJobStore(path), SQLiteJobStore(path)
+        replica_a.submit_many([(job_id_for([str(i)], 100), '{"chunks": ["%d"], "max_tokens": 100}' % i)
+                               for i in range(4)], max_pending=10)
+
+        claimed = []
+        for store in (replica_a, replica_b, replica_a, replica_b, replica_a):
+            job = store.claim(owner=str(id(store)))
+            if job is not None:
+                claimed.append(job[0])
+
+        assert len(claimed) == len(set(claimed)) == 4
+        assert replica_b.counts()["running"] == 4
+        replica_a.close()
+        replica_b.close()
+
+    def test_stale_running_jobs_are_requeued(self, tmp_path):
+        store = SQLiteJobStore(str(tmp_path / "jobs.db"))
+        store.submit_many([("job", '{"chunks": ["a"], "max_tokens": 100}')], max_pending=10)
+        assert store.claim(owner="dead-replica") is not None
+
+        assert store.requeue_stale(older_than=-1) == 1
+        assert store.claim(owner="live-replica")[0] == "job"
+        store.close()
@@ -0,0 +1,141 @@
+"""
+Tests for tiered storage in the enhanced ConsolidatedCacheManager
+"""
+
+import pytest
+
+from src.core.cache_tiers import SharedCacheTier
+from src.core.consolidated_cache_enhanced import (CacheCategory, CacheTier,
+                                                  ConsolidatedCacheManager)
+from src.core.unified_cache import UnifiedCache
+
+
+@pytest.fixture
+def shared_path(tmp_path):
+    path = str(tmp_path / "cache.bin")
+    SharedCacheTier.create(path, capacity_bytes=1024 * 1024, slots=1024).close()
+    return path
+
+
+def make_worker(tmp_path, shared_path=None, **kwargs):
+    """A manager with its own L1, sharing L2 and L3 with the other workers of the test"""
+    manager = ConsolidatedCacheManager(
+        cache_dir=tmp_path / "consolidated",
+        enable_warming=False,
+        enable_monitoring=False,
+        enable_migration=False,
+        shared_cache_path=shared_path,
+        rebalance_interval=0,
+        **kwargs
+    )
+    manager._cache = UnifiedCache(max_size=100, max_memory_mb=1, enable_disk_cache=False,
+                                  enable_predictive_warming=False, enable_consistency_monitoring=False)
+    manager._open_tiers()
+    manager._disk_tier.refresh_interval = 0
+    return manager
+
+
+def in_l1(manager, key):
+    return key in manager._cache._memory_cache
+
+
+class TestTieredReads:
+    """Test L1 -> L2 -> L3 read-through across workers"""
+
+    @pytest.mark.asyncio
+    async def test_warm_keys_are_shared_between_workers(self, tmp_path, shared_path):
+        worker_a, worker_b = make_worker(tmp_path, shared_path), make_worker(tmp_path, shared_path)
+        response = {"choices": [{"message": {"content": "hi"}}]}
+
+        assert await worker_a.set_response("resp:1", response)
+        assert not in_l1(worker_a, "resp:1")  # Responses are warm: L2 and L3 only
+
+        assert await worker_b.get_response("resp:1") == response
+        tier_stats = (await worker_b.get_stats())["tier_stats"]
+        assert tier_stats["hot"]["hits"] == 0
+        assert tier_stats["warm"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_hot_categories_are_served_from_l1(self, tmp_path, shared_path):
+        worker = make_worker(tmp_path, shared_path)
+        models = [{"id": "gpt-4"}]
+        await worker.set_models("openai", "https://api.openai.com", models)
+        key = "models:openai:https://api.openai.com"
+
+        assert in_l1(worker, key)
+        assert worker._shared_tier.get(key) is not None
+        assert worker._disk_tier.get(key) is not None
+        assert await worker.get_models("openai", "https://api.openai.com") == models
+        assert (await worker.get_stats())["tier_stats"]["hot"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cold_keys_reach_shared_tier_once_frequent(self, tmp_path, shared_path):
+        worker_a, worker_b = make_worker(tmp_path, shared_path), make_worker(tmp_path, shared_path)
+        await worker_a.set("report:1", {"rows": 3}, category=CacheCategory.ANALYTICS)
+        assert worker_a._shared_tier.get("report:1") is None  # Cold: disk only
+
+        for _ in range(2):
+            assert await worker_b.get("report:1", CacheCategory.ANALYTICS) == {"rows": 3}
+        assert worker_b._shared_tier.get("report:1") is None
+
+        # Third recent access promotes it to WARM; the L3 hit is copied into L2
+        await worker_b.get("report:1", CacheCategory.ANALYTICS)
+        assert worker_b._tier_assignments["report:1"] == CacheTier.WARM
+        assert worker_b._shared_tier.get("report:1") is not None
+
+    @pytest.mark.asyncio
+    async def test_single_worker_keeps_warm_keys_in_l1(self, tmp_path):
+        worker = make_worker(tmp_path)
+        assert worker._shared_tier is None
+        await worker.set_summary("sum:1", "a summary")
+        assert in_l1(worker, "sum:1")
+        assert worker._disk_tier.get("sum:1") is not None
+
+    @pytest.mark.asyncio
+    async def test_delete_and_clear_reach_every_tier(self, tmp_path, shared_path):
+        worker = make_worker(tmp_path, shared_path)
+        await worker.set_models("p", "u", [{"id": "m"}])
+        await worker.set_response("resp:1", {"ok": True})
+
+        assert await worker.delete("models:p:u")
+        assert not in_l1(worker, "models:p:u")
+        assert worker._shared_tier.get("models:p:u") is None
+        assert worker._disk_tier.get("models:p:u") is None
+
+        await worker.clear(CacheCategory.RESPONSES)
+        assert await worker.get_response("resp:1") is None
+
+
+class TestTierRebalancing:
+    """Test frequency-driven promotion and demotion"""
+
+    @pytest.mark.asyncio
+    async def test_frequent_key_is_promoted_then_demoted_after_decay(self, tmp_path, shared_path):
+        worker = make_worker(tmp_path, shared_path)
+        await worker.set_response("resp:hot", {"text": "popular"})
+
+        for _ in range(10):
+            assert await worker.get_response("resp:hot") == {"text": "popular"}
+        assert worker._tier_assignments["resp:hot"] == CacheTier.HOT
+        assert in_l1(worker, "resp:hot")
+
+        # Two sketch resets take its estimate below the warm threshold
+        worker._frequency._age()
+        worker._frequency._age()
+        result = await worker.rebalance_tiers()
+
+        assert result["reassignments"] == 1
+        assert "resp:hot" not in worker._tier_assignments  # Back to the category's tier
+        assert not in_l1(worker, "resp:hot")
+        assert await worker.get_response("resp:hot") == {"text": "popular"}
+
+    @pytest.mark.asyncio
+    async def test_tiering_disabled_uses_l1_only(self, tmp_path):
+        manager = ConsolidatedCacheManager(cache_dir=tmp_path, enable_warming=False, enable_monitoring=False,
+                                           enable_migration=False, enable_tiering=False)
+        manager._cache = UnifiedCache(max_size=100, max_memory_mb=1, enable_disk_cache=False,
+                                      enable_predictive_warming=False, enable_consistency_monitoring=False)
+        await manager.set_response("resp:1", {"ok": True})
+        assert in_l1(manager, "resp:1")
+        assert manager._disk_tier is None
+        assert await manager.get_response("resp:1") == {"ok": True}
@@ -139,6 +139,20 @@ async def test_lru_eviction(mock_request):
     assert cache.get("key1") is None  # Evicted
     assert cache.get("key2") == ("value2", time.time())
 
+@pytest.mark.asyncio
+async def test_tinylfu_keeps_reused_summaries_through_a_scan():
+    cache = AsyncLRUCache(maxsize=10)
+    for _ in range(3):
+        cache.get("hot")
+        cache.set("hot", ("summary", 1.0))
+    for i in range(50):
+        cache.get(f"once-{i}")
+        cache.set(f"once-{i}", ("one-off", 1.0))
+
+    assert cache.get("hot") == ("summary", 1.0)
+    assert len(cache.cache) == 10
+    assert cache.get_stats()["eviction_policy"]["policy"] == "tinylfu"
+
 @pytest.mark.asyncio
 async def test_proactive_truncation(mock_request, mock_provider):
     """Test proactive truncation before provider call if content > threshold"""
@@ -541,4 +555,172 @@ async def test_background_task_cancellation(mock_request, mock_provider):
     assert task.cancelled()
     # Cleanup
     if os.path.exists("test.json"):
-        os.remove("test.json")
\ No newline at end of file
+        os.remove("test.json")
+def test_build_windows_respects_token_budget():
+    """Windows stay within the token budget and oversized messages are split"""
+    from src.utils.context_condenser import build_windows, estimate_tokens
+    chunks = ["short message", "word " * 2000, "another short message"]
+    windows = build_windows(chunks, 256)
+    assert len(windows) > 2
+    assert all(estimate_tokens(w) <= 256 * 1.1 for w in windows)
+    assert "short message" in windows[0]
+    assert windows[-1].endswith("another short message")
+
+def test_build_windows_prefix_is_stable():
+    """Appending messages only changes the last window of a conversation"""
+    from src.utils.context_condenser import build_windows
+    chunks = [f"message {i} " + "word " * 60 for i in range(10)]
+    before = build_windows(chunks, 256)
+    after = build_windows(chunks + ["message 10 " + "word " * 60], 256)
+    assert after[:len(before) - 1] == before[:-1]
+
+@pytest.mark.asyncio
+async def test_map_reduce_reuses_window_summaries(mock_request, mock_provider):
+    """Only new windows of a growing conversation are summarized again"""
+    from src.utils.context_condenser import build_windows
+    cfg = mock_request.app.state.condensation_config
+    cfg.dynamic_reload = False
+    cfg.prefix_cache_enabled = False
+    cfg.map_reduce_window_tokens = 256
+    mock_request.app.state.lru_cache = AsyncLRUCache(maxsize=100)
+    chunks = [f"message {i} " + "word " * 80 for i in range(8)]
+    grown = chunks + ["message 8 " + "word " * 80]
+
+    with patch('src.utils.context_condenser.provider_factory.create_provider', return_value=mock_provider):
+        summary = await condense_context(mock_request, chunks, max_tokens=512)
+        first_calls = mock_provider.create_completion.call_count
+        await condense_context(mock_request, grown, max_tokens=512)
+        second_calls = mock_provider.create_completion.call_count - first_calls
+
+    windows = build_windows(chunks, 256)
+    new_windows = set(build_windows(grown, 256)) - set(windows)
+    assert summary == "test summary"
+    assert first_calls == len(windows) + 1  # map over every window, then one reduce
+    assert second_calls == len(new_windows) + 1
+    # The final reduce call receives window summaries, not the raw transcript
+    reduce_content = mock_provider.create_completion.call_args[0][0]["messages"][1]["content"]
+    assert "message 0" not in reduce_content
+
+@pytest.mark.asyncio
+async def test_map_reduce_disabled_falls_back_to_truncation(mock_request, mock_provider):
+    """With map-reduce disabled, oversized content is truncated into one call"""
+    cfg = mock_request.app.state.condensation_config
+    cfg.dynamic_reload = False
+    cfg.map_reduce_enabled = False
+    cfg.truncation_threshold = 500
+    mock_request.app.state.lru_cache = AsyncLRUCache(maxsize=10)
+    with patch('src.utils.context_condenser.provider_factory.create_provider', return_value=mock_provider):
+        await condense_context(mock_request, ["word " * 1000], max_tokens=512)
+    assert mock_provider.create_completion.call_count == 1
+    assert len(mock_provider.create_completion.call_args[0][0]["messages"][1]["content"]) <= 250
+
+@pytest.mark.asyncio
+async def test_prefix_summary_reused_for_grown_conversation(mock_request, mock_provider):
+    """A conversation that grows by one message only condenses the new tail"""
+    cfg = mock_request.app.state.condensation_config
+    cfg.dynamic_reload = False
+    mock_request.app.state.lru_cache = AsyncLRUCache(maxsize=100)
+    chunks = [f"message {i}" for i in range(200)]
+
+    with patch('src.utils.context_condenser.provider_factory.create_provider', return_value=mock_provider):
+        await condense_context(mock_request, chunks, max_tokens=512)
+        first_calls = mock_provider.create_completion.call_count
+        summary = await condense_context(mock_request, chunks + ["message 200"], max_tokens=512)
+
+    assert summary == "test summary"
+    assert mock_provider.create_completion.call_count == first_calls + 1
+    content = mock_provider.create_completion.call_args[0][0]["messages"][1]["content"]
+    assert "message 199" not in content
+    assert "test summary" in content and "message 200" in content
+    assert mock_request.app.state.prefix_summary_store.partial_hits == 1
+
+@pytest.mark.asyncio
+async def test_cache_write_behind_file_log(tmp_path):
+    """Writes are batched into an append log that is replayed on load"""
+    persist_file = tmp_path / "cache.json"
+    cache = AsyncLRUCache(maxsize=10, persist_file=str(persist_file), flush_interval=60)
+    for i in range(5):
+        cache.set(f"key_{i}", (f"value_{i}", 1.0))
+    assert not (tmp_path / "cache.json.log").exists()  # nothing written yet
+
+    assert await cache.flush() == 5
+    cache.set("key_0", ("updated", 2.0))
+    await cache.flush()
+    assert len((tmp_path / "cache.json.log").read_text().splitlines()) == 6
+
+    restored = AsyncLRUCache(maxsize=10, persist_file=str(persist_file))
+    await restored.load()
+    assert restored.get("key_0") == ("updated", 2.0)
+    assert len(restored.cache) == 5
+    await cache.shutdown()
+    await restored.shutdown()
+
+@pytest.mark.asyncio
+async def test_cache_log_compaction(tmp_path):
+    """The append log is folded into the snapshot once it outgrows the cache"""
+    persist_file = tmp_path / "cache.json"
+    # Plain LRU so the surviving keys are simply the last three written
+    cache = AsyncLRUCache(maxsize=3, persist_file=str(persist_file), flush_interval=60, eviction_policy="lru")
+    for i in range(8):
+        cache.set(f"key_{i}", (f"value_{i}", 1.0))
+        await cache.flush()
+
+    assert persist_file.exists()
+    assert len((tmp_path / "cache.json.log").read_text().splitlines()) <= 3
+    restored = AsyncLRUCache(maxsize=3, persist_file=str(persist_file))
+    await restored.load()
+    assert list(restored.cache.keys()) == ["key_5", "key_6", "key_7"]
+    await cache.shutdown()
+
+@pytest.mark.asyncio
+async def test_failing_flush_backs_off():
+    """A failing backend with flush_interval=0 is retried after a delay, not in a tight loop"""
+    cache = AsyncLRUCache(maxsize=10, flush_interval=0)
+    pipeline = MagicMock()
+    pipeline.execute = AsyncMock(side_effect=ConnectionError("redis down"))
+    cache.redis_client = MagicMock()
+    cache.redis_client.pipeline.return_value = pipeline
+
+    with patch('src.utils.context_condenser.FLUSH_RETRY_MIN', 0.1):
+        cache.set("key", ("value", 1.0))
+        await asyncio.sleep(0.03)
+        pipeline.execute.assert_awaited_once()
+        assert cache.consecutive_flush_failures == 1
+        assert cache.get_stats()["pending_writes"] == 1
+
+        # The backend recovers; the delayed retry persists the pending key
+        pipeline.execute.side_effect = None
+        await asyncio.sleep(0.2)
+
+    assert pipeline.execute.await_count == 2
+    assert cache.consecutive_flush_failures == 0
+    assert cache.get_stats()["pending_writes"] == 0
+    assert cache.get_stats()["flush_errors"] == 1
+    assert cache._flush_task.done()
+
+@pytest.mark.asyncio
+async def test_cache_redis_pipelined_flush_and_scan_load():
+    """Redis persistence uses one pipeline per flush and SCAN + MGET to load"""
+    cache = AsyncLRUCache(maxsize=10, flush_interval=60, ttl=600)
+    pipeline = MagicMock()
+    pipeline.execute = AsyncMock()
+    cache.redis_client = MagicMock()
+    cache.redis_client.pipeline.return_value = pipeline
+    for i in range(3):
+        cache.set(f"key_{i}", (f"value_{i}", 1.0))
+    await cache.flush()
+
+    pipeline.mset.assert_called_once()
+    assert len(pipeline.mset.call_args[0][0]) == 3
+    assert pipeline.expire.call_count == 3
+    pipeline.execute.assert_awaited_once()
+
+    async def scan_iter(match=None, count=None):
+        for key in (b"cache:a", b"cache:b"):
+            yield key
+    cache.redis_client.scan_iter = scan_iter
+    cache.redis_client.mget = AsyncMock(return_value=[json.dumps(["A", 1.0]), None])
+    cache.cache.clear()
+    await cache.load()
+    assert cache.get("a") == ("A", 1.0)
+    assert cache.get("b") is None
@@ -0,0 +1,162 @@
+"""
+Tests for the embeddings pipeline: vector encoding, cache and batching
+"""
+
+import asyncio
+import base64
+import struct
+
+import pytest
+
+from src.core.embeddings_pipeline import (EmbeddingBatcher, EmbeddingCache,
+                                          EmbeddingResult, EmbeddingsPipeline,
+                                          decode_vector, embedding_key,
+                                          encode_vector)
+from src.core.exceptions import InvalidRequestError
+
+
+def vector_for(text):
+    """Deterministic 3-dimensional float32 vector for an input"""
+    return [float(len(text)), float(ord(text[0])), 0.5]
+
+
+def b64(values):
+    return base64.b64encode(struct.pack(f"<{len(values)}f", *values)).decode()
+
+
+class FakeProvider:
+    """Provider answering embeddings in base64, recording upstream requests"""
+
+    def __init__(self, name="openai", fail_on=None):
+        self.name = name
+        self.fail_on = fail_on
+        self.requests = []
+
+    async def create_embeddings(self, request):
+        self.requests.append(request)
+        if self.fail_on is not None and self.fail_on in request["input"]:
+            raise InvalidRequestError("bad input", param="input")
+        return {
+            "object": "list",
+            "model": request["model"],
+            "data": [
+                {"object": "embedding", "index": i, "embedding": b64(vector_for(text))}
+                for i, text in enumerate(request["input"])
+            ],
+            "usage": {"prompt_tokens": sum(len(t) for t in request["input"]), "total_tokens": 0}
+        }
+
+
+class TestVectors:
+    """Test float32 vector encoding"""
+
+    def test_base64_and_float_lists_decode_to_same_bytes(self):
+        values = [0.25, -1.5, 3.0]
+        assert decode_vector(b64(values)) == decode_vector(values)
+
+    def test_encode_round_trip(self):
+        data = decode_vector([0.25, -1.5, 3.0])
+        assert encode_vector(data, "base64") == b64([0.25, -1.5, 3.0])
+        assert list(encode_vector(data, "float")) == [0.25, -1.5, 3.0]
+
+    def test_key_depends_on_model_and_dimensions(self):
+        assert embedding_key("m", None, "a") == embedding_key("m", None, "a")
+        assert embedding_key("m", None, "a") != embedding_key("m", 256, "a")
+        assert embedding_key("m", None, "a") != embedding_key("n", None, "a")
+
+
+class TestEmbeddingCache:
+    """Test the byte-bounded vector cache"""
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        cache = EmbeddingCache(max_bytes=24)
+        cache.put(b"a", b"x" * 12)
+        cache.put(b"b", b"y" * 12)
+        assert cache.get(b"a") is not None
+        cache.put(b"c", b"z" * 12)
+        assert cache.get(b"b") is None
+        assert cache.get(b"a") is not None
+        assert cache.get_stats()["bytes"] == 24
+
+    def test_ttl_expiry(self):
+        cache = EmbeddingCache(max_bytes=100, ttl=0.0)
+        cache.put(b"a", b"x")
+        assert cache.get(b"a") is None
+        assert len(cache) == 0
+
+
+class TestEmbeddingBatcher:
+    """Test coalescing of concurrent embedding calls"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_upstream_call(self):
+        provider = FakeProvider()
+        batcher = EmbeddingBatcher(provider, {"model": "emb"}, window=0.01, max_inputs=100)
+
+        results = await asyncio.gather(
+            batcher.embed(["aa", "bbb"]),
+            batcher.embed(["bbb", "c"]),
+        )
+
+        assert len(provider.requests) == 1
+        assert provider.requests[0]["input"] == ["aa", "bbb", "c"]
+        assert provider.requests[0]["encoding_format"] == "base64"
+        assert results[0].vectors == [decode_vector(vector_for("aa")), decode_vector(vector_for("bbb"))]
+        assert results[1].vectors[1] == decode_vector(vector_for("c"))
+        assert results[0].prompt_tokens + results[1].prompt_tokens == 9
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_without_waiting(self):
+        provider = FakeProvider()
+        batcher = EmbeddingBatcher(provider, {"model": "emb"}, window=60.0, max_inputs=2)
+        result = await asyncio.wait_for(batcher.embed(["a", "b"]), timeout=1.0)
+        assert len(result.vectors) == 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_request_is_isolated(self):
+        provider = FakeProvider(fail_on="bad")
+        batcher = EmbeddingBatcher(provider, {"model": "emb"}, window=0.01, max_inputs=100)
+
+        good, bad = await asyncio.gather(
+            batcher.embed(["ok"]),
+            batcher.embed(["bad"]),
+            return_exceptions=True
+        )
+
+        assert isinstance(good, EmbeddingResult)
+        assert isinstance(bad, InvalidRequestError)
+        assert len(provider.requests) == 3
+
+
+class TestEmbeddingsPipeline:
+    """Test cache lookup and response assembly"""
+
+    @pytest.mark.asyncio
+    async def test_only_uncached_inputs_are_routed(self):
+        provider = FakeProvider()
+        pipeline = EmbeddingsPipeline(batch_window=0.0, cache=EmbeddingCache(1024 * 1024))
+        routed = []
+
+        async def route(request):
+            routed.append(request["input"])
+            return await pipeline.embed_with(provider, request)
+
+        body, cached = await pipeline.create({"model": "emb", "input": ["a", "bb", "a"]}, route)
+        assert cached == 0
+        assert routed == [["a", "bb"]]
+        assert [item["index"] for item in body["data"]] == [0, 1, 2]
+        assert list(body["data"][2]["embedding"]) == vector_for("a")
+
+        body, cached = await pipeline.create(
+            {"model": "emb", "input": ["bb", "ccc"], "encoding_format": "base64"}, route
+        )
+        assert cached == 1
+        assert routed[-1] == ["ccc"]
+        assert body["data"][0]["embedding"] == b64(vector_for("bb"))
+        assert pipeline.get_stats()["cache"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rejects_empty_input(self):
+        pipeline = EmbeddingsPipeline()
+        with pytest.raises(InvalidRequestError):
+            await pipeline.create({"model": "emb", "input": ["ok", ""]}, None)
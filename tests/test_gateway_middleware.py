@@ -0,0 +1,209 @@
+"""
+Tests for the pure-ASGI gateway middleware
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.api.gateway import GatewayMiddleware, RoutePolicy
+from src.core.auth import APIKeyAuth
+from src.core.phase_timing import current_timer, phase, phase_histograms
+from src.core.rate_limiter import TokenBucketRateLimiter, rate_limiter
+
+
+def make_scope(path="/v1/v1/chat/completions", headers=None, app=None):
+    return {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": headers or [],
+        "client": ("10.0.0.1", 1234),
+        "server": ("testserver", 80),
+        "scheme": "http",
+        "root_path": "",
+        "app": app or SimpleNamespace(state=SimpleNamespace(api_key_auth=APIKeyAuth(["secret"]))),
+    }
+
+
+async def streaming_app(scope, receive, send):
+    """Inner app emitting an SSE response in several body messages"""
+    scope["state"]["reached"] = True
+    await send({"type": "http.response.start", "status": 200,
+                "headers": [(b"content-type", b"text/event-stream")]})
+    for i in range(3):
+        await send({"type": "http.response.body", "body": f"data: {i}\n\n".encode(), "more_body": True})
+    await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+async def run(middleware, scope):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    return messages
+
+
+@pytest.fixture(autouse=True)
+def api_key_header():
+    config = MagicMock()
+    config.settings.api_key_header = "X-API-Key"
+    with patch("src.api.gateway.config_manager") as manager:
+        manager.load_config.return_value = config
+        previous = rate_limiter.token_bucket_limiter
+        rate_limiter.token_bucket_limiter = None
+        yield
+        rate_limiter.token_bucket_limiter = previous
+
+
+class TestGatewayMiddleware:
+    """Test request ID, auth, rate limiting and streaming passthrough"""
+
+    def test_authenticated_stream_passes_through_unbuffered(self):
+        middleware = GatewayMiddleware(streaming_app)
+        scope = make_scope(headers=[(b"x-api-key", b"secret")])
+
+        messages = asyncio.run(run(middleware, scope))
+
+        assert [m["type"] for m in messages] == ["http.response.start"] + ["http.response.body"] * 4
+        assert messages[1]["body"] == b"data: 0\n\n"
+        headers = dict(messages[0]["headers"])
+        assert headers[b"x-request-id"].startswith(b"req_")
+        assert b"x-process-time" in headers
+        assert scope["state"]["authenticated"] is True
+
+    def test_bearer_token_and_incoming_request_id(self):
+        middleware = GatewayMiddleware(streaming_app)
+        scope = make_scope(headers=[(b"authorization", b"Bearer secret"), (b"x-request-id", b"client-42")])
+
+        messages = asyncio.run(run(middleware, scope))
+
+        assert messages[0]["status"] == 200
+        assert dict(messages[0]["headers"])[b"x-request-id"] == b"client-42"
+        assert scope["state"]["request_id"] == "client-42"
+
+    def test_missing_api_key_is_rejected(self):
+        middleware = GatewayMiddleware(streaming_app)
+        scope = make_scope()
+
+        messages = asyncio.run(run(middleware, scope))
+
+        assert messages[0]["status"] == 401
+        assert "reached" not in scope["state"]
+        body = json.loads(messages[1]["body"])
+        assert body["error"]["type"] == "authentication_error"
+        assert middleware.get_stats()["rejected"] == 1
+
+    def test_route_opt_out_skips_auth(self):
+        middleware = GatewayMiddleware(streaming_app, route_policies={
+            "/v1/health": RoutePolicy(auth=False, rate_limit=False, access_log=False)
+        })
+        messages = asyncio.run(run(middleware, make_scope(path="/v1/health")))
+        assert messages[0]["status"] == 200
+        assert middleware.policy_for("/docs").auth is False
+        assert middleware.policy_for("/v1/alerts").auth is True
+
+    def test_api_key_header_follows_reloaded_config(self):
+        middleware = GatewayMiddleware(streaming_app)
+        config = MagicMock()
+        config.settings.api_key_header = "X-Proxy-Key"
+        state = SimpleNamespace(api_key_auth=APIKeyAuth(["secret"]), config=config)
+        app = SimpleNamespace(state=state)
+
+        with patch("src.api.gateway.config_manager") as manager:
+            messages = asyncio.run(run(middleware, make_scope(headers=[(b"x-proxy-key", b"secret")], app=app)))
+            assert messages[0]["status"] == 200
+
+            # A reload replaces app.state.config
+            reloaded = MagicMock()
+            reloaded.settings.api_key_header = "X-Other-Key"
+            state.config = reloaded
+            messages = asyncio.run(run(middleware, make_scope(headers=[(b"x-proxy-key", b"secret")], app=app)))
+            assert messages[0]["status"] == 401
+
+            # Per-request auth never re-reads the config file
+            manager.load_config.assert_not_called()
+
+    def test_rate_limit_returns_retry_after(self):
+        rate_limiter.token_bucket_limiter = TokenBucketRateLimiter(requests_per_minute=1)
+        middleware = GatewayMiddleware(streaming_app)
+        headers = [(b"x-api-key", b"secret")]
+
+        first = asyncio.run(run(middleware, make_scope(headers=headers)))
+        second = asyncio.run(run(middleware, make_scope(headers=headers)))
+
+        assert first[0]["status"] == 200
+        assert second[0]["status"] == 429
+        assert b"retry-after" in dict(second[0]["headers"])
+
+    def test_phase_timing_headers_and_histograms(self):
+        async def timed_app(scope, receive, send):
+            with phase("routing"):
+                pass
+            await streaming_app(scope, receive, send)
+            # Phases after the response started only reach the histograms
+            current_timer().add("streaming", 0.002)
+
+        phase_histograms.reset()
+        middleware = GatewayMiddleware(timed_app)
+        messages = asyncio.run(run(middleware, make_scope(headers=[(b"x-api-key", b"secret")])))
+
+        server_timing = dict(messages[0]["headers"])[b"server-timing"].decode()
+        names = [entry.split(";")[0] for entry in server_timing.split(", ")]
+        assert names == ["rate_limit", "auth", "routing", "proxy", "total"]
+        assert set(phase_histograms.get_stats()) == {"rate_limit", "auth", "routing", "streaming", "proxy", "total"}
+        assert current_timer() is None
+
+    def test_phase_timing_disabled(self):
+        settings = SimpleNamespace(enabled=False, server_timing_header=True, histograms=True, span_attributes=False)
+        phase_histograms.reset()
+        middleware = GatewayMiddleware(streaming_app, phase_timing=settings)
+        messages = asyncio.run(run(middleware, make_scope(headers=[(b"x-api-key", b"secret")])))
+
+        assert b"server-timing" not in dict(messages[0]["headers"])
+        assert phase_histograms.get_stats() == {}
+
+    def test_non_http_scopes_are_untouched(self):
+        inner = MagicMock()
+
+        async def lifespan_app(scope, receive, send):
+            inner(scope["type"])
+
+        asyncio.run(GatewayMiddleware(lifespan_app)({"type": "lifespan"}, None, None))
+        inner.assert_called_once_with("lifespan")
+
+    def test_routed_requests_keep_the_gateway_request_id(self):
+        from starlette.requests import Request
+
+        from src.api.controllers.common import RequestRouter
+
+        router = RequestRouter()
+        config = MagicMock()
+        config.get_forced_provider.return_value = None
+        config.settings.request_timeout = 30
+        app_state = MagicMock()
+        app_state.config_manager.load_config.return_value = config
+        app_state.provider_factory.get_providers_for_model = AsyncMock(return_value=[MagicMock()])
+        app = SimpleNamespace(state=SimpleNamespace(api_key_auth=APIKeyAuth(["secret"]), app_state=app_state))
+
+        async def routed_app(scope, receive, send):
+            await router.route_request(Request(scope, receive), {"model": "gpt-4"}, "chat_completion", MagicMock())
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"{}"})
+
+        with patch.object(RequestRouter, "_try_providers", new=AsyncMock(return_value={})) as try_providers:
+            scope = make_scope(headers=[(b"x-api-key", b"secret"), (b"x-request-id", b"client-42")], app=app)
+            asyncio.run(run(GatewayMiddleware(routed_app), scope))
+
+        # The ID the client sent is the one routing logs and reports back
+        assert try_providers.call_args.args[6] == "client-42"
@@ -0,0 +1,112 @@
+"""
+Tests for the shared-memory provider health table
+"""
+
+import struct
+import time
+
+import pytest
+
+from src.core.health_status_table import (HEADER_SIZE, SEQ_OFFSET,
+                                          StatusTableError, StatusTableReader,
+                                          StatusTableWriter)
+
+
+class TestHealthStatusTable:
+    """Test publishing and reading provider health snapshots"""
+
+    @pytest.fixture
+    def table_path(self, tmp_path):
+        return str(tmp_path / "health.tbl")
+
+    def test_reader_without_table_is_empty(self, table_path):
+        """A missing table behaves as 'no information'"""
+        reader = StatusTableReader(table_path)
+        assert reader.snapshot() == {}
+        assert reader.get("openai") is None
+        assert not reader.is_fresh()
+
+    def test_publish_and_read(self, table_path):
+        """Readers see the latest published snapshot"""
+        writer = StatusTableWriter(table_path, capacity=4096)
+        reader = StatusTableReader(table_path)
+
+        seq = writer.publish({"openai": {"status": "healthy"}})
+        assert reader.get("openai") == {"status": "healthy"}
+        assert reader.sequence == seq
+
+        writer.publish({"openai": {"status": "unhealthy"}})
+        assert reader.get("openai") == {"status": "unhealthy"}
+
+        writer.close()
+        reader.close()
+
+    def test_unchanged_sequence_reuses_decoded_snapshot(self, table_path):
+        """The payload is only decoded when the sequence changes"""
+        writer = StatusTableWriter(table_path, capacity=4096)
+        reader = StatusTableReader(table_path)
+        writer.publish({"anthropic": {"status": "healthy"}})
+
+        first = reader.snapshot()
+        assert reader.snapshot() is first
+
+        writer.close()
+        reader.close()
+
+    def test_in_progress_write_keeps_previous_snapshot(self, table_path):
+        """An odd sequence (writer mid-update) is never decoded"""
+        writer = StatusTableWriter(table_path, capacity=4096)
+        reader = StatusTableReader(table_path)
+        writer.publish({"openai": {"status": "healthy"}})
+        assert reader.get("openai")["status"] == "healthy"
+
+        struct.pack_into("<Q", writer._map, SEQ_OFFSET, writer.sequence + 1)
+        assert reader.get("openai")["status"] == "healthy"
+
+        writer.close()
+        reader.close()
+
+    def test_stale_snapshot_is_ignored(self, table_path):
+        """Snapshots older than max_age are treated as unknown"""
+        writer = StatusTableWriter(table_path, capacity=4096)
+        reader = StatusTableReader(table_path, max_age=0.05)
+        writer.publish({"openai": {"status": "unhealthy"}})
+        assert reader.get("openai") is not None
+
+        time.sleep(0.1)
+        assert reader.get("openai") is None
+
+        writer.close()
+        reader.close()
+
+    def test_restarted_writer_continues_sequence(self, table_path):
+        """A new writer never reuses a sequence readers have already seen"""
+        writer = StatusTableWriter(table_path, capacity=4096)
+        seq = writer.publish({"openai": {"status": "healthy"}})
+        writer.close()
+
+        writer = StatusTableWriter(table_path, capacity=4096)
+        assert writer.publish({"openai": {"status": "healthy"}}) > seq
+        writer.close()
+
+    def test_reader_remaps_after_writer_grows_table(self, table_path):
+        """A writer restarted with a larger capacity is still readable"""
+        writer = StatusTableWriter(table_path, capacity=HEADER_SIZE + 64)
+        reader = StatusTableReader(table_path)
+        writer.publish({"openai": {"status": "healthy"}})
+        assert reader.get("openai") == {"status": "healthy"}
+        writer.close()
+
+        writer = StatusTableWriter(table_path, capacity=4096)
+        writer.publish({"openai": {"status": "unhealthy", "error": "x" * 200}})
+        assert reader.get("openai")["status"] == "unhealthy"
+
+        writer.close()
+        reader.close()
+
+    def test_oversized_snapshot_rejected(self, table_path):
+        """Snapshots larger than the table raise instead of truncating"""
+        writer = StatusTableWriter(table_path, capacity=HEADER_SIZE + 16)
+        with pytest.raises(StatusTableError):
+            writer.publish({"provider": {"status": "healthy", "error": "x" * 100}})
+        writer.close()
@@ -420,6 +420,38 @@ class TestLifespanInitialization:
                 # Verify cache persistence initialization
                 mock_lru_cache.return_value.initialize.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_condensation_cache_uses_configured_eviction_policy(self, mock_app):
+        """Test the condensation_cache step builds the cache with the configured eviction policy"""
+        from main import startup_manager
+
+        with patch('main.app_state') as mock_app_state, \
+             patch('main.get_advanced_http_client') as mock_get_http_client, \
+             patch('main.APIKeyAuth'), \
+             patch('src.core.smart_cache.get_response_cache', new=AsyncMock()), \
+             patch('src.core.smart_cache.get_summary_cache', new=AsyncMock()), \
+             patch('src.core.smart_cache.shutdown_caches', new=AsyncMock()), \
+             patch('src.utils.context_condenser.AsyncLRUCache') as mock_lru_cache, \
+             patch('src.core.rate_limiter.rate_limiter'), \
+             patch.object(startup_manager, 'start_optional_background'), \
+             patch('asyncio.all_tasks', return_value=[]):
+
+            mock_app_state.initialize = AsyncMock()
+            mock_app_state.shutdown = AsyncMock()
+            condensation = mock_app_state.config.settings.condensation
+            condensation.cache_persist = False
+            condensation.cache_size = 1000
+            condensation.cache_eviction_policy = "slru"
+            condensation.prefix_cache_enabled = False
+            mock_get_http_client.return_value.initialize = AsyncMock()
+            mock_lru_cache.return_value = AsyncMock()
+
+            async with lifespan(mock_app):
+                assert mock_lru_cache.call_args.kwargs["eviction_policy"] == "slru"
+                assert mock_app.state.lru_cache is mock_lru_cache.return_value
+                step = next(r for r in startup_manager.records if r.name == "condensation_cache")
+                assert step.status.value == "ready"
+
     @pytest.mark.asyncio
     async def test_web_ui_thread_startup(self, mock_app):
         """Test web UI thread is started during initialization"""
@@ -508,13 +540,13 @@ class TestLifespanIntegration:
         """Test that middleware is properly configured"""
         # Verify CORS middleware is added
         cors_middleware = None
-        gzip_middleware = None
+        compression_middleware = None
 
         for middleware in app.user_middleware:
             if 'CORSMiddleware' in str(middleware.cls):
                 cors_middleware = middleware
-            if 'GZipMiddleware' in str(middleware.cls):
-                gzip_middleware = middleware
+            if 'CompressionMiddleware' in str(middleware.cls):
+                compression_middleware = middleware
 
         assert cors_middleware is not None
-        assert gzip_middleware is not None
\ No newline at end of file
+        assert compression_middleware is not None
\ No newline at end of file
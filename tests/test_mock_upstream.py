@@ -0,0 +1,142 @@
+"""
+Tests for the benchmark mock upstream and result helpers
+"""
+
+import asyncio
+import base64
+import json
+import random
+
+import pytest
+
+from src.benchmarks.e2e import (BENCH_API_KEY, build_proxy_config, percentile,
+                                summarize)
+from src.benchmarks.mock_upstream import (LatencyDistribution, MockUpstream,
+                                          UpstreamProfile)
+
+
+async def post(upstream: MockUpstream, path: str, payload: dict):
+    """Minimal HTTP/1.1 client: returns (status, headers, body) with chunked bodies decoded"""
+    reader, writer = await asyncio.open_connection(upstream.host, upstream.port)
+    body = json.dumps(payload).encode()
+    writer.write(f"POST {path} HTTP/1.1\r\nhost: mock\r\ncontent-type: application/json\r\n"
+                 f"content-length: {len(body)}\r\nconnection: close\r\n\r\n".encode() + body)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+
+    head, _, rest = raw.partition(b"\r\n\r\n")
+    lines = head.decode().split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    headers = {k.lower(): v.strip() for k, _, v in (line.partition(":") for line in lines[1:])}
+    if headers.get("transfer-encoding") == "chunked":
+        decoded = b""
+        while True:
+            size_line, _, rest = rest.partition(b"\r\n")
+            size = int(size_line, 16)
+            if size == 0:
+                break
+            decoded += rest[:size]
+            rest = rest[size + 2:]
+        rest = decoded
+    return status, headers, rest
+
+
+class TestLatencyDistribution:
+    """Test latency specs used by the CLI"""
+
+    def test_parse(self):
+        assert LatencyDistribution.parse("25") == LatencyDistribution("constant", 25.0)
+        assert LatencyDistribution.parse("uniform:10:50") == LatencyDistribution("uniform", 10.0, 50.0)
+        assert str(LatencyDistribution.parse("lognormal:40:0.5")) == "lognormal:40:0.5"
+        with pytest.raises(ValueError):
+            LatencyDistribution.parse("pareto:1:2")
+
+    def test_samples_are_non_negative(self):
+        rng = random.Random(1)
+        samples = [LatencyDistribution("normal", 1.0, 10.0).sample(rng) for _ in range(200)]
+        assert min(samples) == 0.0
+        assert all(10.0 <= LatencyDistribution("uniform", 10, 20).sample(rng) <= 20.0 for _ in range(50))
+
+
+class TestMockUpstream:
+    """Test the simulated upstream endpoints and fault injection"""
+
+    @pytest.mark.asyncio
+    async def test_chat_completion(self):
+        async with MockUpstream() as upstream:
+            status, _, body = await post(upstream, "/default/v1/chat/completions",
+                                         {"model": "m", "messages": [{"role": "user", "content": "hi"}]})
+            assert status == 200
+            data = json.loads(body)
+            assert data["object"] == "chat.completion"
+            assert data["choices"][0]["message"]["content"] == "benchmark"
+            assert upstream.request_count("default", 200) == 1
+
+    @pytest.mark.asyncio
+    async def test_streaming_sends_all_tokens(self):
+        async with MockUpstream({"fast": UpstreamProfile(stream_tokens=5)}) as upstream:
+            status, headers, body = await post(upstream, "/fast/v1/chat/completions",
+                                               {"model": "m", "stream": True, "messages": []})
+            assert status == 200
+            assert headers["content-type"] == "text/event-stream"
+            events = [line[6:] for line in body.decode().split("\n\n") if line.startswith("data: ")]
+            assert events[-1] == "[DONE]"
+            chunks = [json.loads(event) for event in events[:-1]]
+            assert len(chunks) == 5
+            assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
+
+    @pytest.mark.asyncio
+    async def test_base64_embeddings(self):
+        async with MockUpstream({"default": UpstreamProfile(embedding_dimensions=8)}) as upstream:
+            status, _, body = await post(upstream, "/default/v1/embeddings",
+                                         {"model": "e", "input": ["a", "b"], "encoding_format": "base64"})
+            data = json.loads(body)["data"]
+            assert status == 200
+            assert len(data) == 2
+            assert len(base64.b64decode(data[0]["embedding"])) == 8 * 4
+
+    @pytest.mark.asyncio
+    async def test_error_injection_per_profile(self):
+        profiles = {
+            "limited": UpstreamProfile(rate_429=1.0, retry_after=2),
+            "broken": UpstreamProfile(rate_5xx=1.0, status_5xx=502),
+            "small": UpstreamProfile(max_context_tokens=2),
+        }
+        async with MockUpstream(profiles) as upstream:
+            request = {"model": "m", "messages": [{"role": "user", "content": "a long enough prompt"}]}
+            status, headers, _ = await post(upstream, "/limited/v1/chat/completions", request)
+            assert (status, headers["retry-after"]) == (429, "2")
+
+            status, _, _ = await post(upstream, "/broken/v1/chat/completions", request)
+            assert status == 502
+
+            status, _, body = await post(upstream, "/small/v1/chat/completions", request)
+            assert status == 400
+            assert json.loads(body)["error"]["code"] == "context_length_exceeded"
+
+            assert upstream.request_count(status=200) == 0
+            assert upstream.request_count() == 3
+
+
+class TestBenchmarkResults:
+    """Test percentile math and the generated proxy config"""
+
+    def test_percentiles(self):
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == pytest.approx(50.5)
+        assert percentile(values, 99) == pytest.approx(99.01)
+        assert summarize([])["p99"] == 0.0
+        assert summarize([3.0, 1.0, 2.0])["p50"] == 2.0
+
+    def test_proxy_config_points_providers_at_upstream(self):
+        upstream = MockUpstream(port=9999)
+        base = {"app": {"name": "x"}, "telemetry": {"enabled": True, "service_name": "s"},
+                "providers": [{"name": "openai"}]}
+        config = build_proxy_config(base, upstream)
+
+        assert [p["base_url"] for p in config["providers"]] == [
+            "http://127.0.0.1:9999/ok/v1", "http://127.0.0.1:9999/failing/v1", "http://127.0.0.1:9999/ok/v1"]
+        assert config["auth"]["api_keys"] == [BENCH_API_KEY]
+        assert config["telemetry"] == {"enabled": False, "service_name": "s"}
+        assert base["providers"] == [{"name": "openai"}]
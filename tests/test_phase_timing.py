@@ -0,0 +1,114 @@
+"""
+Tests for per-request phase timing
+"""
+
+import asyncio
+
+import pytest
+
+from src.core.phase_timing import (HTTPTrace, PhaseHistograms, PhaseTimer,
+                                   bind_timer, current_timer, phase,
+                                   time_stream, trace_extensions, unbind_timer)
+
+
+@pytest.fixture
+def timer():
+    timer = PhaseTimer()
+    token = bind_timer(timer)
+    yield timer
+    unbind_timer(token)
+
+
+class TestPhaseTimer:
+    """Test phase accumulation and the Server-Timing value"""
+
+    def test_phases_accumulate(self, timer):
+        with phase("routing"):
+            pass
+        timer.add("upstream", 0.010)
+        timer.add("upstream", 0.005)
+
+        assert timer.durations["upstream"] == pytest.approx(0.015)
+        assert "routing" in timer.durations
+
+    def test_proxy_time_excludes_upstream_phases(self):
+        timer = PhaseTimer(started=0.0)
+        timer.add("auth", 0.001)
+        timer.add("upstream", 0.040)
+        timer.add("streaming", 0.050)
+
+        ms = timer.milliseconds(total=0.100)
+        assert ms["proxy"] == pytest.approx(10.0)
+        assert ms["total"] == pytest.approx(100.0)
+        assert timer.server_timing(total=0.100) == (
+            "auth;dur=1.00, upstream;dur=40.00, streaming;dur=50.00, proxy;dur=10.00, total;dur=100.00")
+
+    def test_untimed_requests_share_a_no_op(self):
+        assert current_timer() is None
+        assert phase("routing") is phase("auth")
+        with phase("routing"):
+            pass
+        assert trace_extensions({"sni_hostname": "x"}) == {"sni_hostname": "x"}
+
+    @pytest.mark.asyncio
+    async def test_streaming_is_timed_from_first_chunk(self, timer):
+        async def chunks():
+            await asyncio.sleep(0.02)
+            yield b"a"
+            yield b"b"
+
+        received = [chunk async for chunk in time_stream(chunks())]
+
+        assert received == [b"a", b"b"]
+        # The wait before the first chunk is not streaming time
+        assert timer.durations["streaming"] < 0.02
+
+
+class TestHTTPTrace:
+    """Test queue, connect and TTFB derived from httpcore trace events"""
+
+    @pytest.mark.asyncio
+    async def test_new_connection(self, timer):
+        trace = trace_extensions()["trace"]
+        assert isinstance(trace, HTTPTrace)
+        for event in ("connection.connect_tcp.started", "connection.connect_tcp.complete",
+                      "connection.start_tls.started", "connection.start_tls.complete",
+                      "http11.send_request_headers.started", "http11.send_request_headers.complete",
+                      "http11.receive_response_headers.started", "http11.receive_response_headers.complete"):
+            await trace(event, {})
+
+        assert set(timer.durations) == {"queue", "connect", "upstream_ttfb"}
+
+    @pytest.mark.asyncio
+    async def test_reused_connection_has_no_connect_phase(self, timer):
+        trace = HTTPTrace(timer)
+        await trace("http2.send_request_headers.started", {})
+        await trace("http2.receive_response_headers.complete", {})
+
+        assert set(timer.durations) == {"queue", "upstream_ttfb"}
+
+
+class TestPhaseHistograms:
+    """Test histogram quantiles and Prometheus export"""
+
+    def test_quantiles_and_stats(self):
+        histograms = PhaseHistograms(buckets_ms=(1, 10, 100))
+        for ms in [0.5] * 50 + [5.0] * 40 + [50.0] * 10:
+            histograms.observe("upstream", ms)
+
+        stats = histograms.get_stats()["upstream"]
+        assert stats["count"] == 100
+        assert stats["p50_ms"] == pytest.approx(1.0)
+        assert 1.0 < stats["p90_ms"] <= 10.0
+        assert 10.0 < stats["p99_ms"] <= 100.0
+
+    def test_record_and_prometheus(self):
+        histograms = PhaseHistograms(buckets_ms=(1, 10))
+        timer = PhaseTimer(started=0.0)
+        timer.add("auth", 0.0005)
+        histograms.record(timer, total=0.020)
+
+        text = histograms.to_prometheus()
+        assert 'proxy_api_request_phase_duration_ms_bucket{phase="auth",le="1"} 1' in text
+        assert 'proxy_api_request_phase_duration_ms_bucket{phase="total",le="10"} 0' in text
+        assert 'proxy_api_request_phase_duration_ms_count{phase="total"} 1' in text
@@ -0,0 +1,64 @@
+"""
+Tests for the prefix-aware conversation summary store
+"""
+
+from src.utils.prefix_summary_store import (PREFIX_SUMMARY_HEADER,
+                                            PrefixSummaryStore,
+                                            incremental_chunks, prefix_hashes)
+
+
+class TestPrefixHashes:
+    """Test rolling hashes over message boundaries"""
+
+    def test_hashes_are_stable_for_shared_prefix(self):
+        chunks = ["system", "hello", "how are you?"]
+        grown = prefix_hashes(chunks + ["fine"])
+        assert prefix_hashes(chunks) == grown[:3]
+        assert len(set(grown)) == 4
+
+    def test_message_boundaries_matter(self):
+        assert prefix_hashes(["ab", "c"])[-1] != prefix_hashes(["a", "bc"])[-1]
+        assert prefix_hashes(["a", "b"])[-1] != prefix_hashes(["b", "a"])[-1]
+
+
+class TestPrefixSummaryStore:
+    """Test longest-prefix lookup, eviction and expiry"""
+
+    def test_longest_prefix_wins(self):
+        store = PrefixSummaryStore(maxsize=10)
+        hashes = prefix_hashes([f"message {i}" for i in range(5)])
+        store.put(hashes[:2], "summary of 2")
+        store.put(hashes[:4], "summary of 4")
+
+        assert store.longest_prefix(hashes) == (4, "summary of 4")
+        assert store.longest_prefix(hashes[:4]) == (4, "summary of 4")
+        assert store.longest_prefix(prefix_hashes(["other"])) == (0, None)
+
+        stats = store.get_stats()
+        assert (stats['hits'], stats['partial_hits'], stats['misses']) == (1, 1, 1)
+        assert stats['reused_messages'] == 8
+
+    def test_lru_eviction(self):
+        store = PrefixSummaryStore(maxsize=2)
+        first, second, third = (prefix_hashes([name]) for name in ("a", "b", "c"))
+        store.put(first, "a")
+        store.put(second, "b")
+        store.longest_prefix(first)  # refresh "a"
+        store.put(third, "c")
+
+        assert len(store) == 2
+        assert store.longest_prefix(second) == (0, None)
+        assert store.longest_prefix(first) == (1, "a")
+
+    def test_expired_entries_are_ignored(self):
+        store = PrefixSummaryStore(maxsize=10, ttl=0)
+        hashes = prefix_hashes(["a"])
+        store.put(hashes, "a")
+        assert store.longest_prefix(hashes) == (0, None)
+        assert len(store) == 0
+
+    def test_incremental_chunks(self):
+        assert incremental_chunks(None, ["x"]) == ["x"]
+        chunks = incremental_chunks("earlier", ["x", "y"])
+        assert chunks[0] == f"{PREFIX_SUMMARY_HEADER}\nearlier"
+        assert chunks[1:] == ["x", "y"]
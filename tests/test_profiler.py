@@ -0,0 +1,284 @@
+"""
+Tests for the sampling profiler and event-loop monitor
+"""
+
+import asyncio
+import gc
+import socket
+import threading
+import time
+
+import pytest
+
+from src.core.profiler import (LOOP_THREAD_LABEL, BlockingCallError,
+                               BlockingIODetector, GCPauseTracker, LoopMonitor,
+                               ProfilerBusyError, SamplingProfiler,
+                               loop_monitor)
+
+
+def busy_function(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.fixture
+def isolated_hooks(monkeypatch):
+    """
+    Process-wide hooks in a known state: no foreign gc callbacks, gc enabled,
+    and the shared loop monitor's blocking I/O detector off (audit hooks can't
+    be removed, only switched off). Restored afterwards.
+    """
+    monkeypatch.delenv("PROXY_API_BLOCKING_IO_DETECTION", raising=False)
+    callbacks = list(gc.callbacks)
+    gc_enabled = gc.isenabled()
+    shared_mode = loop_monitor.blocking_io.mode
+    gc.callbacks.clear()
+    gc.enable()
+    loop_monitor.blocking_io.disable()
+    try:
+        yield
+    finally:
+        gc.callbacks[:] = callbacks
+        if not gc_enabled:
+            gc.disable()
+        loop_monitor.blocking_io.mode = shared_mode
+
+
+class TestSamplingProfiler:
+    """Test stack sampling and the collapsed output"""
+
+    def test_collapsed_stacks_of_a_busy_thread(self):
+        worker = threading.Thread(target=busy_function, args=(0.3,), name="busy-worker")
+        worker.start()
+        result = SamplingProfiler().profile(duration=0.2, interval=0.002)
+        worker.join()
+
+        assert result.samples > 10
+        lines = result.collapsed().splitlines()
+        busy = [line for line in lines if line.startswith("busy-worker;")]
+        assert busy
+        stack, count = busy[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert "busy_function (tests/test_profiler.py:" in stack.split(";")[-1]
+        assert result.top_functions(1)[0]["function"].startswith("busy_function")
+
+    def test_loop_only_samples_the_loop_thread(self):
+        loop_thread = threading.Thread(target=busy_function, args=(0.2,))
+        other = threading.Thread(target=busy_function, args=(0.2,), name="other-worker")
+        loop_thread.start()
+        other.start()
+        result = SamplingProfiler().profile(duration=0.1, interval=0.002,
+                                            loop_thread_id=loop_thread.ident, loop_only=True)
+        loop_thread.join()
+        other.join()
+
+        assert set(result.threads) == {LOOP_THREAD_LABEL}
+        assert all(stack[0] == LOOP_THREAD_LABEL for stack in result.stacks)
+
+    def test_idle_threads_are_skipped(self):
+        event = threading.Event()
+        waiter = threading.Thread(target=event.wait, name="idle-waiter")
+        waiter.start()
+        try:
+            result = SamplingProfiler().profile(duration=0.05, interval=0.005)
+        finally:
+            event.set()
+            waiter.join()
+
+        assert "idle-waiter" not in result.threads
+        assert result.idle_samples > 0
+
+    def test_one_profile_at_a_time(self):
+        profiler = SamplingProfiler()
+        thread = threading.Thread(target=profiler.profile, args=(0.2,))
+        thread.start()
+        time.sleep(0.05)
+        try:
+            with pytest.raises(ProfilerBusyError):
+                profiler.profile(duration=0.01)
+        finally:
+            thread.join()
+        assert not profiler.running
+
+    def test_report_includes_gc_pauses(self, isolated_hooks):
+        profiler = SamplingProfiler()
+        collected = []
+
+        def collect_while_profiling():
+            # The profile's tracker is the only gc callback once installed
+            deadline = time.perf_counter() + 5
+            while not gc.callbacks and time.perf_counter() < deadline:
+                time.sleep(0.001)
+            cycle = {}
+            cycle["self"] = cycle
+            del cycle
+            collected.append(gc.collect())
+
+        thread = threading.Thread(target=collect_while_profiling)
+        thread.start()
+        report = profiler.profile(duration=0.2, interval=0.01).to_dict()
+        thread.join()
+
+        assert collected and collected[0] >= 1
+        assert report["gc_pauses"]["gen2"]["collections"] >= 1
+        assert 0 <= report["overhead_percent"] < 100
+
+
+class TestGCPauseTracker:
+    """Test GC pause accounting"""
+
+    def test_records_collections_per_generation(self):
+        tracker = GCPauseTracker()
+        tracker.install()
+        try:
+            gc.collect(0)
+            gc.collect()
+        finally:
+            tracker.uninstall()
+
+        stats = tracker.get_stats()
+        assert stats["gen0"]["collections"] >= 1
+        assert stats["gen2"]["collections"] >= 1
+        assert not tracker.collecting
+
+
+class TestLoopMonitor:
+    """Test event-loop lag and slow-callback detection"""
+
+    @pytest.mark.asyncio
+    async def test_blocking_coroutine_is_reported(self):
+        monitor = LoopMonitor(interval=0.02, slow_callback_threshold=0.05)
+        await monitor.start()
+        try:
+            await asyncio.sleep(0.05)
+
+            async def blocking_handler():
+                time.sleep(0.2)
+
+            await asyncio.create_task(blocking_handler(), name="blocking-request")
+            await asyncio.sleep(0.05)
+        finally:
+            await monitor.stop()
+
+        stats = monitor.get_stats()
+        assert stats["lag_ms"]["max"] >= 100
+        assert stats["slow_callbacks"] == 1
+        event = monitor.get_slow_callbacks()[0]
+        assert event["task"] == "blocking-request"
+        assert event["coroutine"].endswith("blocking_handler")
+        assert event["duration_ms"] >= 100
+        assert any("blocking_handler" in frame for frame in event["stack"])
+
+    @pytest.mark.asyncio
+    async def test_idle_loop_has_no_slow_callbacks(self):
+        monitor = LoopMonitor(interval=0.01, slow_callback_threshold=0.05)
+        await monitor.start()
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+
+        stats = monitor.get_stats()
+        assert stats["lag_ms"]["samples"] >= 3
+        assert stats["slow_callbacks"] == 0
+        assert not stats["running"]
+
+    def test_configure_from_section(self):
+        monitor = LoopMonitor()
+        monitor.configure({"loop_monitor_interval_ms": 50, "slow_callback_threshold_ms": 250,
+                           "max_slow_callbacks": 5})
+
+        assert monitor.interval == pytest.approx(0.05)
+        assert monitor.slow_callback_threshold == pytest.approx(0.25)
+        assert monitor.slow_callbacks.maxlen == 5
+
+
+class TestLagHistogram:
+    """Test lag quantiles and the Prometheus export"""
+
+    def test_lag_quantiles_and_prometheus(self):
+        monitor = LoopMonitor()
+        for lag in [0.0005] * 90 + [0.2] * 10:
+            monitor.record_lag(lag)
+        monitor.slow_callbacks.clear()
+
+        lag_ms = monitor.get_stats()["lag_ms"]
+        assert lag_ms["p50"] <= 1.0
+        assert 100.0 < lag_ms["p99"] <= 250.0
+
+        text = monitor.to_prometheus()
+        assert 'proxy_api_event_loop_lag_ms_bucket{le="1"} 90' in text
+        assert "proxy_api_event_loop_lag_ms_count 100" in text
+        assert "proxy_api_event_loop_slow_callbacks_total 10" in text
+
+
+class TestBlockingIODetector:
+    """Test flagging of sync I/O made on the event-loop thread"""
+
+    @pytest.fixture
+    def detector(self, isolated_hooks):
+        detector = BlockingIODetector()
+        yield detector
+        detector.disable()
+        detector.reset()
+
+    @pytest.mark.asyncio
+    async def test_sync_file_io_on_the_loop_is_recorded(self, detector, tmp_path):
+        detector.enable(asyncio.get_running_loop(), threading.get_ident(), "log")
+
+        async def save_to_disk():
+            with open(tmp_path / "cache.json", "w") as f:
+                f.write("{}")
+
+        await asyncio.create_task(save_to_disk(), name="cache-save")
+        # Off the loop thread is fine
+        await asyncio.to_thread(lambda: open(tmp_path / "cache.json").close())
+
+        stats = detector.get_stats()
+        assert stats["blocking_calls"] == 1
+        event = detector.events[0]
+        assert event["event"] == "open"
+        assert event["task"] == "cache-save"
+        assert event["coroutine"].endswith("save_to_disk")
+        assert event["call_site"].startswith("tests/test_profiler.py:")
+        assert "cache.json" in event["target"]
+
+    @pytest.mark.asyncio
+    async def test_blocking_sockets_are_recorded_and_asyncio_sockets_are_not(self, detector):
+        server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        detector.enable(asyncio.get_running_loop(), threading.get_ident(), "log")
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.close()
+        socket.create_connection(("127.0.0.1", port)).close()
+        detector.disable()
+        server.close()
+        await server.wait_closed()
+
+        # Name resolution and connect of the blocking socket only; tasks other
+        # tests left on this loop may add their own events, so keep ours
+        ours = [event for event in detector.events
+                if event["event"].startswith("socket.") and event["call_site"].startswith("tests/test_profiler.py:")]
+        assert [event["event"] for event in ours] == ["socket.getaddrinfo", "socket.connect"]
+        assert str(port) in ours[1]["target"]
+
+    @pytest.mark.asyncio
+    async def test_raise_mode_fails_the_call(self, detector, tmp_path):
+        detector.enable(asyncio.get_running_loop(), threading.get_ident(), "raise")
+
+        with pytest.raises(BlockingCallError):
+            open(tmp_path / "config.yaml", "w")
+        assert not (tmp_path / "config.yaml").exists()
+
+    def test_mode_from_config_and_environment(self, monkeypatch):
+        monitor = LoopMonitor()
+        monitor.configure({"blocking_io_detection": False})
+        assert monitor.blocking_io_mode == "off"
+
+        monkeypatch.setenv("PROXY_API_BLOCKING_IO_DETECTION", "raise")
+        monitor.configure({"blocking_io_detection": "log"})
+        assert monitor.blocking_io_mode == "raise"
+
+        monkeypatch.setenv("PROXY_API_BLOCKING_IO_DETECTION", "sometimes")
+        with pytest.raises(ValueError):
+            monitor.configure({})
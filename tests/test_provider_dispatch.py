@@ -0,0 +1,155 @@
+"""
+Tests for precompiled provider dispatch and table-driven payload transforms
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.core.provider_dispatch import (FieldRule, ProviderDispatcher,
+                                        compile_payload_map, resolve_api_key)
+from src.core.unified_config import ProviderConfig, ProviderType
+
+
+def make_dispatcher(client=None, **kwargs):
+    client = client or MagicMock(_closed=False)
+    with patch("src.core.provider_dispatch.get_advanced_http_client", return_value=client) as factory:
+        dispatcher = ProviderDispatcher(
+            provider_name=kwargs.pop("provider_name", "test"),
+            base_url=kwargs.pop("base_url", "https://api.test.com/"),
+            auth_headers=kwargs.pop("auth_headers", {"Authorization": "Bearer key"}),
+            **kwargs,
+        )
+    return dispatcher, factory
+
+
+class TestPayloadMap:
+    """Test compiled field mapping tables"""
+
+    def test_defaults_renames_and_optional_fields(self):
+        transform = compile_payload_map([
+            FieldRule("model"),
+            FieldRule("max_tokens", "max_tokens_to_sample", default=1024),
+            FieldRule("top_p"),
+        ], constants={"n": 1})
+
+        assert transform({"model": "m", "top_p": 0.5}) == {
+            "model": "m", "max_tokens_to_sample": 1024, "top_p": 0.5, "n": 1}
+        assert transform({"model": "m", "max_tokens": 10}) == {
+            "model": "m", "max_tokens_to_sample": 10, "n": 1}
+
+    def test_drop_none_and_mutable_defaults(self):
+        transform = compile_payload_map([
+            FieldRule("stop", drop_none=True),
+            FieldRule("messages", default=[]),
+        ])
+        first = transform({"stop": None})
+        assert first == {"messages": []}
+        first["messages"].append("x")
+        assert transform({}) == {"messages": []}
+
+    def test_computed_fields_run_first(self):
+        def prompt(request):
+            if not request.get("messages"):
+                raise ValueError("no messages")
+            return " ".join(request["messages"])
+
+        transform = compile_payload_map([FieldRule("model")], computed={"prompt": prompt})
+        assert transform({"model": "m", "messages": ["a", "b"]}) == {"prompt": "a b", "model": "m"}
+        with pytest.raises(ValueError):
+            transform({"model": "m"})
+
+
+class TestProviderDispatcher:
+    """Test frozen headers, prebuilt URLs and client resolution"""
+
+    def test_headers_are_built_once(self):
+        dispatcher, _ = make_dispatcher(custom_headers={"X-Team": "core"})
+        assert dispatcher.merge_headers(None) is dispatcher.headers
+        assert dict(dispatcher.headers) == {
+            "Authorization": "Bearer key",
+            "User-Agent": "LLM-Proxy-API/2.0 (test)",
+            "X-Team": "core",
+        }
+        with pytest.raises(TypeError):
+            dispatcher.headers["Authorization"] = "other"
+
+    def test_call_headers_merge_under_custom_headers(self):
+        dispatcher, _ = make_dispatcher(custom_headers={"X-Team": "core"})
+        merged = dispatcher.merge_headers({"Authorization": "Bearer call", "X-Team": "call", "X-Title": "t"})
+        assert merged["Authorization"] == "Bearer call"
+        assert merged["X-Team"] == "core"
+        assert merged["X-Title"] == "t"
+        assert "X-Title" not in dispatcher.headers
+
+    def test_endpoint_urls_are_prebuilt(self):
+        dispatcher, _ = make_dispatcher(endpoints={"chat": "/chat/completions", "models": "models"})
+        assert dispatcher.url("chat") == "https://api.test.com/chat/completions"
+        assert dispatcher.url("models") == "https://api.test.com/models"
+        with pytest.raises(KeyError):
+            dispatcher.url("unknown")
+
+    def test_client_resolved_at_init_and_replaced_when_closed(self):
+        client = MagicMock(_closed=False)
+        dispatcher, factory = make_dispatcher(client=client, client_options={"timeout": 5})
+        factory.assert_called_once_with(provider_name="test", timeout=5)
+        assert dispatcher.client is client
+
+        client._closed = True
+        fresh = MagicMock(_closed=False)
+        with patch("src.core.provider_dispatch.get_advanced_http_client", return_value=fresh):
+            assert dispatcher.client is fresh
+
+    @pytest.mark.asyncio
+    async def test_request_uses_frozen_headers(self):
+        client = MagicMock(_closed=False)
+        client.request = AsyncMock(return_value="response")
+        dispatcher, _ = make_dispatcher(client=client, endpoints={"chat": "/chat"})
+
+        result = await dispatcher.request("POST", dispatcher.url("chat"), json={"a": 1})
+        assert result == "response"
+        client.request.assert_awaited_once_with(
+            "POST", "https://api.test.com/chat", headers=dispatcher.headers, json={"a": 1})
+
+    def test_resolve_api_key_prefers_proxy_prefix(self, monkeypatch):
+        monkeypatch.setenv("DISPATCH_KEY", "plain")
+        assert resolve_api_key("DISPATCH_KEY") == "plain"
+        monkeypatch.setenv("PROXY_API_DISPATCH_KEY", "prefixed")
+        assert resolve_api_key("DISPATCH_KEY") == "prefixed"
+        assert resolve_api_key(None) == ""
+
+
+class TestProviderTemplates:
+    """Test the compiled templates of concrete providers"""
+
+    def test_anthropic_dispatcher_and_payload(self, monkeypatch):
+        from src.providers.anthropic import AnthropicProvider
+
+        monkeypatch.setenv("PROXY_API_DISPATCH_ANTHROPIC_KEY", "sk-ant")
+        config = ProviderConfig(
+            name="anthropic_test",
+            type=ProviderType.ANTHROPIC,
+            base_url="https://api.anthropic.com",
+            api_key_env="DISPATCH_ANTHROPIC_KEY",
+            models=["claude-3-opus-20240229"],
+        )
+        with patch("src.core.provider_dispatch.get_advanced_http_client", return_value=MagicMock(_closed=False)):
+            provider = AnthropicProvider(config)
+
+        assert provider.dispatcher.url("messages") == "https://api.anthropic.com/v1/messages"
+        assert provider.dispatcher.headers["x-api-key"] == "sk-ant"
+        assert "Authorization" not in provider.dispatcher.headers
+
+        payload = provider._transform_payload({
+            "model": "claude-3-opus-20240229",
+            "messages": [{"role": "system", "content": "Be brief"}, {"role": "user", "content": "Hi"}],
+            "stop": ["END"],
+        })
+        assert payload == {
+            "prompt": "System: Be brief\n\nHuman: Hi\n\nAssistant:",
+            "stop_sequences": ["END"],
+            "model": "claude-3-opus-20240229",
+            "max_tokens_to_sample": 1024,
+            "temperature": 0.7,
+            "stream": False,
+        }
@@ -0,0 +1,81 @@
+"""
+Tests for fast-path chat request parsing
+"""
+
+import json
+
+import pytest
+
+from src.core.exceptions import InvalidRequestError
+from src.models.request_view import (ChatRequestView, is_validated_request,
+                                     parse_chat_request)
+
+
+def body(**overrides):
+    payload = {"model": "gpt-4", "messages": [{"role": "user", "content": "Hello"}]}
+    payload.update(overrides)
+    return json.dumps(payload).encode()
+
+
+class TestParseChatRequest:
+    """Test single-pass parsing and validation"""
+
+    def test_valid_request_becomes_view(self):
+        view = parse_chat_request(body(temperature=0.5, max_tokens=10))
+        assert isinstance(view, ChatRequestView)
+        assert is_validated_request(view)
+        assert view["model"] == "gpt-4"
+        assert view["temperature"] == 0.5
+        assert "stream" not in view  # only fields sent by the client, like exclude_unset
+        assert view.raw_size == len(body(temperature=0.5, max_tokens=10))
+
+    @pytest.mark.parametrize("overrides,param", [
+        ({"model": ""}, "model"),
+        ({"messages": []}, "messages"),
+        ({"messages": [{"role": "user"}]}, "messages[0]"),
+        ({"max_tokens": 0}, "max_tokens"),
+        ({"max_tokens": "10"}, "max_tokens"),
+        ({"temperature": 2.5}, "temperature"),
+        ({"top_p": True}, "top_p"),
+        ({"stream": "yes"}, "stream"),
+        ({"logit_bias": {"50256": -101}}, "logit_bias"),
+    ])
+    def test_invalid_requests_rejected(self, overrides, param):
+        with pytest.raises(InvalidRequestError) as exc_info:
+            parse_chat_request(body(**overrides))
+        assert exc_info.value.param == param
+
+    def test_invalid_json_rejected(self):
+        with pytest.raises(InvalidRequestError):
+            parse_chat_request(b"{not json")
+        with pytest.raises(InvalidRequestError):
+            parse_chat_request(b"[]")
+
+    def test_explicit_nulls_are_allowed(self):
+        view = parse_chat_request(body(temperature=None, max_tokens=None))
+        assert view["temperature"] is None
+
+
+class TestChatRequestView:
+    """Test that the view is shared read-only and copied only on demand"""
+
+    def test_view_is_read_only(self):
+        view = parse_chat_request(body())
+        with pytest.raises(TypeError):
+            view["stream"] = True
+        with pytest.raises(TypeError):
+            view.update(stream=True)
+        with pytest.raises(TypeError):
+            view.pop("model")
+
+    def test_mutable_copy(self):
+        view = parse_chat_request(body())
+        copy = view.mutable_copy()
+        copy["stream"] = True
+        assert type(copy) is dict
+        assert "stream" not in view
+        assert copy["messages"] is view["messages"]  # shallow: messages are not re-copied
+
+    def test_serializes_like_a_dict(self):
+        view = parse_chat_request(body())
+        assert json.loads(json.dumps(view)) == dict(view)
@@ -0,0 +1,174 @@
+"""
+Tests for retry budgets, request deadlines and Retry-After handling
+"""
+import asyncio
+import email.utils
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.core.exceptions import APIConnectionError, RateLimitError
+from src.core.retry_budget import (Deadline, DeadlineExceededError,
+                                   RetryBudget, current_deadline,
+                                   deadline_scope, get_retry_budget,
+                                   parse_retry_after, retry_after_from_error)
+from src.core.retry_strategies import ExponentialBackoffStrategy, RetryConfig
+
+
+class TestDeadline:
+    """Test request-scoped deadlines"""
+
+    def test_remaining_and_clamp(self):
+        deadline = Deadline(5.0, now=100.0)
+        assert deadline.remaining(now=102.0) == pytest.approx(3.0)
+        assert deadline.clamp(30.0, now=102.0) == pytest.approx(3.0)
+        assert deadline.clamp(1.0, now=102.0) == 1.0
+        assert deadline.allows(2.0, now=102.0)
+        assert not deadline.allows(4.0, now=102.0)
+        assert deadline.expired(now=106.0)
+
+    def test_check_raises_when_expired(self):
+        deadline = Deadline(0.0)
+        with pytest.raises(DeadlineExceededError):
+            deadline.check()
+
+    def test_nested_scope_cannot_extend_deadline(self):
+        assert current_deadline() is None
+        with deadline_scope(1.0) as outer:
+            with deadline_scope(60.0) as inner:
+                assert inner is outer
+            with deadline_scope(0.5) as shorter:
+                assert shorter.expires_at < outer.expires_at
+                assert current_deadline() is shorter
+            assert current_deadline() is outer
+        assert current_deadline() is None
+
+    @pytest.mark.asyncio
+    async def test_deadline_propagates_to_tasks(self):
+        with deadline_scope(2.0) as deadline:
+            task_deadline = await asyncio.create_task(self._read_deadline())
+        assert task_deadline is deadline
+
+    async def _read_deadline(self):
+        return current_deadline()
+
+
+class TestRetryAfter:
+    """Test parsing of upstream Retry-After hints"""
+
+    def test_parse_delta_seconds(self):
+        assert parse_retry_after("7") == 7.0
+        assert parse_retry_after(3) == 3.0
+        assert parse_retry_after(b"2.5") == 2.5
+
+    def test_parse_http_date(self):
+        now = time.time()
+        value = email.utils.formatdate(now + 30, usegmt=True)
+        assert parse_retry_after(value, now=now) == pytest.approx(30.0, abs=1.0)
+
+    def test_parse_invalid(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("") is None
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(MagicMock()) is None
+
+    def test_from_error_attribute_and_wrapped_response(self):
+        assert retry_after_from_error(RateLimitError("slow down", retry_after=4)) == 4.0
+
+        upstream = Exception("429 Too Many Requests")
+        upstream.response = MagicMock(headers={"Retry-After": "9"})
+        try:
+            try:
+                raise upstream
+            except Exception:
+                raise RateLimitError("Rate limit exceeded")
+        except RateLimitError as wrapped:
+            assert retry_after_from_error(wrapped) == 9.0
+
+
+class TestRetryBudget:
+    """Test per-provider retry budgets"""
+
+    def test_floor_allows_retries_without_traffic(self):
+        budget = RetryBudget("test", retry_ratio=0.2, min_retries_per_second=0.5, window_seconds=10.0)
+        now = 1000.0
+        granted = sum(budget.try_acquire(now=now) for _ in range(20))
+        assert granted == 5
+        assert budget.rejected_retries == 15
+
+    def test_retries_scale_with_successes(self):
+        budget = RetryBudget("test", retry_ratio=0.2, min_retries_per_second=0.0, window_seconds=10.0)
+        now = 1000.0
+        for _ in range(50):
+            budget.record_success(now=now)
+        granted = sum(budget.try_acquire(now=now) for _ in range(20))
+        assert granted == 10
+
+    def test_window_expiry_restores_budget(self):
+        budget = RetryBudget("test", retry_ratio=0.0, min_retries_per_second=0.1, window_seconds=10.0)
+        assert budget.try_acquire(now=1000.0)
+        assert not budget.try_acquire(now=1005.0)
+        assert budget.try_acquire(now=1011.0)
+
+    def test_defer_honors_retry_after(self):
+        budget = RetryBudget("test")
+        budget.defer(5.0, now=100.0)
+        budget.defer(1.0, now=100.0)  # a shorter hint never shortens an earlier one
+        assert budget.retry_after(now=102.0) == pytest.approx(3.0)
+        assert budget.retry_after(now=106.0) == 0.0
+
+
+class TestRetryStrategyIntegration:
+    """Test that execute_with_retry respects budgets and deadlines"""
+
+    def setup_method(self):
+        self.config = RetryConfig(max_attempts=5, base_delay=0.01, max_delay=1.0, jitter=False)
+
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_stops_retries(self):
+        strategy = ExponentialBackoffStrategy(self.config, "budget_exhausted_provider")
+        budget = get_retry_budget("budget_exhausted_provider")
+        budget.reset()
+        func = AsyncMock(side_effect=RateLimitError("Rate limit exceeded"))
+
+        with patch.object(RetryBudget, 'try_acquire', return_value=False):
+            with pytest.raises(RateLimitError):
+                await strategy.execute_with_retry(func)
+
+        assert func.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_deadline_stops_retries(self):
+        strategy = ExponentialBackoffStrategy(self.config, "deadline_provider")
+        get_retry_budget("deadline_provider").reset()
+        func = AsyncMock(side_effect=RateLimitError("Rate limit exceeded", retry_after=1))
+
+        with deadline_scope(0.5):
+            with pytest.raises(RateLimitError):
+                await strategy.execute_with_retry(func)
+
+        assert func.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_retry_after_sets_minimum_delay(self):
+        strategy = ExponentialBackoffStrategy(self.config, "retry_after_provider")
+        get_retry_budget("retry_after_provider").reset()
+        func = AsyncMock(side_effect=[RateLimitError("Rate limit exceeded", retry_after=1), {"ok": True}])
+
+        with patch('src.core.retry_strategies.asyncio.sleep', new=AsyncMock()) as mock_sleep:
+            assert await strategy.execute_with_retry(func) == {"ok": True}
+
+        assert mock_sleep.await_args[0][0] >= 1.0
+        assert get_retry_budget("retry_after_provider").retry_after() > 0
+
+    @pytest.mark.asyncio
+    async def test_expired_deadline_prevents_call(self):
+        strategy = ExponentialBackoffStrategy(self.config, "expired_provider")
+        func = AsyncMock(side_effect=APIConnectionError("Connection reset"))
+
+        with deadline_scope(0.0):
+            with pytest.raises(DeadlineExceededError):
+                await strategy.execute_with_retry(func)
+
+        func.assert_not_called()
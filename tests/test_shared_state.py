@@ -0,0 +1,124 @@
+"""
+Tests for the multi-worker shared state plane
+"""
+
+import os
+import socket
+
+import pytest
+
+from src.core.circuit_breaker import (CallOutcome, CircuitState,
+                                      SlidingWindowCircuitBreaker,
+                                      SlidingWindowConfig)
+from src.core.rate_limiter import TokenBucketRateLimiter
+from src.core.shared_state import (SHARED_STATE_ENV, SharedStateError,
+                                   SharedStatePlane)
+from src.core.supervisor import bind_socket
+
+
+@pytest.fixture
+def plane_path(tmp_path):
+    path = str(tmp_path / "state.bin")
+    SharedStatePlane.create(path, slots=256, workers=2).close()
+    return path
+
+
+class TestSharedStatePlane:
+    """Test counters, buckets and breaker records shared by two handles"""
+
+    def test_counters_are_shared(self, plane_path):
+        worker_a, worker_b = SharedStatePlane(plane_path), SharedStatePlane(plane_path)
+        worker_a.incr("requests.total")
+        worker_b.incr("requests.total", 2)
+        assert worker_a.get_counters(["requests.total", "requests.failed"]) == {
+            "requests.total": 3, "requests.failed": 0}
+        assert worker_b.workers == 2
+
+    def test_counters_across_processes(self, plane_path):
+        if not hasattr(os, "fork"):
+            pytest.skip("requires os.fork")
+        pids = []
+        for _ in range(4):
+            pid = os.fork()
+            if pid == 0:
+                plane = SharedStatePlane(plane_path)
+                for _ in range(500):
+                    plane.incr("hits")
+                os._exit(0)
+            pids.append(pid)
+        for pid in pids:
+            os.waitpid(pid, 0)
+        assert SharedStatePlane(plane_path).get_counters(["hits"])["hits"] == 2000
+
+    def test_token_bucket_is_shared(self, plane_path):
+        worker_a, worker_b = SharedStatePlane(plane_path), SharedStatePlane(plane_path)
+        assert worker_a.consume_token("rate:client", capacity=2, refill_rate=1, now=100.0) == (True, 1.0)
+        assert worker_b.consume_token("rate:client", capacity=2, refill_rate=1, now=100.0) == (True, 0.0)
+        assert worker_a.consume_token("rate:client", capacity=2, refill_rate=1, now=100.0)[0] is False
+        assert worker_b.consume_token("rate:client", capacity=2, refill_rate=1, now=101.5) == (True, 0.5)
+
+    def test_full_table_recycles_buckets_only(self, tmp_path):
+        plane = SharedStatePlane.create(str(tmp_path / "tiny.bin"), slots=2)
+        assert plane.consume_token("rate:a", 1, 1, now=1.0) == (True, 0.0)
+        assert plane.consume_token("rate:b", 1, 1, now=2.0) == (True, 0.0)
+        # The least recently refilled bucket is replaced
+        assert plane.consume_token("rate:c", 1, 1, now=3.0) == (True, 0.0)
+        assert plane.get_stats()["buckets"] == 2
+        assert plane.incr("requests.total") is None
+
+    def test_invalid_file_is_rejected(self, tmp_path):
+        path = tmp_path / "garbage.bin"
+        path.write_bytes(b"x" * 64)
+        with pytest.raises(SharedStateError):
+            SharedStatePlane(str(path))
+
+
+class TestSharedConsumers:
+    """Test the rate limiter and circuit breaker on top of the plane"""
+
+    def test_rate_limiter_budget_is_per_host(self, plane_path, monkeypatch):
+        monkeypatch.setenv(SHARED_STATE_ENV, plane_path)
+        worker_a = TokenBucketRateLimiter(requests_per_minute=2)
+        worker_b = TokenBucketRateLimiter(requests_per_minute=2)
+        assert worker_a.shared is not None
+
+        assert worker_a.is_allowed("10.0.0.1")[0]
+        assert worker_b.is_allowed("10.0.0.1")[0]
+        allowed, reset_time = worker_a.is_allowed("10.0.0.1")
+        assert not allowed
+        assert reset_time > 0
+
+    def test_breaker_trip_and_recovery_propagate(self, plane_path):
+        config = SlidingWindowConfig(consecutive_failure_threshold=2, open_timeout=30,
+                                     half_open_max_probes=1, minimum_calls=100)
+        worker_a = SlidingWindowCircuitBreaker("openai", config, shared=SharedStatePlane(plane_path))
+        worker_b = SlidingWindowCircuitBreaker("openai", config, shared=SharedStatePlane(plane_path))
+
+        worker_a.record_outcome(CallOutcome.SERVER_ERROR, now=100.0)
+        worker_a.record_outcome(CallOutcome.SERVER_ERROR, now=100.0)
+        assert worker_a.is_open()
+
+        # The peer adopts the open state and the original opening time
+        assert worker_b.allow_request(now=101.0) is False
+        assert worker_b.is_open()
+        assert worker_b.opened_at == 100.0
+
+        # worker_a probes after the timeout and closes the breaker for everyone
+        assert worker_a.allow_request(now=131.0) is True
+        worker_a.record_outcome(CallOutcome.SUCCESS, now=131.0)
+        assert worker_a.is_closed()
+        assert worker_b.allow_request(now=131.5) is True
+        assert worker_b.state == CircuitState.CLOSED
+
+
+class TestSupervisorSockets:
+    """Test SO_REUSEPORT listeners used by the workers"""
+
+    @pytest.mark.skipif(not hasattr(socket, "SO_REUSEPORT"), reason="requires SO_REUSEPORT")
+    def test_workers_can_bind_the_same_port(self):
+        first = bind_socket("127.0.0.1", 0, reuse_port=True)
+        port = first.getsockname()[1]
+        second = bind_socket("127.0.0.1", port, reuse_port=True)
+        assert second.getsockname()[1] == port
+        first.close()
+        second.close()
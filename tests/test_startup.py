@@ -0,0 +1,127 @@
+"""
+Tests for staged startup and the import-time profile
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.core.startup import (StageStatus, StartupManager, Subsystem,
+                              format_import_report, parse_importtime)
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        420 | io
+import time:      2000 |       2000 |     yaml.reader
+import time:      5000 |       7000 |   yaml
+import time:      1000 |       8000 | src.core.config
+"""
+
+
+def sections(**values):
+    async def load_config_section(name):
+        return values.get(name)
+    return patch("src.core.optimized_config.load_config_section", load_config_section)
+
+
+class TestStartupManager:
+    """Test stage timing, feature gating and shutdown"""
+
+    @pytest.mark.asyncio
+    async def test_optional_subsystems_follow_config_sections(self):
+        started, stopped = [], []
+
+        async def start(app, section):
+            started.append(section)
+
+        async def stop(app):
+            stopped.append("alerting")
+
+        manager = StartupManager(subsystems=[
+            Subsystem("alerting", "alerting", start, stop),
+            Subsystem("chaos_engineering", "chaos_engineering", start, enabled_by_default=False),
+            Subsystem("web_ui", "web_ui", start),
+        ])
+        with sections(alerting={"enabled": True, "interval": 5}, web_ui={"enabled": False}):
+            await manager.start_optional(SimpleNamespace())
+
+        assert started == [{"enabled": True, "interval": 5}]
+        assert manager.is_started("alerting")
+        statuses = {r.name: r.status for r in manager.records}
+        assert statuses == {"alerting": StageStatus.READY,
+                            "chaos_engineering": StageStatus.SKIPPED,
+                            "web_ui": StageStatus.SKIPPED}
+
+        await manager.shutdown(SimpleNamespace())
+        assert stopped == ["alerting"]
+
+    @pytest.mark.asyncio
+    async def test_failed_subsystem_does_not_block_others(self):
+        async def broken(app, section):
+            raise RuntimeError("no exporter")
+
+        async def fine(app, section):
+            pass
+
+        manager = StartupManager(subsystems=[Subsystem("telemetry", "telemetry", broken),
+                                             Subsystem("memory_manager", "memory", fine)])
+        with sections():
+            await manager.start_optional(SimpleNamespace())
+
+        report = manager.get_report()
+        assert report["started_subsystems"] == ["memory_manager"]
+        assert report["stages"][0]["status"] == "failed"
+        assert report["stages"][0]["error"] == "no exporter"
+        assert report["optional_complete"] is True
+
+    @pytest.mark.asyncio
+    async def test_ready_before_optional_stage_finishes(self):
+        release = asyncio.Event()
+
+        async def slow(app, section):
+            await release.wait()
+
+        manager = StartupManager(subsystems=[Subsystem("alerting", "alerting", slow)])
+        async with manager.step("app_state"):
+            pass
+        manager.mark_ready()
+
+        with sections():
+            task = manager.start_optional_background(SimpleNamespace())
+            await asyncio.sleep(0)
+            report = manager.get_report()
+            assert report["ready"] is True
+            assert report["optional_complete"] is False
+
+            # Shutdown cancels a stage still in progress
+            await manager.shutdown(SimpleNamespace())
+        assert task.cancelled()
+        assert not manager.is_started("alerting")
+
+    @pytest.mark.asyncio
+    async def test_failed_core_step_is_recorded_and_raised(self):
+        manager = StartupManager()
+        with pytest.raises(ValueError):
+            async with manager.step("http_client"):
+                raise ValueError("bad config")
+        assert manager.records[0].status == StageStatus.FAILED
+        assert manager.ready is False
+
+
+class TestImportProfile:
+    """Test parsing and reporting of -X importtime output"""
+
+    def test_parse_importtime(self):
+        timings = parse_importtime(IMPORTTIME_OUTPUT)
+        assert [t.module for t in timings] == ["_io", "io", "yaml.reader", "yaml", "src.core.config"]
+        assert timings[2].depth == 2
+        assert timings[4].cumulative_us == 8000
+
+    def test_report_groups_by_package(self):
+        report = format_import_report(parse_importtime(IMPORTTIME_OUTPUT), top=2)
+        assert report.startswith("Imported 5 modules in 8.4 ms")
+        package_lines = report.split("\n\n")[1].splitlines()[1:]
+        assert [line.split()[0] for line in package_lines] == ["yaml", "src"]
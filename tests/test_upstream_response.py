@@ -0,0 +1,89 @@
+"""
+Tests for raw upstream response passthrough
+"""
+
+import json
+import pickle
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.models.upstream_response import UpstreamResponse, parse_upstream_json
+
+BODY = b'{"id":"chatcmpl-1","object":"chat.completion","usage":{"prompt_tokens":3,"completion_tokens":2,"total_tokens":5,"cached_tokens":0}}'
+
+
+class TestUpstreamResponse:
+    """Test raw-bytes tracking on decoded upstream bodies"""
+
+    def test_parse_keeps_raw_bytes(self):
+        data = parse_upstream_json(SimpleNamespace(content=BODY))
+        assert isinstance(data, UpstreamResponse)
+        assert data.raw == BODY
+        assert data["usage"]["total_tokens"] == 5
+        # Fields the proxy does not know about are preserved verbatim
+        assert data["usage"]["cached_tokens"] == 0
+
+    @pytest.mark.parametrize("mutate", [
+        lambda d: d.__setitem__("_extra", 1),
+        lambda d: d.__delitem__("id"),
+        lambda d: d.update(model="x"),
+        lambda d: d.setdefault("_extra", {}),
+        lambda d: d.pop("id"),
+        lambda d: d.popitem(),
+        lambda d: d.clear(),
+    ])
+    def test_top_level_mutation_drops_raw(self, mutate):
+        data = parse_upstream_json(SimpleNamespace(content=BODY))
+        mutate(data)
+        assert data.raw is None
+
+    def test_reads_keep_raw(self):
+        data = parse_upstream_json(SimpleNamespace(content=BODY))
+        data.get("usage", {}).get("total_tokens", 0)
+        data.setdefault("id", "other")
+        assert "error" not in data
+        assert data.raw == BODY
+
+    def test_non_object_bodies_are_plain(self):
+        assert parse_upstream_json(SimpleNamespace(content=b"[1, 2]")) == [1, 2]
+
+    def test_mock_response_falls_back_to_json(self):
+        response = MagicMock()
+        response.json.return_value = {"id": "mocked"}
+        assert parse_upstream_json(response) == {"id": "mocked"}
+
+    def test_pickles_as_plain_dict(self):
+        data = parse_upstream_json(SimpleNamespace(content=BODY))
+        restored = pickle.loads(pickle.dumps(data))
+        assert type(restored) is dict
+        assert restored == json.loads(BODY)
+
+
+class TestCompletionResponse:
+    """Test building the HTTP response for routed completions"""
+
+    def _request(self, proxy_info=None):
+        return SimpleNamespace(state=SimpleNamespace(proxy_info=proxy_info))
+
+    def test_unmodified_upstream_body_sent_verbatim(self):
+        from src.api.responses import RawJSONResponse, completion_response
+
+        info = {"provider": "openai", "attempt_number": 2, "response_time": 0.25, "request_id": "chat_1"}
+        response = completion_response(self._request(info), parse_upstream_json(SimpleNamespace(content=BODY)))
+        assert isinstance(response, RawJSONResponse)
+        assert response.body == BODY
+        assert response.headers["x-proxy-provider"] == "openai"
+        assert response.headers["x-proxy-attempt"] == "2"
+        assert response.headers["x-request-id"] == "chat_1"
+
+    def test_transformed_body_is_encoded(self):
+        from src.api.responses import FastJSONResponse, completion_response
+
+        data = parse_upstream_json(SimpleNamespace(content=BODY))
+        data["id"] = "rewritten"
+        response = completion_response(self._request(), data)
+        assert isinstance(response, FastJSONResponse)
+        assert json.loads(response.body)["id"] == "rewritten"
+        assert "x-proxy-provider" not in response.headers